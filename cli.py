@@ -16,10 +16,14 @@ from hospital_routes.core.interfaces import (
     OptimizationConfig,
     ReportType,
 )
+from hospital_routes.core.exceptions import InvalidConfigurationError
 from hospital_routes.optimization.genetic_algorithm import GeneticAlgorithmOptimizer
 from hospital_routes.optimization.factory import OptimizerFactory
 from hospital_routes.visualization.map_generator import MapGenerator
 from hospital_routes.utils.logger import setup_logger, get_logger
+from hospital_routes.utils.distance_service import get_distance_service
+from hospital_routes.utils.matrix_store import MatrixStore, set_matrix_store
+from hospital_routes.utils.road_network import RoadNetwork, set_road_network
 
 
 def load_input_file(input_path: str) -> Dict[str, Any]:
@@ -77,6 +81,17 @@ def parse_vehicles(data: Dict[str, Any]) -> list[VehicleConstraints]:
     return vehicles
 
 
+def positive_float(value: str) -> float:
+    """Tipo do argparse para valores reais positivos (ex: --time-limit)."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número inválido: {value}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"deve ser positivo: {value}")
+    return number
+
+
 def parse_config(data: Dict[str, Any]) -> OptimizationConfig:
     """Converte dados JSON em OptimizationConfig."""
     config_data = data.get("config", {})
@@ -88,6 +103,10 @@ def parse_config(data: Dict[str, Any]) -> OptimizationConfig:
         max_iterations_without_improvement=config_data.get(
             "max_iterations_without_improvement", None
         ),
+        time_limit_seconds=config_data.get("time_limit_seconds", None),
+        distance_precision=config_data.get("distance_precision", "haversine"),
+        distance_dtype=config_data.get("distance_dtype", "float64"),
+        distance_layout=config_data.get("distance_layout", "dense"),
     )
 
 
@@ -166,11 +185,92 @@ Exemplos:
     parser.add_argument(
         "--algorithm",
         type=str,
-        choices=["genetic", "greedy", "simulated_annealing"],
+        choices=["genetic", "genetic_islands", "greedy", "simulated_annealing", "alns"],
         default="genetic",
         help="Algoritmo de otimização a usar",
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos para avaliação paralela do fitness (algoritmo genético)",
+    )
+    
+    parser.add_argument(
+        "--islands",
+        type=int,
+        default=4,
+        help="Número de ilhas (processos) do algoritmo genético em ilhas",
+    )
+    
+    parser.add_argument(
+        "--migration-interval",
+        type=int,
+        default=10,
+        help="Gerações entre migrações do algoritmo genético em ilhas",
+    )
+    
+    parser.add_argument(
+        "--encoding",
+        type=str,
+        choices=["routes", "giant_tour"],
+        default="routes",
+        help="Codificação do cromossomo do algoritmo genético",
+    )
+    
+    parser.add_argument(
+        "--evaluation",
+        type=str,
+        choices=["fused", "vectorized"],
+        default="fused",
+        help="Avaliação da população do algoritmo genético (vectorized: população inteira em arrays)",
+    )
+    
+    parser.add_argument(
+        "--memetic",
+        type=int,
+        default=0,
+        help="Busca local nos N melhores filhos de cada geração do algoritmo genético (0 = desativada)",
+    )
+    
+    parser.add_argument(
+        "--operator-selection",
+        type=str,
+        choices=["none", "uniform", "roulette", "ucb"],
+        default="none",
+        help="Seleção adaptativa dos operadores de mutação e crossover do algoritmo genético",
+    )
+    
+    parser.add_argument(
+        "--local-search",
+        type=str,
+        choices=["none", "first", "best"],
+        default="none",
+        help="Busca local entre rotas após o algoritmo (primeira ou melhor melhoria)",
+    )
+    
+    parser.add_argument(
+        "--time-limit",
+        type=positive_float,
+        default=None,
+        help="Tempo máximo de otimização em segundos (retorna a melhor solução até o prazo)",
+    )
+    
+    parser.add_argument(
+        "--matrix-cache",
+        type=str,
+        default=None,
+        help="Diretório para reutilizar matrizes de distâncias (.npy mapeados em memória)",
+    )
+    
+    parser.add_argument(
+        "--road-network",
+        type=str,
+        default=None,
+        help="Malha viária offline (.graphml ou .osm) para distâncias de condução",
+    )
+    
     parser.add_argument(
         "--map",
         type=str,
@@ -222,13 +322,38 @@ Exemplos:
         deliveries = parse_deliveries(data)
         vehicles = parse_vehicles(data)
         config = parse_config(data)
+        if args.matrix_cache:
+            set_matrix_store(MatrixStore(args.matrix_cache))
+        if args.road_network:
+            logger.info(f"Carregando malha viária: {args.road_network}")
+            network = RoadNetwork.from_file(args.road_network)
+            logger.info(f"Malha viária: {network.node_count} nós, {network.edge_count} arestas")
+            set_road_network(network)
+        if args.time_limit is not None:
+            config.time_limit_seconds = args.time_limit
         depot_location = tuple(data.get("depot_location", [-23.5505, -46.6333]))
         
         logger.info(f"Carregados: {len(deliveries)} entregas, {len(vehicles)} veículos")
         
         # Executar otimização
         logger.info(f"Executando algoritmo: {args.algorithm}")
-        optimizer = OptimizerFactory.create(args.algorithm)
+        optimizer = OptimizerFactory.create(
+            args.algorithm,
+            {
+                "n_workers": args.workers,
+                "encoding": args.encoding,
+                "evaluation_mode": args.evaluation,
+                "memetic_config": {"top_k": args.memetic},
+                "operator_selection": (
+                    None if args.operator_selection == "none" else args.operator_selection
+                ),
+                "island_config": {
+                    "n_islands": args.islands,
+                    "migration_interval": args.migration_interval,
+                },
+                "local_search": None if args.local_search == "none" else args.local_search,
+            },
+        )
         
         result = optimizer.optimize(
             deliveries=deliveries,
@@ -241,6 +366,11 @@ Exemplos:
             f"Otimização concluída: {result.solution.total_distance:.2f} km, "
             f"R$ {result.solution.total_cost:.2f}, {result.execution_time:.2f}s"
         )
+        if result.statistics.get("time_limit_reached"):
+            logger.warning(
+                f"Prazo de {config.time_limit_seconds}s atingido: "
+                f"retornando a melhor solução encontrada"
+            )
         
         # Salvar resultado
         logger.info(f"Salvando resultado em: {args.output}")
@@ -283,6 +413,13 @@ Exemplos:
             except Exception as e:
                 logger.error(f"Erro ao gerar relatório: {e}")
         
+        for call_site, stats in get_distance_service().stats().items():
+            logger.debug(
+                f"Distâncias [{call_site}]: {stats['calls']} consultas, "
+                f"{stats['hit_rate']:.0%} em matriz/cache, "
+                f"{stats['compute_time']:.3f}s calculando"
+            )
+        
         logger.info("Processo concluído com sucesso!")
         return 0
     
@@ -292,6 +429,9 @@ Exemplos:
     except json.JSONDecodeError as e:
         logger.error(f"Erro ao ler JSON: {e}")
         return 1
+    except InvalidConfigurationError as e:
+        logger.error(f"Configuração inválida: {e}")
+        return 1
     except Exception as e:
         logger.exception(f"Erro inesperado: {e}")
         return 1
@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from hospital_routes.core.exceptions import InvalidConfigurationError
+
 
 @dataclass
 class OptimizationConfig:
@@ -23,6 +25,17 @@ class OptimizationConfig:
     elite_size: int = 10
     max_vehicles: int = 5
     max_iterations_without_improvement: Optional[int] = None
+    time_limit_seconds: Optional[float] = None  # Prazo (wall-clock); None = sem limite
+    distance_precision: str = "haversine"  # "haversine" (rápido) ou "ellipsoidal" (WGS-84)
+    distance_dtype: str = "float64"  # "float64" ou "float32" (metade da memória)
+    distance_layout: str = "dense"  # "dense" ou "packed" (só triângulo inferior)
+    
+    def __post_init__(self):
+        """Valida o prazo de execução."""
+        if self.time_limit_seconds is not None and self.time_limit_seconds <= 0:
+            raise InvalidConfigurationError(
+                f"time_limit_seconds deve ser positivo: {self.time_limit_seconds}"
+            )
 
 
 @dataclass
@@ -174,14 +174,16 @@ class RouteChatbot:
             
             # Se temos acesso às entregas, calcular métricas
             if hasattr(self, '_deliveries_cache') and self._deliveries_cache:
-                from hospital_routes.utils.distance import calculate_distance
+                from hospital_routes.utils.distance_service import get_distance_service
+                distance_service = get_distance_service()
                 delivery_dict = {d.id: d for d in self._deliveries_cache}
                 
                 for j in range(len(route) - 1):
                     if route[j] in delivery_dict and route[j + 1] in delivery_dict:
-                        route_distance += calculate_distance(
+                        route_distance += distance_service.distance(
                             delivery_dict[route[j]].location,
                             delivery_dict[route[j + 1]].location,
+                            call_site="RouteChatbot._build_context",
                         )
                 
                 for delivery_id in route:
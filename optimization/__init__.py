@@ -3,12 +3,19 @@
 from hospital_routes.optimization.genetic_algorithm import GeneticAlgorithmOptimizer
 from hospital_routes.optimization.greedy_optimizer import GreedyOptimizer
 from hospital_routes.optimization.simulated_annealing_optimizer import SimulatedAnnealingOptimizer
+from hospital_routes.optimization.alns_optimizer import ALNSOptimizer
+from hospital_routes.optimization.island_model import IslandModelOptimizer
+from hospital_routes.optimization.local_search import LocalSearch, LocalSearchStage
 from hospital_routes.optimization.benchmark import AlgorithmBenchmark, BenchmarkResult
 
 __all__ = [
     "GeneticAlgorithmOptimizer",
     "GreedyOptimizer",
     "SimulatedAnnealingOptimizer",
+    "ALNSOptimizer",
+    "IslandModelOptimizer",
+    "LocalSearch",
+    "LocalSearchStage",
     "AlgorithmBenchmark",
     "BenchmarkResult",
 ]
@@ -0,0 +1,743 @@
+"""
+Implementação do Adaptive Large Neighborhood Search (ALNS) para otimização de rotas.
+
+A cada iteração o ALNS remove parte das entregas da solução atual
+(operador de destruição) e as reinsere (operador de reparo). Os operadores
+são sorteados por roleta com pesos adaptados ao desempenho recente, e a
+nova solução é aceita por um critério do tipo Simulated Annealing.
+A busca é limitada por um orçamento de tempo (wall-clock).
+
+Referência: Ropke & Pisinger (2006), "An Adaptive Large Neighborhood
+Search Heuristic for the Pickup and Delivery Problem with Time Windows".
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from hospital_routes.core.interfaces import (
+    BaseOptimizer,
+    Delivery,
+    VehicleConstraints,
+    OptimizationConfig,
+    RouteSolution,
+    OptimizationResult,
+)
+from hospital_routes.core.exceptions import InvalidConfigurationError, OptimizationError
+from hospital_routes.utils.distance import (
+    build_delivery_distance_matrix,
+    DistanceMatrix,
+    DEPOT_INDEX,
+)
+from hospital_routes.utils.validators import validate_deliveries, validate_vehicles
+from hospital_routes.utils.deadline import Deadline
+from hospital_routes.utils.travel_time import TravelTimeTensor
+from hospital_routes.utils.candidate_graph import DEFAULT_CANDIDATE_COUNT
+from hospital_routes.optimization.fitness.composite_fitness import CompositeFitness
+from hospital_routes.optimization.fitness.fused_fitness import FusedFitnessEvaluator
+from hospital_routes.utils.config import FitnessWeights
+
+
+DESTROY_OPERATORS = ("random", "worst", "shaw", "route")
+REPAIR_OPERATORS = ("greedy", "regret_2", "regret_3")
+
+# Pontuações da roleta adaptativa (Ropke & Pisinger)
+SCORE_GLOBAL_BEST = 33.0  # Nova melhor solução global
+SCORE_IMPROVED = 9.0  # Melhor que a solução atual
+SCORE_ACCEPTED = 13.0  # Pior, mas aceita (diversificação)
+
+# Pesos da relação de Shaw: distância, carga e prioridade
+SHAW_DISTANCE_WEIGHT = 9.0
+SHAW_LOAD_WEIGHT = 2.0
+SHAW_PRIORITY_WEIGHT = 5.0
+
+# Rota candidata: (custo, posição de inserção)
+Insertion = Tuple[float, int]
+
+# Estado de uma rota: (carga, distância, críticas a partir de cada posição,
+# posição de cada parada)
+RouteState = Tuple[float, float, List[int], Dict[int, int]]
+
+
+class ALNSOptimizer(BaseOptimizer):
+    """
+    Otimizador de rotas usando Adaptive Large Neighborhood Search.
+    
+    Estratégia: destrói e reconstrói parte da solução a cada iteração,
+    escolhendo os operadores mais bem-sucedidos com maior frequência.
+    Escala para instâncias maiores que o GA dentro de um tempo fixo.
+    """
+    
+    def __init__(
+        self,
+        fitness_weights: FitnessWeights = None,
+        time_limit: float = 10.0,
+        max_iterations: Optional[int] = None,
+        min_removal: float = 0.05,
+        max_removal: float = 0.3,
+        max_removed_stops: int = 60,
+        segment_length: int = 100,
+        reaction_factor: float = 0.1,
+        start_temperature_ratio: float = 0.05,
+        cooling_end_ratio: float = 0.002,
+        candidate_count: Optional[int] = DEFAULT_CANDIDATE_COUNT,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            fitness_weights: Pesos da função de fitness (usa padrão se None)
+            time_limit: Orçamento de tempo em segundos (wall-clock)
+            max_iterations: Limite opcional de iterações (None = só o tempo)
+            min_removal: Fração mínima de entregas removidas por iteração
+            max_removal: Fração máxima de entregas removidas por iteração
+            max_removed_stops: Teto absoluto de entregas removidas por iteração
+            segment_length: Iterações entre atualizações dos pesos da roleta
+            reaction_factor: Velocidade de adaptação dos pesos (0-1)
+            start_temperature_ratio: Piora relativa aceita com 50% de
+                probabilidade no início da busca
+            cooling_end_ratio: Fração da temperatura inicial ao fim do orçamento
+            candidate_count: Vizinhos do grafo de candidatos; em rotas com mais
+                de 2x esse número de paradas, a inserção só testa as posições
+                ao lado desses vizinhos e do depósito (None = todas as posições)
+            seed: Semente do gerador aleatório (None = não determinístico)
+        """
+        if time_limit <= 0:
+            raise InvalidConfigurationError(
+                f"time_limit deve ser positivo: {time_limit}"
+            )
+        if not 0 < min_removal <= max_removal <= 1:
+            raise InvalidConfigurationError(
+                "Frações de remoção devem satisfazer 0 < min_removal <= max_removal <= 1"
+            )
+        
+        self.fitness_weights = fitness_weights or FitnessWeights()
+        self.composite_fitness = CompositeFitness(self.fitness_weights)
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.min_removal = min_removal
+        self.max_removal = max_removal
+        self.max_removed_stops = max_removed_stops
+        self.segment_length = segment_length
+        self.reaction_factor = reaction_factor
+        self.start_temperature_ratio = start_temperature_ratio
+        self.cooling_end_ratio = cooling_end_ratio
+        self.candidate_count = candidate_count
+        self.seed = seed
+        self._distance_matrix: Optional[DistanceMatrix] = None
+    
+    def optimize(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        config: OptimizationConfig,
+        depot_location: Tuple[float, float],
+    ) -> OptimizationResult:
+        """
+        Otimiza rotas usando ALNS.
+        
+        Args:
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos disponíveis
+            config: Configuração (usa distance_precision; time_limit_seconds,
+                se menor, substitui o orçamento de tempo do otimizador)
+            depot_location: Localização do depósito
+        
+        Returns:
+            OptimizationResult: Resultado da otimização
+        """
+        start_time = time.time()
+        
+        try:
+            # Validar inputs
+            validate_deliveries(deliveries)
+            validate_vehicles(vehicles)
+            
+            self._rng = random.Random(self.seed)
+            
+            # O prazo cobre a matriz e a solução inicial
+            time_limit = self.time_limit
+            if config.time_limit_seconds is not None:
+                time_limit = min(time_limit, config.time_limit_seconds)
+            deadline = Deadline(time_limit, start_time)
+            
+            # Construir matriz de distâncias e avaliador fundido
+            # (replanejamento: a matriz da execução anterior é atualizada no lugar)
+            distance_matrix = self._distance_matrix = build_delivery_distance_matrix(
+                deliveries,
+                depot_location,
+                precision=config.distance_precision,
+                dtype=config.distance_dtype,
+                layout=config.distance_layout,
+                previous=self._distance_matrix,
+            )
+            self._prepare(deliveries, vehicles, distance_matrix)
+            
+            # Solução inicial (Greedy)
+            current = [
+                distance_matrix.indices(route)
+                for route in self._initial_solution(
+                    deliveries, vehicles, depot_location, distance_matrix, deadline
+                )
+            ]
+            current_fitness = self._evaluator.evaluate_indices(current)
+            best = [route[:] for route in current]
+            best_fitness = current_fitness
+            best_fitness_history = [best_fitness]
+            
+            # Temperatura relativa à melhor solução: no início, uma piora de
+            # start_temperature_ratio é aceita com 50% de probabilidade
+            temperature = self._temperature(best_fitness, 0.0)
+            
+            destroy_weights = {name: 1.0 for name in DESTROY_OPERATORS}
+            repair_weights = {name: 1.0 for name in REPAIR_OPERATORS}
+            scores = {name: 0.0 for name in DESTROY_OPERATORS + REPAIR_OPERATORS}
+            uses = {name: 0 for name in DESTROY_OPERATORS + REPAIR_OPERATORS}
+            total_uses = {name: 0 for name in DESTROY_OPERATORS + REPAIR_OPERATORS}
+            improvements = 0
+            accepted = 0
+            
+            n_stops = len(deliveries)
+            min_removed = max(1, int(self.min_removal * n_stops))
+            max_removed = max(
+                min_removed, min(int(self.max_removal * n_stops), self.max_removed_stops)
+            )
+            
+            iteration = 0
+            while not deadline.expired() and (
+                self.max_iterations is None or iteration < self.max_iterations
+            ):
+                iteration += 1
+                
+                destroy_name = self._roulette(destroy_weights)
+                repair_name = self._roulette(repair_weights)
+                
+                # Destruir e reparar uma cópia da solução atual
+                candidate = [route[:] for route in current]
+                n_remove = self._rng.randint(min_removed, max_removed)
+                removed = self._destroy(destroy_name, candidate, n_remove)
+                candidate = [route for route in candidate if route]
+                self._repair(repair_name, candidate, removed)
+                candidate = [route for route in candidate if route]
+                candidate_fitness = self._evaluator.evaluate_indices(candidate)
+                
+                # Critério de aceitação (Simulated Annealing)
+                score = 0.0
+                delta = candidate_fitness - current_fitness
+                if delta < 0 or self._rng.random() < math.exp(-delta / temperature):
+                    accepted += 1
+                    current = candidate
+                    current_fitness = candidate_fitness
+                    if current_fitness < best_fitness - 1e-9:
+                        best = [route[:] for route in current]
+                        best_fitness = current_fitness
+                        best_fitness_history.append(best_fitness)
+                        improvements += 1
+                        score = SCORE_GLOBAL_BEST
+                    elif delta < 0:
+                        score = SCORE_IMPROVED
+                    else:
+                        score = SCORE_ACCEPTED
+                
+                for name in (destroy_name, repair_name):
+                    scores[name] += score
+                    uses[name] += 1
+                    total_uses[name] += 1
+                
+                # Atualizar pesos da roleta ao fim de cada segmento
+                if iteration % self.segment_length == 0:
+                    for weights in (destroy_weights, repair_weights):
+                        for name in weights:
+                            if uses[name]:
+                                weights[name] = (
+                                    (1 - self.reaction_factor) * weights[name]
+                                    + self.reaction_factor * scores[name] / uses[name]
+                                )
+                            # Peso mínimo para que nenhum operador seja descartado
+                            weights[name] = max(weights[name], 0.05)
+                            scores[name] = 0.0
+                            uses[name] = 0
+                
+                # Resfriamento proporcional ao orçamento de tempo consumido
+                progress = (time.time() - start_time) / time_limit
+                if self.max_iterations:
+                    progress = max(progress, iteration / self.max_iterations)
+                temperature = self._temperature(best_fitness, progress)
+            
+            # Converter melhor solução para RouteSolution
+            ids = distance_matrix.ids
+            solution = self._routes_to_solution(
+                [[ids[stop] for stop in route] for route in best],
+                deliveries, vehicles, depot_location, distance_matrix,
+            )
+            
+            execution_time = time.time() - start_time
+            
+            return OptimizationResult(
+                solution=solution,
+                execution_time=execution_time,
+                generations_evolved=iteration,
+                best_fitness_history=best_fitness_history,
+                config=config,
+                statistics={
+                    "algorithm": "alns",
+                    "iterations": iteration,
+                    "accepted": accepted,
+                    "improvements": improvements,
+                    "final_temperature": temperature,
+                    "destroy_weights": dict(destroy_weights),
+                    "repair_weights": dict(repair_weights),
+                    "operator_uses": dict(total_uses),
+                    **deadline.statistics(),
+                },
+            )
+        
+        except Exception as e:
+            raise OptimizationError(f"Erro durante otimização ALNS: {str(e)}") from e
+    
+    def validate_solution(
+        self,
+        solution: RouteSolution,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+    ) -> bool:
+        """Valida se uma solução atende todas as restrições."""
+        delivery_dict = {d.id: d for d in deliveries}
+        
+        # Verificar se todas as entregas estão nas rotas
+        all_delivery_ids = set(d.id for d in deliveries)
+        solution_delivery_ids = set()
+        for route in solution.routes:
+            solution_delivery_ids.update(route)
+        
+        if all_delivery_ids != solution_delivery_ids:
+            return False
+        
+        # Verificar restrições de capacidade
+        for route_idx, route in enumerate(solution.routes):
+            if route_idx >= len(vehicles):
+                return False
+            
+            vehicle = vehicles[route_idx]
+            route_weight = sum(
+                delivery_dict[d_id].weight
+                for d_id in route
+                if d_id in delivery_dict
+            )
+            if route_weight > vehicle.max_capacity:
+                return False
+        
+        return True
+    
+    def _prepare(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        distance_matrix: DistanceMatrix,
+    ) -> None:
+        """Pré-computa arrays por índice usados pelos operadores."""
+        self._vehicles = vehicles
+        self._evaluator: FusedFitnessEvaluator = self.composite_fitness.build_evaluator(
+            deliveries, vehicles, distance_matrix
+        )
+        self._rows = distance_matrix.rows
+        self._weights = self._evaluator.stop_weights
+        self._critical = self._evaluator.critical
+        self._open_costs: Optional[Tuple[int, Dict[int, float]]] = None
+        self._candidates = (
+            distance_matrix.candidate_graph(self.candidate_count).neighbors
+            if self.candidate_count else None
+        )
+        
+        # Normalizadores da relação de Shaw
+        self._max_distance = distance_matrix.max_distance() or 1.0
+        stop_weights = [d.weight for d in deliveries]
+        self._max_weight_gap = (max(stop_weights) - min(stop_weights)) or 1.0
+    
+    def _initial_solution(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        depot_location: Tuple[float, float],
+        distance_matrix: DistanceMatrix,
+        deadline: Optional[Deadline] = None,
+    ) -> List[List[str]]:
+        """
+        Gera solução inicial usando Greedy.
+        
+        Usa a matriz já construída (mesma precisão, dtype e layout) e o
+        prazo da otimização; não monta uma segunda matriz.
+        """
+        from hospital_routes.optimization.greedy_optimizer import GreedyOptimizer
+        
+        greedy = GreedyOptimizer(fitness_weights=self.fitness_weights)
+        return greedy._solve_greedy(
+            deliveries, vehicles, depot_location, distance_matrix, deadline
+        )
+    
+    def _temperature(self, best_fitness: float, progress: float) -> float:
+        """Temperatura com resfriamento geométrico pelo progresso (0-1)."""
+        start_temperature = self.start_temperature_ratio * abs(best_fitness) / math.log(2)
+        return max(
+            start_temperature * self.cooling_end_ratio ** min(progress, 1.0), 1e-9
+        )
+    
+    def _roulette(self, weights: Dict[str, float]) -> str:
+        """Sorteia um operador com probabilidade proporcional ao peso."""
+        threshold = self._rng.random() * sum(weights.values())
+        cumulative = 0.0
+        for name, weight in weights.items():
+            cumulative += weight
+            if threshold <= cumulative:
+                return name
+        return name
+    
+    def _destroy(
+        self, operator: str, routes: List[List[int]], n_remove: int
+    ) -> List[int]:
+        """
+        Remove entregas das rotas (in-place).
+        
+        Args:
+            operator: Operador de destruição
+            routes: Rotas (índices da matriz), alteradas in-place
+            n_remove: Número de entregas a remover
+        
+        Returns:
+            List[int]: Entregas removidas
+        """
+        stops = [stop for route in routes for stop in route]
+        n_remove = min(n_remove, len(stops))
+        
+        if operator == "random":
+            removed = self._rng.sample(stops, n_remove)
+        elif operator == "worst":
+            removed = self._worst_removal(routes, n_remove)
+        elif operator == "shaw":
+            removed = self._shaw_removal(stops, n_remove)
+        elif operator == "route":
+            removed = self._route_removal(routes, n_remove)
+        else:
+            raise InvalidConfigurationError(f"Operador de destruição desconhecido: {operator}")
+        
+        removed_set = set(removed)
+        for r, route in enumerate(routes):
+            routes[r] = [stop for stop in route if stop not in removed_set]
+        
+        return removed
+    
+    def _randomized_pick(self, ranked: List, determinism: float) -> int:
+        """Índice sorteado com viés para o início da lista (y^p)."""
+        return int(len(ranked) * self._rng.random() ** determinism)
+    
+    def _worst_removal(self, routes: List[List[int]], n_remove: int) -> List[int]:
+        """Remove as entregas de maior custo (distância + atraso de críticas)."""
+        rows = self._rows
+        critical = self._critical
+        alpha = self.fitness_weights.distance_weight
+        delta = self.fitness_weights.priority_penalty
+        
+        costs = []
+        for route in routes:
+            critical_after = sum(critical[stop] for stop in route)
+            for k, stop in enumerate(route):
+                critical_after -= critical[stop]
+                previous = route[k - 1] if k > 0 else DEPOT_INDEX
+                following = route[k + 1] if k + 1 < len(route) else DEPOT_INDEX
+                saving = rows[previous][stop] + rows[stop][following] - rows[previous][following]
+                delay = (k if critical[stop] else 0) + critical_after
+                costs.append((alpha * saving + delta * delay, stop))
+        
+        costs.sort(reverse=True)
+        ranked = [stop for _, stop in costs]
+        removed = []
+        while len(removed) < n_remove:
+            removed.append(ranked.pop(self._randomized_pick(ranked, 3.0)))
+        return removed
+    
+    def _relatedness(self, a: int, b: int) -> float:
+        """Relação de Shaw entre duas entregas (menor = mais relacionadas)."""
+        return (
+            SHAW_DISTANCE_WEIGHT * self._rows[a][b] / self._max_distance
+            + SHAW_LOAD_WEIGHT * abs(self._weights[a] - self._weights[b]) / self._max_weight_gap
+            + SHAW_PRIORITY_WEIGHT * (self._critical[a] != self._critical[b])
+        )
+    
+    def _shaw_removal(self, stops: List[int], n_remove: int) -> List[int]:
+        """Remove entregas relacionadas (próximas, de carga e prioridade similares)."""
+        remaining = list(stops)
+        removed = [remaining.pop(self._rng.randrange(len(remaining)))]
+        while len(removed) < n_remove:
+            reference = self._rng.choice(removed)
+            remaining.sort(key=lambda stop: self._relatedness(reference, stop))
+            removed.append(remaining.pop(self._randomized_pick(remaining, 6.0)))
+        return removed
+    
+    def _route_removal(self, routes: List[List[int]], n_remove: int) -> List[int]:
+        """Esvazia rotas inteiras, sorteadas, até remover n_remove entregas."""
+        order = [r for r in range(len(routes)) if routes[r]]
+        self._rng.shuffle(order)
+        removed: List[int] = []
+        for r in order:
+            if len(removed) >= n_remove:
+                break
+            removed.extend(routes[r])
+        return removed
+    
+    def _repair(
+        self, operator: str, routes: List[List[int]], removed: List[int]
+    ) -> None:
+        """
+        Reinsere as entregas removidas (in-place).
+        
+        O custo de inserção combina distância (α), atraso de críticas (δ) e
+        o aumento das penalidades de capacidade (β) e autonomia (γ); abrir
+        uma rota custa também ε. Cada entrega mantém sua melhor inserção por
+        rota, recalculada apenas para a rota alterada.
+        
+        Args:
+            operator: "greedy", "regret_2" ou "regret_3"
+            routes: Rotas (índices da matriz), alteradas in-place
+            removed: Entregas a reinserir
+        """
+        if operator == "greedy":
+            regret = 1
+        elif operator.startswith("regret_"):
+            regret = int(operator.split("_")[1])
+        else:
+            raise InvalidConfigurationError(f"Operador de reparo desconhecido: {operator}")
+        
+        state = [self._route_state(route) for route in routes]
+        pending = list(removed)
+        self._rng.shuffle(pending)
+        table = {
+            stop: [self._best_insertion(stop, routes[r], state[r], r) for r in range(len(routes))]
+            for stop in pending
+        }
+        
+        while pending:
+            open_cost = self._open_route_cost(len(routes))
+            best_stop = None
+            best_key = None
+            best_choice: Tuple[float, int, int] = (0.0, -1, -1)
+            
+            for stop in pending:
+                options = [
+                    (cost, r, position)
+                    for r, (cost, position) in enumerate(table[stop])
+                ]
+                if open_cost is not None:
+                    options.append((open_cost[stop], len(routes), 0))
+                options.sort()
+                
+                choice = options[0]
+                if regret > 1:
+                    # Maior arrependimento primeiro; empate pelo menor custo
+                    horizon = options[1:regret]
+                    regret_value = sum(cost - choice[0] for cost, _, _ in horizon)
+                    if len(horizon) < regret - 1:
+                        regret_value = float('inf')
+                    key = (-regret_value, choice[0])
+                else:
+                    key = (choice[0],)
+                
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_stop = stop
+                    best_choice = choice
+            
+            _, r, position = best_choice
+            pending.remove(best_stop)
+            del table[best_stop]
+            
+            if r == len(routes):
+                routes.append([best_stop])
+                state.append(self._route_state(routes[r]))
+                for stop in pending:
+                    table[stop].append(self._best_insertion(stop, routes[r], state[r], r))
+            else:
+                routes[r].insert(position, best_stop)
+                state[r] = self._route_state(routes[r])
+                for stop in pending:
+                    table[stop][r] = self._best_insertion(stop, routes[r], state[r], r)
+    
+    def _route_state(self, route: List[int]) -> RouteState:
+        """(carga, distância, críticas a partir de cada posição, posições) da rota."""
+        rows = self._rows
+        critical = self._critical
+        load = sum(self._weights[stop] for stop in route)
+        distance = 0.0
+        previous = DEPOT_INDEX
+        for stop in route:
+            distance += rows[previous][stop]
+            previous = stop
+        distance += rows[previous][DEPOT_INDEX]
+        
+        critical_from = [0] * (len(route) + 1)
+        for k in range(len(route) - 1, -1, -1):
+            critical_from[k] = critical_from[k + 1] + critical[route[k]]
+        
+        return load, distance, critical_from, {stop: k for k, stop in enumerate(route)}
+    
+    def _penalty_increase(
+        self, r: int, load: float, distance: float, new_load: float, new_distance: float
+    ) -> float:
+        """Aumento das penalidades de capacidade e autonomia da rota r."""
+        if r >= len(self._vehicles):
+            return 0.0
+        vehicle = self._vehicles[r]
+        weights = self.fitness_weights
+        return (
+            weights.capacity_penalty * (
+                max(0.0, new_load - vehicle.max_capacity)
+                - max(0.0, load - vehicle.max_capacity)
+            )
+            + weights.autonomy_penalty * (
+                max(0.0, new_distance - vehicle.max_range)
+                - max(0.0, distance - vehicle.max_range)
+            )
+        )
+    
+    def _best_insertion(
+        self,
+        stop: int,
+        route: List[int],
+        state: RouteState,
+        r: int,
+    ) -> Insertion:
+        """
+        Melhor posição para inserir ``stop`` na rota r: (custo, posição).
+        
+        Em rotas longas, só as posições vizinhas aos candidatos de ``stop``
+        (e as pontas, junto ao depósito) são avaliadas.
+        """
+        rows = self._rows
+        alpha = self.fitness_weights.distance_weight
+        delta = self.fitness_weights.priority_penalty
+        load, distance, critical_from, position = state
+        is_critical = self._critical[stop]
+        
+        # A penalidade de capacidade não depende da posição; a de autonomia
+        # só muda quando a inserção ultrapassa o alcance do veículo
+        fixed_cost = self._penalty_increase(
+            r, load, distance, load + self._weights[stop], distance
+        )
+        max_range = self._vehicles[r].max_range if r < len(self._vehicles) else float('inf')
+        
+        if self._candidates is not None and len(route) > 2 * self.candidate_count:
+            positions = {0, len(route)}
+            for neighbor in self._candidates[stop]:
+                k = position.get(neighbor)
+                if k is not None:
+                    positions.add(k)
+                    positions.add(k + 1)
+            positions = sorted(positions)
+        else:
+            positions = range(len(route) + 1)
+        
+        best_cost = float('inf')
+        best_position = 0
+        for k in positions:
+            previous = route[k - 1] if k else DEPOT_INDEX
+            following = route[k] if k < len(route) else DEPOT_INDEX
+            added = rows[previous][stop] + rows[stop][following] - rows[previous][following]
+            cost = (
+                fixed_cost
+                + alpha * added
+                + delta * (critical_from[k] + (k if is_critical else 0))
+            )
+            if distance + added > max_range:
+                cost += self._penalty_increase(r, load, distance, load, distance + added)
+            if cost < best_cost:
+                best_cost = cost
+                best_position = k
+        
+        return best_cost, best_position
+    
+    def _open_route_cost(self, r: int) -> Optional[Dict[int, float]]:
+        """Custo de abrir a rota r para cada entrega (None se não há veículo livre)."""
+        if r >= len(self._vehicles):
+            return None
+        if self._open_costs is None or self._open_costs[0] != r:
+            rows = self._rows
+            alpha = self.fitness_weights.distance_weight
+            vehicle_cost = self.fitness_weights.vehicle_penalty
+            costs = {}
+            for stop in range(1, len(rows)):
+                round_trip = rows[DEPOT_INDEX][stop] + rows[stop][DEPOT_INDEX]
+                costs[stop] = (
+                    alpha * round_trip
+                    + vehicle_cost
+                    + self._penalty_increase(r, 0.0, 0.0, self._weights[stop], round_trip)
+                )
+            self._open_costs = (r, costs)
+        return self._open_costs[1]
+    
+    def _routes_to_solution(
+        self,
+        routes: List[List[str]],
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        depot_location: Tuple[float, float],
+        distance_matrix: DistanceMatrix,
+    ) -> RouteSolution:
+        """Converte rotas em RouteSolution."""
+        delivery_dict = {d.id: d for d in deliveries}
+        
+        # Distância de cada rota (uma leitura vetorizada da matriz)
+        route_indices = [distance_matrix.indices(route) for route in routes]
+        route_distances = distance_matrix.route_distances(route_indices).tolist()
+        total_distance = sum(route_distances)
+        
+        # Tempo dirigindo pelo perfil horário de velocidades (picos de trânsito)
+        travel_times = TravelTimeTensor.for_deliveries(distance_matrix, deliveries)
+        
+        # Calcular custo total e violações
+        total_cost = 0.0
+        capacity_violation = 0.0
+        autonomy_violation = 0.0
+        
+        for route_idx, route in enumerate(routes):
+            if route_idx >= len(vehicles):
+                continue
+            
+            vehicle = vehicles[route_idx]
+            route_distance = route_distances[route_idx]
+            
+            total_cost += route_distance * vehicle.fuel_cost_per_km
+            total_cost += (
+                travel_times.route_hours(route_indices[route_idx])
+                * vehicle.driver_cost_per_hour
+            )
+            
+            route_weight = sum(
+                delivery_dict[d_id].weight
+                for d_id in route
+                if d_id in delivery_dict
+            )
+            if route_weight > vehicle.max_capacity:
+                capacity_violation += route_weight - vehicle.max_capacity
+            
+            if route_distance > vehicle.max_range:
+                autonomy_violation += route_distance - vehicle.max_range
+        
+        violations = {
+            "capacity": capacity_violation,
+            "autonomy": autonomy_violation,
+        }
+        
+        solution = RouteSolution(
+            routes=routes,
+            total_distance=total_distance,
+            total_cost=total_cost,
+            fitness_score=0.0,
+            violations=violations,
+            metadata={"algorithm": "alns"},
+        )
+        
+        fitness = self.composite_fitness.calculate(
+            solution, deliveries, vehicles, depot_location, distance_matrix
+        )
+        solution.fitness_score = fitness
+        
+        return solution
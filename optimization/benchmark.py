@@ -1,9 +1,10 @@
 """
 Módulo de benchmark e comparação de algoritmos de otimização.
 
-Compara desempenho de diferentes algoritmos (Genetic Algorithm, Greedy, Simulated Annealing).
+Compara desempenho de diferentes algoritmos (Genetic Algorithm, Greedy, Simulated Annealing, ALNS).
 """
 
+import os
 import time
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
@@ -17,6 +18,8 @@ from hospital_routes.core.interfaces import (
 from hospital_routes.optimization.genetic_algorithm import GeneticAlgorithmOptimizer
 from hospital_routes.optimization.greedy_optimizer import GreedyOptimizer
 from hospital_routes.optimization.simulated_annealing_optimizer import SimulatedAnnealingOptimizer
+from hospital_routes.optimization.alns_optimizer import ALNSOptimizer
+from hospital_routes.optimization.parallel_evaluation import ParallelEvaluator, evaluate_shared
 
 
 @dataclass
@@ -45,6 +48,19 @@ class BenchmarkResult:
     summary: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class ParallelScalingResult:
+    """Vazão da avaliação de fitness do GA para um número de workers."""
+    
+    n_workers: int
+    evaluations: int
+    evaluation_time: float  # Tempo total de avaliação (s), sem startup do pool
+    evaluations_per_second: float
+    speedup: float  # Relativo a 1 worker
+    efficiency: float  # speedup / n_workers
+    startup_time: float  # Criação do pool e publicação dos dados (s)
+
+
 class AlgorithmBenchmark:
     """
     Classe para comparar desempenho de diferentes algoritmos de otimização.
@@ -61,6 +77,7 @@ class AlgorithmBenchmark:
                 initial_temperature=1000.0,
                 cooling_rate=0.95,
             ),
+            "alns": ALNSOptimizer(time_limit=10.0),
         }
     
     def run_benchmark(
@@ -273,4 +290,106 @@ class AlgorithmBenchmark:
             json.dump(data, f, indent=2, ensure_ascii=False)
         
         print(f"✅ Resultados exportados para: {output_file}")
-
+    
+    def run_parallel_scaling(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        depot_location: tuple[float, float],
+        worker_counts: Optional[List[int]] = None,
+        population_size: int = 200,
+        rounds: int = 3,
+    ) -> List[ParallelScalingResult]:
+        """
+        Mede a vazão da avaliação de fitness do GA de 1 a N workers.
+        
+        Avalia a mesma população ``rounds`` vezes para cada número de
+        workers. O tempo de criação do pool é medido à parte, pois em uma
+        otimização real ele é pago uma única vez.
+        
+        Args:
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos
+            depot_location: Localização do depósito
+            worker_counts: Números de workers a testar
+                (None = 1, 2, 4, ... até os núcleos disponíveis)
+            population_size: Tamanho da população avaliada
+            rounds: Repetições da avaliação por número de workers
+        
+        Returns:
+            List[ParallelScalingResult]: Resultado por número de workers
+        """
+        if worker_counts is None:
+            max_workers = os.cpu_count() or 1
+            worker_counts = []
+            n = 1
+            while n < max_workers:
+                worker_counts.append(n)
+                n *= 2
+            worker_counts.append(max_workers)
+        
+        # Mesma preparação de ``optimize`` (matriz, avaliador fundido, DEAP)
+        ga = GeneticAlgorithmOptimizer()
+        ga._prepare_problem(deliveries, vehicles, depot_location, OptimizationConfig())
+        
+        population = [
+            ga.initialization_strategy.generate_individual(
+                deliveries, vehicles, depot_location
+            )
+            for _ in range(population_size)
+        ]
+        evaluations = population_size * rounds
+        
+        print(f"🔬 Escalabilidade da avaliação paralela: workers {worker_counts}")
+        print()
+        
+        results = []
+        baseline_rate = None
+        for n_workers in worker_counts:
+            start_time = time.time()
+            if n_workers > 1:
+                evaluator = ParallelEvaluator(
+                    deliveries,
+                    vehicles,
+                    depot_location,
+                    ga._distance_matrix,
+                    ga.fitness_weights,
+                    n_workers=n_workers,
+                )
+                map_func, evaluate = evaluator.map, evaluate_shared
+                # Aquecer o pool (initializers rodam na primeira tarefa)
+                evaluator.map(evaluate, population[:n_workers])
+            else:
+                evaluator = None
+                map_func, evaluate = map, ga._evaluate_individual
+            startup_time = time.time() - start_time
+            
+            try:
+                start_time = time.time()
+                for _ in range(rounds):
+                    list(map_func(evaluate, population))
+                evaluation_time = time.time() - start_time
+            finally:
+                if evaluator is not None:
+                    evaluator.close()
+            
+            rate = evaluations / max(evaluation_time, 1e-9)
+            if baseline_rate is None:
+                baseline_rate = rate
+            speedup = rate / baseline_rate
+            
+            results.append(
+                ParallelScalingResult(
+                    n_workers=n_workers,
+                    evaluations=evaluations,
+                    evaluation_time=evaluation_time,
+                    evaluations_per_second=rate,
+                    speedup=speedup,
+                    efficiency=speedup / n_workers,
+                    startup_time=startup_time,
+                )
+            )
+            print(f"   {n_workers:>3} worker(s): {rate:,.0f} avaliações/s (speedup {speedup:.2f}x)")
+        
+        print()
+        return results
@@ -11,11 +11,13 @@ from hospital_routes.core.exceptions import InvalidConfigurationError
 from hospital_routes.optimization.genetic_algorithm import GeneticAlgorithmOptimizer
 from hospital_routes.optimization.greedy_optimizer import GreedyOptimizer
 from hospital_routes.optimization.simulated_annealing_optimizer import SimulatedAnnealingOptimizer
+from hospital_routes.optimization.alns_optimizer import ALNSOptimizer
+from hospital_routes.optimization.island_model import IslandModelOptimizer
+from hospital_routes.optimization.local_search import LocalSearchStage
+from hospital_routes.optimization.fitness.fitness_cache import DEFAULT_FITNESS_CACHE_SIZE
 from hospital_routes.optimization.initialization_strategy import (
     InitialPopulationStrategy,
-    RandomInitializationStrategy,
-    NearestNeighborInitializationStrategy,
-    PriorityFirstInitializationStrategy,
+    create_initialization_strategy,
 )
 from hospital_routes.utils.config import FitnessWeights
 
@@ -42,6 +44,23 @@ class OptimizerFactory:
             config: Configuração opcional para o otimizador
                 - fitness_weights: FitnessWeights (opcional)
                 - initialization_strategy: str ("random", "nearest_neighbor", "priority_first")
+                - n_workers: int (processos para avaliação paralela do GA, padrão 1)
+                - encoding: str ("routes" ou "giant_tour", codificação do GA)
+                - fitness_cache_size: int (cromossomos memorizados pelo GA,
+                  0 desativa; padrão DEFAULT_FITNESS_CACHE_SIZE)
+                - fitness_cache_eviction: str ("lru" ou "fifo")
+                - evaluation_mode: str ("fused" ou "vectorized", avaliação
+                  da população do GA)
+                - memetic_config: dict (top_k, probability, time_budget,
+                  move_budget da busca local memética do GA; top_k 0 desativa)
+                - operator_selection: str ("uniform", "roulette" ou "ucb";
+                  seleção adaptativa de mutação/crossover do GA, padrão None)
+                - alns_config: dict (time_limit, max_iterations, seed do ALNS)
+                - island_config: dict (n_islands, migration_interval,
+                  migration_size, topology, island_strategies, seed,
+                  target_fitness do GA em ilhas)
+                - local_search: str ("first" ou "best"; aplica LocalSearchStage
+                  após o otimizador, padrão None)
         
         Returns:
             BaseOptimizer: Instância do otimizador
@@ -51,24 +70,58 @@ class OptimizerFactory:
         """
         config = config or {}
         
+        optimizer = OptimizerFactory._create_base(optimizer_type, config)
+        
+        # Etapa opcional de busca local após qualquer otimizador
+        local_search_policy = config.get("local_search")
+        if local_search_policy:
+            optimizer = LocalSearchStage(optimizer, policy=local_search_policy)
+        
+        return optimizer
+    
+    @staticmethod
+    def _create_base(optimizer_type: str, config: dict) -> BaseOptimizer:
+        """Cria o otimizador base (sem etapas adicionais)."""
         # Fitness weights (compartilhado entre algoritmos)
         fitness_weights = config.get("fitness_weights")
         if fitness_weights is None:
             fitness_weights = FitnessWeights()
         
-        if optimizer_type == "genetic_algorithm":
+        if optimizer_type in ("genetic_algorithm", "genetic"):
             # Initialization strategy
-            strategy_name = config.get("initialization_strategy", "random")
-            if strategy_name == "nearest_neighbor":
-                initialization_strategy = NearestNeighborInitializationStrategy()
-            elif strategy_name == "priority_first":
-                initialization_strategy = PriorityFirstInitializationStrategy()
-            else:
-                initialization_strategy = RandomInitializationStrategy()
+            initialization_strategy = create_initialization_strategy(
+                config.get("initialization_strategy", "random")
+            )
+            memetic_config = config.get("memetic_config", {})
             
             return GeneticAlgorithmOptimizer(
                 fitness_weights=fitness_weights,
                 initialization_strategy=initialization_strategy,
+                n_workers=config.get("n_workers", 1),
+                encoding=config.get("encoding", "routes"),
+                fitness_cache_size=config.get(
+                    "fitness_cache_size", DEFAULT_FITNESS_CACHE_SIZE
+                ),
+                fitness_cache_eviction=config.get("fitness_cache_eviction", "lru"),
+                evaluation_mode=config.get("evaluation_mode", "fused"),
+                memetic_top_k=memetic_config.get("top_k", 0),
+                memetic_probability=memetic_config.get("probability", 1.0),
+                memetic_time_budget=memetic_config.get("time_budget"),
+                memetic_move_budget=memetic_config.get("move_budget", 200),
+                operator_selection=config.get("operator_selection"),
+            )
+        elif optimizer_type == "genetic_islands":
+            island_config = config.get("island_config", {})
+            return IslandModelOptimizer(
+                fitness_weights=fitness_weights,
+                n_islands=island_config.get("n_islands", 4),
+                migration_interval=island_config.get("migration_interval", 10),
+                migration_size=island_config.get("migration_size", 2),
+                topology=island_config.get("topology", "ring"),
+                island_strategies=island_config.get("island_strategies"),
+                encoding=config.get("encoding", "routes"),
+                seed=island_config.get("seed"),
+                target_fitness=island_config.get("target_fitness"),
             )
         elif optimizer_type == "greedy":
             return GreedyOptimizer(fitness_weights=fitness_weights)
@@ -80,9 +133,18 @@ class OptimizerFactory:
                 cooling_rate=sa_config.get("cooling_rate", 0.95),
                 min_temperature=sa_config.get("min_temperature", 0.1),
             )
+        elif optimizer_type == "alns":
+            alns_config = config.get("alns_config", {})
+            return ALNSOptimizer(
+                fitness_weights=fitness_weights,
+                time_limit=alns_config.get("time_limit", 10.0),
+                max_iterations=alns_config.get("max_iterations"),
+                seed=alns_config.get("seed"),
+            )
         else:
             raise InvalidConfigurationError(
                 f"Tipo de otimizador não suportado: {optimizer_type}. "
-                f"Opções: genetic_algorithm, greedy, simulated_annealing"
+                f"Opções: genetic_algorithm, genetic_islands, greedy, "
+                f"simulated_annealing, alns"
             )
 
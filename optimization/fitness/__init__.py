@@ -13,6 +13,9 @@ from hospital_routes.optimization.fitness.capacity_penalty import CapacityPenalt
 from hospital_routes.optimization.fitness.autonomy_penalty import AutonomyPenalty
 from hospital_routes.optimization.fitness.priority_penalty import PriorityPenalty
 from hospital_routes.optimization.fitness.load_balance_penalty import LoadBalancePenalty
+from hospital_routes.optimization.fitness.fused_fitness import FusedFitnessEvaluator
+from hospital_routes.optimization.fitness.delta_fitness import IncrementalFitness, Move
+from hospital_routes.optimization.fitness.fitness_cache import FitnessCache, chromosome_key
 
 __all__ = [
     "CompositeFitness",
@@ -21,5 +24,10 @@ __all__ = [
     "AutonomyPenalty",
     "PriorityPenalty",
     "LoadBalancePenalty",
+    "FusedFitnessEvaluator",
+    "IncrementalFitness",
+    "Move",
+    "FitnessCache",
+    "chromosome_key",
 ]
 
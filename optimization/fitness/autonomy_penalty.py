@@ -4,8 +4,14 @@ Componente de fitness: Penalidade por violação de autonomia.
 Penaliza soluções que excedem a autonomia máxima dos veículos.
 """
 
-from typing import List
+from typing import Dict, List, Tuple, Union
 from hospital_routes.core.interfaces import Delivery, RouteSolution, VehicleConstraints
+from hospital_routes.optimization.fitness.delivery_lookup import DeliveryLookup
+from hospital_routes.utils.distance import (
+    DEPOT_KEY,
+    DistanceMatrix,
+    calculate_distance,
+)
 
 
 class AutonomyPenalty:
@@ -21,6 +27,7 @@ class AutonomyPenalty:
             penalty_weight: Peso da penalidade (deve ser alto para desencorajar violações)
         """
         self.penalty_weight = penalty_weight
+        self._delivery_lookup = DeliveryLookup()
     
     def calculate(
         self,
@@ -28,7 +35,7 @@ class AutonomyPenalty:
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: tuple[float, float],
-        distance_matrix: dict[tuple[str, str], float],
+        distance_matrix: Union[DistanceMatrix, Dict[Tuple[str, str], float]],
     ) -> float:
         """
         Calcula a penalidade total por violação de autonomia.
@@ -38,12 +45,13 @@ class AutonomyPenalty:
             deliveries: Lista de entregas
             vehicles: Lista de veículos com restrições
             depot_location: Localização do depósito
-            distance_matrix: Matriz de distâncias entre pontos
+            distance_matrix: Matriz de distâncias (DistanceMatrix ou dict por par de IDs)
         
         Returns:
             float: Penalidade total (já multiplicada pelo peso)
         """
         total_penalty = 0.0
+        delivery_dict = self._delivery_lookup.get(deliveries)
         
         # Verificar cada rota
         for route_idx, route in enumerate(solution.routes):
@@ -54,37 +62,10 @@ class AutonomyPenalty:
             
             vehicle = vehicles[route_idx]
             
-            # Calcular distância total da rota
-            route_distance = 0.0
-            
-            # Distância do depósito até primeira entrega
-            if route:
-                first_delivery = next(
-                    (d for d in deliveries if d.id == route[0]), None
-                )
-                if first_delivery:
-                    route_distance += self._calculate_distance(
-                        depot_location, first_delivery.location, distance_matrix
-                    )
-            
-            # Distâncias entre entregas
-            for i in range(len(route) - 1):
-                delivery1 = next((d for d in deliveries if d.id == route[i]), None)
-                delivery2 = next((d for d in deliveries if d.id == route[i + 1]), None)
-                if delivery1 and delivery2:
-                    route_distance += self._calculate_distance(
-                        delivery1.location, delivery2.location, distance_matrix
-                    )
-            
-            # Distância da última entrega até depósito
-            if route:
-                last_delivery = next(
-                    (d for d in deliveries if d.id == route[-1]), None
-                )
-                if last_delivery:
-                    route_distance += self._calculate_distance(
-                        last_delivery.location, depot_location, distance_matrix
-                    )
+            # Calcular distância total da rota (depósito → entregas → depósito)
+            route_distance = self._route_distance(
+                route, delivery_dict, depot_location, distance_matrix
+            )
             
             # Calcular violação de autonomia
             if route_distance > vehicle.max_range:
@@ -93,19 +74,43 @@ class AutonomyPenalty:
         
         return total_penalty
     
-    def _calculate_distance(
+    def _route_distance(
         self,
-        loc1: tuple[float, float],
-        loc2: tuple[float, float],
-        distance_matrix: dict[tuple[str, str], float],
+        route: List[str],
+        delivery_dict: Dict[str, Delivery],
+        depot_location: tuple[float, float],
+        distance_matrix: Union[DistanceMatrix, Dict[Tuple[str, str], float]],
     ) -> float:
-        """Calcula distância entre dois pontos usando matriz ou cálculo direto."""
-        # Se temos matriz de distâncias, usar ela
-        key = (f"{loc1[0]},{loc1[1]}", f"{loc2[0]},{loc2[1]}")
-        if key in distance_matrix:
-            return distance_matrix[key]
+        """
+        Distância da rota em km, usando a matriz de distâncias.
         
-        # Fallback: cálculo simples (Euclidiano - não ideal para geografia, mas funcional)
-        from math import sqrt
-        return sqrt((loc1[0] - loc2[0]) ** 2 + (loc1[1] - loc2[1]) ** 2)
-
+        Entregas desconhecidas são ignoradas. Pares ausentes de uma matriz
+        legada (dict) são calculados pela distância geodésica.
+        """
+        if isinstance(distance_matrix, DistanceMatrix):
+            index = distance_matrix.index
+            return distance_matrix.route_distance(
+                [index[d_id] for d_id in route if d_id in index]
+            )
+        
+        stops = [d_id for d_id in route if d_id in delivery_dict]
+        if not stops:
+            return 0.0
+        
+        path = [DEPOT_KEY] + stops + [DEPOT_KEY]
+        total = 0.0
+        for from_id, to_id in zip(path, path[1:]):
+            distance = distance_matrix.get((from_id, to_id))
+            if distance is None:
+                from_loc = (
+                    depot_location if from_id == DEPOT_KEY
+                    else delivery_dict[from_id].location
+                )
+                to_loc = (
+                    depot_location if to_id == DEPOT_KEY
+                    else delivery_dict[to_id].location
+                )
+                distance = calculate_distance(from_loc, to_loc)
+            total += distance
+        
+        return total
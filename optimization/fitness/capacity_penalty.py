@@ -6,6 +6,7 @@ Penaliza soluções que excedem a capacidade máxima dos veículos.
 
 from typing import List
 from hospital_routes.core.interfaces import Delivery, RouteSolution, VehicleConstraints
+from hospital_routes.optimization.fitness.delivery_lookup import DeliveryLookup
 
 
 class CapacityPenalty:
@@ -21,6 +22,7 @@ class CapacityPenalty:
             penalty_weight: Peso da penalidade (deve ser alto para desencorajar violações)
         """
         self.penalty_weight = penalty_weight
+        self._delivery_lookup = DeliveryLookup()
     
     def calculate(
         self,
@@ -41,8 +43,7 @@ class CapacityPenalty:
         """
         total_penalty = 0.0
         
-        # Criar dicionário de entregas para acesso rápido
-        delivery_dict = {d.id: d for d in deliveries}
+        delivery_dict = self._delivery_lookup.get(deliveries)
         
         # Verificar cada rota
         for route_idx, route in enumerate(solution.routes):
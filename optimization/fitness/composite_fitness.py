@@ -4,7 +4,7 @@ Função de fitness composta (multiobjetivo).
 Combina todos os componentes de fitness em uma única função.
 """
 
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 from hospital_routes.core.interfaces import (
     Delivery,
     RouteSolution,
@@ -15,7 +15,9 @@ from hospital_routes.optimization.fitness.capacity_penalty import CapacityPenalt
 from hospital_routes.optimization.fitness.autonomy_penalty import AutonomyPenalty
 from hospital_routes.optimization.fitness.priority_penalty import PriorityPenalty
 from hospital_routes.optimization.fitness.load_balance_penalty import LoadBalancePenalty
+from hospital_routes.optimization.fitness.fused_fitness import FusedFitnessEvaluator
 from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.distance import DistanceMatrix
 
 
 class CompositeFitness:
@@ -30,6 +32,11 @@ class CompositeFitness:
            + ε * vehicle_count
     
     Onde os pesos (α, β, γ, δ, ε) são configuráveis.
+    
+    Com uma ``DistanceMatrix``, ``calculate`` usa o avaliador fundido
+    (``FusedFitnessEvaluator``), que calcula todos os componentes em uma
+    única passada por rota; ``get_components_breakdown`` mantém o cálculo
+    componente a componente como referência.
     """
     
     def __init__(self, weights: FitnessWeights):
@@ -47,6 +54,55 @@ class CompositeFitness:
         self.load_balance_penalty = LoadBalancePenalty(
             getattr(weights, 'load_balance_penalty', 0.5)
         )
+        
+        # Avaliador fundido do último problema visto (reconstruído se mudar)
+        self._evaluator: Optional[FusedFitnessEvaluator] = None
+        self._evaluator_inputs: Tuple = ()
+    
+    def build_evaluator(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        distance_matrix: DistanceMatrix,
+    ) -> FusedFitnessEvaluator:
+        """
+        Cria um avaliador fundido para o problema.
+        
+        Args:
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos com restrições
+            distance_matrix: Matriz de distâncias (depósito no índice 0)
+        
+        Returns:
+            FusedFitnessEvaluator: Avaliador em passada única
+        """
+        return FusedFitnessEvaluator(
+            self.weights, deliveries, vehicles, distance_matrix
+        )
+    
+    def _cached_evaluator(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        distance_matrix: DistanceMatrix,
+    ) -> FusedFitnessEvaluator:
+        """Reaproveita o avaliador enquanto o problema não mudar."""
+        inputs = self._evaluator_inputs
+        if (
+            self._evaluator is None
+            or inputs[0] is not deliveries
+            or inputs[1] != len(deliveries)
+            or inputs[2] is not vehicles
+            or inputs[3] != len(vehicles)
+            or inputs[4] is not distance_matrix
+        ):
+            self._evaluator = self.build_evaluator(
+                deliveries, vehicles, distance_matrix
+            )
+            self._evaluator_inputs = (
+                deliveries, len(deliveries), vehicles, len(vehicles), distance_matrix
+            )
+        return self._evaluator
     
     def calculate(
         self,
@@ -54,7 +110,7 @@ class CompositeFitness:
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: tuple[float, float],
-        distance_matrix: dict[tuple[str, str], float],
+        distance_matrix: Union[DistanceMatrix, Dict[Tuple[str, str], float]],
     ) -> float:
         """
         Calcula o fitness total da solução.
@@ -69,6 +125,10 @@ class CompositeFitness:
         Returns:
             float: Fitness total (quanto menor, melhor)
         """
+        if isinstance(distance_matrix, DistanceMatrix):
+            evaluator = self._cached_evaluator(deliveries, vehicles, distance_matrix)
+            return evaluator.evaluate(solution.routes, solution.total_distance)
+        
         # Componente de distância
         distance_component = self.distance_fitness.calculate(
             solution, deliveries, depot_location
@@ -109,13 +169,35 @@ class CompositeFitness:
         
         return total_fitness
     
+    def evaluate_routes(
+        self,
+        routes: List[List[str]],
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        distance_matrix: DistanceMatrix,
+    ) -> float:
+        """
+        Calcula o fitness diretamente das rotas, sem montar ``RouteSolution``.
+        
+        Args:
+            routes: Rotas como listas de IDs de entregas
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos com restrições
+            distance_matrix: Matriz de distâncias (depósito no índice 0)
+        
+        Returns:
+            float: Fitness total (quanto menor, melhor)
+        """
+        evaluator = self._cached_evaluator(deliveries, vehicles, distance_matrix)
+        return evaluator.evaluate(routes)
+    
     def get_components_breakdown(
         self,
         solution: RouteSolution,
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: tuple[float, float],
-        distance_matrix: dict[tuple[str, str], float],
+        distance_matrix: Union[DistanceMatrix, Dict[Tuple[str, str], float]],
     ) -> dict[str, float]:
         """
         Retorna breakdown detalhado de cada componente do fitness.
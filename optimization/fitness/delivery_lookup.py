@@ -0,0 +1,37 @@
+"""
+Cache do dicionário de entregas usado pelos componentes de fitness.
+
+Os componentes são chamados milhares de vezes com a mesma lista de
+entregas; o dicionário ID → entrega só é reconstruído quando a lista muda.
+"""
+
+from typing import Dict, List, Optional
+from hospital_routes.core.interfaces import Delivery
+
+
+class DeliveryLookup:
+    """
+    Dicionário ID → entrega reaproveitado entre chamadas.
+    
+    A lista é reconhecida por identidade e tamanho; uma lista nova (ou
+    alterada no tamanho) reconstrói o dicionário.
+    """
+    
+    def __init__(self):
+        self._deliveries: Optional[List[Delivery]] = None
+        self._size = 0
+        self._by_id: Dict[str, Delivery] = {}
+    
+    def get(self, deliveries: List[Delivery]) -> Dict[str, Delivery]:
+        """
+        Args:
+            deliveries: Lista de entregas
+        
+        Returns:
+            dict: Mapeamento ID → entrega
+        """
+        if deliveries is not self._deliveries or len(deliveries) != self._size:
+            self._deliveries = deliveries
+            self._size = len(deliveries)
+            self._by_id = {d.id: d for d in deliveries}
+        return self._by_id
@@ -0,0 +1,367 @@
+"""
+Avaliação incremental (delta) de fitness para movimentos em rotas.
+
+Mantém, para cada rota, distância, carga, soma das posições das entregas
+críticas e contagem de críticas por prefixo. O delta de um movimento
+(swap, move ou reverse) é obtido atualizando apenas as rotas afetadas -
+em O(1) ou O(tamanho da rota) - e reagregando as penalidades sobre as
+rotas (O(nº de rotas)), sem construir ``RouteSolution``.
+
+Uso típico (busca local, Simulated Annealing)::
+    
+    state = IncrementalFitness(evaluator, evaluator.route_indices(routes))
+    move = state.random_move()
+    if state.delta(move) < 0:
+        state.apply(move)
+"""
+
+import random
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from hospital_routes.optimization.fitness.fused_fitness import (
+    EXTRA_ROUTE_PENALTY_FACTOR,
+    FusedFitnessEvaluator,
+)
+from hospital_routes.utils.distance import DEPOT_INDEX
+
+
+MOVE_OPERATORS = ("swap", "move", "reverse")
+
+
+class Move(NamedTuple):
+    """
+    Movimento sobre as rotas (posições referem-se às rotas atuais).
+    
+    - swap: troca ``route[position]`` com ``target_route[target_position]``
+    - move: remove ``route[position]`` e o insere em ``target_route`` na
+      posição ``target_position`` (contada após a remoção); se a rota de
+      origem ficar vazia ela é eliminada
+    - reverse: inverte ``route``
+    """
+    
+    operator: str
+    route: int
+    position: int = -1
+    target_route: int = -1
+    target_position: int = -1
+
+
+# Estatísticas de uma rota: (distância, carga, soma posições críticas, nº críticas)
+RouteStats = Tuple[float, float, int, int]
+
+
+class IncrementalFitness:
+    """
+    Estado de uma solução com fitness atualizável por movimentos.
+    
+    O fitness é idêntico (a menos de arredondamento) ao de
+    ``FusedFitnessEvaluator`` para as mesmas rotas.
+    """
+    
+    def __init__(
+        self,
+        evaluator: FusedFitnessEvaluator,
+        routes: Sequence[Sequence[int]],
+    ):
+        """
+        Args:
+            evaluator: Avaliador fundido do problema
+            routes: Rotas como listas de índices da matriz
+        """
+        self.evaluator = evaluator
+        self.routes: List[List[int]] = [list(route) for route in routes]
+        self.stats: List[RouteStats] = [
+            evaluator.route_stats(route) for route in self.routes
+        ]
+        self._prefix: List[List[int]] = [
+            self._critical_prefix(route) for route in self.routes
+        ]
+        self.fitness = self._aggregate(self.stats)
+        
+        self._rows = evaluator.distance_matrix.rows
+        self._pending: Optional[Tuple[Move, List[Tuple[int, RouteStats]], float]] = None
+    
+    @property
+    def size(self) -> int:
+        """Número total de entregas nas rotas."""
+        return sum(len(route) for route in self.routes)
+    
+    def route_ids(self) -> List[List[str]]:
+        """Rotas atuais como listas de IDs de entregas."""
+        ids = self.evaluator.distance_matrix.ids
+        return [[ids[stop] for stop in route] for route in self.routes]
+    
+    def _critical_prefix(self, route: Sequence[int]) -> List[int]:
+        """prefix[i] = nº de entregas críticas em route[:i]."""
+        critical = self.evaluator.critical
+        prefix = [0]
+        for stop in route:
+            prefix.append(prefix[-1] + critical[stop])
+        return prefix
+    
+    def _aggregate(self, stats: Sequence[RouteStats]) -> float:
+        """Fitness total a partir das estatísticas por rota (O(nº de rotas))."""
+        evaluator = self.evaluator
+        weights = evaluator.weights
+        capacities = evaluator.capacities
+        ranges = evaluator.ranges
+        n_vehicles = len(capacities)
+        
+        distance_sum = 0.0
+        capacity = 0.0
+        autonomy = 0.0
+        position_sum = 0
+        route_loads = []
+        for route_idx, (distance, load, positions, _) in enumerate(stats):
+            distance_sum += distance
+            position_sum += positions
+            route_loads.append(load)
+            
+            if route_idx >= n_vehicles:
+                capacity += weights.capacity_penalty * EXTRA_ROUTE_PENALTY_FACTOR
+                autonomy += weights.autonomy_penalty * EXTRA_ROUTE_PENALTY_FACTOR
+                continue
+            
+            if load > capacities[route_idx]:
+                capacity += weights.capacity_penalty * (load - capacities[route_idx])
+            if distance > ranges[route_idx]:
+                autonomy += weights.autonomy_penalty * (distance - ranges[route_idx])
+        
+        return (
+            weights.distance_weight * distance_sum
+            + capacity
+            + autonomy
+            + weights.priority_penalty * position_sum
+            + evaluator.load_balance(route_loads)
+            + weights.vehicle_penalty * len(stats)
+        )
+    
+    def delta(self, move: Move) -> float:
+        """
+        Variação do fitness caso o movimento seja aplicado.
+        
+        Args:
+            move: Movimento sobre as rotas atuais
+        
+        Returns:
+            float: Fitness após o movimento menos o fitness atual
+        """
+        changes = self._route_changes(move)
+        stats = list(self.stats)
+        removed = None
+        for route_idx, route_stats in changes:
+            if route_stats is None:
+                removed = route_idx
+            else:
+                stats[route_idx] = route_stats
+        if removed is not None:
+            stats.pop(removed)
+        
+        new_fitness = self._aggregate(stats)
+        self._pending = (move, changes, new_fitness)
+        return new_fitness - self.fitness
+    
+    def apply(self, move: Move) -> float:
+        """
+        Aplica o movimento e atualiza o estado.
+        
+        Reaproveita o cálculo do último ``delta`` quando o movimento é o mesmo.
+        
+        Args:
+            move: Movimento sobre as rotas atuais
+        
+        Returns:
+            float: Novo fitness
+        """
+        if self._pending is None or self._pending[0] != move:
+            self.delta(move)
+        _, changes, new_fitness = self._pending
+        self._pending = None
+        
+        routes = self.routes
+        if move.operator == "swap":
+            a = routes[move.route][move.position]
+            routes[move.route][move.position] = routes[move.target_route][move.target_position]
+            routes[move.target_route][move.target_position] = a
+        elif move.operator == "move":
+            stop = routes[move.route].pop(move.position)
+            routes[move.target_route].insert(move.target_position, stop)
+        else:
+            routes[move.route].reverse()
+        
+        removed = None
+        for route_idx, route_stats in changes:
+            if route_stats is None:
+                removed = route_idx
+            else:
+                self.stats[route_idx] = route_stats
+                self._prefix[route_idx] = self._critical_prefix(routes[route_idx])
+        if removed is not None:
+            routes.pop(removed)
+            self.stats.pop(removed)
+            self._prefix.pop(removed)
+        
+        self.fitness = new_fitness
+        return self.fitness
+    
+    def _route_changes(self, move: Move) -> List[Tuple[int, Optional[RouteStats]]]:
+        """
+        Novas estatísticas das rotas afetadas pelo movimento.
+        
+        Returns:
+            List: Pares (índice da rota, estatísticas); ``None`` indica que a
+            rota fica vazia e é eliminada
+        """
+        if move.operator == "swap":
+            return self._swap_changes(move)
+        if move.operator == "move":
+            return self._move_changes(move)
+        if move.operator == "reverse":
+            route = self.routes[move.route]
+            return [(move.route, self.evaluator.route_stats(route[::-1]))]
+        raise ValueError(f"Operador de movimento desconhecido: {move.operator}")
+    
+    def _neighbors(self, route: List[int], position: int) -> Tuple[int, int]:
+        """Paradas antes e depois de ``position`` (depósito nas pontas)."""
+        previous = route[position - 1] if position > 0 else DEPOT_INDEX
+        following = route[position + 1] if position + 1 < len(route) else DEPOT_INDEX
+        return previous, following
+    
+    def _swap_changes(self, move: Move) -> List[Tuple[int, Optional[RouteStats]]]:
+        """Swap: O(1) entre rotas distintas, O(tamanho da rota) na mesma rota."""
+        r1, p1, r2, p2 = move.route, move.position, move.target_route, move.target_position
+        route1 = self.routes[r1]
+        route2 = self.routes[r2]
+        
+        if r1 == r2:
+            swapped = list(route1)
+            swapped[p1], swapped[p2] = swapped[p2], swapped[p1]
+            return [(r1, self.evaluator.route_stats(swapped))]
+        
+        x = route1[p1]
+        y = route2[p2]
+        return [
+            (r1, self._replace_stats(r1, p1, x, y)),
+            (r2, self._replace_stats(r2, p2, y, x)),
+        ]
+    
+    def _replace_stats(self, route_idx: int, position: int, old: int, new: int) -> RouteStats:
+        """Estatísticas da rota ao trocar ``old`` por ``new`` em ``position``."""
+        rows = self._rows
+        critical = self.evaluator.critical
+        weights = self.evaluator.stop_weights
+        distance, load, positions, count = self.stats[route_idx]
+        previous, following = self._neighbors(self.routes[route_idx], position)
+        
+        distance += (
+            rows[previous][new] + rows[new][following]
+            - rows[previous][old] - rows[old][following]
+        )
+        load += weights[new] - weights[old]
+        change = critical[new] - critical[old]
+        return distance, load, positions + position * change, count + change
+    
+    def _move_changes(self, move: Move) -> List[Tuple[int, Optional[RouteStats]]]:
+        """Move: O(1) em distância e carga; O(1) em prioridade via prefixos."""
+        r1, p1, r2, q = move.route, move.position, move.target_route, move.target_position
+        source = self.routes[r1]
+        
+        if r1 == r2:
+            moved = list(source)
+            moved.insert(q, moved.pop(p1))
+            return [(r1, self.evaluator.route_stats(moved))]
+        
+        rows = self._rows
+        critical = self.evaluator.critical
+        weights = self.evaluator.stop_weights
+        stop = source[p1]
+        is_critical = critical[stop]
+        
+        # Remoção da rota de origem
+        if len(source) == 1:
+            source_stats = None
+        else:
+            distance, load, positions, count = self.stats[r1]
+            previous, following = self._neighbors(source, p1)
+            distance += (
+                rows[previous][following]
+                - rows[previous][stop] - rows[stop][following]
+            )
+            # Críticas após p1 sobem uma posição
+            after = count - self._prefix[r1][p1 + 1]
+            positions -= after + (p1 if is_critical else 0)
+            source_stats = (distance, load - weights[stop], positions, count - is_critical)
+        
+        # Inserção na rota de destino
+        target = self.routes[r2]
+        distance, load, positions, count = self.stats[r2]
+        previous = target[q - 1] if q > 0 else DEPOT_INDEX
+        following = target[q] if q < len(target) else DEPOT_INDEX
+        distance += (
+            rows[previous][stop] + rows[stop][following]
+            - rows[previous][following]
+        )
+        # Críticas a partir de q descem uma posição
+        after = count - self._prefix[r2][q]
+        positions += after + (q if is_critical else 0)
+        target_stats = (distance, load + weights[stop], positions, count + is_critical)
+        
+        return [(r1, source_stats), (r2, target_stats)]
+    
+    def _random_position(self, rng: random.Random) -> Tuple[int, int]:
+        """Sorteia uma entrega uniformemente entre todas as rotas."""
+        k = rng.randrange(self.size)
+        for route_idx, route in enumerate(self.routes):
+            if k < len(route):
+                return route_idx, k
+            k -= len(route)
+        raise IndexError("posição fora das rotas")
+    
+    def random_move(
+        self,
+        rng: Optional[random.Random] = None,
+        operator: Optional[str] = None,
+    ) -> Optional[Move]:
+        """
+        Sorteia um movimento válido (swap, move ou reverse).
+        
+        Args:
+            rng: Gerador aleatório (padrão: módulo ``random``)
+            operator: Operador fixo (None = sorteado)
+        
+        Returns:
+            Move ou None se não houver movimento possível
+        """
+        rng = rng or random
+        operator = operator or rng.choice(MOVE_OPERATORS)
+        total = self.size
+        
+        if operator == "swap":
+            if total < 2:
+                return None
+            r1, p1 = self._random_position(rng)
+            r2, p2 = self._random_position(rng)
+            while (r1, p1) == (r2, p2):
+                r2, p2 = self._random_position(rng)
+            return Move("swap", r1, p1, r2, p2)
+        
+        if operator == "move":
+            if total == 0:
+                return None
+            r1, p1 = self._random_position(rng)
+            if len(self.routes[r1]) == 1:
+                # A rota de origem será eliminada: destino entre as demais
+                if len(self.routes) == 1:
+                    return None
+                r2 = rng.randrange(len(self.routes) - 1)
+                if r2 >= r1:
+                    r2 += 1
+                return Move("move", r1, p1, r2, rng.randint(0, len(self.routes[r2])))
+            r2 = rng.randrange(len(self.routes))
+            target_size = len(self.routes[r2]) - (1 if r2 == r1 else 0)
+            return Move("move", r1, p1, r2, rng.randint(0, target_size))
+        
+        non_empty = [i for i, route in enumerate(self.routes) if len(route) > 1]
+        if not non_empty:
+            return None
+        return Move("reverse", rng.choice(non_empty))
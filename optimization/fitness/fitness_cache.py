@@ -0,0 +1,140 @@
+"""
+Cache de fitness por cromossomo.
+
+Com elitismo (``selBest`` sobre população + filhos) e taxas de mutação
+baixas, muitos filhos são cópias exatas de indivíduos já avaliados. O
+cache guarda o fitness pela chave canônica do cromossomo, de modo que
+uma avaliação repetida custa uma consulta a dicionário.
+
+A chave é o próprio conteúdo do cromossomo (não um hash dele, que em uma
+colisão devolveria o fitness de outro cromossomo sem erro) e preserva a
+ordem das paradas em cada rota e a ordem das rotas (cada rota corresponde
+a um veículo).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+
+# Entradas mantidas quando o chamador não especifica (0 = desativado)
+DEFAULT_FITNESS_CACHE_SIZE = 10_000
+
+# Políticas de remoção quando o cache está cheio
+EVICTION_POLICIES = ("lru", "fifo")
+
+
+def chromosome_key(individual: Any) -> Union[bytes, Tuple[Tuple[Any, ...], ...]]:
+    """
+    Chave canônica de um cromossomo.
+    
+    Args:
+        individual: Lista de rotas (listas de IDs) ou giant tour
+            (``array`` de inteiros)
+    
+    Returns:
+        Bytes do giant tour ou tupla de rotas; chaves iguais só para
+        cromossomos iguais (mesma ordem de rotas e de paradas)
+    """
+    if hasattr(individual, "tobytes"):
+        return individual.tobytes()
+    return tuple(map(tuple, individual))
+
+
+class FitnessCache:
+    """
+    Cache limitado de fitness por chave de cromossomo.
+    
+    ``get``/``set`` O(1) sobre um ``OrderedDict``; com a política "lru" um
+    acerto renova a entrada, com "fifo" as entradas saem na ordem de
+    inserção. Conta acertos, falhas e remoções (``stats``).
+    
+    Exemplo:
+        cache = FitnessCache(maxsize=10_000)
+        key = chromosome_key(individual)
+        fitness = cache.get(key)
+        if fitness is None:
+            fitness = evaluate(individual)
+            cache.set(key, fitness)
+    """
+    
+    def __init__(self, maxsize: int = DEFAULT_FITNESS_CACHE_SIZE, eviction: str = "lru"):
+        """
+        Args:
+            maxsize: Número máximo de entradas
+            eviction: Política de remoção ("lru" ou "fifo")
+        
+        Raises:
+            ValueError: Se o tamanho for negativo ou a política não for suportada
+        """
+        if maxsize < 0:
+            raise ValueError(f"Tamanho do cache de fitness deve ser >= 0: {maxsize}")
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(
+                f"Política de remoção inválida: {eviction}. "
+                f"Opções: {', '.join(EVICTION_POLICIES)}"
+            )
+        
+        self.maxsize = maxsize
+        self.eviction = eviction
+        self._cache: "OrderedDict[Hashable, float]" = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        """Número de entradas."""
+        return len(self._cache)
+    
+    def get(self, key: Hashable) -> Optional[float]:
+        """
+        Obtém o fitness de um cromossomo.
+        
+        Args:
+            key: Chave do cromossomo (``chromosome_key``)
+        
+        Returns:
+            Fitness ou None se não estiver no cache
+        """
+        fitness = self._cache.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        
+        if self.eviction == "lru":
+            self._cache.move_to_end(key)
+        self.hits += 1
+        return fitness
+    
+    def set(self, key: Hashable, fitness: float) -> None:
+        """
+        Armazena o fitness de um cromossomo.
+        
+        Args:
+            key: Chave do cromossomo (``chromosome_key``)
+            fitness: Fitness calculado
+        """
+        if not self.maxsize:
+            return
+        
+        self._cache[key] = fitness
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove todas as entradas (os contadores são mantidos)."""
+        self._cache.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "eviction": self.eviction,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,386 @@
+"""
+Avaliador de fitness fundido (passada única).
+
+Calcula todos os componentes da função de fitness percorrendo cada rota
+uma única vez sobre arrays pré-computados (peso, prioridade, índice na
+matriz de distâncias), em vez de uma passada por componente.
+
+Produz os mesmos valores de ``CompositeFitness.get_components_breakdown``.
+"""
+
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hospital_routes.core.interfaces import Delivery, VehicleConstraints
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.distance import DistanceMatrix, DEPOT_INDEX, routes_to_csr
+
+
+# Penalidade (multiplicador do peso) para rotas além da frota disponível,
+# a mesma aplicada por CapacityPenalty e AutonomyPenalty
+EXTRA_ROUTE_PENALTY_FACTOR = 1000
+
+
+class FusedFitnessEvaluator:
+    """
+    Avalia soluções em uma única passada por rota.
+    
+    Construído uma vez por problema (entregas, veículos, matriz); cada
+    avaliação custa O(total de paradas) sem criar ``RouteSolution``.
+    """
+    
+    def __init__(
+        self,
+        weights: FitnessWeights,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        distance_matrix: DistanceMatrix,
+    ):
+        """
+        Args:
+            weights: Pesos da função de fitness
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos com restrições
+            distance_matrix: Matriz de distâncias (depósito no índice 0)
+        """
+        self.weights = weights
+        self.distance_matrix = distance_matrix
+        self.capacities = [v.max_capacity for v in vehicles]
+        self.ranges = [v.max_range for v in vehicles]
+        
+        size = len(distance_matrix)
+        self.stop_weights = [0.0] * size
+        self.critical = [False] * size
+        for d in deliveries:
+            idx = distance_matrix.index_of(d.id)
+            self.stop_weights[idx] = d.weight
+            self.critical[idx] = d.priority == 1
+        
+        self._index = distance_matrix.index
+        self._load_balance_weight = getattr(weights, "load_balance_penalty", 0.5)
+        
+        # Mesmos dados em arrays para a avaliação vetorizada da população
+        self._stop_weights_array = np.asarray(self.stop_weights, dtype=np.float64)
+        self._critical_array = np.asarray(self.critical, dtype=bool)
+        self._capacities_array = np.asarray(self.capacities, dtype=np.float64)
+        self._ranges_array = np.asarray(self.ranges, dtype=np.float64)
+    
+    def route_indices(self, routes: Sequence[Sequence[str]]) -> List[List[int]]:
+        """Converte rotas de IDs em rotas de índices (IDs desconhecidos são ignorados)."""
+        index = self._index
+        return [
+            [index[d_id] for d_id in route if d_id in index]
+            for route in routes
+        ]
+    
+    def components_from_indices(
+        self,
+        routes: Sequence[Sequence[int]],
+        total_distance: Optional[float] = None,
+        route_distances: Optional[Sequence[float]] = None,
+    ) -> Dict[str, float]:
+        """
+        Calcula todos os componentes do fitness em uma passada.
+        
+        Args:
+            routes: Rotas como listas de índices da matriz
+            total_distance: Distância total já conhecida (None = calcula)
+            route_distances: Distância de cada rota já conhecida (ex: de
+                ``DistanceMatrix.route_distances``; None = calcula)
+        
+        Returns:
+            dict: Componentes com as mesmas chaves de ``get_components_breakdown``
+        """
+        weights = self.weights
+        matrix = self.distance_matrix
+        # Matriz sem ``rows`` (compacta grande ou compartilhada entre
+        # processos): distâncias de todas as rotas em uma leitura vetorizada
+        # do array, sem criar n² floats Python; distâncias já calculadas em
+        # lote dispensam a leitura da matriz
+        rows = matrix.rows if matrix.rows_available and route_distances is None else None
+        if rows is None and route_distances is None:
+            route_distances = matrix.route_distances(routes).tolist()
+        stop_weights = self.stop_weights
+        critical = self.critical
+        capacities = self.capacities
+        ranges = self.ranges
+        n_vehicles = len(capacities)
+        priority_weight = weights.priority_penalty
+        capacity_weight = weights.capacity_penalty
+        autonomy_weight = weights.autonomy_penalty
+        
+        distance_sum = 0.0
+        capacity = 0.0
+        autonomy = 0.0
+        priority = 0.0
+        route_loads = []
+        
+        for route_idx, route in enumerate(routes):
+            load = 0.0
+            if rows is None:
+                distance = route_distances[route_idx]
+                for position, stop in enumerate(route):
+                    load += stop_weights[stop]
+                    if critical[stop]:
+                        priority += position * priority_weight
+            else:
+                distance = 0.0
+                previous = DEPOT_INDEX
+                for position, stop in enumerate(route):
+                    distance += rows[previous][stop]
+                    load += stop_weights[stop]
+                    if critical[stop]:
+                        priority += position * priority_weight
+                    previous = stop
+                if route:
+                    distance += rows[previous][DEPOT_INDEX]
+            
+            distance_sum += distance
+            route_loads.append(load)
+            
+            if route_idx >= n_vehicles:
+                # Mais rotas que veículos disponíveis - penalidade alta
+                capacity += capacity_weight * EXTRA_ROUTE_PENALTY_FACTOR
+                autonomy += autonomy_weight * EXTRA_ROUTE_PENALTY_FACTOR
+                continue
+            
+            if load > capacities[route_idx]:
+                capacity += capacity_weight * (load - capacities[route_idx])
+            if distance > ranges[route_idx]:
+                autonomy += autonomy_weight * (distance - ranges[route_idx])
+        
+        if total_distance is None:
+            total_distance = distance_sum
+        
+        return {
+            "distance": weights.distance_weight * total_distance,
+            "capacity_penalty": capacity,
+            "autonomy_penalty": autonomy,
+            "priority_penalty": priority,
+            "load_balance_penalty": self.load_balance(route_loads),
+            "vehicle_penalty": weights.vehicle_penalty * len(routes),
+        }
+    
+    def route_stats(self, route: Sequence[int]) -> Tuple[float, float, int, int]:
+        """
+        Estatísticas de uma rota em uma passada.
+        
+        Args:
+            route: Rota como lista de índices da matriz
+        
+        Returns:
+            Tuple: (distância, carga, soma das posições críticas, nº de críticas)
+        """
+        rows = self.distance_matrix.rows
+        stop_weights = self.stop_weights
+        critical = self.critical
+        
+        load = 0.0
+        distance = 0.0
+        position_sum = 0
+        critical_count = 0
+        previous = DEPOT_INDEX
+        for position, stop in enumerate(route):
+            distance += rows[previous][stop]
+            load += stop_weights[stop]
+            if critical[stop]:
+                position_sum += position
+                critical_count += 1
+            previous = stop
+        if route:
+            distance += rows[previous][DEPOT_INDEX]
+        
+        return distance, load, position_sum, critical_count
+    
+    def load_balance(self, route_loads: List[float]) -> float:
+        """Penalidade de desbalanceamento (mesma fórmula de LoadBalancePenalty)."""
+        if not route_loads:
+            return 0.0
+        
+        mean_load = sum(route_loads) / len(route_loads)
+        variance = sum((load - mean_load) ** 2 for load in route_loads) / len(route_loads)
+        std_dev = variance ** 0.5
+        
+        if mean_load > 0:
+            coefficient_of_variation = std_dev / mean_load
+        else:
+            coefficient_of_variation = 0.0
+        
+        return self._load_balance_weight * (coefficient_of_variation * mean_load)
+    
+    def components(
+        self,
+        routes: Sequence[Sequence[str]],
+        total_distance: Optional[float] = None,
+    ) -> Dict[str, float]:
+        """
+        Calcula todos os componentes do fitness para rotas de IDs.
+        
+        Args:
+            routes: Rotas como listas de IDs de entregas
+            total_distance: Distância total já conhecida (None = calcula)
+        
+        Returns:
+            dict: Componentes com as mesmas chaves de ``get_components_breakdown``
+        """
+        return self.components_from_indices(
+            self.route_indices(routes), total_distance
+        )
+    
+    def evaluate_indices(
+        self,
+        routes: Sequence[Sequence[int]],
+        total_distance: Optional[float] = None,
+        route_distances: Optional[Sequence[float]] = None,
+    ) -> float:
+        """Fitness total (quanto menor, melhor) para rotas de índices."""
+        c = self.components_from_indices(routes, total_distance, route_distances)
+        return (
+            c["distance"]
+            + c["capacity_penalty"]
+            + c["autonomy_penalty"]
+            + c["priority_penalty"]
+            + c["load_balance_penalty"]
+            + c["vehicle_penalty"]
+        )
+    
+    def population_components(
+        self, solutions: Sequence[Sequence[Sequence[int]]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Componentes do fitness de uma população inteira, sem laço por indivíduo.
+        
+        Todas as rotas de todas as soluções são concatenadas em arrays de
+        índices (formato CSR, sem o preenchimento que rotas de tamanhos
+        muito diferentes exigiriam em um array retangular): as distâncias
+        saem de um único ``take`` da matriz; cargas, posições críticas e
+        totais por solução, de ``np.bincount``.
+        
+        Args:
+            solutions: Soluções, cada uma uma lista de rotas de índices
+        
+        Returns:
+            dict: Mesmas chaves de ``components_from_indices``, cada uma com
+            um array (len(solutions),) de float64
+        """
+        weights = self.weights
+        n_solutions = len(solutions)
+        route_counts = np.fromiter(map(len, solutions), dtype=np.int64, count=n_solutions)
+        routes = list(itertools.chain.from_iterable(solutions))
+        
+        # Dono de cada rota e posição dela na solução (= veículo)
+        owners = np.repeat(np.arange(n_solutions), route_counts)
+        ranks = np.arange(len(routes)) - np.repeat(
+            np.cumsum(route_counts) - route_counts, route_counts
+        )
+        
+        # Rotas concatenadas (CSR): paradas de todas as rotas em um único
+        # array, com a rota e a posição de cada parada
+        stops, offsets = routes_to_csr(routes)
+        rows = np.repeat(np.arange(len(routes)), np.diff(offsets))
+        positions = np.arange(len(stops)) - offsets[:-1][rows]
+        
+        distances = self.distance_matrix.route_distances_csr(stops, offsets)
+        loads = np.bincount(
+            rows, weights=self._stop_weights_array[stops], minlength=len(routes)
+        )
+        priorities = np.bincount(
+            rows, weights=self._critical_array[stops] * positions, minlength=len(routes)
+        )
+        
+        # Restrições por veículo; rotas além da frota recebem a penalidade fixa
+        n_vehicles = len(self._capacities_array)
+        in_fleet = ranks < n_vehicles
+        vehicle = np.minimum(ranks, max(n_vehicles - 1, 0))
+        extra = np.where(in_fleet, 0.0, float(EXTRA_ROUTE_PENALTY_FACTOR))
+        if n_vehicles:
+            capacity_excess = np.maximum(loads - self._capacities_array[vehicle], 0.0)
+            range_excess = np.maximum(distances - self._ranges_array[vehicle], 0.0)
+        else:
+            capacity_excess = range_excess = np.zeros(len(routes))
+        capacity = weights.capacity_penalty * np.where(in_fleet, capacity_excess, extra)
+        autonomy = weights.autonomy_penalty * np.where(in_fleet, range_excess, extra)
+        
+        def per_solution(values: np.ndarray) -> np.ndarray:
+            return np.bincount(owners, weights=values, minlength=n_solutions)
+        
+        # Balanceamento de carga: coeficiente de variação das cargas das rotas
+        counts = np.maximum(route_counts, 1)
+        mean_loads = per_solution(loads) / counts
+        variances = per_solution((loads - mean_loads[owners]) ** 2) / counts
+        std_devs = np.sqrt(variances)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variation = np.where(mean_loads > 0, std_devs / mean_loads, 0.0)
+        
+        return {
+            "distance": weights.distance_weight * per_solution(distances),
+            "capacity_penalty": per_solution(capacity),
+            "autonomy_penalty": per_solution(autonomy),
+            "priority_penalty": weights.priority_penalty * per_solution(priorities),
+            "load_balance_penalty": self._load_balance_weight * variation * mean_loads,
+            "vehicle_penalty": weights.vehicle_penalty * route_counts.astype(np.float64),
+        }
+    
+    def evaluate_population_vectorized(
+        self, solutions: Sequence[Sequence[Sequence[int]]]
+    ) -> np.ndarray:
+        """
+        Fitness de uma população inteira como um vetor (ver ``population_components``).
+        
+        Mesmos valores de ``evaluate_population`` a menos de arredondamento
+        (a ordem das somas difere).
+        
+        Args:
+            solutions: Soluções, cada uma uma lista de rotas de índices
+        
+        Returns:
+            np.ndarray: Fitness de cada solução, float64
+        """
+        if not len(solutions):
+            return np.zeros(0, dtype=np.float64)
+        c = self.population_components(solutions)
+        return (
+            c["distance"]
+            + c["capacity_penalty"]
+            + c["autonomy_penalty"]
+            + c["priority_penalty"]
+            + c["load_balance_penalty"]
+            + c["vehicle_penalty"]
+        )
+    
+    def evaluate(
+        self,
+        routes: Sequence[Sequence[str]],
+        total_distance: Optional[float] = None,
+    ) -> float:
+        """Fitness total (quanto menor, melhor) para rotas de IDs."""
+        return self.evaluate_indices(self.route_indices(routes), total_distance)
+    
+    def evaluate_population(
+        self, solutions: Sequence[Sequence[Sequence[int]]]
+    ) -> List[float]:
+        """
+        Fitness de várias soluções (rotas de índices) de uma vez.
+        
+        As distâncias de todas as rotas de todas as soluções saem de uma
+        única chamada a ``DistanceMatrix.route_distances``.
+        
+        Args:
+            solutions: Soluções, cada uma uma lista de rotas de índices
+        
+        Returns:
+            List[float]: Fitness de cada solução, na mesma ordem
+        """
+        distances = self.distance_matrix.route_distances(
+            [route for routes in solutions for route in routes]
+        ).tolist()
+        
+        fitnesses = []
+        start = 0
+        for routes in solutions:
+            end = start + len(routes)
+            fitnesses.append(self.evaluate_indices(routes, route_distances=distances[start:end]))
+            start = end
+        return fitnesses
@@ -10,6 +10,7 @@ from hospital_routes.core.interfaces import (
     RouteSolution,
     VehicleConstraints,
 )
+from hospital_routes.optimization.fitness.delivery_lookup import DeliveryLookup
 
 
 class LoadBalancePenalty:
@@ -25,6 +26,7 @@ class LoadBalancePenalty:
             weight: Peso deste componente na função de fitness
         """
         self.weight = weight
+        self._delivery_lookup = DeliveryLookup()
     
     def calculate(
         self,
@@ -48,7 +50,7 @@ class LoadBalancePenalty:
         if not solution.routes:
             return 0.0
         
-        delivery_dict = {d.id: d for d in deliveries}
+        delivery_dict = self._delivery_lookup.get(deliveries)
         
         # Calcular carga de cada rota
         route_loads = []
@@ -6,6 +6,7 @@ Penaliza soluções que atrasam entregas críticas (medicamentos).
 
 from typing import List
 from hospital_routes.core.interfaces import Delivery, RouteSolution
+from hospital_routes.optimization.fitness.delivery_lookup import DeliveryLookup
 
 
 class PriorityPenalty:
@@ -22,6 +23,7 @@ class PriorityPenalty:
             penalty_weight: Peso da penalidade por atraso
         """
         self.penalty_weight = penalty_weight
+        self._delivery_lookup = DeliveryLookup()
     
     def calculate(
         self,
@@ -43,8 +45,7 @@ class PriorityPenalty:
         """
         total_penalty = 0.0
         
-        # Criar dicionário de entregas para acesso rápido
-        delivery_dict = {d.id: d for d in deliveries}
+        delivery_dict = self._delivery_lookup.get(deliveries)
         
         # Para cada rota, calcular penalidade baseada na posição das entregas críticas
         for route in solution.routes:
@@ -6,7 +6,8 @@ Este módulo implementa o BaseOptimizer usando Algoritmos Genéticos com DEAP.
 
 import time
 import random
-from typing import List, Dict, Tuple, Any, Optional
+from array import array
+from typing import List, Dict, Hashable, Tuple, Any, Optional
 from dataclasses import dataclass
 
 from deap import base, creator, tools
@@ -20,8 +21,27 @@ from hospital_routes.core.interfaces import (
     RouteSolution,
     OptimizationResult,
 )
-from hospital_routes.core.exceptions import OptimizationError
+from hospital_routes.core.exceptions import (
+    OptimizationError,
+    InvalidConfigurationError,
+)
 from hospital_routes.optimization.fitness.composite_fitness import CompositeFitness
+from hospital_routes.optimization.fitness.fused_fitness import FusedFitnessEvaluator
+from hospital_routes.optimization.fitness.fitness_cache import (
+    FitnessCache,
+    chromosome_key,
+    DEFAULT_FITNESS_CACHE_SIZE,
+)
+from hospital_routes.optimization.split import GiantTourSplitter
+from hospital_routes.optimization.local_search import LocalSearch, IMPROVEMENT_EPSILON
+from hospital_routes.optimization.operator_selection import (
+    OperatorPortfolio,
+    SELECTION_POLICIES,
+)
+from hospital_routes.optimization.parallel_evaluation import (
+    ParallelEvaluator,
+    evaluate_shared,
+)
 from hospital_routes.optimization.initialization_strategy import (
     InitialPopulationStrategy,
     RandomInitializationStrategy,
@@ -29,8 +49,15 @@ from hospital_routes.optimization.initialization_strategy import (
     PriorityFirstInitializationStrategy,
 )
 from hospital_routes.utils.config import FitnessWeights, SystemConfig
-from hospital_routes.utils.distance import calculate_distance, calculate_distance_matrix
+from hospital_routes.utils.distance import (
+    calculate_distance,
+    build_delivery_distance_matrix,
+    DistanceMatrix,
+)
+from hospital_routes.utils.distance_service import get_distance_service
 from hospital_routes.utils.validators import validate_deliveries, validate_vehicles
+from hospital_routes.utils.deadline import Deadline
+from hospital_routes.utils.travel_time import TravelTimeTensor
 
 
 @dataclass
@@ -92,33 +119,127 @@ class Route:
         return self.delivery_ids.copy()
 
 
+# Codificações de cromossomo suportadas
+ENCODINGS = ("routes", "giant_tour")
+
+# Modos de avaliação sequencial da população: um indivíduo por vez sobre
+# distâncias lidas em lote ("fused") ou a população inteira em arrays
+# NumPy ("vectorized", indicado para populações grandes)
+EVALUATION_MODES = ("fused", "vectorized")
+
+# Operadores de mutação e crossover (ambas as codificações)
+MUTATION_OPERATORS = ("swap", "move", "reverse")
+CROSSOVER_OPERATORS = ("ordered", "partially_matched")
+
+
 class GeneticAlgorithmOptimizer(BaseOptimizer):
     """
     Otimizador de rotas usando Algoritmo Genético.
     Implementa o BaseOptimizer usando DEAP para evolução genética.
+    
+    Codificações disponíveis:
+    - "routes": indivíduo é uma lista de rotas (listas de IDs)
+    - "giant_tour": indivíduo é uma permutação compacta (array de inteiros)
+      das entregas, decodificada em rotas pelo Split ótimo (Prins)
     """
     
     def __init__(
         self,
         fitness_weights: Optional[FitnessWeights] = None,
         initialization_strategy: Optional[InitialPopulationStrategy] = None,
+        n_workers: int = 1,
+        encoding: str = "routes",
+        fitness_cache_size: int = DEFAULT_FITNESS_CACHE_SIZE,
+        fitness_cache_eviction: str = "lru",
+        evaluation_mode: str = "fused",
+        memetic_top_k: int = 0,
+        memetic_probability: float = 1.0,
+        memetic_time_budget: Optional[float] = None,
+        memetic_move_budget: int = 200,
+        operator_selection: Optional[str] = None,
     ):
         """
         Args:
             fitness_weights: Pesos da função de fitness (usa padrão se None)
             initialization_strategy: Estratégia de inicialização (usa Random se None)
+            n_workers: Processos para avaliação paralela do fitness
+                (1 = avaliação sequencial no processo atual)
+            encoding: Codificação do cromossomo ("routes" ou "giant_tour")
+            fitness_cache_size: Cromossomos com fitness memorizado por
+                execução (0 = sem cache)
+            fitness_cache_eviction: Remoção quando o cache enche ("lru" ou "fifo")
+            evaluation_mode: Avaliação sequencial da população ("fused" ou
+                "vectorized"; ver ``EVALUATION_MODES``)
+            memetic_top_k: Filhos (os melhores de cada geração) que passam
+                por busca local; 0 desativa o modo memético
+            memetic_probability: Probabilidade de aplicar a busca local a
+                cada um dos ``memetic_top_k`` filhos
+            memetic_time_budget: Tempo máximo (s) de busca local por geração
+                (None = limitado só pelo prazo da otimização)
+            memetic_move_budget: Movimentos entre rotas por geração
+            operator_selection: Seleção adaptativa de mutações e crossovers
+                ("uniform", "roulette" ou "ucb"; ver ``OperatorPortfolio``).
+                None mantém os operadores fixos (mutação sorteada, crossover OX)
         """
+        if n_workers < 1:
+            raise InvalidConfigurationError("n_workers deve ser >= 1")
+        if encoding not in ENCODINGS:
+            raise InvalidConfigurationError(
+                f"Codificação não suportada: {encoding}. "
+                f"Opções: {', '.join(ENCODINGS)}"
+            )
+        if evaluation_mode not in EVALUATION_MODES:
+            raise InvalidConfigurationError(
+                f"Modo de avaliação não suportado: {evaluation_mode}. "
+                f"Opções: {', '.join(EVALUATION_MODES)}"
+            )
+        if memetic_top_k < 0:
+            raise InvalidConfigurationError("memetic_top_k deve ser >= 0")
+        if not 0.0 <= memetic_probability <= 1.0:
+            raise InvalidConfigurationError(
+                "memetic_probability deve estar entre 0 e 1"
+            )
+        if memetic_time_budget is not None and memetic_time_budget <= 0:
+            raise InvalidConfigurationError("memetic_time_budget deve ser positivo")
+        if memetic_move_budget < 0:
+            raise InvalidConfigurationError("memetic_move_budget deve ser >= 0")
+        if operator_selection is not None and operator_selection not in SELECTION_POLICIES:
+            raise InvalidConfigurationError(
+                f"Seleção de operadores não suportada: {operator_selection}. "
+                f"Opções: {', '.join(SELECTION_POLICIES)}"
+            )
+        
         self.fitness_weights = fitness_weights or FitnessWeights()
         self.initialization_strategy = (
             initialization_strategy or RandomInitializationStrategy()
         )
         self.composite_fitness = CompositeFitness(self.fitness_weights)
+        self.n_workers = n_workers
+        self.encoding = encoding
+        self.evaluation_mode = evaluation_mode
+        self.memetic_top_k = memetic_top_k
+        self.memetic_probability = memetic_probability
+        self.memetic_time_budget = memetic_time_budget
+        self.memetic_move_budget = memetic_move_budget
+        self._local_search: Optional[LocalSearch] = None
+        self._local_search_stats: Dict[str, float] = {}
+        self.operator_selection = operator_selection
+        self._mutation_portfolio: Optional[OperatorPortfolio] = None
+        self._crossover_portfolio: Optional[OperatorPortfolio] = None
+        self._operator_trace: Dict[int, Tuple[Any, Optional[float], List[Tuple]]] = {}
+        try:
+            self._fitness_cache = FitnessCache(fitness_cache_size, fitness_cache_eviction)
+        except ValueError as e:
+            raise InvalidConfigurationError(str(e)) from e
+        self._parallel_evaluator: Optional[ParallelEvaluator] = None
+        self._splitter: Optional[GiantTourSplitter] = None
+        self._fitness_evaluator: Optional[FusedFitnessEvaluator] = None
         
         # Cache de dados
         self._deliveries: List[Delivery] = []
         self._vehicles: List[VehicleConstraints] = []
         self._depot_location: Tuple[float, float] = (0.0, 0.0)
-        self._distance_matrix: Dict[Tuple[str, str], float] = {}
+        self._distance_matrix: Optional[DistanceMatrix] = None
         self._delivery_dict: Dict[str, Delivery] = {}
     
     def optimize(
@@ -144,25 +265,14 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
             OptimizationError: Se houver erro na otimização
         """
         start_time = time.time()
+        deadline = Deadline.from_config(config, start_time)
         
         try:
             # Validar inputs
             validate_deliveries(deliveries)
             validate_vehicles(vehicles)
             
-            # Armazenar dados para uso nos operadores
-            self._deliveries = deliveries
-            self._vehicles = vehicles
-            self._depot_location = depot_location
-            self._delivery_dict = {d.id: d for d in deliveries}
-            
-            # Calcular matriz de distâncias
-            self._distance_matrix = self._build_distance_matrix(
-                deliveries, depot_location
-            )
-            
-            # Configurar DEAP
-            self._setup_deap()
+            self._prepare_problem(deliveries, vehicles, depot_location, config)
             
             # Criar população inicial
             population = self._create_initial_population(
@@ -170,36 +280,24 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
             )
             
             # Avaliar população inicial
-            fitnesses = list(map(self._evaluate_individual, population))
-            for ind, fit in zip(population, fitnesses):
-                ind.fitness.values = (fit,)
+            self._evaluate_population(population)
             
             # Histórico de fitness
             best_fitness_history = []
             best_fitness = float('inf')
             generations_without_improvement = 0
+            converged = False
+            fits = [ind.fitness.values[0] for ind in population]
+            generation = -1
             
             # Evolução
             for generation in range(config.generations):
-                # Seleção
-                offspring = self._select(population, config)
-                
-                # Crossover
-                offspring = self._crossover(offspring, config)
-                
-                # Mutação
-                offspring = self._mutate(offspring, config)
-                
-                # Avaliar novos indivíduos
-                invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-                fitnesses = list(map(self._evaluate_individual, invalid_ind))
-                for ind, fit in zip(invalid_ind, fitnesses):
-                    ind.fitness.values = (fit,)
+                # Prazo atingido: manter a melhor população até aqui
+                if deadline.expired():
+                    generation -= 1
+                    break
                 
-                # Substituir população (elitismo)
-                population = self._replace_with_elitism(
-                    population, offspring, config
-                )
+                population = self._evolve_generation(population, config, deadline)
                 
                 # Estatísticas
                 fits = [ind.fitness.values[0] for ind in population]
@@ -218,8 +316,13 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
                     and generations_without_improvement
                     >= config.max_iterations_without_improvement
                 ):
+                    converged = True
                     break
             
+            # Prazo esgotado antes da primeira geração: usar a população inicial
+            if not best_fitness_history:
+                best_fitness = min(fits)
+            
             # Melhor solução
             best_individual = tools.selBest(population, 1)[0]
             solution = self._individual_to_route_solution(
@@ -227,17 +330,7 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
             )
             
             # Aplicar busca local para melhorar solução final
-            try:
-                from hospital_routes.optimization.local_search import LocalSearch
-                local_search = LocalSearch(
-                    deliveries, vehicles, depot_location, distance_matrix
-                )
-                solution = local_search.improve_solution(
-                    solution, max_iterations=30, fitness_calculator=self.composite_fitness
-                )
-            except Exception as e:
-                # Se busca local falhar, continuar com solução do GA
-                pass
+            solution = self._polish_solution(solution, deadline)
             
             execution_time = time.time() - start_time
             
@@ -252,11 +345,22 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
                     "final_avg_fitness": np.mean(fits),
                     "final_worst_fitness": max(fits),
                     "generations_without_improvement": generations_without_improvement,
+                    "n_workers": self.n_workers,
+                    "encoding": self.encoding,
+                    "evaluation_mode": self.evaluation_mode,
+                    "fitness_cache": self._fitness_cache.stats(),
+                    "local_search": self._local_search_statistics(execution_time),
+                    "operator_selection": self.operator_selection,
+                    "operators": self._operator_statistics(),
+                    **deadline.statistics(converged),
                 },
             )
         
         except Exception as e:
             raise OptimizationError(f"Erro durante otimização: {str(e)}") from e
+        
+        finally:
+            self._close_parallel_evaluator()
     
     def validate_solution(
         self,
@@ -304,6 +408,195 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
         
         return True
     
+    def _prepare_problem(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        depot_location: Tuple[float, float],
+        config: OptimizationConfig,
+    ) -> None:
+        """
+        Armazena os dados do problema, calcula a matriz e configura o DEAP.
+        
+        Args:
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos
+            depot_location: Localização do depósito
+            config: Configuração (precisão, dtype e layout da matriz)
+        """
+        # Armazenar dados para uso nos operadores
+        self._deliveries = deliveries
+        self._vehicles = vehicles
+        self._depot_location = depot_location
+        self._delivery_dict = {d.id: d for d in deliveries}
+        
+        # Calcular matriz de distâncias
+        self._distance_matrix = self._build_distance_matrix(
+            deliveries,
+            depot_location,
+            precision=config.distance_precision,
+            dtype=config.distance_dtype,
+            layout=config.distance_layout,
+        )
+        self._prepare_encoding()
+        
+        # Configurar DEAP
+        self._setup_deap()
+    
+    def _evolve_generation(
+        self,
+        population: List,
+        config: OptimizationConfig,
+        deadline: Optional[Deadline] = None,
+    ) -> List:
+        """
+        Uma geração: seleção, crossover, mutação, avaliação e elitismo.
+        
+        No modo memético, os melhores filhos passam por busca local antes
+        do elitismo.
+        
+        Args:
+            population: População atual (já avaliada)
+            config: Configuração
+            deadline: Prazo da otimização (limita a busca local memética)
+        
+        Returns:
+            List: Nova população
+        """
+        # Seleção
+        offspring = self._select(population, config)
+        
+        # Crossover
+        offspring = self._crossover(offspring, config)
+        
+        # Mutação
+        offspring = self._mutate(offspring, config)
+        
+        # Avaliar novos indivíduos
+        invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+        self._evaluate_population(invalid_ind)
+        
+        # Creditar aos operadores a melhoria dos filhos sobre os pais
+        if self.operator_selection is not None:
+            self._credit_operators()
+        
+        # Busca local nos melhores filhos (modo memético)
+        if self.memetic_top_k:
+            self._improve_offspring(offspring, deadline)
+        
+        # Substituir população (elitismo)
+        return self._replace_with_elitism(population, offspring, config)
+    
+    def _improve_offspring(self, offspring: List, deadline: Optional[Deadline]) -> None:
+        """
+        Busca local memética nos ``memetic_top_k`` melhores filhos.
+        
+        Cada filho sorteado (``memetic_probability``) passa por 2-opt e
+        movimentos entre rotas avaliados por ganho incremental; a solução
+        resultante substitui o cromossomo (lamarckiano) só se o fitness
+        melhorar. O tempo (``memetic_time_budget``) e os movimentos
+        (``memetic_move_budget``) são limitados por geração.
+        
+        Args:
+            offspring: Filhos já avaliados (alterados in-place)
+            deadline: Prazo da otimização
+        """
+        seconds = [
+            limit
+            for limit in (
+                self.memetic_time_budget,
+                deadline.remaining() if deadline is not None else None,
+            )
+            if limit is not None
+        ]
+        if seconds and min(seconds) <= 0:
+            return
+        budget = Deadline(min(seconds)) if seconds else None
+        
+        local_search = self._get_local_search()
+        stats = self._local_search_stats
+        moves_left = self.memetic_move_budget
+        start_time = time.time()
+        
+        for individual in tools.selBest(offspring, self.memetic_top_k):
+            if budget is not None and budget.expired():
+                break
+            if random.random() >= self.memetic_probability:
+                continue
+            
+            moves_before = sum(local_search.move_counts.values())
+            routes = local_search.polish_routes(
+                [list(route) for route in self._decode(individual)],
+                max_moves=moves_left,
+                deadline=budget,
+            )
+            moves = sum(local_search.move_counts.values()) - moves_before
+            moves_left = max(0, moves_left - moves)
+            
+            candidate = self._routes_to_individual(routes)
+            self._evaluate_population([candidate])
+            gain = individual.fitness.values[0] - candidate.fitness.values[0]
+            
+            stats["memetic_applications"] += 1
+            stats["memetic_moves"] += moves
+            if gain > IMPROVEMENT_EPSILON:
+                individual[:] = candidate
+                individual.fitness.values = candidate.fitness.values
+                stats["memetic_improved"] += 1
+                stats["memetic_gain"] += gain
+        
+        stats["memetic_time"] += time.time() - start_time
+    
+    def _polish_solution(self, solution: RouteSolution, deadline: Deadline) -> RouteSolution:
+        """
+        Aplica busca local à melhor solução encontrada pela evolução.
+        
+        Args:
+            solution: Melhor solução do GA
+            deadline: Prazo da otimização
+        
+        Returns:
+            RouteSolution: Solução melhorada
+        """
+        start_time = time.time()
+        improved = self._get_local_search().improve_solution(
+            solution, max_iterations=30, fitness_calculator=self.composite_fitness,
+            deadline=deadline,
+        )
+        
+        stats = self._local_search_stats
+        stats["final_gain"] = solution.fitness_score - improved.fitness_score
+        stats["final_time"] = time.time() - start_time
+        return improved
+    
+    def _get_local_search(self) -> LocalSearch:
+        """Busca local sobre os dados do problema atual (criada sob demanda)."""
+        if self._local_search is None:
+            self._local_search = LocalSearch(
+                self._deliveries,
+                self._vehicles,
+                self._depot_location,
+                self._distance_matrix,
+                fitness_weights=self.fitness_weights,
+            )
+        return self._local_search
+    
+    def _local_search_statistics(self, execution_time: float) -> Dict[str, float]:
+        """
+        Contribuição da busca local (memética e final) para o resultado.
+        
+        Args:
+            execution_time: Tempo total da otimização
+        
+        Returns:
+            Dict: Contadores, ganho de fitness e tempo de cada etapa, e a
+            fração do tempo total gasta em busca local
+        """
+        stats = dict(self._local_search_stats)
+        local_search_time = stats["memetic_time"] + stats["final_time"]
+        stats["time_share"] = local_search_time / execution_time if execution_time > 0 else 0.0
+        return stats
+    
     def _setup_deap(self) -> None:
         """Configura DEAP (creator e toolbox)."""
         # Criar tipos se ainda não existirem
@@ -317,49 +610,130 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
                 fitness=creator.FitnessMin,
             )
         
+        if not hasattr(creator, "GiantTourIndividual"):
+            creator.create(
+                "GiantTourIndividual",
+                array,
+                typecode="i",
+                fitness=creator.FitnessMin,
+            )
+        
         # Toolbox
         self.toolbox = base.Toolbox()
         
-        # Registros de operadores serão feitos dinamicamente
-        # pois dependem dos dados do problema
+        # Avaliação: sequencial ou em pool de processos com dados compartilhados
+        if self.n_workers > 1:
+            self._parallel_evaluator = ParallelEvaluator(
+                self._deliveries,
+                self._vehicles,
+                self._depot_location,
+                self._distance_matrix,
+                self.fitness_weights,
+                n_workers=self.n_workers,
+                encoding=self.encoding,
+            )
+            self.toolbox.register("map", self._parallel_evaluator.map)
+            self.toolbox.register("evaluate", evaluate_shared)
+        else:
+            self.toolbox.register("map", map)
+            self.toolbox.register("evaluate", self._evaluate_individual)
+        
+        # Demais operadores são aplicados diretamente pelos métodos
+        # _select/_crossover/_mutate, pois dependem dos dados do problema
+    
+    def _prepare_encoding(self) -> None:
+        """
+        Prepara a avaliação para os dados do problema atual.
+        
+        Cria o avaliador de fitness fundido, um cache de fitness vazio,
+        zera as estatísticas da busca local e dos operadores e, quando a
+        codificação é giant tour, cria o decodificador Split.
+        """
+        self._fitness_cache = FitnessCache(
+            self._fitness_cache.maxsize, self._fitness_cache.eviction
+        )
+        self._local_search = None
+        self._local_search_stats = {
+            "memetic_applications": 0,
+            "memetic_improved": 0,
+            "memetic_moves": 0,
+            "memetic_gain": 0.0,
+            "memetic_time": 0.0,
+            "final_gain": 0.0,
+            "final_time": 0.0,
+        }
+        
+        if self.operator_selection is not None:
+            self._mutation_portfolio = OperatorPortfolio(
+                MUTATION_OPERATORS, policy=self.operator_selection
+            )
+            self._crossover_portfolio = OperatorPortfolio(
+                CROSSOVER_OPERATORS, policy=self.operator_selection
+            )
+        self._operator_trace = {}
+        self._fitness_evaluator = self.composite_fitness.build_evaluator(
+            self._deliveries, self._vehicles, self._distance_matrix
+        )
+        
+        if self.encoding == "giant_tour":
+            self._splitter = GiantTourSplitter(
+                self._distance_matrix,
+                self._deliveries,
+                self._vehicles,
+                self.fitness_weights,
+            )
+        else:
+            self._splitter = None
+    
+    def _decode(self, individual) -> List[List[str]]:
+        """
+        Converte um indivíduo em lista de rotas (IDs).
+        
+        No giant tour, cada gene é a posição da entrega na lista de
+        entregas; o índice na matriz é gene + 1 (depósito = 0).
+        """
+        if self._splitter is None:
+            return individual
+        return self._splitter.decode([gene + 1 for gene in individual])
+    
+    def _close_parallel_evaluator(self) -> None:
+        """Encerra o pool de avaliação paralela, se existir."""
+        if self._parallel_evaluator is not None:
+            self._parallel_evaluator.close()
+            self._parallel_evaluator = None
     
     def _build_distance_matrix(
         self,
         deliveries: List[Delivery],
         depot_location: Tuple[float, float],
-    ) -> Dict[Tuple[str, str], float]:
+        precision: str = "haversine",
+        dtype: Optional[str] = None,
+        layout: str = "dense",
+    ) -> DistanceMatrix:
         """
         Constrói matriz de distâncias entre todos os pontos.
         
+        Se a execução anterior usou quase as mesmas entregas, a matriz dela
+        é atualizada no lugar (só as entregas novas são calculadas).
+        
         Args:
             deliveries: Lista de entregas
             depot_location: Localização do depósito
+            precision: Modo de precisão ("haversine" ou "ellipsoidal")
+            dtype: "float64" (padrão) ou "float32"
+            layout: "dense" (padrão) ou "packed"
         
         Returns:
-            dict: Matriz de distâncias (chave: (from_id, to_id))
-        """
-        matrix = {}
-        
-        # Distâncias entre entregas
-        for d1 in deliveries:
-            for d2 in deliveries:
-                if d1.id != d2.id:
-                    key = (d1.id, d2.id)
-                    matrix[key] = calculate_distance(d1.location, d2.location)
-        
-        # Distâncias do depósito para entregas e vice-versa
-        depot_key = "depot"
-        for d in deliveries:
-            # Depósito → Entrega
-            matrix[(depot_key, d.id)] = calculate_distance(
-                depot_location, d.location
-            )
-            # Entrega → Depósito
-            matrix[(d.id, depot_key)] = calculate_distance(
-                d.location, depot_location
-            )
-        
-        return matrix
+            DistanceMatrix: Matriz de distâncias (depósito no índice 0)
+        """
+        return build_delivery_distance_matrix(
+            deliveries,
+            depot_location,
+            precision=precision,
+            dtype=dtype,
+            layout=layout,
+            previous=self._distance_matrix,
+        )
     
     def _create_initial_population(
         self,
@@ -371,6 +745,9 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
         """
         Cria população inicial usando estratégia configurada.
         
+        A matriz do problema fica registrada no ``DistanceService`` só
+        durante a geração (estratégias por vizinho mais próximo a consultam).
+        
         Args:
             deliveries: Lista de entregas
             vehicles: Lista de veículos
@@ -382,38 +759,118 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
         """
         population = []
         
-        for _ in range(config.population_size):
-            routes_list = self.initialization_strategy.generate_individual(
-                deliveries, vehicles, depot_location
-            )
-            individual = creator.Individual(routes_list)
-            population.append(individual)
+        with get_distance_service().problem_matrix(self._distance_matrix):
+            for _ in range(config.population_size):
+                routes_list = self.initialization_strategy.generate_individual(
+                    deliveries, vehicles, depot_location
+                )
+                population.append(self._routes_to_individual(routes_list))
         
         return population
     
+    def _routes_to_individual(self, routes_list: List[List[str]]):
+        """Cria o indivíduo (sem fitness) para rotas de IDs na codificação atual."""
+        if self.encoding == "giant_tour":
+            return self._routes_to_giant_tour(routes_list)
+        return creator.Individual(routes_list)
+    
+    def _routes_to_giant_tour(self, routes_list: List[List[str]]):
+        """
+        Concatena rotas em um giant tour (array compacto de inteiros).
+        
+        Entregas que a estratégia de inicialização não atribuiu a nenhuma
+        rota são anexadas ao final em ordem aleatória.
+        """
+        index = self._distance_matrix.index
+        genes = [index[d_id] - 1 for route in routes_list for d_id in route]
+        
+        missing = set(range(len(self._deliveries))) - set(genes)
+        if missing:
+            missing = list(missing)
+            random.shuffle(missing)
+            genes.extend(missing)
+        
+        return creator.GiantTourIndividual(genes)
+    
+    def _evaluate_population(self, individuals: List) -> None:
+        """
+        Avalia indivíduos, consultando antes o cache de fitness.
+        
+        Cromossomos já avaliados (ou repetidos no próprio lote) recebem o
+        fitness memorizado; só os inéditos são calculados.
+        
+        Args:
+            individuals: Indivíduos a avaliar (fitness é atribuído in-place)
+        """
+        cache = self._fitness_cache
+        if not cache.maxsize:
+            fitnesses = self._compute_fitnesses(individuals)
+            for ind, fit in zip(individuals, fitnesses):
+                ind.fitness.values = (fit,)
+            return
+        
+        # Indivíduos sem fitness memorizado, agrupados pela chave
+        pending: Dict[Hashable, List] = {}
+        for ind in individuals:
+            key = chromosome_key(ind)
+            fit = cache.get(key)
+            if fit is None:
+                pending.setdefault(key, []).append(ind)
+            else:
+                ind.fitness.values = (fit,)
+        
+        fitnesses = self._compute_fitnesses([group[0] for group in pending.values()])
+        for (key, group), fit in zip(pending.items(), fitnesses):
+            cache.set(key, fit)
+            for ind in group:
+                ind.fitness.values = (fit,)
+    
+    def _compute_fitnesses(self, individuals: List) -> List[float]:
+        """
+        Calcula o fitness de indivíduos usando o ``map`` registrado no toolbox.
+        
+        Na avaliação sequencial, as distâncias de todas as rotas de todos
+        os indivíduos saem de uma única leitura vetorizada da matriz; no
+        modo "vectorized", todos os termos do fitness são calculados para
+        a população inteira em arrays.
+        
+        Args:
+            individuals: Indivíduos a avaliar
+        
+        Returns:
+            List[float]: Fitness de cada indivíduo, na mesma ordem
+        """
+        if not individuals:
+            return []
+        if self._parallel_evaluator is None and self._fitness_evaluator is not None:
+            solutions = [self._individual_indices(ind) for ind in individuals]
+            if self.evaluation_mode == "vectorized":
+                return self._fitness_evaluator.evaluate_population_vectorized(
+                    solutions
+                ).tolist()
+            return self._fitness_evaluator.evaluate_population(solutions)
+        return list(self.toolbox.map(self.toolbox.evaluate, individuals))
+    
     def _evaluate_individual(self, individual: List[List[str]]) -> float:
         """
         Avalia um indivíduo (solução) calculando seu fitness.
         
         Args:
-            individual: Indivíduo (lista de rotas)
+            individual: Indivíduo (lista de rotas ou giant tour)
         
         Returns:
             float: Fitness (quanto menor, melhor)
         """
-        # Converter para RouteSolution
-        solution = self._routes_list_to_solution(individual)
-        
-        # Calcular fitness usando CompositeFitness
-        fitness = self.composite_fitness.calculate(
-            solution,
-            self._deliveries,
-            self._vehicles,
-            self._depot_location,
-            self._distance_matrix,
+        # Avaliador fundido: uma passada por rota, sem montar RouteSolution
+        return self._fitness_evaluator.evaluate_indices(
+            self._individual_indices(individual)
         )
-        
-        return fitness
+    
+    def _individual_indices(self, individual) -> List[List[int]]:
+        """Rotas do indivíduo como índices da matriz (decodifica o giant tour)."""
+        if self._splitter is None:
+            return self._fitness_evaluator.route_indices(individual)
+        return self._splitter.split([gene + 1 for gene in individual])
     
     def _routes_list_to_solution(
         self, routes_list: List[List[str]]
@@ -462,71 +919,33 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
         self, routes_list: List[List[str]]
     ) -> float:
         """Calcula distância total de todas as rotas."""
-        total = 0.0
-        depot_key = "depot"
-        
-        for route in routes_list:
-            if not route:
-                continue
-            
-            # Depósito → primeira entrega
-            total += self._distance_matrix.get(
-                (depot_key, route[0]), 0.0
-            )
-            
-            # Entre entregas
-            for i in range(len(route) - 1):
-                total += self._distance_matrix.get(
-                    (route[i], route[i + 1]), 0.0
-                )
-            
-            # Última entrega → depósito
-            total += self._distance_matrix.get(
-                (route[-1], depot_key), 0.0
-            )
-        
-        return total
+        return float(self._calculate_route_distances(routes_list).sum())
     
     def _calculate_total_cost(
         self, routes_list: List[List[str]], total_distance: float
     ) -> float:
         """Calcula custo total."""
+        matrix = self._distance_matrix
+        travel_times = TravelTimeTensor.for_deliveries(matrix, self._deliveries)
+        route_distances = self._calculate_route_distances(routes_list)
         cost = 0.0
         
         # Custo de combustível
         for route_idx, route in enumerate(routes_list):
             if route_idx < len(self._vehicles):
                 vehicle = self._vehicles[route_idx]
-                route_distance = self._calculate_route_distance(route)
-                cost += route_distance * vehicle.fuel_cost_per_km
+                indices = matrix.indices(route)
+                cost += float(route_distances[route_idx]) * vehicle.fuel_cost_per_km
                 
-                # Custo do motorista (estimado)
-                route_time = route_distance / 50.0  # 50 km/h média
-                cost += route_time * vehicle.driver_cost_per_hour
+                # Custo do motorista (perfil horário de velocidades)
+                cost += travel_times.route_hours(indices) * vehicle.driver_cost_per_hour
         
         return cost
     
-    def _calculate_route_distance(self, route: List[str]) -> float:
-        """Calcula distância de uma rota específica."""
-        if not route:
-            return 0.0
-        
-        distance = 0.0
-        depot_key = "depot"
-        
-        # Depósito → primeira entrega
-        distance += self._distance_matrix.get((depot_key, route[0]), 0.0)
-        
-        # Entre entregas
-        for i in range(len(route) - 1):
-            distance += self._distance_matrix.get(
-                (route[i], route[i + 1]), 0.0
-            )
-        
-        # Última entrega → depósito
-        distance += self._distance_matrix.get((route[-1], depot_key), 0.0)
-        
-        return distance
+    def _calculate_route_distances(self, routes_list: List[List[str]]) -> np.ndarray:
+        """Calcula a distância de cada rota (uma leitura vetorizada da matriz)."""
+        matrix = self._distance_matrix
+        return matrix.route_distances([matrix.indices(route) for route in routes_list])
     
     def _calculate_violations(
         self, routes_list: List[List[str]]
@@ -536,6 +955,7 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
             "capacity": 0.0,
             "autonomy": 0.0,
         }
+        route_distances = self._calculate_route_distances(routes_list)
         
         for route_idx, route in enumerate(routes_list):
             if route_idx >= len(self._vehicles):
@@ -553,7 +973,7 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
                 violations["capacity"] += route_weight - vehicle.max_capacity
             
             # Violação de autonomia
-            route_distance = self._calculate_route_distance(route)
+            route_distance = float(route_distances[route_idx])
             if route_distance > vehicle.max_range:
                 violations["autonomy"] += route_distance - vehicle.max_range
         
@@ -567,25 +987,103 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
         selected = tools.selTournament(
             population, len(population), tournsize=3
         )
-        return selected
+        # Clonar: crossover e mutação alteram os filhos in-place e não
+        # podem invalidar o fitness dos pais que seguem na população
+        return [self._clone(ind) for ind in selected]
+    
+    def _clone(self, individual):
+        """Copia um indivíduo preservando o fitness."""
+        if self.encoding == "giant_tour":
+            clone = creator.GiantTourIndividual(individual)
+        else:
+            clone = creator.Individual([route[:] for route in individual])
+        clone.fitness.values = individual.fitness.values
+        return clone
     
     def _crossover(
         self, offspring: List, config: OptimizationConfig
     ) -> List:
-        """Operador de crossover."""
+        """Operador de crossover (escolhido pelo portfólio, se houver)."""
+        portfolio = self._crossover_portfolio
         for i in range(0, len(offspring) - 1, 2):
             if random.random() < config.crossover_rate:
-                child1, child2 = self._route_crossover(
-                    offspring[i], offspring[i + 1]
-                )
-                # Converter listas para DEAP Individual objects
-                offspring[i] = creator.Individual(child1)
-                offspring[i + 1] = creator.Individual(child2)
-                del offspring[i].fitness.values
-                del offspring[i + 1].fitness.values
+                if portfolio is None:
+                    self._apply_crossover(offspring, i, "ordered")
+                    continue
+                
+                name = portfolio.select()
+                parents = [
+                    ind.fitness.values[0] for ind in offspring[i:i + 2] if ind.fitness.valid
+                ]
+                start = time.process_time()
+                self._apply_crossover(offspring, i, name)
+                elapsed = time.process_time() - start
+                for child in offspring[i:i + 2]:
+                    self._trace_operator(
+                        child, portfolio, name, min(parents, default=None), elapsed / 2
+                    )
         
         return offspring
     
+    def _apply_crossover(self, offspring: List, i: int, name: str) -> None:
+        """
+        Cruza ``offspring[i]`` e ``offspring[i + 1]`` (filhos substituem os pais).
+        
+        Args:
+            offspring: Filhos da geração
+            i: Posição do primeiro pai
+            name: Operador ("ordered" ou "partially_matched")
+        """
+        if self.encoding == "giant_tour":
+            if len(offspring[i]) < 2:
+                return  # OX/PMX sorteiam dois pontos de corte
+            
+            # Crossover direto sobre as permutações (OX ou PMX)
+            if name == "ordered":
+                tools.cxOrdered(offspring[i], offspring[i + 1])
+            else:
+                tools.cxPartialyMatched(offspring[i], offspring[i + 1])
+            del offspring[i].fitness.values
+            del offspring[i + 1].fitness.values
+            return
+        
+        if name == "ordered":
+            child1, child2 = self._route_crossover(offspring[i], offspring[i + 1])
+        else:
+            child1, child2 = self._route_pmx_crossover(offspring[i], offspring[i + 1])
+        # Converter listas para DEAP Individual objects
+        offspring[i] = creator.Individual(child1)
+        offspring[i + 1] = creator.Individual(child2)
+        del offspring[i].fitness.values
+        del offspring[i + 1].fitness.values
+    
+    def _route_pmx_crossover(
+        self, ind1: List[List[str]], ind2: List[List[str]]
+    ) -> Tuple[List[List[str]], List[List[str]]]:
+        """
+        Partially Matched Crossover (PMX) sobre as rotas concatenadas.
+        
+        As entregas são numeradas pela ordem no primeiro pai para aplicar o
+        PMX do DEAP; os filhos são redistribuídos entre os veículos.
+        """
+        flat1 = [d_id for route in ind1 for d_id in route]
+        flat2 = [d_id for route in ind2 for d_id in route]
+        if len(flat1) < 2 or sorted(flat1) != sorted(flat2):
+            return ind1, ind2
+        
+        code = {d_id: k for k, d_id in enumerate(flat1)}
+        perm1 = list(range(len(flat1)))
+        perm2 = [code[d_id] for d_id in flat2]
+        tools.cxPartialyMatched(perm1, perm2)
+        
+        child1 = self._redistribute_to_routes(
+            [flat1[k] for k in perm1], len(ind1), self._vehicles
+        )
+        child2 = self._redistribute_to_routes(
+            [flat1[k] for k in perm2], len(ind2), self._vehicles
+        )
+        return child1, child2
+    
     def _route_crossover(
         self, ind1: List[List[str]], ind2: List[List[str]]
     ) -> Tuple[List[List[str]], List[List[str]]]:
@@ -679,19 +1177,85 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
     def _mutate(
         self, offspring: List, config: OptimizationConfig
     ) -> List:
-        """Operador de mutação."""
+        """Operador de mutação (escolhido pelo portfólio, se houver)."""
+        portfolio = self._mutation_portfolio
         for ind in offspring:
             if random.random() < config.mutation_rate:
-                self._route_mutate(ind)
+                name = None
+                if portfolio is not None:
+                    name = portfolio.select()
+                    parent_fitness = ind.fitness.values[0] if ind.fitness.valid else None
+                    start = time.process_time()
+                
+                if self.encoding == "giant_tour":
+                    self._giant_tour_mutate(ind, name)
+                else:
+                    self._route_mutate(ind, name)
+                
+                if portfolio is not None:
+                    self._trace_operator(
+                        ind, portfolio, name, parent_fitness, time.process_time() - start
+                    )
                 del ind.fitness.values
         
         return offspring
     
-    def _route_mutate(self, individual: List[List[str]]) -> None:
+    def _trace_operator(
+        self,
+        individual,
+        portfolio: OperatorPortfolio,
+        name: str,
+        parent_fitness: Optional[float],
+        cpu_time: float,
+    ) -> None:
+        """
+        Registra um operador aplicado ao filho (creditado após a avaliação).
+        
+        O fitness de referência é o do pai; filhos de crossover mutados
+        mantêm o fitness do melhor pai do crossover.
+        """
+        entry = self._operator_trace.get(id(individual))
+        if entry is None:
+            self._operator_trace[id(individual)] = (
+                individual, parent_fitness, [(portfolio, name, cpu_time)]
+            )
+        else:
+            entry[2].append((portfolio, name, cpu_time))
+    
+    def _credit_operators(self) -> None:
+        """
+        Credita a melhoria de cada filho avaliado aos operadores que o geraram.
+        
+        Encerra o segmento (geração) dos portfólios, o que atualiza os
+        pesos da roleta.
+        """
+        for individual, parent_fitness, applications in self._operator_trace.values():
+            if parent_fitness is None or not individual.fitness.valid:
+                continue
+            improvement = parent_fitness - individual.fitness.values[0]
+            for portfolio, name, cpu_time in applications:
+                portfolio.record(name, improvement, cpu_time)
+        self._operator_trace = {}
+        
+        self._mutation_portfolio.end_segment()
+        self._crossover_portfolio.end_segment()
+    
+    def _operator_statistics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Estatísticas por operador (vazio sem seleção adaptativa)."""
+        if self.operator_selection is None:
+            return {}
+        return {
+            "mutation": self._mutation_portfolio.stats(),
+            "crossover": self._crossover_portfolio.stats(),
+        }
+    
+    def _route_mutate(
+        self, individual: List[List[str]], mutation_type: Optional[str] = None
+    ) -> None:
         """
         Mutação específica para rotas VRP.
         
-        Operadores de mutação:
+        Operadores de mutação (sorteado se ``mutation_type`` for None):
         - Swap: Troca duas entregas
         - Move: Move entrega de uma rota para outra
         - Reverse: Inverte ordem de uma rota
@@ -699,7 +1263,7 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
         if not individual:
             return
         
-        mutation_type = random.choice(["swap", "move", "reverse"])
+        mutation_type = mutation_type or random.choice(["swap", "move", "reverse"])
         
         if mutation_type == "swap":
             # Trocar duas entregas aleatórias
@@ -740,6 +1304,30 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
                 route_idx = random.randint(0, len(individual) - 1)
                 individual[route_idx].reverse()
     
+    def _giant_tour_mutate(self, individual, mutation_type: Optional[str] = None) -> None:
+        """
+        Mutação sobre a permutação do giant tour.
+        
+        Operadores de mutação (sorteado se ``mutation_type`` for None):
+        - Swap: Troca duas entregas
+        - Move: Reinsere uma entrega em outra posição
+        - Reverse: Inverte um segmento (2-opt no giant tour)
+        """
+        size = len(individual)
+        if size < 2:
+            return
+        
+        i, j = sorted(random.sample(range(size), 2))
+        mutation_type = mutation_type or random.choice(["swap", "move", "reverse"])
+        
+        if mutation_type == "swap":
+            individual[i], individual[j] = individual[j], individual[i]
+        elif mutation_type == "move":
+            gene = individual.pop(i)
+            individual.insert(j, gene)
+        else:
+            individual[i:j + 1] = individual[i:j + 1][::-1]
+    
     def _replace_with_elitism(
         self,
         population: List,
@@ -784,7 +1372,9 @@ class GeneticAlgorithmOptimizer(BaseOptimizer):
         Returns:
             RouteSolution: Solução de rota
         """
-        return self._routes_list_to_solution(individual)
+        return self._routes_list_to_solution(
+            [list(route) for route in self._decode(individual)]
+        )
 
 
 
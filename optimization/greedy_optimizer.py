@@ -6,7 +6,7 @@ a entrega mais próxima como próxima parada.
 """
 
 import time
-from typing import List, Dict, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from hospital_routes.core.interfaces import (
     BaseOptimizer,
@@ -17,12 +17,105 @@ from hospital_routes.core.interfaces import (
     OptimizationResult,
 )
 from hospital_routes.core.exceptions import OptimizationError
-from hospital_routes.utils.distance import calculate_distance
+from hospital_routes.utils.distance import (
+    build_delivery_distance_matrix,
+    DistanceMatrix,
+    DEPOT_INDEX,
+)
 from hospital_routes.utils.validators import validate_deliveries, validate_vehicles
+from hospital_routes.utils.deadline import Deadline
+from hospital_routes.utils.travel_time import TravelTimeTensor
+from hospital_routes.utils.candidate_graph import CandidateGraph, DEFAULT_CANDIDATE_COUNT
 from hospital_routes.optimization.fitness.composite_fitness import CompositeFitness
 from hospital_routes.utils.config import FitnessWeights
 
 
+def nearest_neighbor_routes(
+    distance_matrix: DistanceMatrix,
+    order: Sequence[int],
+    weights: Sequence[float],
+    vehicles: List[VehicleConstraints],
+    candidates: Optional[CandidateGraph] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[List[List[int]], List[int]]:
+    """
+    Vizinho mais próximo por veículo, com índices da matriz de distâncias.
+    
+    Cada veículo sai do depósito e segue para a entrega mais próxima que
+    ainda cabe (carga e autonomia), até nenhuma caber. Com um grafo de
+    candidatos, o primeiro vizinho livre e viável da lista (ordenada por
+    distância) já é o mais próximo; a varredura de todas as entregas só
+    ocorre quando nenhum candidato serve.
+    
+    Args:
+        distance_matrix: Matriz de distâncias
+        order: Entregas a atribuir (empates favorecem as primeiras)
+        weights: Peso de cada localização, por índice da matriz
+        vehicles: Veículos, na ordem de uso
+        candidates: Grafo de candidatos (None = sempre varrer todas)
+        deadline: Prazo de execução (interrompe a construção)
+    
+    Returns:
+        Tuple: (rotas, entregas não atribuídas na ordem de ``order``)
+    """
+    remaining = dict.fromkeys(order)
+    routes = []
+    
+    for vehicle in vehicles:
+        if not remaining:
+            break
+        
+        route = []
+        current_location = DEPOT_INDEX
+        current_weight = 0.0
+        current_range = 0.0
+        
+        while remaining:
+            if deadline is not None and deadline.expired():
+                break
+            
+            nearest_idx = None
+            nearest_distance = float('inf')
+            
+            if candidates is not None:
+                for delivery_idx, distance in zip(
+                    candidates.neighbors[current_location],
+                    candidates.distances[current_location],
+                ):
+                    if (delivery_idx in remaining and
+                        current_weight + weights[delivery_idx] <= vehicle.max_capacity and
+                        current_range + distance <= vehicle.max_range):
+                        nearest_idx = delivery_idx
+                        nearest_distance = distance
+                        break
+            
+            if nearest_idx is None:
+                # Nenhum candidato serve: varrer todas as entregas restantes
+                distances = distance_matrix.row(current_location).tolist()
+                for delivery_idx in remaining:
+                    distance = distances[delivery_idx]
+                    if (current_weight + weights[delivery_idx] <= vehicle.max_capacity and
+                        current_range + distance <= vehicle.max_range and
+                        distance < nearest_distance):
+                        nearest_idx = delivery_idx
+                        nearest_distance = distance
+            
+            if nearest_idx is None:
+                # Nenhuma entrega cabe, terminar rota deste veículo
+                break
+            
+            route.append(nearest_idx)
+            current_location = nearest_idx
+            current_weight += weights[nearest_idx]
+            current_range += nearest_distance
+            del remaining[nearest_idx]
+        
+        if route:
+            routes.append(route)
+    
+    return routes, list(remaining)
+
+
 class GreedyOptimizer(BaseOptimizer):
     """
     Otimizador de rotas usando algoritmo Greedy (Nearest Neighbor).
@@ -31,13 +124,21 @@ class GreedyOptimizer(BaseOptimizer):
     Rápido mas pode não encontrar a solução ótima.
     """
     
-    def __init__(self, fitness_weights: FitnessWeights = None):
+    def __init__(
+        self,
+        fitness_weights: FitnessWeights = None,
+        candidate_count: Optional[int] = DEFAULT_CANDIDATE_COUNT,
+    ):
         """
         Args:
             fitness_weights: Pesos da função de fitness (usa padrão se None)
+            candidate_count: Vizinhos do grafo de candidatos consultados antes
+                de varrer todas as entregas (None = sempre varrer)
         """
         self.fitness_weights = fitness_weights or FitnessWeights()
+        self.candidate_count = candidate_count
         self.composite_fitness = CompositeFitness(self.fitness_weights)
+        self._distance_matrix: Optional[DistanceMatrix] = None
     
     def optimize(
         self,
@@ -59,6 +160,7 @@ class GreedyOptimizer(BaseOptimizer):
             OptimizationResult: Resultado da otimização
         """
         start_time = time.time()
+        deadline = Deadline.from_config(config, start_time)
         
         try:
             # Validar inputs
@@ -67,12 +169,16 @@ class GreedyOptimizer(BaseOptimizer):
             
             # Construir matriz de distâncias
             distance_matrix = self._build_distance_matrix(
-                deliveries, depot_location
+                deliveries,
+                depot_location,
+                precision=config.distance_precision,
+                dtype=config.distance_dtype,
+                layout=config.distance_layout,
             )
             
             # Resolver usando Greedy
             routes = self._solve_greedy(
-                deliveries, vehicles, depot_location, distance_matrix
+                deliveries, vehicles, depot_location, distance_matrix, deadline
             )
             
             # Calcular métricas
@@ -91,6 +197,7 @@ class GreedyOptimizer(BaseOptimizer):
                 statistics={
                     "algorithm": "greedy",
                     "num_routes": len(routes),
+                    **deadline.statistics(),
                 },
             )
         
@@ -135,113 +242,74 @@ class GreedyOptimizer(BaseOptimizer):
         self,
         deliveries: List[Delivery],
         depot_location: Tuple[float, float],
-    ) -> Dict[Tuple[str, str], float]:
-        """Constrói matriz de distâncias."""
-        matrix = {}
-        depot_key = "depot"
-        
-        # Distâncias entre entregas
-        for d1 in deliveries:
-            for d2 in deliveries:
-                if d1.id != d2.id:
-                    matrix[(d1.id, d2.id)] = calculate_distance(
-                        d1.location, d2.location
-                    )
-        
-        # Distâncias do depósito
-        for d in deliveries:
-            matrix[(depot_key, d.id)] = calculate_distance(
-                depot_location, d.location
-            )
-            matrix[(d.id, depot_key)] = calculate_distance(
-                d.location, depot_location
-            )
+        precision: str = "haversine",
+        dtype: Optional[str] = None,
+        layout: str = "dense",
+    ) -> DistanceMatrix:
+        """
+        Constrói matriz de distâncias (passada vetorizada única).
         
-        return matrix
+        Se a execução anterior usou quase as mesmas entregas, a matriz dela
+        é atualizada (só as entregas novas são calculadas).
+        """
+        # Replanejamento: a matriz da execução anterior é atualizada no lugar
+        self._distance_matrix = build_delivery_distance_matrix(
+            deliveries,
+            depot_location,
+            precision=precision,
+            dtype=dtype,
+            layout=layout,
+            previous=self._distance_matrix,
+        )
+        return self._distance_matrix
     
     def _solve_greedy(
         self,
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: Tuple[float, float],
-        distance_matrix: Dict[Tuple[str, str], float],
+        distance_matrix: DistanceMatrix,
+        deadline: Optional[Deadline] = None,
     ) -> List[List[str]]:
         """
         Resolve o problema usando estratégia Greedy.
         
         Para cada veículo, sempre escolhe a entrega mais próxima que cabe.
+        Trabalha internamente com índices da matriz de distâncias e consulta
+        primeiro o grafo de candidatos (k vizinhos mais próximos).
+        Se o prazo terminar, as entregas restantes vão para rotas adicionais.
         """
-        routes = []
-        remaining_deliveries = {d.id: d for d in deliveries}
-        depot_key = "depot"
+        ids = distance_matrix.ids
+        weights = [0.0] * len(distance_matrix)
+        for d in deliveries:
+            weights[distance_matrix.index_of(d.id)] = d.weight
         
         # Priorizar entregas críticas primeiro
         critical_deliveries = [
-            d_id for d_id, d in remaining_deliveries.items() if d.priority == 1
+            distance_matrix.index_of(d.id) for d in deliveries if d.priority == 1
         ]
         normal_deliveries = [
-            d_id for d_id, d in remaining_deliveries.items() if d.priority != 1
+            distance_matrix.index_of(d.id) for d in deliveries if d.priority != 1
         ]
         
-        # Ordenar por prioridade (críticas primeiro)
-        delivery_order = critical_deliveries + normal_deliveries
-        
-        for vehicle_idx, vehicle in enumerate(vehicles):
-            if not remaining_deliveries:
-                break
-            
-            route = []
-            current_location = depot_key
-            current_weight = 0.0
-            current_range = 0.0
-            
-            while remaining_deliveries:
-                # Encontrar entrega mais próxima que cabe no veículo
-                nearest = None
-                nearest_distance = float('inf')
-                nearest_id = None
-                
-                # Tentar primeiro entregas críticas, depois normais
-                candidates = delivery_order if delivery_order else list(remaining_deliveries.keys())
-                
-                for delivery_id in candidates:
-                    if delivery_id not in remaining_deliveries:
-                        continue
-                    
-                    delivery = remaining_deliveries[delivery_id]
-                    distance = distance_matrix.get((current_location, delivery_id), float('inf'))
-                    
-                    # Verificar se cabe no veículo
-                    if (current_weight + delivery.weight <= vehicle.max_capacity and
-                        current_range + distance <= vehicle.max_range):
-                        
-                        if distance < nearest_distance:
-                            nearest = delivery
-                            nearest_distance = distance
-                            nearest_id = delivery_id
-                
-                if nearest_id:
-                    # Adicionar à rota
-                    route.append(nearest_id)
-                    current_location = nearest_id
-                    current_weight += nearest.weight
-                    current_range += nearest_distance
-                    del remaining_deliveries[nearest_id]
-                    if nearest_id in delivery_order:
-                        delivery_order.remove(nearest_id)
-                else:
-                    # Nenhuma entrega cabe, terminar rota deste veículo
-                    break
-            
-            if route:
-                routes.append(route)
+        candidates = (
+            distance_matrix.candidate_graph(self.candidate_count)
+            if self.candidate_count else None
+        )
+        index_routes, unassigned = nearest_neighbor_routes(
+            distance_matrix,
+            critical_deliveries + normal_deliveries,
+            weights,
+            vehicles,
+            candidates=candidates,
+            deadline=deadline,
+        )
+        routes = [[ids[idx] for idx in route] for route in index_routes]
         
         # Se ainda há entregas não atribuídas, criar rotas adicionais
         # (isso violará restrições, mas será penalizado no fitness)
-        while remaining_deliveries:
-            route = [list(remaining_deliveries.keys())[0]]
-            del remaining_deliveries[route[0]]
-            routes.append(route)
+        for delivery_idx in sorted(unassigned):
+            routes.append([ids[delivery_idx]])
         
         return routes
     
@@ -251,46 +319,21 @@ class GreedyOptimizer(BaseOptimizer):
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: Tuple[float, float],
-        distance_matrix: Dict[Tuple[str, str], float],
+        distance_matrix: DistanceMatrix,
     ) -> RouteSolution:
         """Converte rotas em RouteSolution."""
         delivery_dict = {d.id: d for d in deliveries}
-        depot_key = "depot"
         
-        # Calcular distância total
-        total_distance = 0.0
-        for route in routes:
-            if not route:
-                continue
-            
-            # Depósito → primeira entrega
-            total_distance += distance_matrix.get((depot_key, route[0]), 0.0)
-            
-            # Entre entregas
-            for i in range(len(route) - 1):
-                total_distance += distance_matrix.get((route[i], route[i + 1]), 0.0)
-            
-            # Última entrega → depósito
-            total_distance += distance_matrix.get((route[-1], depot_key), 0.0)
+        # Distância de cada rota (uma leitura vetorizada da matriz)
+        route_indices = [distance_matrix.indices(route) for route in routes]
+        route_distances = distance_matrix.route_distances(route_indices).tolist()
+        total_distance = sum(route_distances)
         
-        # Calcular custo total
-        total_cost = 0.0
-        for route_idx, route in enumerate(routes):
-            if route_idx < len(vehicles):
-                vehicle = vehicles[route_idx]
-                route_distance = 0.0
-                
-                if route:
-                    route_distance += distance_matrix.get((depot_key, route[0]), 0.0)
-                    for i in range(len(route) - 1):
-                        route_distance += distance_matrix.get((route[i], route[i + 1]), 0.0)
-                    route_distance += distance_matrix.get((route[-1], depot_key), 0.0)
-                
-                total_cost += route_distance * vehicle.fuel_cost_per_km
-                total_cost += (route_distance / 50.0) * vehicle.driver_cost_per_hour
+        # Tempo dirigindo pelo perfil horário de velocidades (picos de trânsito)
+        travel_times = TravelTimeTensor.for_deliveries(distance_matrix, deliveries)
         
-        # Calcular violações
-        violations = {}
+        # Calcular custo total e violações
+        total_cost = 0.0
         capacity_violation = 0.0
         autonomy_violation = 0.0
         
@@ -299,27 +342,29 @@ class GreedyOptimizer(BaseOptimizer):
                 continue
             
             vehicle = vehicles[route_idx]
+            route_distance = route_distances[route_idx]
+            
+            total_cost += route_distance * vehicle.fuel_cost_per_km
+            total_cost += (
+                travel_times.route_hours(route_indices[route_idx])
+                * vehicle.driver_cost_per_hour
+            )
+            
             route_weight = sum(
                 delivery_dict[d_id].weight
                 for d_id in route
                 if d_id in delivery_dict
             )
-            
             if route_weight > vehicle.max_capacity:
                 capacity_violation += route_weight - vehicle.max_capacity
             
-            route_distance = 0.0
-            if route:
-                route_distance += distance_matrix.get((depot_key, route[0]), 0.0)
-                for i in range(len(route) - 1):
-                    route_distance += distance_matrix.get((route[i], route[i + 1]), 0.0)
-                route_distance += distance_matrix.get((route[-1], depot_key), 0.0)
-            
             if route_distance > vehicle.max_range:
                 autonomy_violation += route_distance - vehicle.max_range
         
-        violations["capacity"] = capacity_violation
-        violations["autonomy"] = autonomy_violation
+        violations = {
+            "capacity": capacity_violation,
+            "autonomy": autonomy_violation,
+        }
         
         solution = RouteSolution(
             routes=routes,
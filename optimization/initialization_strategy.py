@@ -6,8 +6,9 @@ melhorando a convergência do algoritmo.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 from hospital_routes.core.interfaces import Delivery, VehicleConstraints
+from hospital_routes.utils.candidate_graph import DEFAULT_CANDIDATE_COUNT
 
 
 class InitialPopulationStrategy(ABC):
@@ -83,8 +84,20 @@ class NearestNeighborInitializationStrategy(InitialPopulationStrategy):
     Estratégia de inicialização usando heurística do vizinho mais próximo.
     
     Gera soluções de melhor qualidade inicial, acelerando convergência.
+    
+    Quando a matriz de distâncias do problema atual (``DistanceService``)
+    contém todas as entregas, a busca consulta primeiro o grafo de
+    candidatos (k vizinhos mais próximos) em vez de todas as entregas.
     """
     
+    def __init__(self, candidate_count: Optional[int] = DEFAULT_CANDIDATE_COUNT):
+        """
+        Args:
+            candidate_count: Vizinhos do grafo de candidatos consultados antes
+                de varrer todas as entregas (None = sempre varrer)
+        """
+        self.candidate_count = candidate_count
+    
     def generate_individual(
         self,
         deliveries: List[Delivery],
@@ -92,7 +105,14 @@ class NearestNeighborInitializationStrategy(InitialPopulationStrategy):
         depot_location: tuple[float, float],
     ) -> List[List[str]]:
         """Gera solução usando nearest neighbor."""
-        from hospital_routes.utils.distance import calculate_distance
+        from hospital_routes.utils.distance_service import get_distance_service
+        
+        distance_service = get_distance_service()
+        routes = self._generate_with_matrix(
+            distance_service.matrix, deliveries, vehicles, depot_location
+        )
+        if routes is not None:
+            return routes
         
         routes = []
         remaining_deliveries = deliveries.copy()
@@ -113,7 +133,10 @@ class NearestNeighborInitializationStrategy(InitialPopulationStrategy):
                 nearest_distance = float('inf')
                 
                 for delivery in remaining_deliveries:
-                    distance = calculate_distance(current_location, delivery.location)
+                    distance = distance_service.distance(
+                        current_location, delivery.location,
+                        call_site="NearestNeighborInitializationStrategy.generate_individual",
+                    )
                     
                     # Verificar se cabe no veículo
                     if (current_weight + delivery.weight <= vehicle.max_capacity and
@@ -138,6 +161,46 @@ class NearestNeighborInitializationStrategy(InitialPopulationStrategy):
                 current_location = depot_location  # Voltar ao depósito
         
         return routes
+    
+    def _generate_with_matrix(
+        self,
+        matrix,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        depot_location: tuple[float, float],
+    ) -> Optional[List[List[str]]]:
+        """
+        Mesma heurística sobre índices da matriz e grafo de candidatos.
+        
+        Returns:
+            Rotas, ou None se a matriz não cobre o depósito e todas as entregas
+        """
+        from hospital_routes.optimization.greedy_optimizer import nearest_neighbor_routes
+        from hospital_routes.utils.distance import DEPOT_INDEX
+        
+        if matrix is None or matrix.locations is None:
+            return None
+        if matrix.locations[DEPOT_INDEX] != tuple(depot_location):
+            return None
+        
+        order = []
+        weights = [0.0] * len(matrix)
+        for delivery in deliveries:
+            idx = matrix.index.get(delivery.id)
+            if idx is None or matrix.locations[idx] != tuple(delivery.location):
+                return None
+            order.append(idx)
+            weights[idx] = delivery.weight
+        
+        candidates = (
+            matrix.candidate_graph(self.candidate_count)
+            if self.candidate_count else None
+        )
+        index_routes, _ = nearest_neighbor_routes(
+            matrix, order, weights, vehicles, candidates=candidates
+        )
+        ids = matrix.ids
+        return [[ids[idx] for idx in route] for route in index_routes]
 
 
 class PriorityFirstInitializationStrategy(InitialPopulationStrategy):
@@ -198,3 +261,25 @@ class PriorityFirstInitializationStrategy(InitialPopulationStrategy):
         
         return routes
 
+
+
+# Estratégias por nome (configuração da factory e das ilhas do GA)
+INITIALIZATION_STRATEGIES = {
+    "random": RandomInitializationStrategy,
+    "nearest_neighbor": NearestNeighborInitializationStrategy,
+    "priority_first": PriorityFirstInitializationStrategy,
+}
+
+
+def create_initialization_strategy(name: str) -> InitialPopulationStrategy:
+    """
+    Cria uma estratégia de inicialização pelo nome.
+    
+    Args:
+        name: "random", "nearest_neighbor" ou "priority_first" (nomes
+            desconhecidos usam a estratégia aleatória)
+    
+    Returns:
+        InitialPopulationStrategy: Nova instância da estratégia
+    """
+    return INITIALIZATION_STRATEGIES.get(name, RandomInitializationStrategy)()
@@ -0,0 +1,521 @@
+"""
+Algoritmo genético em modelo de ilhas.
+
+A população é dividida em K subpopulações (ilhas), cada uma evoluindo em
+um processo próprio com a sua estratégia de inicialização. A cada M
+gerações as ilhas trocam os seus melhores indivíduos (migração) em anel
+ou com destinos sorteados. As ilhas só se comunicam nas migrações, então
+o tempo por geração cai com o número de núcleos disponíveis.
+
+Os dados do problema são publicados uma única vez em memória
+compartilhada (``SharedProblem``); cada ilha reconstrói um
+``GeneticAlgorithmOptimizer`` a partir deles e usa os mesmos operadores
+do GA sequencial.
+"""
+
+import multiprocessing
+import random
+import time
+import traceback
+from dataclasses import replace
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from deap import creator, tools
+
+from hospital_routes.core.interfaces import (
+    BaseOptimizer,
+    Delivery,
+    VehicleConstraints,
+    OptimizationConfig,
+    RouteSolution,
+    OptimizationResult,
+)
+from hospital_routes.core.exceptions import (
+    OptimizationError,
+    InvalidConfigurationError,
+)
+from hospital_routes.optimization.genetic_algorithm import (
+    GeneticAlgorithmOptimizer,
+    ENCODINGS,
+)
+from hospital_routes.optimization.initialization_strategy import (
+    INITIALIZATION_STRATEGIES,
+    create_initialization_strategy,
+)
+from hospital_routes.optimization.parallel_evaluation import (
+    SharedProblem,
+    attach_problem,
+)
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.validators import validate_deliveries, validate_vehicles
+from hospital_routes.utils.deadline import Deadline
+
+
+# Topologias de migração
+ISLAND_TOPOLOGIES = ("ring", "random")
+
+# Estratégias atribuídas às ilhas (em ciclo) quando não especificadas
+DEFAULT_ISLAND_STRATEGIES = ("random", "nearest_neighbor", "priority_first")
+
+# Tamanho mínimo da subpopulação de cada ilha
+MIN_ISLAND_POPULATION = 4
+
+# Espera máxima (segundos) pelo encerramento de uma ilha
+_SHUTDOWN_TIMEOUT = 5.0
+
+
+def _island_worker(
+    connection: Any,
+    initargs: tuple,
+    strategy_name: str,
+    config: OptimizationConfig,
+    n_emigrants: int,
+    seed: Optional[int],
+) -> None:
+    """
+    Laço de uma ilha (processo filho).
+    
+    Protocolo pela ``connection``:
+    - ``("evolve", n_generations, immigrants, end_time)``: integra os
+      imigrantes (substituem os piores), evolui até ``n_generations``
+      gerações (ou até ``end_time``) e responde
+      ``("ok", history, emigrants, best)`` com os ``n_emigrants``
+      melhores indivíduos como emigrantes
+    - ``("stop",)``: encerra
+    
+    Indivíduos trafegam como ``(genes, fitness)`` com genes em listas
+    simples. Qualquer erro é devolvido como ``("error", traceback)``.
+    """
+    try:
+        # Sem semente, cada ilha precisa de um estado próprio (processos
+        # criados por fork herdam o gerador do processo pai)
+        random.seed(seed)
+        np.random.seed(None if seed is None else seed % (2 ** 32))
+        
+        optimizer, blocks = attach_problem(*initargs)
+        optimizer.initialization_strategy = create_initialization_strategy(strategy_name)
+        optimizer._setup_deap()
+        
+        population = optimizer._create_initial_population(
+            optimizer._deliveries,
+            optimizer._vehicles,
+            optimizer._depot_location,
+            config,
+        )
+        optimizer._evaluate_population(population)
+        
+        while True:
+            message = connection.recv()
+            if message[0] == "stop":
+                break
+            
+            _, n_generations, immigrants, end_time = message
+            population = _receive_immigrants(optimizer, population, immigrants)
+            
+            history = []
+            for _ in range(n_generations):
+                if end_time is not None and time.time() >= end_time:
+                    break
+                population = optimizer._evolve_generation(population, config)
+                history.append(min(ind.fitness.values[0] for ind in population))
+            
+            elite = tools.selBest(population, max(1, n_emigrants))
+            connection.send((
+                "ok",
+                history,
+                [_export(ind) for ind in elite[:n_emigrants]],
+                _export(elite[0]),
+            ))
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def _export(individual) -> Tuple[Any, float]:
+    """Indivíduo como ``(genes, fitness)`` serializável."""
+    if isinstance(individual, list):
+        genes = [list(route) for route in individual]
+    else:
+        genes = list(individual)
+    return genes, individual.fitness.values[0]
+
+
+def _import(optimizer: GeneticAlgorithmOptimizer, genes: Any, fitness: float):
+    """Recria o indivíduo do DEAP a partir de ``(genes, fitness)`` (sem reavaliar)."""
+    if optimizer.encoding == "giant_tour":
+        individual = creator.GiantTourIndividual(genes)
+    else:
+        individual = creator.Individual([list(route) for route in genes])
+    individual.fitness.values = (fitness,)
+    return individual
+
+
+def _receive_immigrants(
+    optimizer: GeneticAlgorithmOptimizer,
+    population: List,
+    immigrants: Sequence[Tuple[Any, float]],
+) -> List:
+    """Substitui os piores indivíduos da população pelos imigrantes."""
+    if not immigrants:
+        return population
+    survivors = tools.selBest(population, max(0, len(population) - len(immigrants)))
+    return survivors + [_import(optimizer, genes, fitness) for genes, fitness in immigrants]
+
+
+class IslandModelOptimizer(BaseOptimizer):
+    """
+    Algoritmo genético com K ilhas em processos separados e migração periódica.
+    
+    A população de ``config.population_size`` é dividida igualmente entre
+    as ilhas. A cada ``migration_interval`` gerações, cada ilha envia os
+    ``migration_size`` melhores indivíduos para outra ilha (a seguinte no
+    anel, ou uma sorteada na topologia "random"); os imigrantes substituem
+    os piores da ilha de destino.
+    
+    Exemplo:
+        optimizer = IslandModelOptimizer(n_islands=4, migration_interval=10)
+        result = optimizer.optimize(deliveries, vehicles, config, depot)
+        result.statistics["island_best_histories"]
+    """
+    
+    def __init__(
+        self,
+        fitness_weights: Optional[FitnessWeights] = None,
+        n_islands: int = 4,
+        migration_interval: int = 10,
+        migration_size: int = 2,
+        topology: str = "ring",
+        island_strategies: Optional[Sequence[str]] = None,
+        encoding: str = "routes",
+        seed: Optional[int] = None,
+        target_fitness: Optional[float] = None,
+    ):
+        """
+        Args:
+            fitness_weights: Pesos da função de fitness (usa padrão se None)
+            n_islands: Número de ilhas (processos)
+            migration_interval: Gerações entre migrações
+            migration_size: Indivíduos enviados por ilha em cada migração
+            topology: Destino dos migrantes ("ring" ou "random")
+            island_strategies: Estratégia de inicialização de cada ilha,
+                repetidas em ciclo (padrão: random, nearest_neighbor,
+                priority_first)
+            encoding: Codificação do cromossomo ("routes" ou "giant_tour")
+            seed: Semente (cada ilha usa ``seed + i``; None = não determinístico)
+            target_fitness: Fitness alvo; a evolução para ao atingi-lo e o
+                tempo gasto é registrado em ``time_to_target``
+        """
+        if n_islands < 1:
+            raise InvalidConfigurationError("n_islands deve ser >= 1")
+        if migration_interval < 1:
+            raise InvalidConfigurationError("migration_interval deve ser >= 1")
+        if migration_size < 0:
+            raise InvalidConfigurationError("migration_size deve ser >= 0")
+        if topology not in ISLAND_TOPOLOGIES:
+            raise InvalidConfigurationError(
+                f"Topologia não suportada: {topology}. "
+                f"Opções: {', '.join(ISLAND_TOPOLOGIES)}"
+            )
+        if encoding not in ENCODINGS:
+            raise InvalidConfigurationError(
+                f"Codificação não suportada: {encoding}. "
+                f"Opções: {', '.join(ENCODINGS)}"
+            )
+        
+        strategies = list(island_strategies or DEFAULT_ISLAND_STRATEGIES)
+        unknown = [name for name in strategies if name not in INITIALIZATION_STRATEGIES]
+        if not strategies or unknown:
+            raise InvalidConfigurationError(
+                f"Estratégias de inicialização inválidas: {unknown or strategies}. "
+                f"Opções: {', '.join(INITIALIZATION_STRATEGIES)}"
+            )
+        
+        self.fitness_weights = fitness_weights or FitnessWeights()
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.island_strategies = [
+            strategies[i % len(strategies)] for i in range(n_islands)
+        ]
+        self.encoding = encoding
+        self.seed = seed
+        self.target_fitness = target_fitness
+        
+        # GA do processo coordenador: matriz de distâncias (reaproveitada
+        # entre execuções), decodificação e busca local da melhor solução
+        self._ga = GeneticAlgorithmOptimizer(
+            fitness_weights=self.fitness_weights, encoding=encoding
+        )
+    
+    def optimize(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        config: OptimizationConfig,
+        depot_location: Tuple[float, float],
+    ) -> OptimizationResult:
+        """
+        Otimiza as rotas evoluindo as ilhas em paralelo.
+        
+        Args:
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos disponíveis
+            config: Configuração (``population_size`` é o total das ilhas)
+            depot_location: Localização do depósito
+        
+        Returns:
+            OptimizationResult: Resultado da otimização
+        
+        Raises:
+            OptimizationError: Se houver erro na otimização ou em alguma ilha
+        """
+        start_time = time.time()
+        deadline = Deadline.from_config(config, start_time)
+        problem: Optional[SharedProblem] = None
+        islands: List[Tuple[Any, Any]] = []
+        
+        try:
+            validate_deliveries(deliveries)
+            validate_vehicles(vehicles)
+            
+            self._ga._prepare_problem(deliveries, vehicles, depot_location, config)
+            problem = SharedProblem(
+                self._ga._deliveries,
+                vehicles,
+                depot_location,
+                self._ga._distance_matrix,
+                self.fitness_weights,
+                encoding=self.encoding,
+            )
+            
+            island_population = max(
+                MIN_ISLAND_POPULATION, config.population_size // self.n_islands
+            )
+            island_config = replace(config, population_size=island_population)
+            islands = self._start_islands(problem, island_config)
+            
+            rng = random.Random(self.seed)
+            immigrants: List[List[Tuple[Any, float]]] = [[] for _ in islands]
+            island_histories: List[List[float]] = [[] for _ in islands]
+            best_fitness_history: List[float] = []
+            best: Tuple[Any, float] = (None, float('inf'))
+            best_fitness = float('inf')
+            generations_without_improvement = 0
+            converged = False
+            target_reached = False
+            time_to_target: Optional[float] = None
+            migrations = 0
+            generation = 0
+            
+            while generation < config.generations:
+                if deadline.expired():
+                    break
+                
+                n_generations = min(self.migration_interval, config.generations - generation)
+                replies = self._evolve_islands(
+                    islands, n_generations, immigrants, deadline.end_time
+                )
+                
+                # Históricos: melhor de cada ilha e melhor global por geração
+                epoch = max(len(history) for history, _, _ in replies)
+                for island_history, (history, _, _) in zip(island_histories, replies):
+                    island_history.extend(history)
+                for offset in range(epoch):
+                    current_best = min(
+                        history[min(offset, len(history) - 1)]
+                        for history, _, _ in replies
+                        if history
+                    )
+                    best_fitness_history.append(current_best)
+                    
+                    if current_best < best_fitness:
+                        best_fitness = current_best
+                        generations_without_improvement = 0
+                    else:
+                        generations_without_improvement += 1
+                
+                generation += epoch
+                for _, _, island_best in replies:
+                    if island_best[1] < best[1]:
+                        best = island_best
+                
+                if self.target_fitness is not None and best[1] <= self.target_fitness:
+                    target_reached = True
+                    time_to_target = time.time() - start_time
+                    break
+                
+                if (
+                    config.max_iterations_without_improvement
+                    and generations_without_improvement
+                    >= config.max_iterations_without_improvement
+                ):
+                    converged = True
+                    break
+                
+                if epoch < n_generations:
+                    # Ilhas pararam pelo prazo
+                    deadline.expired()
+                    break
+                if generation >= config.generations:
+                    break
+                
+                immigrants = self._migrate([emigrants for _, emigrants, _ in replies], rng)
+                migrations += 1
+            
+            if best[0] is None:
+                # Nenhuma geração evoluída: melhor indivíduo da população inicial
+                replies = self._evolve_islands(islands, 0, immigrants, deadline.end_time)
+                best = min((island_best for _, _, island_best in replies), key=lambda b: b[1])
+                best_fitness = best[1]
+            
+            best_individual = _import(self._ga, *best)
+            solution = self._ga._individual_to_route_solution(
+                best_individual, deliveries, vehicles, depot_location
+            )
+            
+            # Busca local na melhor solução global
+            solution = self._ga._polish_solution(solution, deadline)
+            
+            execution_time = time.time() - start_time
+            
+            return OptimizationResult(
+                solution=solution,
+                execution_time=execution_time,
+                generations_evolved=generation,
+                best_fitness_history=best_fitness_history,
+                config=config,
+                statistics={
+                    "final_best_fitness": best_fitness,
+                    "generations_without_improvement": generations_without_improvement,
+                    "n_islands": self.n_islands,
+                    "island_population_size": island_population,
+                    "island_strategies": list(self.island_strategies),
+                    "island_best_histories": island_histories,
+                    "topology": self.topology,
+                    "migration_interval": self.migration_interval,
+                    "migration_size": self.migration_size,
+                    "migrations": migrations,
+                    "encoding": self.encoding,
+                    "target_fitness": self.target_fitness,
+                    "target_reached": target_reached,
+                    "time_to_target": time_to_target,
+                    **deadline.statistics(converged or target_reached),
+                },
+            )
+        
+        except Exception as e:
+            raise OptimizationError(f"Erro durante otimização em ilhas: {str(e)}") from e
+        
+        finally:
+            self._stop_islands(islands)
+            if problem is not None:
+                problem.close()
+    
+    def validate_solution(
+        self,
+        solution: RouteSolution,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+    ) -> bool:
+        """Valida uma solução (mesmas regras do GA)."""
+        return self._ga.validate_solution(solution, deliveries, vehicles)
+    
+    def _start_islands(
+        self, problem: SharedProblem, config: OptimizationConfig
+    ) -> List[Tuple[Any, Any]]:
+        """Inicia um processo por ilha; retorna pares (processo, conexão)."""
+        islands = []
+        for i, strategy_name in enumerate(self.island_strategies):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_island_worker,
+                args=(
+                    child_connection,
+                    problem.initargs,
+                    strategy_name,
+                    config,
+                    self.migration_size,
+                    None if self.seed is None else self.seed + i,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            islands.append((process, parent_connection))
+        return islands
+    
+    def _evolve_islands(
+        self,
+        islands: List[Tuple[Any, Any]],
+        n_generations: int,
+        immigrants: List[List[Tuple[Any, float]]],
+        end_time: Optional[float],
+    ) -> List[Tuple[List[float], List[Tuple[Any, float]], Tuple[Any, float]]]:
+        """
+        Evolui todas as ilhas por ``n_generations`` gerações em paralelo.
+        
+        Returns:
+            List: (histórico, emigrantes, melhor indivíduo) de cada ilha
+        
+        Raises:
+            OptimizationError: Se alguma ilha falhar
+        """
+        for (_, connection), island_immigrants in zip(islands, immigrants):
+            connection.send(("evolve", n_generations, island_immigrants, end_time))
+        
+        replies = []
+        for i, (_, connection) in enumerate(islands):
+            try:
+                reply = connection.recv()
+            except EOFError:
+                raise OptimizationError(f"Ilha {i} encerrou inesperadamente")
+            if reply[0] == "error":
+                raise OptimizationError(f"Falha na ilha {i}:\n{reply[1]}")
+            replies.append(reply[1:])
+        return replies
+    
+    def _migrate(
+        self,
+        emigrants: List[List[Tuple[Any, float]]],
+        rng: random.Random,
+    ) -> List[List[Tuple[Any, float]]]:
+        """
+        Distribui os emigrantes de cada ilha conforme a topologia.
+        
+        Args:
+            emigrants: Melhores indivíduos de cada ilha
+            rng: Gerador usado na topologia "random"
+        
+        Returns:
+            List: Imigrantes recebidos por cada ilha
+        """
+        n_islands = len(emigrants)
+        immigrants: List[List[Tuple[Any, float]]] = [[] for _ in range(n_islands)]
+        if n_islands < 2 or not self.migration_size:
+            return immigrants
+        
+        for source, individuals in enumerate(emigrants):
+            if self.topology == "ring":
+                target = (source + 1) % n_islands
+            else:
+                target = rng.choice([i for i in range(n_islands) if i != source])
+            immigrants[target].extend(individuals)
+        return immigrants
+    
+    def _stop_islands(self, islands: List[Tuple[Any, Any]]) -> None:
+        """Encerra os processos das ilhas."""
+        for process, connection in islands:
+            try:
+                connection.send(("stop",))
+            except (OSError, ValueError):
+                # Falha silenciosa - processo já encerrado
+                pass
+        for process, connection in islands:
+            process.join(_SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            connection.close()
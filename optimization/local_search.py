@@ -3,18 +3,152 @@ Busca local para melhorar soluções do algoritmo genético.
 
 Aplica operadores de busca local para refinar soluções:
 - 2-opt para otimizar rotas individuais
-- Swap entre rotas para balancear carga
-- Reinserção de entregas
+- Relocate / Or-opt, exchange e 2-opt* entre rotas
 """
 
-import random
-from typing import List, Tuple, Dict, Any
+import time
+from collections import deque
+from typing import List, Tuple, Dict, Any, Optional, Union
+
+import numpy as np
+
 from hospital_routes.core.interfaces import (
+    BaseOptimizer,
     Delivery,
+    OptimizationConfig,
+    OptimizationResult,
     RouteSolution,
     VehicleConstraints,
 )
-from hospital_routes.utils.distance import calculate_distance_matrix
+from hospital_routes.core.exceptions import InvalidConfigurationError
+from hospital_routes.optimization.fitness.composite_fitness import CompositeFitness
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.deadline import Deadline
+from hospital_routes.utils.distance import (
+    DistanceMatrix,
+    DEPOT_INDEX,
+    DEPOT_KEY,
+    build_delivery_distance_matrix,
+)
+from hospital_routes.utils.travel_time import TravelTimeTensor
+
+
+# Ganho mínimo para aceitar um movimento (evita ciclos por arredondamento)
+IMPROVEMENT_EPSILON = 1e-10
+
+# Políticas de aceitação da busca entre rotas
+SEARCH_POLICIES = ("first", "best")
+
+# Tamanho máximo das cadeias movidas pelo Or-opt
+MAX_CHAIN_LENGTH = 3
+
+# Operadores da busca entre rotas
+INTER_ROUTE_OPERATORS = ("relocate", "exchange", "two_opt_star")
+
+# Rotas maiores que isto usam o grafo de candidatos global no 2-opt, em vez
+# dos vizinhos exatos calculados sobre a submatriz da rota (O(m²))
+ROUTE_NEIGHBOR_EXACT_LIMIT = 1000
+
+
+class _InterRouteState:
+    """
+    Rotas (com depósito nas pontas) e acumulados usados pela busca inter-rotas.
+    
+    Para a rota r com tour t: prefix_distance[r][k] é a distância de t[0]
+    até t[k] (prefix_backward[r][k], o mesmo trecho percorrido de trás para
+    frente; só em matrizes assimétricas), prefix_load[r][k] a carga de
+    t[1..k] e critical_count / critical_sum a contagem e a soma das posições
+    das críticas em t[1..k].
+    """
+    
+    def __init__(self, search: "LocalSearch", routes: List[List[int]]):
+        matrix = search.distance_matrix
+        self.rows = matrix.rows
+        self.weights = [0.0] * len(matrix)
+        for d in search.deliveries:
+            if d.id in matrix.index:
+                self.weights[matrix.index_of(d.id)] = d.weight
+        self.vehicles = search.vehicles
+        
+        self.tours = [[DEPOT_INDEX] + route + [DEPOT_INDEX] for route in routes]
+        self.route_of = [-1] * len(matrix)
+        self.position = [-1] * len(matrix)
+        self.prefix_distance: List[List[float]] = [[] for _ in self.tours]
+        self.prefix_backward: List[List[float]] = [[] for _ in self.tours]
+        self.symmetric = matrix.symmetric
+        self.prefix_load: List[List[float]] = [[] for _ in self.tours]
+        self.critical_count: List[List[int]] = [[] for _ in self.tours]
+        self.critical_sum: List[List[int]] = [[] for _ in self.tours]
+        self._search = search
+        self.last_route = 0
+        self.distances = [0.0] * len(self.tours)
+        self.loads = [0.0] * len(self.tours)
+        for r in range(len(self.tours)):
+            self.refresh(r)
+    
+    def refresh(self, r: int) -> None:
+        """Recalcula os acumulados da rota r (O(tamanho da rota))."""
+        rows = self.rows
+        tour = self.tours[r]
+        distances = [0.0]
+        loads = [0.0]
+        for k in range(1, len(tour)):
+            distances.append(distances[-1] + rows[tour[k - 1]][tour[k]])
+            loads.append(loads[-1] + self.weights[tour[k]])
+        for k in range(1, len(tour) - 1):
+            self.route_of[tour[k]] = r
+            self.position[tour[k]] = k
+        self.prefix_distance[r] = distances
+        if not self.symmetric:
+            _, self.prefix_backward[r] = self._search._direction_prefix(tour)
+        self.prefix_load[r] = loads
+        self.critical_count[r], self.critical_sum[r] = self._search._critical_prefix(tour)
+        self.distances[r] = distances[-1]
+        self.loads[r] = loads[-1]
+    
+    def feasible(self, r: int, load: float, distance: float) -> bool:
+        """
+        Verifica se a rota r pode assumir a carga e a distância dadas.
+        
+        Rotas já inviáveis aceitam movimentos que não pioram a violação.
+        """
+        if r >= len(self.vehicles):
+            return True
+        vehicle = self.vehicles[r]
+        return (
+            load <= vehicle.max_capacity or load <= self.loads[r] + IMPROVEMENT_EPSILON
+        ) and (
+            distance <= vehicle.max_range
+            or distance <= self.distances[r] + IMPROVEMENT_EPSILON
+        )
+    
+    def apply(self, move: Tuple) -> None:
+        """Aplica um movimento encontrado por ``_find_inter_route_move``."""
+        operator = move[1]
+        if operator == "relocate":
+            _, _, r1, i, length, r2, k, reverse = move
+            t1 = self.tours[r1]
+            t2 = self.tours[r2]
+            chain = t1[i:i + length]
+            if reverse:
+                chain.reverse()
+            self.tours[r1] = t1[:i] + t1[i + length:]
+            self.tours[r2] = t2[:k + 1] + chain + t2[k + 1:]
+        elif operator == "exchange":
+            _, _, r1, i, r2, j = move
+            t1 = self.tours[r1]
+            t2 = self.tours[r2]
+            t1[i], t2[j] = t2[j], t1[i]
+        else:
+            _, _, r1, i, r2, j = move
+            t1 = self.tours[r1]
+            t2 = self.tours[r2]
+            self.tours[r1] = t1[:i + 1] + t2[j:]
+            self.tours[r2] = t2[:j] + t1[i + 1:]
+        
+        self.refresh(r1)
+        self.refresh(r2)
+        self.last_route = r1
 
 
 class LocalSearch:
@@ -23,8 +157,9 @@ class LocalSearch:
     
     Operadores:
     1. 2-opt: Otimiza ordem dentro de uma rota
-    2. Inter-route swap: Move entregas entre rotas para balancear
-    3. Reinsertion: Reinsere entregas em posições melhores
+    2. Relocate / Or-opt: Move cadeias de entregas para outra rota
+    3. Exchange: Troca entregas entre rotas
+    4. 2-opt*: Troca os finais de duas rotas
     """
     
     def __init__(
@@ -32,26 +167,56 @@ class LocalSearch:
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: Tuple[float, float],
-        distance_matrix: Dict[Tuple[str, str], float],
+        distance_matrix: Union[DistanceMatrix, Dict[Tuple[str, str], float]],
+        neighbor_count: int = 10,
+        policy: str = "first",
+        fitness_weights: Optional[FitnessWeights] = None,
     ):
         """
         Args:
             deliveries: Lista de entregas
             vehicles: Lista de veículos
             depot_location: Localização do depósito
-            distance_matrix: Matriz de distâncias
+            distance_matrix: Matriz de distâncias (DistanceMatrix ou dict legado
+                indexado por (from_id, to_id))
+            neighbor_count: Vizinhos mais próximos considerados por parada
+            policy: Política da busca entre rotas ("first" ou "best")
+            fitness_weights: Pesos usados no ganho dos movimentos (distância α
+                e atraso de críticas δ); padrão: pesos do fitness_calculator
+                de ``improve_solution`` ou ``FitnessWeights()``
         """
+        if policy not in SEARCH_POLICIES:
+            raise InvalidConfigurationError(
+                f"Política de busca inválida: {policy}. "
+                f"Opções: {', '.join(SEARCH_POLICIES)}"
+            )
+        
         self.deliveries = deliveries
         self.vehicles = vehicles
         self.depot_location = depot_location
+        if not isinstance(distance_matrix, DistanceMatrix):
+            distance_matrix = DistanceMatrix.from_mapping(
+                [DEPOT_KEY] + [d.id for d in deliveries], distance_matrix
+            )
         self.distance_matrix = distance_matrix
         self.delivery_dict = {d.id: d for d in deliveries}
+        self.neighbor_count = neighbor_count
+        self.policy = policy
+        self.fitness_weights = fitness_weights or FitnessWeights()
+        self.move_counts = {operator: 0 for operator in INTER_ROUTE_OPERATORS}
+        self._neighbors: Optional[List[List[int]]] = None
+        
+        self._critical = [False] * len(distance_matrix)
+        for d in deliveries:
+            if d.id in distance_matrix.index:
+                self._critical[distance_matrix.index_of(d.id)] = d.priority == 1
     
     def improve_solution(
         self,
         solution: RouteSolution,
         max_iterations: int = 50,
         fitness_calculator: Any = None,
+        deadline: Optional[Deadline] = None,
     ) -> RouteSolution:
         """
         Melhora uma solução aplicando busca local.
@@ -60,11 +225,15 @@ class LocalSearch:
             solution: Solução a melhorar
             max_iterations: Número máximo de iterações
             fitness_calculator: Função para calcular fitness
+            deadline: Prazo de execução; ao expirar, retorna a melhor
+                solução encontrada até então
         
         Returns:
             RouteSolution: Solução melhorada
         """
         current_solution = solution
+        if isinstance(getattr(fitness_calculator, "weights", None), FitnessWeights):
+            self.fitness_weights = fitness_calculator.weights
         current_fitness = fitness_calculator.calculate(
             current_solution, self.deliveries, self.vehicles,
             self.depot_location, self.distance_matrix
@@ -74,26 +243,23 @@ class LocalSearch:
         iterations = 0
         
         while improved and iterations < max_iterations:
+            if deadline is not None and deadline.expired():
+                break
+            
             improved = False
             iterations += 1
             
-            # Tentar 2-opt em cada rota
-            new_routes = []
-            for route in current_solution.routes:
-                improved_route = self._two_opt(route)
-                new_routes.append(improved_route)
-            
-            # Tentar balanceamento de carga
-            balanced_routes = self._balance_loads(new_routes)
+            # 2-opt em cada rota e movimentos entre rotas
+            balanced_routes = self.polish_routes(current_solution.routes, deadline=deadline)
             
             # Criar nova solução
-            from hospital_routes.core.interfaces import RouteSolution
             new_solution = RouteSolution(
                 routes=balanced_routes,
                 total_distance=self._calculate_total_distance(balanced_routes),
                 total_cost=self._calculate_total_cost(balanced_routes),
                 fitness_score=0.0,  # Será recalculado
-                violations=[],
+                violations=self._calculate_violations(balanced_routes),
+                metadata=dict(current_solution.metadata),
             )
             
             # Recalcular fitness
@@ -102,6 +268,7 @@ class LocalSearch:
                     new_solution, self.deliveries, self.vehicles,
                     self.depot_location, self.distance_matrix
                 )
+                new_solution.fitness_score = new_fitness
                 
                 if new_fitness < current_fitness:
                     current_solution = new_solution
@@ -110,119 +277,636 @@ class LocalSearch:
         
         return current_solution
     
-    def _two_opt(self, route: List[str]) -> List[str]:
+    def polish_routes(
+        self,
+        routes: List[List[str]],
+        max_moves: int = 1000,
+        deadline: Optional[Deadline] = None,
+    ) -> List[List[str]]:
+        """
+        Uma passada de 2-opt em cada rota seguida da busca entre rotas.
+        
+        Todos os movimentos são avaliados por ganho incremental; não monta
+        ``RouteSolution`` nem recalcula o fitness (o chamador decide se
+        aceita o resultado).
+        
+        Args:
+            routes: Rotas como listas de IDs
+            max_moves: Número máximo de movimentos entre rotas
+            deadline: Prazo de execução
+        
+        Returns:
+            List[List[str]]: Rotas melhoradas
+        """
+        # 2-opt em cada rota
+        new_routes = [self._two_opt(route, deadline) for route in routes]
+        
+        # Movimentos entre rotas (relocate, exchange, 2-opt*)
+        return self.improve_routes(new_routes, max_moves=max_moves, deadline=deadline)
+    
+    def _two_opt(self, route: List[str], deadline: Optional[Deadline] = None) -> List[str]:
         """
         Aplica 2-opt para melhorar uma rota.
         
-        Tenta todas as inversões de segmentos e mantém a melhor.
+        Cada candidato é avaliado em O(1): ganho de distância nas duas
+        arestas trocadas (α) e variação do atraso das entregas críticas do
+        segmento invertido (δ), via somas de prefixo. Em matrizes
+        assimétricas (malha viária), o ganho inclui a diferença entre
+        percorrer o segmento invertido e no sentido original, lida das
+        somas de prefixo nos dois sentidos. Os candidatos de cada parada são
+        limitados aos ``neighbor_count`` vizinhos mais próximos da mesma
+        rota, e bits "don't look" evitam reexaminar paradas cuja vizinhança
+        não mudou.
         """
-        if len(route) < 4:
+        if len(route) < 3:
             return route
         
-        best_route = route[:]
-        best_distance = self._calculate_route_distance(route)
-        improved = True
+        matrix = self.distance_matrix
+        rows = matrix.rows
+        stops = matrix.indices(route)
+        
+        # Tour fechado: depósito nas posições 0 e n - 1
+        tour = [DEPOT_INDEX] + stops + [DEPOT_INDEX]
+        n = len(tour)
+        position = {stop: p for p, stop in enumerate(tour) if 0 < p < n - 1}
+        neighbors = self._route_neighbors(stops)
+        distance_weight = self.fitness_weights.distance_weight
+        priority_weight = self.fitness_weights.priority_penalty
+        critical_count, critical_sum = self._critical_prefix(tour)
+        symmetric = matrix.symmetric
+        if not symmetric:
+            forward, backward = self._direction_prefix(tour)
+        
+        # Fila de paradas ativas (bit "don't look" desligado)
+        queue = deque(stops)
+        active = set(stops)
         
-        while improved:
+        while queue:
+            if deadline is not None and deadline.expired():
+                break
+            
+            a = queue.popleft()
+            active.discard(a)
+            p = position[a]
             improved = False
-            for i in range(1, len(best_route) - 2):
-                for j in range(i + 1, len(best_route)):
-                    if j - i == 1:
+            
+            for successor in (True, False):
+                b = tour[p + 1] if successor else tour[p - 1]
+                d_ab = rows[a][b]
+                
+                for c in neighbors[a]:
+                    d_ac = rows[a][c]
+                    if d_ac >= d_ab:
+                        break  # Vizinhos ordenados: nenhum ganho possível
+                    
+                    if c == DEPOT_INDEX:
+                        q = 0 if successor else n - 1
+                    else:
+                        q = position[c]
+                    d = tour[q + 1] if successor else tour[q - 1]
+                    if c == b or d == a:
                         continue
                     
-                    # Inverter segmento
-                    new_route = best_route[:i] + best_route[i:j][::-1] + best_route[j:]
-                    new_distance = self._calculate_route_distance(new_route)
+                    # Segmento entre as arestas removidas
+                    if successor:
+                        start, end = (p + 1, q) if q > p else (q + 1, p)
+                    else:
+                        start, end = (q, p - 1) if q < p else (p, q - 1)
                     
-                    if new_distance < best_distance:
-                        best_route = new_route
-                        best_distance = new_distance
-                        improved = True
-                        break
+                    # Críticas do segmento: posição x (0-based) vira start+end-2-x
+                    count = critical_count[end] - critical_count[start - 1]
+                    total = critical_sum[end] - critical_sum[start - 1]
+                    delay_change = count * (start + end - 2) - 2 * total
+                    
+                    if symmetric:
+                        distance_gain = d_ab + rows[c][d] - d_ac - rows[b][d]
+                    else:
+                        # Arestas nas pontas do segmento e o segmento invertido
+                        before = tour[start - 1]
+                        after = tour[end + 1]
+                        first = tour[start]
+                        last = tour[end]
+                        distance_gain = (
+                            rows[before][first] + rows[last][after]
+                            - rows[before][last] - rows[first][after]
+                            + (forward[end] - forward[start])
+                            - (backward[end] - backward[start])
+                        )
+                    gain = distance_weight * distance_gain - priority_weight * delay_change
+                    if gain <= IMPROVEMENT_EPSILON:
+                        continue
+                    
+                    tour[start:end + 1] = tour[start:end + 1][::-1]
+                    for k in range(start, end + 1):
+                        position[tour[k]] = k
+                    if count:
+                        critical_count, critical_sum = self._critical_prefix(tour)
+                    if not symmetric:
+                        forward, backward = self._direction_prefix(tour)
+                    
+                    for stop in (a, b, c, d):
+                        if stop != DEPOT_INDEX and stop not in active:
+                            active.add(stop)
+                            queue.append(stop)
+                    improved = True
+                    break
+                
                 if improved:
                     break
         
-        return best_route
+        ids = matrix.ids
+        return [ids[idx] for idx in tour[1:-1]]
     
-    def _balance_loads(self, routes: List[List[str]]) -> List[List[str]]:
+    def _critical_prefix(self, tour: List[int]) -> Tuple[List[int], List[int]]:
         """
-        Tenta balancear cargas entre rotas movendo entregas.
+        Contagem e soma de posições (0-based) das críticas em tour[1..k].
+        
+        Args:
+            tour: Rota com o depósito nas pontas
         
-        Move entregas de rotas sobrecarregadas para subutilizadas.
+        Returns:
+            Tuple: (contagens, somas) indexadas pela posição no tour
         """
-        if len(routes) < 2:
-            return routes
+        critical = self._critical
+        counts = [0]
+        sums = [0]
+        for k in range(1, len(tour)):
+            is_critical = critical[tour[k]]
+            counts.append(counts[-1] + is_critical)
+            sums.append(sums[-1] + (k - 1 if is_critical else 0))
+        return counts, sums
+    
+    def _direction_prefix(self, tour: List[int]) -> Tuple[List[float], List[float]]:
+        """
+        Distâncias acumuladas de tour[0] até tour[k] nos dois sentidos.
         
-        # Calcular cargas
-        route_loads = []
-        for route in routes:
-            load = sum(
-                self.delivery_dict[d_id].weight
-                for d_id in route
-                if d_id in self.delivery_dict
-            )
-            route_loads.append(load)
+        Args:
+            tour: Rota com o depósito nas pontas
         
-        if not route_loads:
-            return routes
+        Returns:
+            Tuple: (ida, volta) com ida[k] = soma de d(tour[t], tour[t + 1])
+            e volta[k] = soma de d(tour[t + 1], tour[t]) para t < k
+        """
+        rows = self.distance_matrix.rows
+        forward = [0.0]
+        backward = [0.0]
+        for k in range(1, len(tour)):
+            forward.append(forward[-1] + rows[tour[k - 1]][tour[k]])
+            backward.append(backward[-1] + rows[tour[k]][tour[k - 1]])
+        return forward, backward
+    
+    def _route_neighbors(self, stops: List[int]) -> Dict[int, List[int]]:
+        """
+        Lista de candidatos de cada parada: os k vizinhos mais próximos.
         
-        mean_load = sum(route_loads) / len(route_loads)
-        new_routes = [route[:] for route in routes]
+        Considera apenas paradas da mesma rota e o depósito, ordenados
+        por distância crescente. Rotas longas filtram o grafo de candidatos
+        global (vizinhos em outras rotas são descartados).
+        """
+        if len(stops) > ROUTE_NEIGHBOR_EXACT_LIMIT:
+            return self._route_neighbors_from_graph(stops)
         
-        # Tentar mover entregas
-        for _ in range(10):  # Máximo de tentativas
-            # Encontrar rota mais sobrecarregada e mais subutilizada
-            max_idx = max(range(len(route_loads)), key=lambda i: route_loads[i])
-            min_idx = min(range(len(route_loads)), key=lambda i: route_loads[i])
-            
-            if route_loads[max_idx] <= mean_load * 1.1:
-                break  # Já está balanceado
-            
-            if not new_routes[max_idx]:
+        nodes = np.array([DEPOT_INDEX] + stops)
+        sub = self.distance_matrix.submatrix(nodes).astype(np.float64, copy=False)
+        np.fill_diagonal(sub, np.inf)
+        
+        k = min(self.neighbor_count, len(nodes) - 1)
+        if k < len(nodes) - 1:
+            nearest = np.argpartition(sub, k - 1, axis=1)[:, :k]
+        else:
+            nearest = np.tile(np.arange(len(nodes)), (len(nodes), 1))
+        
+        neighbors = {}
+        for row, node in enumerate(nodes.tolist()):
+            candidates = [col for col in nearest[row].tolist() if col != row]
+            candidates.sort(key=sub[row].__getitem__)
+            neighbors[node] = nodes[candidates].tolist()
+        
+        return neighbors
+    
+    def _route_neighbors_from_graph(self, stops: List[int]) -> Dict[int, List[int]]:
+        """Vizinhos da mesma rota tirados do grafo de candidatos, mais o depósito."""
+        matrix = self.distance_matrix
+        graph = matrix.candidate_graph(self.neighbor_count)
+        in_route = set(stops)
+        neighbors = {
+            DEPOT_INDEX: [c for c in graph.neighbors[DEPOT_INDEX] if c in in_route]
+        }
+        
+        for stop in stops:
+            depot_distance = matrix.distance(stop, DEPOT_INDEX)
+            candidates = []
+            for candidate, distance in zip(graph.neighbors[stop], graph.distances[stop]):
+                if candidate not in in_route:
+                    continue
+                if depot_distance is not None and depot_distance <= distance:
+                    candidates.append(DEPOT_INDEX)
+                    depot_distance = None
+                candidates.append(candidate)
+            if depot_distance is not None:
+                candidates.append(DEPOT_INDEX)
+            neighbors[stop] = candidates
+        
+        return neighbors
+    
+    def improve_routes(
+        self,
+        routes: List[List[str]],
+        policy: Optional[str] = None,
+        max_moves: int = 1000,
+        deadline: Optional[Deadline] = None,
+    ) -> List[List[str]]:
+        """
+        Busca local entre rotas até um ótimo local.
+        
+        Vizinhança:
+        - Relocate / Or-opt: move uma cadeia de 1 a ``MAX_CHAIN_LENGTH``
+          entregas para outra rota (em qualquer orientação)
+        - Exchange: troca duas entregas de rotas diferentes
+        - 2-opt*: troca os finais de duas rotas
+        
+        O ganho de cada movimento combina distância (α) e atraso das entregas
+        críticas (δ), os termos da função de fitness decomponíveis por rota.
+        Em matrizes assimétricas, uma cadeia inserida invertida custa a sua
+        distância no sentido contrário.
+        Ganho, capacidade e autonomia são verificados em O(1) com cargas,
+        comprimentos e posições de críticas acumulados de cada rota. Um movimento
+        nunca piora a violação de capacidade ou autonomia de uma rota nem
+        a deixa vazia (o veículo de cada rota é fixo pela posição).
+        
+        Args:
+            routes: Rotas como listas de IDs
+            policy: "first" (primeira melhoria) ou "best" (melhor melhoria);
+                padrão: política da instância
+            max_moves: Número máximo de movimentos aplicados
+            deadline: Prazo de execução (para com os movimentos já aplicados)
+        
+        Returns:
+            List[List[str]]: Rotas melhoradas
+        """
+        policy = policy or self.policy
+        if policy not in SEARCH_POLICIES:
+            raise InvalidConfigurationError(
+                f"Política de busca inválida: {policy}. "
+                f"Opções: {', '.join(SEARCH_POLICIES)}"
+            )
+        
+        matrix = self.distance_matrix
+        state = _InterRouteState(self, [matrix.indices(route) for route in routes])
+        neighbors = self._nearest_neighbors()
+        
+        moves = 0
+        while moves < max_moves:
+            if deadline is not None and deadline.expired():
                 break
             
-            # Tentar mover uma entrega
-            delivery_to_move = random.choice(new_routes[max_idx])
-            delivery_weight = self.delivery_dict.get(delivery_to_move, None)
-            
-            if delivery_weight:
-                # Verificar se pode mover sem violar capacidade
-                if min_idx < len(self.vehicles):
-                    vehicle = self.vehicles[min_idx]
-                    if route_loads[min_idx] + delivery_weight.weight <= vehicle.max_capacity:
-                        new_routes[max_idx].remove(delivery_to_move)
-                        new_routes[min_idx].append(delivery_to_move)
-                        route_loads[max_idx] -= delivery_weight.weight
-                        route_loads[min_idx] += delivery_weight.weight
+            move = self._find_inter_route_move(state, neighbors, policy == "first")
+            if move is None:
+                break
+            state.apply(move)
+            self.move_counts[move[1]] += 1
+            moves += 1
         
-        return new_routes
+        ids = matrix.ids
+        return [[ids[stop] for stop in tour[1:-1]] for tour in state.tours]
     
-    def _calculate_route_distance(self, route: List[str]) -> float:
-        """Calcula distância de uma rota."""
-        if not route:
-            return 0.0
-        
-        distance = 0.0
-        depot_key = "depot"
+    def _nearest_neighbors(self) -> List[List[int]]:
+        """
+        k vizinhos mais próximos de cada entrega (índices da matriz).
         
-        # Depósito → primeira entrega
-        distance += self.distance_matrix.get((depot_key, route[0]), 0.0)
+        Lidos do grafo de candidatos da matriz (índice espacial, calculado
+        uma única vez por matriz); o depósito não entra como candidato.
+        """
+        if self._neighbors is None:
+            self._neighbors = self.distance_matrix.candidate_graph(
+                self.neighbor_count
+            ).neighbors
+        return self._neighbors
+    
+    def _find_inter_route_move(
+        self,
+        state: "_InterRouteState",
+        neighbors: List[List[int]],
+        first_improvement: bool,
+    ) -> Optional[Tuple]:
+        """
+        Procura um movimento inter-rotas com ganho positivo.
         
-        # Entre entregas
-        for i in range(len(route) - 1):
-            distance += self.distance_matrix.get((route[i], route[i + 1]), 0.0)
+        Returns:
+            Tuple ou None: (ganho, operador, parâmetros...) do movimento
+            escolhido, ou None em um ótimo local
+        """
+        rows = self.distance_matrix.rows
+        critical = self._critical
+        alpha = self.fitness_weights.distance_weight
+        delta = self.fitness_weights.priority_penalty
+        symmetric = state.symmetric
+        tours = state.tours
+        route_of = state.route_of
+        position = state.position
+        best = None
+        best_gain = IMPROVEMENT_EPSILON
         
-        # Última entrega → depósito
-        distance += self.distance_matrix.get((route[-1], depot_key), 0.0)
+        # Varredura circular a partir da rota do último movimento aplicado
+        start = state.last_route
+        for r1 in list(range(start, len(tours))) + list(range(start)):
+            t1 = tours[r1]
+            m1 = len(t1) - 2
+            dist1 = state.distances[r1]
+            load1 = state.loads[r1]
+            pd1 = state.prefix_distance[r1]
+            pb1 = state.prefix_backward[r1]
+            pl1 = state.prefix_load[r1]
+            cc1 = state.critical_count[r1]
+            cs1 = state.critical_sum[r1]
+            
+            for i in range(1, m1 + 1):
+                u = t1[i]
+                p = t1[i - 1]
+                n = t1[i + 1]
+                
+                # Relocate / Or-opt: cadeia t1[i..i+length-1]
+                for length in range(1, min(MAX_CHAIN_LENGTH, m1 - 1) + 1):
+                    end = i + length - 1
+                    if end > m1:
+                        break
+                    last = t1[end]
+                    after = t1[end + 1]
+                    chain_load = pl1[end] - pl1[i - 1]
+                    chain_distance = pd1[end] - pd1[i]
+                    reversed_distance = (
+                        chain_distance if symmetric else pb1[end] - pb1[i]
+                    )
+                    removal = rows[p][u] + rows[last][after] - rows[p][after]
+                    
+                    # Críticas da cadeia e as que sobem `length` posições
+                    chain_critical = cc1[end] - cc1[i - 1]
+                    chain_offsets = cs1[end] - cs1[i - 1] - chain_critical * (i - 1)
+                    removal_delay = (
+                        -(cs1[end] - cs1[i - 1]) - length * (cc1[m1] - cc1[end])
+                    )
+                    if not state.feasible(
+                        r1, load1 - chain_load, dist1 - removal - chain_distance
+                    ):
+                        continue
+                    
+                    for v in neighbors[u] + neighbors[last]:
+                        r2 = route_of[v]
+                        if r2 == r1:
+                            continue
+                        t2 = tours[r2]
+                        cc2 = state.critical_count[r2]
+                        m2 = len(t2) - 2
+                        q = position[v]
+                        for k in (q - 1, q):
+                            a = t2[k]
+                            b = t2[k + 1]
+                            # Cadeia passa a ocupar as posições k..k+length-1
+                            shifted = length * (cc2[m2] - cc2[k])
+                            for reverse in (False, True):
+                                head, tail = (last, u) if reverse else (u, last)
+                                insertion = rows[a][head] + rows[tail][b] - rows[a][b]
+                                if reverse:
+                                    chain_delay = (
+                                        chain_critical * (k + length - 1) - chain_offsets
+                                    )
+                                else:
+                                    chain_delay = chain_critical * k + chain_offsets
+                                gain = alpha * (removal - insertion) - delta * (
+                                    removal_delay + shifted + chain_delay
+                                )
+                                moved_distance = chain_distance
+                                if reverse and not symmetric:
+                                    moved_distance = reversed_distance
+                                    gain -= alpha * (reversed_distance - chain_distance)
+                                if gain <= best_gain:
+                                    continue
+                                if not state.feasible(
+                                    r2,
+                                    state.loads[r2] + chain_load,
+                                    state.distances[r2] + insertion + moved_distance,
+                                ):
+                                    continue
+                                best_gain = gain
+                                best = (gain, "relocate", r1, i, length, r2, k, reverse)
+                                if first_improvement:
+                                    return best
+                
+                for v in neighbors[u]:
+                    r2 = route_of[v]
+                    if r2 == r1:
+                        continue
+                    t2 = tours[r2]
+                    j = position[v]
+                    dist2 = state.distances[r2]
+                    load2 = state.loads[r2]
+                    pd2 = state.prefix_distance[r2]
+                    pl2 = state.prefix_load[r2]
+                    
+                    # Exchange: u <-> v
+                    a = t2[j - 1]
+                    b = t2[j + 1]
+                    change1 = rows[p][v] + rows[v][n] - rows[p][u] - rows[u][n]
+                    change2 = rows[a][u] + rows[u][b] - rows[a][v] - rows[v][b]
+                    delay_change = (critical[v] - critical[u]) * ((i - 1) - (j - 1))
+                    gain = -alpha * (change1 + change2) - delta * delay_change
+                    if gain > best_gain:
+                        weight_change = state.weights[v] - state.weights[u]
+                        if state.feasible(
+                            r1, load1 + weight_change, dist1 + change1
+                        ) and state.feasible(
+                            r2, load2 - weight_change, dist2 + change2
+                        ):
+                            best_gain = gain
+                            best = (gain, "exchange", r1, i, r2, j)
+                            if first_improvement:
+                                return best
+                    
+                    # 2-opt*: t1[..i] + t2[j..] e t2[..j-1] + t1[i+1..]
+                    if j - 1 + m1 - i == 0:
+                        continue  # Segunda rota ficaria vazia
+                    a = t2[j - 1]
+                    new_dist1 = pd1[i] + rows[u][v] + (dist2 - pd2[j])
+                    new_dist2 = pd2[j - 1] + rows[a][n] + (dist1 - pd1[i + 1])
+                    
+                    # Final de r1 passa a começar na posição j-1 e o de r2 em i
+                    cc2 = state.critical_count[r2]
+                    m2 = len(t2) - 2
+                    delay_change = ((j - 1) - i) * (
+                        (cc1[m1] - cc1[i]) - (cc2[m2] - cc2[j - 1])
+                    )
+                    gain = (
+                        alpha * (dist1 + dist2 - new_dist1 - new_dist2)
+                        - delta * delay_change
+                    )
+                    if gain > best_gain:
+                        new_load1 = pl1[i] + (load2 - pl2[j - 1])
+                        new_load2 = pl2[j - 1] + (load1 - pl1[i])
+                        if state.feasible(r1, new_load1, new_dist1) and state.feasible(
+                            r2, new_load2, new_dist2
+                        ):
+                            best_gain = gain
+                            best = (gain, "two_opt_star", r1, i, r2, j)
+                            if first_improvement:
+                                return best
         
-        return distance
+        return best
+    
+    def _calculate_route_distances(self, routes: List[List[str]]) -> np.ndarray:
+        """Calcula a distância de cada rota (uma leitura vetorizada da matriz)."""
+        matrix = self.distance_matrix
+        return matrix.route_distances([matrix.indices(route) for route in routes])
     
     def _calculate_total_distance(self, routes: List[List[str]]) -> float:
         """Calcula distância total de todas as rotas."""
-        return sum(self._calculate_route_distance(route) for route in routes)
+        return float(self._calculate_route_distances(routes).sum())
+    
+    def _calculate_violations(self, routes: List[List[str]]) -> Dict[str, float]:
+        """Calcula violações de capacidade e autonomia por veículo."""
+        violations = {
+            "capacity": 0.0,
+            "autonomy": 0.0,
+        }
+        route_distances = self._calculate_route_distances(routes)
+        
+        for route_idx, route in enumerate(routes):
+            if route_idx >= len(self.vehicles):
+                continue
+            
+            vehicle = self.vehicles[route_idx]
+            route_weight = sum(
+                self.delivery_dict[d_id].weight
+                for d_id in route
+                if d_id in self.delivery_dict
+            )
+            if route_weight > vehicle.max_capacity:
+                violations["capacity"] += route_weight - vehicle.max_capacity
+            
+            route_distance = float(route_distances[route_idx])
+            if route_distance > vehicle.max_range:
+                violations["autonomy"] += route_distance - vehicle.max_range
+        
+        return violations
     
     def _calculate_total_cost(self, routes: List[List[str]]) -> float:
-        """Calcula custo total (simplificado: distância * custo por km)."""
-        total_distance = self._calculate_total_distance(routes)
-        cost_per_km = 2.5  # R$ por km
-        return total_distance * cost_per_km
+        """Calcula custo total (combustível + motorista), como os otimizadores."""
+        matrix = self.distance_matrix
+        travel_times = TravelTimeTensor.for_deliveries(matrix, self.deliveries)
+        route_distances = self._calculate_route_distances(routes)
+        cost = 0.0
+        for route_idx, route in enumerate(routes):
+            if route_idx >= len(self.vehicles):
+                continue
+            
+            vehicle = self.vehicles[route_idx]
+            indices = matrix.indices(route)
+            cost += float(route_distances[route_idx]) * vehicle.fuel_cost_per_km
+            cost += travel_times.route_hours(indices) * vehicle.driver_cost_per_hour
+        
+        return cost
+
+
+class LocalSearchStage(BaseOptimizer):
+    """
+    Etapa de busca local após qualquer otimizador.
+    
+    Executa o otimizador envolvido e refina a solução com ``LocalSearch``
+    (2-opt + movimentos entre rotas), mantendo o contrato de ``BaseOptimizer``::
+        
+        optimizer = LocalSearchStage(GreedyOptimizer(), policy="best")
+        result = optimizer.optimize(deliveries, vehicles, config, depot)
+    """
+    
+    def __init__(
+        self,
+        optimizer: BaseOptimizer,
+        policy: str = "first",
+        max_iterations: int = 30,
+        fitness_weights: Optional[FitnessWeights] = None,
+    ):
+        """
+        Args:
+            optimizer: Otimizador cuja solução será refinada
+            policy: Política da busca entre rotas ("first" ou "best")
+            max_iterations: Iterações máximas de ``improve_solution``
+            fitness_weights: Pesos da função de fitness (padrão: do otimizador)
+        """
+        if policy not in SEARCH_POLICIES:
+            raise InvalidConfigurationError(
+                f"Política de busca inválida: {policy}. "
+                f"Opções: {', '.join(SEARCH_POLICIES)}"
+            )
+        self.optimizer = optimizer
+        self.policy = policy
+        self.max_iterations = max_iterations
+        self.fitness_weights = (
+            fitness_weights
+            or getattr(optimizer, "fitness_weights", None)
+            or FitnessWeights()
+        )
+        self.composite_fitness = CompositeFitness(self.fitness_weights)
+    
+    def optimize(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        config: OptimizationConfig,
+        depot_location: Tuple[float, float],
+    ) -> OptimizationResult:
+        """
+        Otimiza com o otimizador envolvido e aplica a busca local.
+        
+        O prazo ``config.time_limit_seconds`` cobre as duas etapas: a busca
+        local usa apenas o tempo que sobrar após o otimizador envolvido.
+        
+        Returns:
+            OptimizationResult: Resultado do otimizador com a solução refinada;
+            ``statistics["local_search"]`` registra o efeito da etapa
+        """
+        deadline = Deadline.from_config(config)
+        result = self.optimizer.optimize(deliveries, vehicles, config, depot_location)
+        
+        start_time = time.time()
+        distance_matrix = build_delivery_distance_matrix(
+            deliveries,
+            depot_location,
+            precision=config.distance_precision,
+            dtype=config.distance_dtype,
+            layout=config.distance_layout,
+        )
+        local_search = LocalSearch(
+            deliveries, vehicles, depot_location, distance_matrix, policy=self.policy
+        )
+        solution = local_search.improve_solution(
+            result.solution,
+            max_iterations=self.max_iterations,
+            fitness_calculator=self.composite_fitness,
+            deadline=deadline,
+        )
+        elapsed = time.time() - start_time
+        
+        result.statistics["local_search"] = {
+            "policy": self.policy,
+            "initial_fitness": result.solution.fitness_score,
+            "final_fitness": solution.fitness_score,
+            "initial_distance": result.solution.total_distance,
+            "final_distance": solution.total_distance,
+            "moves": dict(local_search.move_counts),
+            "time": elapsed,
+            "time_limit_reached": deadline.reached,
+        }
+        if deadline.reached:
+            result.statistics.update(deadline.statistics())
+        result.solution = solution
+        result.execution_time += elapsed
+        
+        return result
+    
+    def validate_solution(
+        self,
+        solution: RouteSolution,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+    ) -> bool:
+        """Valida a solução com as regras do otimizador envolvido."""
+        return self.optimizer.validate_solution(solution, deliveries, vehicles)
@@ -0,0 +1,203 @@
+"""
+Seleção adaptativa de operadores (portfólio de operadores).
+
+Cada aplicação de um operador é creditada com a melhoria de fitness que
+produziu e o tempo de CPU que custou. A probabilidade de escolha se
+adapta à melhoria por segundo de CPU de cada operador:
+
+- "roulette": roleta com pesos atualizados ao fim de cada segmento
+  (ex: uma geração), como a roleta de operadores do ALNS
+- "ucb": bandido UCB1 sobre a melhoria média por segundo normalizada
+- "uniform": escolha uniforme (só coleta estatísticas)
+"""
+
+import math
+import random
+from typing import Dict, Optional, Sequence
+
+
+# Políticas de seleção suportadas
+SELECTION_POLICIES = ("uniform", "roulette", "ucb")
+
+# Peso mínimo de um operador na roleta (mantém exploração)
+MIN_OPERATOR_WEIGHT = 0.05
+
+
+class OperatorPortfolio:
+    """
+    Portfólio de operadores com seleção adaptativa.
+    
+    Exemplo:
+        portfolio = OperatorPortfolio(["swap", "move", "reverse"], policy="ucb")
+        name = portfolio.select()
+        ...  # aplicar o operador e avaliar o resultado
+        portfolio.record(name, improvement, cpu_seconds)
+        portfolio.end_segment()  # ao fim da geração
+    """
+    
+    def __init__(
+        self,
+        names: Sequence[str],
+        policy: str = "roulette",
+        reaction_factor: float = 0.1,
+        exploration: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            names: Nomes dos operadores
+            policy: Política de seleção ("uniform", "roulette" ou "ucb")
+            reaction_factor: Velocidade de adaptação dos pesos da roleta (0-1)
+            exploration: Coeficiente de exploração do UCB
+            rng: Gerador aleatório (padrão: módulo ``random``)
+        
+        Raises:
+            ValueError: Se não houver operadores ou a política não for suportada
+        """
+        if not names:
+            raise ValueError("Portfólio de operadores vazio")
+        if policy not in SELECTION_POLICIES:
+            raise ValueError(
+                f"Política de seleção inválida: {policy}. "
+                f"Opções: {', '.join(SELECTION_POLICIES)}"
+            )
+        
+        self.names = list(names)
+        self.policy = policy
+        self.reaction_factor = reaction_factor
+        self.exploration = exploration
+        self._rng = rng or random
+        
+        self.weights = {name: 1.0 for name in self.names}
+        self.uses = {name: 0 for name in self.names}
+        self.successes = {name: 0 for name in self.names}
+        self.improvement = {name: 0.0 for name in self.names}
+        self.cpu_time = {name: 0.0 for name in self.names}
+        self._segment_improvement = {name: 0.0 for name in self.names}
+        self._segment_time = {name: 0.0 for name in self.names}
+    
+    def select(self) -> str:
+        """Escolhe o próximo operador conforme a política."""
+        if self.policy == "roulette":
+            return self._roulette()
+        if self.policy == "ucb":
+            return self._ucb()
+        return self._rng.choice(self.names)
+    
+    def record(self, name: str, improvement: float, cpu_time: float) -> None:
+        """
+        Credita uma aplicação do operador.
+        
+        Args:
+            name: Operador aplicado
+            improvement: Redução do fitness em relação ao pai (<= 0 = sem melhoria)
+            cpu_time: Tempo de CPU (s) da aplicação
+        """
+        gain = max(improvement, 0.0)
+        self.uses[name] += 1
+        self.successes[name] += gain > 0
+        self.improvement[name] += gain
+        self.cpu_time[name] += cpu_time
+        self._segment_improvement[name] += gain
+        self._segment_time[name] += cpu_time
+    
+    def end_segment(self) -> None:
+        """
+        Atualiza os pesos da roleta com a melhoria por segundo do segmento.
+        
+        As taxas são normalizadas pela maior do segmento; operadores não
+        usados mantêm o peso.
+        """
+        rates = {
+            name: self._segment_improvement[name] / self._segment_time[name]
+            for name in self.names
+            if self._segment_time[name] > 0
+        }
+        best_rate = max(rates.values(), default=0.0)
+        for name, rate in rates.items():
+            reward = rate / best_rate if best_rate > 0 else 0.0
+            self.weights[name] = max(
+                (1 - self.reaction_factor) * self.weights[name]
+                + self.reaction_factor * reward,
+                MIN_OPERATOR_WEIGHT,
+            )
+        
+        self._segment_improvement = {name: 0.0 for name in self.names}
+        self._segment_time = {name: 0.0 for name in self.names}
+    
+    def probabilities(self) -> Dict[str, float]:
+        """
+        Probabilidade de escolha de cada operador.
+        
+        Na roleta, a partir dos pesos atuais; no UCB (determinístico), a
+        fração das escolhas feitas até aqui.
+        """
+        if self.policy == "roulette":
+            total = sum(self.weights.values())
+            return {name: weight / total for name, weight in self.weights.items()}
+        total_uses = sum(self.uses.values())
+        if self.policy == "ucb" and total_uses:
+            return {name: self.uses[name] / total_uses for name in self.names}
+        return {name: 1.0 / len(self.names) for name in self.names}
+    
+    def _roulette(self) -> str:
+        """Seleção proporcional aos pesos."""
+        threshold = self._rng.random() * sum(self.weights.values())
+        cumulative = 0.0
+        for name, weight in self.weights.items():
+            cumulative += weight
+            if threshold < cumulative:
+                return name
+        return self.names[-1]
+    
+    def _ucb(self) -> str:
+        """
+        UCB1: melhoria média por segundo (normalizada) + bônus de exploração.
+        
+        Operadores ainda não usados são escolhidos primeiro.
+        """
+        for name in self.names:
+            if not self.uses[name]:
+                return name
+        
+        rates = {name: self._rate(name) for name in self.names}
+        best_rate = max(rates.values()) or 1.0
+        log_total = math.log(sum(self.uses.values()))
+        return max(
+            self.names,
+            key=lambda name: (
+                rates[name] / best_rate
+                + self.exploration * math.sqrt(2 * log_total / self.uses[name])
+            ),
+        )
+    
+    def _rate(self, name: str) -> float:
+        """Melhoria acumulada por segundo de CPU."""
+        if self.cpu_time[name] <= 0:
+            return 0.0
+        return self.improvement[name] / self.cpu_time[name]
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Estatísticas por operador.
+        
+        Returns:
+            Dict: Para cada operador: uses, successes, success_rate,
+            improvement (total), cpu_time (s), improvement_per_second e
+            probability (probabilidade atual de escolha)
+        """
+        probabilities = self.probabilities()
+        return {
+            name: {
+                "uses": self.uses[name],
+                "successes": self.successes[name],
+                "success_rate": (
+                    self.successes[name] / self.uses[name] if self.uses[name] else 0.0
+                ),
+                "improvement": self.improvement[name],
+                "cpu_time": self.cpu_time[name],
+                "improvement_per_second": self._rate(name),
+                "probability": probabilities[name],
+            }
+            for name in self.names
+        }
@@ -0,0 +1,310 @@
+"""
+Avaliação paralela de fitness para o algoritmo genético.
+
+Distribui a avaliação da população entre processos de um pool. Os dados
+do problema (matriz de distâncias e arrays das entregas) são publicados
+uma única vez em memória compartilhada (``multiprocessing.shared_memory``);
+cada worker se conecta aos blocos no initializer e, a partir daí, cada
+tarefa transporta apenas as rotas do indivíduo.
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from hospital_routes.core.interfaces import Delivery, VehicleConstraints
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.distance import DistanceMatrix
+
+
+# Colunas do array de entregas publicado em memória compartilhada
+DELIVERY_COLUMNS = ("latitude", "longitude", "weight", "priority", "service_time")
+
+# Estado do processo worker (preenchido por _init_worker)
+_worker_state: Dict[str, Any] = {}
+
+
+class SharedProblem:
+    """
+    Dados do problema publicados em memória compartilhada.
+    
+    Matriz de distâncias (no armazenamento original) e arrays das entregas
+    são copiados uma única vez; ``initargs`` carrega apenas os nomes dos
+    blocos e os metadados, e ``attach_problem`` reconstrói o otimizador
+    dentro de outro processo. Usado pelo pool de avaliação e pelas ilhas
+    do modelo de ilhas.
+    """
+    
+    def __init__(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        depot_location: Tuple[float, float],
+        distance_matrix: DistanceMatrix,
+        fitness_weights: FitnessWeights,
+        encoding: str = "routes",
+    ):
+        """
+        Args:
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos
+            depot_location: Localização do depósito
+            distance_matrix: Matriz de distâncias (depósito no índice 0)
+            fitness_weights: Pesos da função de fitness
+            encoding: Codificação do cromossomo usada pelo GA
+        """
+        self._blocks: List[shared_memory.SharedMemory] = []
+        
+        try:
+            # Publicado no armazenamento original (dtype/layout compactos)
+            matrix_block = self._publish(distance_matrix.data)
+            
+            # Entregas na ordem dos índices da matriz (que pode diferir da
+            # lista recebida após atualizações incrementais)
+            delivery_dict = {d.id: d for d in deliveries}
+            delivery_data = np.array(
+                [
+                    [
+                        d.location[0],
+                        d.location[1],
+                        d.weight,
+                        d.priority,
+                        d.estimated_service_time,
+                    ]
+                    for d in (delivery_dict[loc_id] for loc_id in distance_matrix.ids[1:])
+                ],
+                dtype=np.float64,
+            ).reshape(-1, len(DELIVERY_COLUMNS))
+            deliveries_block = self._publish(delivery_data)
+        except Exception:
+            self.close()
+            raise
+        
+        self.initargs = (
+            matrix_block.name,
+            distance_matrix.data.shape,
+            distance_matrix.dtype.name,
+            distance_matrix.layout,
+            deliveries_block.name,
+            delivery_data.shape,
+            distance_matrix.ids,
+            list(vehicles),
+            depot_location,
+            fitness_weights,
+            encoding,
+        )
+    
+    def _publish(self, array: np.ndarray) -> shared_memory.SharedMemory:
+        """Copia um array para um novo bloco de memória compartilhada."""
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._blocks.append(block)
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared[...] = array
+        return block
+    
+    def close(self) -> None:
+        """Libera os blocos de memória compartilhada."""
+        for block in self._blocks:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+
+def attach_problem(
+    matrix_block: str,
+    matrix_shape: Tuple[int, ...],
+    matrix_dtype: str,
+    matrix_layout: str,
+    deliveries_block: str,
+    deliveries_shape: Tuple[int, int],
+    location_ids: List[str],
+    vehicles: List[VehicleConstraints],
+    depot_location: Tuple[float, float],
+    fitness_weights: FitnessWeights,
+    encoding: str,
+    materialize_rows: bool = True,
+) -> Tuple[Any, Tuple[shared_memory.SharedMemory, ...]]:
+    """
+    Conecta aos blocos de ``SharedProblem.initargs`` e prepara um GA.
+    
+    Args:
+        materialize_rows: False mantém a matriz só no bloco compartilhado
+            (``DistanceMatrix.rows`` não é criada pelas leituras); os demais
+            argumentos vêm de ``SharedProblem.initargs``
+    
+    Returns:
+        Tuple: (``GeneticAlgorithmOptimizer`` pronto para avaliar, blocos
+        abertos - manter referência enquanto o otimizador for usado)
+    """
+    from hospital_routes.optimization.genetic_algorithm import (
+        GeneticAlgorithmOptimizer,
+    )
+    
+    # Os processos compartilham o resource_tracker do processo pai, que
+    # continua responsável por remover os blocos (SharedProblem.close)
+    matrix_shm = shared_memory.SharedMemory(name=matrix_block)
+    deliveries_shm = shared_memory.SharedMemory(name=deliveries_block)
+    
+    values = np.ndarray(matrix_shape, dtype=matrix_dtype, buffer=matrix_shm.buf)
+    delivery_data = np.ndarray(
+        deliveries_shape, dtype=np.float64, buffer=deliveries_shm.buf
+    )
+    
+    deliveries = [
+        Delivery(
+            id=delivery_id,
+            location=(row[0], row[1]),
+            weight=row[2],
+            priority=int(row[3]),
+            estimated_service_time=row[4],
+        )
+        for delivery_id, row in zip(location_ids[1:], delivery_data.tolist())
+    ]
+    
+    optimizer = GeneticAlgorithmOptimizer(
+        fitness_weights=fitness_weights, encoding=encoding
+    )
+    optimizer._deliveries = deliveries
+    optimizer._vehicles = vehicles
+    optimizer._depot_location = depot_location
+    optimizer._delivery_dict = {d.id: d for d in deliveries}
+    optimizer._distance_matrix = DistanceMatrix(
+        location_ids,
+        values,
+        locations=[depot_location] + [d.location for d in deliveries],
+        dtype=matrix_dtype,
+        layout=matrix_layout,
+        materialize_rows=materialize_rows,
+    )
+    optimizer._prepare_encoding()
+    
+    return optimizer, (matrix_shm, deliveries_shm)
+
+
+def _init_worker(*initargs: Any) -> None:
+    """
+    Initializer do pool: conecta à memória compartilhada e prepara o avaliador.
+    
+    Executado uma única vez por processo worker. A avaliação lê a matriz
+    direto do bloco compartilhado: criar ``rows`` (n² floats Python, cerca
+    de 4x o bloco) em cada worker anularia o compartilhamento.
+    """
+    optimizer, blocks = attach_problem(*initargs, materialize_rows=False)
+    
+    # Manter referências aos blocos enquanto o worker estiver vivo
+    _worker_state["blocks"] = blocks
+    _worker_state["optimizer"] = optimizer
+
+
+def evaluate_shared(routes: List) -> float:
+    """
+    Avalia um indivíduo dentro de um worker usando os dados compartilhados.
+    
+    Args:
+        routes: Genes do indivíduo (rotas ou giant tour, conforme a codificação)
+    
+    Returns:
+        float: Fitness (quanto menor, melhor)
+    """
+    return _worker_state["optimizer"]._evaluate_individual(routes)
+
+
+class ParallelEvaluator:
+    """
+    Pool de processos para avaliação de fitness com dados em memória compartilhada.
+    
+    Fornece um ``map`` compatível com o toolbox do DEAP::
+        
+        evaluator = ParallelEvaluator(...)
+        toolbox.register("map", evaluator.map)
+        toolbox.register("evaluate", evaluate_shared)
+    
+    Deve ser encerrado com ``close()`` (ou usado como context manager)
+    para liberar o pool e os blocos de memória compartilhada.
+    """
+    
+    def __init__(
+        self,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        depot_location: Tuple[float, float],
+        distance_matrix: DistanceMatrix,
+        fitness_weights: FitnessWeights,
+        n_workers: int,
+        encoding: str = "routes",
+        chunks_per_worker: int = 4,
+    ):
+        """
+        Args:
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos
+            depot_location: Localização do depósito
+            distance_matrix: Matriz de distâncias (depósito no índice 0)
+            fitness_weights: Pesos da função de fitness
+            n_workers: Número de processos do pool
+            encoding: Codificação do cromossomo usada pelo GA
+            chunks_per_worker: Lotes por worker em cada ``map`` (balanceamento)
+        """
+        self.n_workers = n_workers
+        self.chunks_per_worker = chunks_per_worker
+        self._pool: Optional[Any] = None
+        self._problem = SharedProblem(
+            deliveries,
+            vehicles,
+            depot_location,
+            distance_matrix,
+            fitness_weights,
+            encoding=encoding,
+        )
+        
+        try:
+            self._pool = multiprocessing.Pool(
+                processes=n_workers,
+                initializer=_init_worker,
+                initargs=self._problem.initargs,
+            )
+        except Exception:
+            self.close()
+            raise
+    
+    def map(self, func: Callable, individuals: Iterable) -> List[Any]:
+        """
+        ``map`` paralelo para o toolbox do DEAP.
+        
+        Os indivíduos são enviados como listas simples, para não depender
+        dos tipos criados pelo ``creator`` nos workers.
+        
+        Args:
+            func: Função de avaliação (ex: ``evaluate_shared``)
+            individuals: Indivíduos a avaliar
+        
+        Returns:
+            List: Resultados na mesma ordem dos indivíduos
+        """
+        payload = [list(ind) for ind in individuals]
+        if not payload:
+            return []
+        
+        chunksize = max(1, len(payload) // (self.n_workers * self.chunks_per_worker))
+        return self._pool.map(func, payload, chunksize=chunksize)
+    
+    def close(self) -> None:
+        """Encerra o pool e libera a memória compartilhada."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._problem.close()
+    
+    def __enter__(self) -> "ParallelEvaluator":
+        """Permite uso como context manager."""
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        """Libera pool e memória compartilhada ao sair do contexto."""
+        self.close()
@@ -8,7 +8,7 @@ com probabilidade decrescente (temperatura), permitindo escapar de mínimos loca
 import time
 import random
 import math
-from typing import List, Dict, Tuple
+from typing import List, Optional, Tuple
 
 from hospital_routes.core.interfaces import (
     BaseOptimizer,
@@ -19,9 +19,15 @@ from hospital_routes.core.interfaces import (
     OptimizationResult,
 )
 from hospital_routes.core.exceptions import OptimizationError
-from hospital_routes.utils.distance import calculate_distance
+from hospital_routes.utils.distance import (
+    build_delivery_distance_matrix,
+    DistanceMatrix,
+)
 from hospital_routes.utils.validators import validate_deliveries, validate_vehicles
+from hospital_routes.utils.deadline import Deadline
+from hospital_routes.utils.travel_time import TravelTimeTensor
 from hospital_routes.optimization.fitness.composite_fitness import CompositeFitness
+from hospital_routes.optimization.fitness.delta_fitness import IncrementalFitness, Move
 from hospital_routes.utils.config import FitnessWeights
 
 
@@ -52,6 +58,7 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
         self.initial_temperature = initial_temperature
         self.cooling_rate = cooling_rate
         self.min_temperature = min_temperature
+        self._distance_matrix: Optional[DistanceMatrix] = None
     
     def optimize(
         self,
@@ -73,6 +80,8 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
             OptimizationResult: Resultado da otimização
         """
         start_time = time.time()
+        # Iterações custam microssegundos: consultar o relógio a cada 256
+        deadline = Deadline.from_config(config, start_time, check_interval=256)
         
         try:
             # Validar inputs
@@ -81,16 +90,27 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
             
             # Construir matriz de distâncias
             distance_matrix = self._build_distance_matrix(
-                deliveries, depot_location
+                deliveries,
+                depot_location,
+                precision=config.distance_precision,
+                dtype=config.distance_dtype,
+                layout=config.distance_layout,
             )
             
             # Solução inicial (Greedy)
             current_solution = self._initial_solution(
-                deliveries, vehicles, depot_location, distance_matrix
+                deliveries, vehicles, depot_location, distance_matrix, deadline
+            )
+            
+            # Estado incremental: cada vizinho é avaliado pelo delta do
+            # movimento, sem copiar as rotas nem reavaliar a solução inteira
+            evaluator = self.composite_fitness.build_evaluator(
+                deliveries, vehicles, distance_matrix
             )
-            current_fitness = self._calculate_fitness(
-                current_solution, deliveries, vehicles, depot_location, distance_matrix
+            state = IncrementalFitness(
+                evaluator, evaluator.route_indices(current_solution)
             )
+            current_fitness = state.fitness
             
             # Melhor solução encontrada
             best_solution = current_solution
@@ -100,25 +120,22 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
             # Simulated Annealing
             temperature = self.initial_temperature
             iterations = config.generations if config.generations > 0 else 1000
+            converged = False
             
             for iteration in range(iterations):
-                # Gerar solução vizinha
-                neighbor = self._generate_neighbor(current_solution, deliveries, vehicles)
-                neighbor_fitness = self._calculate_fitness(
-                    neighbor, deliveries, vehicles, depot_location, distance_matrix
-                )
-                
-                # Calcular diferença de fitness
-                delta = neighbor_fitness - current_fitness
+                # Gerar movimento vizinho e avaliar seu delta
+                move = self._generate_neighbor(state)
+                delta = state.delta(move) if move is not None else 0.0
                 
                 # Aceitar solução se for melhor ou com probabilidade baseada em temperatura
-                if delta < 0 or random.random() < math.exp(-delta / temperature):
-                    current_solution = neighbor
-                    current_fitness = neighbor_fitness
+                if move is not None and (
+                    delta < 0 or random.random() < math.exp(-delta / temperature)
+                ):
+                    current_fitness = state.apply(move)
                     
                     # Atualizar melhor solução
                     if current_fitness < best_fitness:
-                        best_solution = current_solution
+                        best_solution = state.route_ids()
                         best_fitness = current_fitness
                         best_fitness_history.append(best_fitness)
                 
@@ -127,6 +144,11 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
                 
                 # Parar se temperatura muito baixa
                 if temperature < self.min_temperature:
+                    converged = True
+                    break
+                
+                # Prazo atingido: manter a melhor solução até aqui
+                if deadline.expired():
                     break
             
             # Converter melhor solução para RouteSolution
@@ -147,6 +169,7 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
                     "initial_temperature": self.initial_temperature,
                     "final_temperature": temperature,
                     "iterations": iteration + 1,
+                    **deadline.statistics(converged),
                 },
             )
         
@@ -193,122 +216,64 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
         self,
         deliveries: List[Delivery],
         depot_location: Tuple[float, float],
-    ) -> Dict[Tuple[str, str], float]:
-        """Constrói matriz de distâncias."""
-        matrix = {}
-        depot_key = "depot"
-        
-        for d1 in deliveries:
-            for d2 in deliveries:
-                if d1.id != d2.id:
-                    matrix[(d1.id, d2.id)] = calculate_distance(
-                        d1.location, d2.location
-                    )
-        
-        for d in deliveries:
-            matrix[(depot_key, d.id)] = calculate_distance(
-                depot_location, d.location
-            )
-            matrix[(d.id, depot_key)] = calculate_distance(
-                d.location, depot_location
-            )
+        precision: str = "haversine",
+        dtype: Optional[str] = None,
+        layout: str = "dense",
+    ) -> DistanceMatrix:
+        """
+        Constrói matriz de distâncias (passada vetorizada única).
         
-        return matrix
+        Se a execução anterior usou quase as mesmas entregas, a matriz dela
+        é atualizada (só as entregas novas são calculadas).
+        """
+        # Replanejamento: a matriz da execução anterior é atualizada no lugar
+        self._distance_matrix = build_delivery_distance_matrix(
+            deliveries,
+            depot_location,
+            precision=precision,
+            dtype=dtype,
+            layout=layout,
+            previous=self._distance_matrix,
+        )
+        return self._distance_matrix
     
     def _initial_solution(
         self,
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: Tuple[float, float],
-        distance_matrix: Dict[Tuple[str, str], float],
+        distance_matrix: DistanceMatrix,
+        deadline: Optional[Deadline] = None,
     ) -> List[List[str]]:
-        """Gera solução inicial usando Greedy."""
+        """
+        Gera solução inicial usando Greedy.
+        
+        Usa a matriz já construída (mesma precisão, dtype e layout) e o
+        prazo da otimização; não monta uma segunda matriz.
+        """
         from hospital_routes.optimization.greedy_optimizer import GreedyOptimizer
         
         greedy = GreedyOptimizer()
-        result = greedy.optimize(
-            deliveries, vehicles,
-            OptimizationConfig(population_size=1, generations=1),
-            depot_location
+        return greedy._solve_greedy(
+            deliveries, vehicles, depot_location, distance_matrix, deadline
         )
-        return result.solution.routes
     
-    def _generate_neighbor(
-        self,
-        current_routes: List[List[str]],
-        deliveries: List[Delivery],
-        vehicles: List[VehicleConstraints],
-    ) -> List[List[str]]:
+    def _generate_neighbor(self, state: IncrementalFitness) -> Optional[Move]:
         """
-        Gera solução vizinha aplicando operadores de mutação.
+        Gera movimento vizinho aplicando operadores de mutação.
         
         Operadores:
         - Swap: Troca duas entregas
         - Move: Move entrega de uma rota para outra
         - Reverse: Inverte ordem de uma rota
-        """
-        neighbor = [route.copy() for route in current_routes]
-        
-        # Escolher operador aleatório
-        operator = random.choice(["swap", "move", "reverse"])
-        
-        if operator == "swap":
-            # Trocar duas entregas aleatórias
-            all_deliveries = [
-                (r_idx, d_idx, d_id)
-                for r_idx, route in enumerate(neighbor)
-                for d_idx, d_id in enumerate(route)
-            ]
-            if len(all_deliveries) >= 2:
-                (r1, d1_idx, d1), (r2, d2_idx, d2) = random.sample(all_deliveries, 2)
-                neighbor[r1][d1_idx] = d2
-                neighbor[r2][d2_idx] = d1
         
-        elif operator == "move":
-            # Mover entrega de uma rota para outra
-            all_deliveries = [
-                (r_idx, d_idx, d_id)
-                for r_idx, route in enumerate(neighbor)
-                for d_idx, d_id in enumerate(route)
-            ]
-            if all_deliveries:
-                r1, d1_idx, d1 = random.choice(all_deliveries)
-                r2 = random.randint(0, len(neighbor) - 1)
-                
-                neighbor[r1].pop(d1_idx)
-                if not neighbor[r1]:
-                    neighbor.pop(r1)
-                    if r2 >= len(neighbor):
-                        r2 = len(neighbor) - 1
-                
-                if r2 < len(neighbor):
-                    insert_pos = random.randint(0, len(neighbor[r2]))
-                    neighbor[r2].insert(insert_pos, d1)
-        
-        elif operator == "reverse":
-            # Inverter ordem de uma rota
-            if neighbor:
-                route_idx = random.randint(0, len(neighbor) - 1)
-                if neighbor[route_idx]:
-                    neighbor[route_idx].reverse()
+        Args:
+            state: Estado incremental da solução atual
         
-        return neighbor
-    
-    def _calculate_fitness(
-        self,
-        routes: List[List[str]],
-        deliveries: List[Delivery],
-        vehicles: List[VehicleConstraints],
-        depot_location: Tuple[float, float],
-        distance_matrix: Dict[Tuple[str, str], float],
-    ) -> float:
-        """Calcula fitness de uma solução."""
-        solution = self._routes_to_solution(
-            routes, deliveries, vehicles, depot_location, distance_matrix
-        )
-        return self.composite_fitness.calculate(
-            solution, deliveries, vehicles, depot_location, distance_matrix
-        )
+        Returns:
+            Move: Movimento a avaliar (None se nenhum for possível)
+        """
+        return state.random_move()
     
     def _routes_to_solution(
         self,
@@ -316,45 +281,37 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
         deliveries: List[Delivery],
         vehicles: List[VehicleConstraints],
         depot_location: Tuple[float, float],
-        distance_matrix: Dict[Tuple[str, str], float],
+        distance_matrix: DistanceMatrix,
     ) -> RouteSolution:
         """Converte rotas em RouteSolution."""
         delivery_dict = {d.id: d for d in deliveries}
-        depot_key = "depot"
         
-        # Calcular distância total
-        total_distance = 0.0
-        for route in routes:
-            if not route:
-                continue
-            total_distance += distance_matrix.get((depot_key, route[0]), 0.0)
-            for i in range(len(route) - 1):
-                total_distance += distance_matrix.get((route[i], route[i + 1]), 0.0)
-            total_distance += distance_matrix.get((route[-1], depot_key), 0.0)
+        # Distância de cada rota (uma leitura vetorizada da matriz)
+        route_indices = [distance_matrix.indices(route) for route in routes]
+        route_distances = distance_matrix.route_distances(route_indices).tolist()
+        total_distance = sum(route_distances)
         
-        # Calcular custo
-        total_cost = 0.0
-        for route_idx, route in enumerate(routes):
-            if route_idx < len(vehicles):
-                vehicle = vehicles[route_idx]
-                route_distance = 0.0
-                if route:
-                    route_distance += distance_matrix.get((depot_key, route[0]), 0.0)
-                    for i in range(len(route) - 1):
-                        route_distance += distance_matrix.get((route[i], route[i + 1]), 0.0)
-                    route_distance += distance_matrix.get((route[-1], depot_key), 0.0)
-                total_cost += route_distance * vehicle.fuel_cost_per_km
-                total_cost += (route_distance / 50.0) * vehicle.driver_cost_per_hour
+        # Tempo dirigindo pelo perfil horário de velocidades (picos de trânsito)
+        travel_times = TravelTimeTensor.for_deliveries(distance_matrix, deliveries)
         
-        # Calcular violações
-        violations = {}
+        # Calcular custo total e violações
+        total_cost = 0.0
         capacity_violation = 0.0
         autonomy_violation = 0.0
         
         for route_idx, route in enumerate(routes):
             if route_idx >= len(vehicles):
                 continue
+            
             vehicle = vehicles[route_idx]
+            route_distance = route_distances[route_idx]
+            
+            total_cost += route_distance * vehicle.fuel_cost_per_km
+            total_cost += (
+                travel_times.route_hours(route_indices[route_idx])
+                * vehicle.driver_cost_per_hour
+            )
+            
             route_weight = sum(
                 delivery_dict[d_id].weight
                 for d_id in route
@@ -363,17 +320,13 @@ class SimulatedAnnealingOptimizer(BaseOptimizer):
             if route_weight > vehicle.max_capacity:
                 capacity_violation += route_weight - vehicle.max_capacity
             
-            route_distance = 0.0
-            if route:
-                route_distance += distance_matrix.get((depot_key, route[0]), 0.0)
-                for i in range(len(route) - 1):
-                    route_distance += distance_matrix.get((route[i], route[i + 1]), 0.0)
-                route_distance += distance_matrix.get((route[-1], depot_key), 0.0)
             if route_distance > vehicle.max_range:
                 autonomy_violation += route_distance - vehicle.max_range
         
-        violations["capacity"] = capacity_violation
-        violations["autonomy"] = autonomy_violation
+        violations = {
+            "capacity": capacity_violation,
+            "autonomy": autonomy_violation,
+        }
         
         solution = RouteSolution(
             routes=routes,
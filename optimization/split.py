@@ -0,0 +1,193 @@
+"""
+Procedimento Split para decodificar cromossomos "giant tour".
+
+Um giant tour é uma permutação de todas as entregas, sem delimitadores
+de rota. O Split (Prins, 2004) encontra o particionamento ótimo dessa
+sequência em rotas consecutivas resolvendo um caminho mínimo em um
+grafo acíclico: cada arco (i, j) representa a rota que atende as
+entregas tour[i+1..j] e só existe se respeitar capacidade e autonomia.
+
+Esta versão usa frota limitada e heterogênea: a k-ésima rota é atendida
+por ``vehicles[k]``, mantendo a correspondência rota ↔ veículo usada
+pela função de fitness.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from hospital_routes.core.interfaces import Delivery, VehicleConstraints
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.distance import DistanceMatrix, DEPOT_INDEX
+
+
+class GiantTourSplitter:
+    """
+    Decodifica giant tours em rotas pelo Split ótimo com frota limitada.
+    
+    O custo de uma rota combina os termos decomponíveis por rota da
+    função de fitness: distância (α), atraso de entregas críticas (δ)
+    e uso de veículo (ε). Capacidade e autonomia são restrições rígidas
+    dos arcos; uma entrega isolada é sempre aceita (com penalidade) para
+    que toda permutação tenha decodificação.
+    """
+    
+    def __init__(
+        self,
+        distance_matrix: DistanceMatrix,
+        deliveries: List[Delivery],
+        vehicles: List[VehicleConstraints],
+        fitness_weights: FitnessWeights,
+    ):
+        """
+        Args:
+            distance_matrix: Matriz de distâncias (depósito no índice 0)
+            deliveries: Lista de entregas
+            vehicles: Lista de veículos (a rota k usa vehicles[k])
+            fitness_weights: Pesos da função de fitness
+        """
+        self.distance_matrix = distance_matrix
+        self.vehicles = vehicles
+        self.fitness_weights = fitness_weights
+        
+        size = len(distance_matrix)
+        self._weights = [0.0] * size
+        self._critical = [False] * size
+        for d in deliveries:
+            idx = distance_matrix.index_of(d.id)
+            self._weights[idx] = d.weight
+            self._critical[idx] = d.priority == 1
+    
+    def split(self, tour: Sequence[int]) -> List[List[int]]:
+        """
+        Particiona o giant tour em rotas de custo mínimo.
+        
+        Args:
+            tour: Índices (da matriz) das entregas na ordem do giant tour
+        
+        Returns:
+            List[List[int]]: Rotas como listas de índices da matriz
+        """
+        n = len(tour)
+        if n == 0:
+            return []
+        
+        # Trechos do tour e ligações com o depósito em três leituras do
+        # array (não exige ``rows``, ex: matriz compartilhada nos workers)
+        matrix = self.distance_matrix
+        stops = np.asarray(tour, dtype=np.int64)
+        depot = np.full(n, DEPOT_INDEX, dtype=np.int64)
+        legs = [0.0] + matrix.take(stops[:-1], stops[1:]).tolist()
+        from_depot = matrix.take(depot, stops).tolist()
+        to_depot = matrix.take(stops, depot).tolist()
+        weights = self._weights
+        critical = self._critical
+        distance_weight = self.fitness_weights.distance_weight
+        priority_weight = self.fitness_weights.priority_penalty
+        vehicle_cost = self.fitness_weights.vehicle_penalty
+        inf = float('inf')
+        
+        # cost[k][j]: melhor custo atendendo tour[:j] com k rotas
+        # parent[k][j]: início (i) da k-ésima rota na solução ótima
+        cost = [[inf] * (n + 1)]
+        cost[0][0] = 0.0
+        parent: List[List[int]] = [[-1] * (n + 1)]
+        
+        best_k: Optional[int] = None
+        for k, vehicle in enumerate(self.vehicles, start=1):
+            previous = cost[k - 1]
+            current = [inf] * (n + 1)
+            current_parent = [-1] * (n + 1)
+            
+            for i in range(n):
+                base_cost = previous[i]
+                if base_cost == inf:
+                    continue
+                
+                load = 0.0
+                inner = 0.0
+                delay = 0
+                start_distance = from_depot[i]
+                for j in range(i, n):
+                    stop = tour[j]
+                    load += weights[stop]
+                    if j > i:
+                        inner += legs[j]
+                    distance = start_distance + inner + to_depot[j]
+                    
+                    # Distâncias respeitam a desigualdade triangular: se a
+                    # rota já excede capacidade ou autonomia, estendê-la
+                    # não a torna viável
+                    if j > i and (
+                        load > vehicle.max_capacity or distance > vehicle.max_range
+                    ):
+                        break
+                    
+                    if critical[stop]:
+                        delay += j - i
+                    
+                    route_cost = (
+                        base_cost
+                        + distance_weight * distance
+                        + priority_weight * delay
+                        + vehicle_cost
+                    )
+                    if route_cost < current[j + 1]:
+                        current[j + 1] = route_cost
+                        current_parent[j + 1] = i
+            
+            cost.append(current)
+            parent.append(current_parent)
+            
+            if current[n] < inf and (best_k is None or current[n] < cost[best_k][n]):
+                best_k = k
+        
+        if best_k is None:
+            # Frota insuficiente para atender tudo sem violar restrições
+            return self._fallback_split(tour)
+        
+        routes = []
+        j = n
+        for k in range(best_k, 0, -1):
+            i = parent[k][j]
+            routes.append(list(tour[i:j]))
+            j = i
+        routes.reverse()
+        
+        return routes
+    
+    def _fallback_split(self, tour: Sequence[int]) -> List[List[int]]:
+        """
+        Divide o tour sequencialmente quando não há Split viável.
+        
+        Preenche cada veículo até a capacidade; o excedente fica na última
+        rota e é penalizado pela função de fitness.
+        """
+        routes: List[List[int]] = [[]]
+        load = 0.0
+        for stop in tour:
+            vehicle = self.vehicles[len(routes) - 1]
+            if (
+                routes[-1]
+                and load + self._weights[stop] > vehicle.max_capacity
+                and len(routes) < len(self.vehicles)
+            ):
+                routes.append([])
+                load = 0.0
+            routes[-1].append(stop)
+            load += self._weights[stop]
+        
+        return routes
+    
+    def decode(self, tour: Sequence[int]) -> List[List[str]]:
+        """
+        Decodifica o giant tour em rotas de IDs de entregas.
+        
+        Args:
+            tour: Índices (da matriz) das entregas na ordem do giant tour
+        
+        Returns:
+            List[List[str]]: Rotas como listas de IDs
+        """
+        ids = self.distance_matrix.ids
+        return [[ids[idx] for idx in route] for route in self.split(tour)]
@@ -0,0 +1,48 @@
+"""
+Teste de fumaça da medição de escalabilidade da avaliação paralela.
+"""
+
+import random
+
+from hospital_routes.core.interfaces import Delivery, VehicleConstraints
+from hospital_routes.optimization.benchmark import AlgorithmBenchmark
+
+
+DEPOT = (-23.5505, -46.6333)
+
+
+def _instance(n_deliveries: int = 12, seed: int = 3):
+    rng = random.Random(seed)
+    deliveries = [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.55 + rng.uniform(-0.05, 0.05), -46.63 + rng.uniform(-0.05, 0.05)),
+            priority=rng.choice([1, 2]),
+            weight=rng.uniform(1, 10),
+        )
+        for i in range(n_deliveries)
+    ]
+    vehicles = [
+        VehicleConstraints(
+            max_capacity=80.0, max_range=120.0,
+            fuel_cost_per_km=0.8, driver_cost_per_hour=30.0,
+        )
+        for _ in range(3)
+    ]
+    return deliveries, vehicles
+
+
+def test_run_parallel_scaling_smoke():
+    deliveries, vehicles = _instance()
+    
+    results = AlgorithmBenchmark().run_parallel_scaling(
+        deliveries, vehicles, DEPOT,
+        worker_counts=[1, 2],
+        population_size=10,
+        rounds=1,
+    )
+    
+    assert [r.n_workers for r in results] == [1, 2]
+    assert all(r.evaluations == 10 for r in results)
+    assert all(r.evaluations_per_second > 0 for r in results)
+    assert results[0].speedup == 1.0
@@ -0,0 +1,119 @@
+"""
+Testes do cache de distâncias: persistência (log e SQLite) e remoção.
+"""
+
+import pytest
+
+from hospital_routes.utils.cache import LOG_MAGIC, DistanceCache
+
+
+A = (-23.550520, -46.633308)
+B = (-23.561684, -46.655981)
+C = (-23.587416, -46.657634)
+D = (-23.533773, -46.625290)
+
+
+def test_log_round_trip(tmp_path):
+    path = str(tmp_path / "distances.log")
+    cache = DistanceCache(maxsize=10, persist_file=path)
+    cache.set(A, B, 2.5)
+    cache.put_many([(A, C), (B, D)], [4.25, 5.0])
+    cache.flush()
+    
+    reloaded = DistanceCache(maxsize=10, persist_file=path)
+    
+    assert len(reloaded) == 3
+    assert reloaded.get(B, A) == 2.5
+    assert reloaded.get_many([(C, A), (B, D), (C, D)]) == [4.25, 5.0, None]
+
+
+def test_log_keeps_latest_value_and_compacts(tmp_path):
+    path = tmp_path / "distances.log"
+    cache = DistanceCache(maxsize=10, persist_file=str(path), compaction_ratio=2.0)
+    for value in range(10):
+        cache.set(A, B, float(value))
+        cache.flush()
+    
+    reloaded = DistanceCache(maxsize=10, persist_file=str(path))
+    
+    assert reloaded.get(A, B) == 9.0
+    assert cache.stats()["log_records"] <= 2
+    assert path.stat().st_size < len(LOG_MAGIC) + 3 * 24
+
+
+def test_log_ignores_truncated_record(tmp_path):
+    path = tmp_path / "distances.log"
+    cache = DistanceCache(maxsize=10, persist_file=str(path))
+    cache.set(A, B, 2.5)
+    cache.set(C, D, 3.5)
+    cache.flush()
+    path.write_bytes(path.read_bytes()[:-5])
+    
+    reloaded = DistanceCache(maxsize=10, persist_file=str(path))
+    
+    assert reloaded.get(A, B) == 2.5
+    assert reloaded.get(C, D) is None
+
+
+def test_sqlite_round_trip_between_instances(tmp_path):
+    path = str(tmp_path / "distances.sqlite")
+    writer = DistanceCache(maxsize=10, persist_file=path, backend="sqlite")
+    writer.put_many([(A, B), (C, D)], [2.5, 3.5])
+    writer.flush()
+    
+    reader = DistanceCache(maxsize=10, persist_file=path, backend="sqlite")
+    
+    assert len(reader) == 0
+    assert reader.get_many([(B, A), (A, C), (D, C)]) == [2.5, None, 3.5]
+    assert reader.get(A, B) == 2.5
+    assert reader.stats()["hits"] == 3
+
+
+def test_lru_evicts_least_recently_used():
+    cache = DistanceCache(maxsize=2)
+    cache.set(A, B, 1.0)
+    cache.set(A, C, 2.0)
+    cache.get(A, B)
+    cache.set(A, D, 3.0)
+    
+    assert cache.get(A, C) is None
+    assert cache.get(A, B) == 1.0
+    assert cache.get(A, D) == 3.0
+    assert cache.evictions == 1
+
+
+def test_cold_entries_are_evicted_oldest_first(tmp_path):
+    path = str(tmp_path / "distances.log")
+    cache = DistanceCache(maxsize=10, persist_file=path)
+    cache.set(A, B, 1.0)
+    cache.set(A, C, 2.0)
+    cache.set(A, D, 3.0)
+    cache.flush()
+    
+    reloaded = DistanceCache(maxsize=3, persist_file=path)
+    reloaded.get(A, B)
+    reloaded.set(B, C, 4.0)
+    
+    assert reloaded.get(A, C) is None
+    assert reloaded.get(A, D) == 3.0
+    assert reloaded.get(A, B) == 1.0
+
+
+def test_load_keeps_newest_records_when_log_exceeds_maxsize(tmp_path):
+    path = str(tmp_path / "distances.log")
+    cache = DistanceCache(maxsize=10, persist_file=path)
+    cache.set(A, B, 1.0)
+    cache.set(A, C, 2.0)
+    cache.set(A, D, 3.0)
+    cache.flush()
+    
+    reloaded = DistanceCache(maxsize=2, persist_file=path)
+    
+    assert reloaded.get(A, B) is None
+    assert reloaded.get(A, C) == 2.0
+    assert reloaded.get(A, D) == 3.0
+
+
+def test_invalid_backend_raises():
+    with pytest.raises(ValueError):
+        DistanceCache(backend="redis")
@@ -0,0 +1,122 @@
+"""
+Testes do grafo de candidatos (k vizinhos mais próximos).
+
+O índice espacial deve devolver os mesmos vizinhos que uma busca exata
+sobre a matriz de distâncias.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from hospital_routes.core.interfaces import Delivery
+from hospital_routes.utils.candidate_graph import (
+    CandidateGraph,
+    _grid_knn,
+    project_points,
+    spatial_knn,
+)
+from hospital_routes.utils.distance import DEPOT_INDEX, DistanceMatrix
+
+
+DEPOT = (-23.550, -46.640)
+
+
+def _matrix(n_deliveries: int = 300, seed: int = 11, **kwargs):
+    rng = random.Random(seed)
+    deliveries = [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.70 + rng.uniform(0, 0.3), -46.80 + rng.uniform(0, 0.3)),
+            priority=2,
+            weight=1.0,
+        )
+        for i in range(n_deliveries)
+    ]
+    return DistanceMatrix.from_deliveries(deliveries, DEPOT, **kwargs)
+
+
+def _exact_neighbors(matrix, k):
+    """k entregas mais próximas de cada localização (ordenação completa)."""
+    values = matrix.values.astype(np.float64)
+    values[:, DEPOT_INDEX] = np.inf
+    np.fill_diagonal(values, np.inf)
+    order = np.argsort(values, axis=1, kind="stable")[:, :k]
+    return order, np.take_along_axis(values, order, axis=1)
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_grid_knn_matches_brute_force(k):
+    rng = np.random.default_rng(3)
+    data = rng.uniform(0, 50, size=(400, 2))
+    queries = rng.uniform(-5, 55, size=(60, 2))
+    
+    found = _grid_knn(data, queries, k)
+    
+    squared = ((queries[:, None, :] - data[None, :, :]) ** 2).sum(axis=2)
+    expected = np.argsort(squared, axis=1, kind="stable")[:, :k]
+    np.testing.assert_array_equal(found, expected)
+
+
+def test_spatial_knn_limits_k_to_data_size():
+    data = project_points([(-23.55, -46.64), (-23.56, -46.65)])
+    
+    assert spatial_knn(data, data, 5).shape == (2, 2)
+
+
+@pytest.mark.parametrize("layout, dtype", [("dense", "float64"), ("packed", "float32")])
+def test_spatial_graph_matches_exact_neighbors(layout, dtype):
+    matrix = _matrix(layout=layout, dtype=dtype)
+    k = 12
+    
+    graph = CandidateGraph.from_matrix(matrix, k)
+    expected_neighbors, expected_distances = _exact_neighbors(matrix, k)
+    
+    assert len(graph) == len(matrix)
+    np.testing.assert_allclose(graph.distances, expected_distances, rtol=1e-12)
+    np.testing.assert_array_equal(graph.neighbors, expected_neighbors)
+
+
+def test_graph_without_coordinates_uses_exact_search():
+    located = _matrix(n_deliveries=60)
+    matrix = DistanceMatrix(located.ids, located.values)
+    k = 8
+    
+    graph = CandidateGraph.from_matrix(matrix, k)
+    expected_neighbors, expected_distances = _exact_neighbors(matrix, k)
+    
+    np.testing.assert_array_equal(graph.neighbors, expected_neighbors)
+    np.testing.assert_allclose(graph.distances, expected_distances, rtol=1e-12)
+
+
+def test_graph_excludes_depot_and_self():
+    matrix = _matrix(n_deliveries=50)
+    
+    graph = matrix.candidate_graph(10)
+    
+    for i, (neighbors, distances) in enumerate(zip(graph.neighbors, graph.distances)):
+        assert DEPOT_INDEX not in neighbors
+        assert i not in neighbors
+        assert len(set(neighbors)) == len(neighbors) == 10
+        assert distances == sorted(distances)
+
+
+def test_graph_is_cached_and_invalidated_by_updates():
+    matrix = _matrix(n_deliveries=30)
+    graph = matrix.candidate_graph(5)
+    
+    assert matrix.candidate_graph(5) is graph
+    
+    matrix.remove_locations(["D0"])
+    
+    assert matrix.candidate_graph(5) is not graph
+    assert len(matrix.candidate_graph(5)) == 30
+
+
+def test_small_matrix_clips_k():
+    matrix = _matrix(n_deliveries=3)
+    
+    graph = CandidateGraph.from_matrix(matrix, 16)
+    
+    assert [len(neighbors) for neighbors in graph.neighbors] == [2, 2, 2, 2]
@@ -0,0 +1,144 @@
+"""
+Testes da atualização incremental da matriz de distâncias.
+
+``add_locations``/``remove_locations`` devem chegar à mesma matriz que uma
+construção completa com as localizações finais, em todos os formatos de
+armazenamento.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from hospital_routes.core.interfaces import Delivery
+from hospital_routes.utils.distance import (
+    DEPOT_KEY,
+    DistanceMatrix,
+    build_delivery_distance_matrix,
+)
+from hospital_routes.utils.road_network import RoadNetwork
+
+
+DEPOT = (-23.550, -46.640)
+STORAGES = [
+    ("dense", "float64"),
+    ("dense", "float32"),
+    ("packed", "float64"),
+    ("packed", "float32"),
+]
+
+
+def _deliveries(n_deliveries: int = 12, seed: int = 5):
+    rng = random.Random(seed)
+    return [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.60 + rng.uniform(0, 0.1), -46.69 + rng.uniform(0, 0.1)),
+            priority=2,
+            weight=1.0,
+        )
+        for i in range(n_deliveries)
+    ]
+
+
+def _rebuild(deliveries, layout, dtype):
+    return DistanceMatrix.from_deliveries(deliveries, DEPOT, dtype=dtype, layout=layout)
+
+
+@pytest.mark.parametrize("layout, dtype", STORAGES)
+def test_add_locations_matches_rebuild(layout, dtype):
+    deliveries = _deliveries()
+    matrix = _rebuild(deliveries[:8], layout, dtype)
+    
+    added = matrix.add_locations(
+        [d.id for d in deliveries[8:]], [d.location for d in deliveries[8:]]
+    )
+    expected = _rebuild(deliveries, layout, dtype)
+    
+    assert added == list(range(9, 13))
+    assert matrix.ids == expected.ids
+    assert matrix.data.shape == expected.data.shape
+    np.testing.assert_array_equal(matrix.values, expected.values)
+
+
+@pytest.mark.parametrize("layout, dtype", STORAGES)
+def test_remove_locations_matches_rebuild(layout, dtype):
+    deliveries = _deliveries()
+    matrix = _rebuild(deliveries, layout, dtype)
+    removed = {"D0", "D3", "D4", "D11"}
+    
+    matrix.remove_locations(sorted(removed))
+    expected = _rebuild([d for d in deliveries if d.id not in removed], layout, dtype)
+    
+    assert matrix.ids == expected.ids
+    np.testing.assert_array_equal(matrix.values, expected.values)
+    assert matrix.distance(1, 2) == expected.distance(1, 2)
+
+
+def test_update_reuses_previous_matrix():
+    deliveries = _deliveries()
+    previous = build_delivery_distance_matrix(deliveries[:10], DEPOT, layout="packed")
+    replanned = deliveries[2:]
+    
+    matrix = build_delivery_distance_matrix(
+        replanned, DEPOT, layout="packed", previous=previous
+    )
+    expected = _rebuild(replanned, "packed", "float64")
+    
+    assert matrix is previous
+    assert matrix.ids == expected.ids
+    np.testing.assert_array_equal(matrix.values, expected.values)
+
+
+def test_update_deliveries_replaces_moved_location():
+    deliveries = _deliveries()
+    matrix = _rebuild(deliveries, "dense", "float64")
+    moved = Delivery(id="D5", location=(-23.555, -46.645), priority=2, weight=1.0)
+    replanned = [d for d in deliveries if d.id != "D5"] + [moved]
+    
+    counts = matrix.update_deliveries(replanned)
+    expected = _rebuild(replanned, "dense", "float64")
+    
+    assert counts == (1, 1)
+    np.testing.assert_array_equal(matrix.values, expected.values)
+
+
+def test_add_locations_on_road_network_matches_rebuild():
+    size, spacing = 6, 0.01
+    latitudes = [-23.60 + (k // size) * spacing for k in range(size * size)]
+    longitudes = [-46.69 + (k % size) * spacing for k in range(size * size)]
+    sources, targets = [], []
+    for row in range(size):
+        for col in range(size - 1):
+            a, b = row * size + col, row * size + col + 1
+            sources += [a if row % 2 == 0 else b]
+            targets += [b if row % 2 == 0 else a]
+    for col in range(size):
+        for row in range(size - 1):
+            a, b = row * size + col, (row + 1) * size + col
+            sources += [a, b]
+            targets += [b, a]
+    network = RoadNetwork.from_edges(latitudes, longitudes, sources, targets)
+    
+    deliveries = _deliveries(n_deliveries=8)
+    points = [DEPOT] + [d.location for d in deliveries]
+    ids = [DEPOT_KEY] + [d.id for d in deliveries]
+    initial = network.distance_array(points[:6], points[:6])
+    np.fill_diagonal(initial, 0.0)
+    matrix = DistanceMatrix(ids[:6], initial, locations=points[:6], network=network)
+    
+    matrix.add_locations(ids[6:], points[6:])
+    expected = network.distance_array(points, points)
+    np.fill_diagonal(expected, 0.0)
+    
+    assert not matrix.symmetric
+    np.testing.assert_array_equal(matrix.values, expected)
+
+
+def test_add_existing_location_raises():
+    deliveries = _deliveries()
+    matrix = _rebuild(deliveries, "dense", "float64")
+    
+    with pytest.raises(ValueError):
+        matrix.add_locations(["D1"], [(-23.56, -46.65)])
@@ -0,0 +1,133 @@
+"""
+Testes do modelo de ilhas: a migração não perde nem duplica entregas.
+"""
+
+import random
+
+import pytest
+
+from hospital_routes.core.interfaces import Delivery, OptimizationConfig, VehicleConstraints
+from hospital_routes.optimization.genetic_algorithm import GeneticAlgorithmOptimizer
+from hospital_routes.optimization.island_model import (
+    IslandModelOptimizer,
+    _export,
+    _import,
+    _receive_immigrants,
+)
+
+
+DEPOT = (-23.5505, -46.6333)
+
+
+def _instance(n_deliveries: int = 20, seed: int = 9):
+    rng = random.Random(seed)
+    deliveries = [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.55 + rng.uniform(-0.05, 0.05), -46.63 + rng.uniform(-0.05, 0.05)),
+            priority=rng.choice([1, 2]),
+            weight=rng.uniform(1, 10),
+        )
+        for i in range(n_deliveries)
+    ]
+    vehicles = [
+        VehicleConstraints(
+            max_capacity=60.0, max_range=120.0,
+            fuel_cost_per_km=0.8, driver_cost_per_hour=30.0,
+        )
+        for _ in range(4)
+    ]
+    return deliveries, vehicles
+
+
+def _population(ga, deliveries, vehicles, size):
+    population = ga._create_initial_population(
+        deliveries, vehicles, DEPOT, OptimizationConfig(population_size=size)
+    )
+    ga._evaluate_population(population)
+    return population
+
+
+def _delivery_ids(ga, individual):
+    """IDs atendidos pelo indivíduo, em qualquer codificação."""
+    routes = ga._decode(individual) if ga.encoding == "giant_tour" else individual
+    return sorted(d_id for route in routes for d_id in route)
+
+
+@pytest.mark.parametrize("topology", ["ring", "random"])
+def test_migrate_sends_each_island_emigrants_to_one_other_island(topology):
+    optimizer = IslandModelOptimizer(n_islands=4, migration_size=2, topology=topology)
+    emigrants = [[(f"genes-{i}-{k}", float(k)) for k in range(2)] for i in range(4)]
+    
+    immigrants = optimizer._migrate(emigrants, random.Random(0))
+    
+    received = [individual for island in immigrants for individual in island]
+    assert sorted(received) == sorted(sum(emigrants, []))
+    for target, island in enumerate(immigrants):
+        assert all(not genes.startswith(f"genes-{target}-") for genes, _ in island)
+    if topology == "ring":
+        assert immigrants == [emigrants[3], emigrants[0], emigrants[1], emigrants[2]]
+
+
+def test_migrate_without_partners_sends_nothing():
+    optimizer = IslandModelOptimizer(n_islands=1, migration_size=2)
+    
+    assert optimizer._migrate([[("genes", 1.0)]], random.Random(0)) == [[]]
+
+
+@pytest.mark.parametrize("encoding", ["routes", "giant_tour"])
+def test_immigrants_keep_every_delivery_and_replace_the_worst(encoding):
+    deliveries, vehicles = _instance()
+    ga = GeneticAlgorithmOptimizer(encoding=encoding)
+    ga._prepare_problem(deliveries, vehicles, DEPOT, OptimizationConfig())
+    population = _population(ga, deliveries, vehicles, 10)
+    source = _population(ga, deliveries, vehicles, 10)
+    emigrants = [
+        _export(ind) for ind in sorted(source, key=lambda ind: ind.fitness.values[0])[:3]
+    ]
+    
+    merged = _receive_immigrants(ga, population, emigrants)
+    
+    all_ids = sorted(d.id for d in deliveries)
+    assert len(merged) == len(population)
+    assert all(_delivery_ids(ga, ind) == all_ids for ind in merged)
+    for (_, fitness), immigrant in zip(emigrants, merged[-3:]):
+        assert immigrant.fitness.values[0] == fitness
+        assert ga._evaluate_individual(immigrant) == pytest.approx(fitness, rel=1e-12)
+    survivors = sorted(ind.fitness.values[0] for ind in merged[:-3])
+    assert survivors == sorted(ind.fitness.values[0] for ind in population)[:-3]
+
+
+@pytest.mark.parametrize("encoding", ["routes", "giant_tour"])
+def test_export_import_round_trip(encoding):
+    deliveries, vehicles = _instance()
+    ga = GeneticAlgorithmOptimizer(encoding=encoding)
+    ga._prepare_problem(deliveries, vehicles, DEPOT, OptimizationConfig())
+    individual = _population(ga, deliveries, vehicles, 4)[0]
+    
+    restored = _import(ga, *_export(individual))
+    
+    assert list(restored) == list(individual)
+    assert type(restored) is type(individual)
+    assert restored.fitness.values == individual.fitness.values
+
+
+@pytest.mark.parametrize("encoding, topology", [
+    ("routes", "ring"),
+    ("giant_tour", "random"),
+])
+def test_island_model_solution_serves_every_delivery(encoding, topology):
+    deliveries, vehicles = _instance()
+    optimizer = IslandModelOptimizer(
+        n_islands=2, migration_interval=2, migration_size=2,
+        topology=topology, encoding=encoding, seed=1,
+    )
+    
+    result = optimizer.optimize(
+        deliveries, vehicles, OptimizationConfig(population_size=16, generations=6), DEPOT
+    )
+    
+    served = [d_id for route in result.solution.routes for d_id in route]
+    assert sorted(served) == sorted(d.id for d in deliveries)
+    assert result.statistics["migrations"] == 2
+    assert result.generations_evolved == 6
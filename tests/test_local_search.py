@@ -0,0 +1,131 @@
+"""
+Testes da busca local em matrizes assimétricas (malha viária).
+
+Com vias de mão única, inverter um trecho da rota muda o custo do próprio
+trecho; o 2-opt e o relocate invertido precisam considerar isso para não
+aplicar movimentos que pioram a rota (e ciclar sem fim).
+"""
+
+import random
+
+from hospital_routes.core.interfaces import Delivery, VehicleConstraints
+from hospital_routes.optimization.local_search import LocalSearch
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.deadline import Deadline
+from hospital_routes.utils.distance import DEPOT_KEY, DistanceMatrix
+from hospital_routes.utils.road_network import RoadNetwork
+
+
+DEPOT = (-23.550, -46.640)
+
+
+def _one_way_grid(size: int = 8, spacing: float = 0.004) -> RoadNetwork:
+    """Grade de ruas de mão única com sentidos alternados."""
+    latitudes = []
+    longitudes = []
+    for row in range(size):
+        for col in range(size):
+            latitudes.append(-23.564 + row * spacing)
+            longitudes.append(-46.654 + col * spacing)
+    
+    sources = []
+    targets = []
+    for row in range(size):
+        for col in range(size - 1):
+            a, b = row * size + col, row * size + col + 1
+            sources.append(a if row % 2 == 0 else b)
+            targets.append(b if row % 2 == 0 else a)
+    for col in range(size):
+        for row in range(size - 1):
+            a, b = row * size + col, (row + 1) * size + col
+            sources.append(a if col % 2 == 0 else b)
+            targets.append(b if col % 2 == 0 else a)
+    
+    return RoadNetwork.from_edges(latitudes, longitudes, sources, targets)
+
+
+def _instance(n_deliveries: int = 15, seed: int = 7):
+    rng = random.Random(seed)
+    deliveries = [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.562 + rng.uniform(0, 0.026), -46.652 + rng.uniform(0, 0.026)),
+            priority=rng.choice([1, 2]),
+            weight=1.0,
+        )
+        for i in range(n_deliveries)
+    ]
+    vehicles = [
+        VehicleConstraints(
+            max_capacity=100.0, max_range=500.0,
+            fuel_cost_per_km=1.0, driver_cost_per_hour=10.0,
+        )
+        for _ in range(3)
+    ]
+    network = _one_way_grid()
+    points = [DEPOT] + [d.location for d in deliveries]
+    matrix = DistanceMatrix(
+        [DEPOT_KEY] + [d.id for d in deliveries],
+        network.distance_array(points, points),
+        locations=points,
+        network=network,
+    )
+    return deliveries, vehicles, matrix
+
+
+def _search(deliveries, vehicles, matrix, priority_penalty=500.0):
+    return LocalSearch(
+        deliveries, vehicles, DEPOT, matrix,
+        fitness_weights=FitnessWeights(priority_penalty=priority_penalty),
+    )
+
+
+def _total_distance(matrix, routes):
+    return sum(matrix.route_distance(matrix.indices(route)) for route in routes)
+
+
+def test_matrix_is_asymmetric():
+    _, _, matrix = _instance()
+    
+    assert not matrix.symmetric
+    assert (matrix.values != matrix.values.T).any()
+
+
+def test_two_opt_terminates_and_never_worsens_distance():
+    deliveries, vehicles, matrix = _instance()
+    search = _search(deliveries, vehicles, matrix, priority_penalty=0.0)
+    route = [d.id for d in deliveries]
+    deadline = Deadline(30.0)
+    
+    improved = search._two_opt(route, deadline)
+    
+    assert not deadline.reached
+    assert sorted(improved) == sorted(route)
+    assert _total_distance(matrix, [improved]) <= _total_distance(matrix, [route]) + 1e-9
+
+
+def test_inter_route_moves_never_worsen_distance():
+    deliveries, vehicles, matrix = _instance()
+    search = _search(deliveries, vehicles, matrix, priority_penalty=0.0)
+    ids = [d.id for d in deliveries]
+    routes = [ids[0:5], ids[5:10], ids[10:15]]
+    
+    for _ in range(50):
+        moved = search.improve_routes(routes, max_moves=1)
+        assert _total_distance(matrix, moved) <= _total_distance(matrix, routes) + 1e-9
+        if moved == routes:
+            break
+        routes = moved
+
+
+def test_polish_routes_terminates_without_deadline_firing():
+    deliveries, vehicles, matrix = _instance()
+    search = _search(deliveries, vehicles, matrix)
+    ids = [d.id for d in deliveries]
+    routes = [ids[0:5], ids[5:10], ids[10:15]]
+    deadline = Deadline(30.0)
+    
+    polished = search.polish_routes(routes, deadline=deadline)
+    
+    assert not deadline.reached
+    assert sorted(d_id for route in polished for d_id in route) == sorted(ids)
@@ -0,0 +1,117 @@
+"""
+Testes do portfólio de operadores: crédito e seleção adaptativa.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from hospital_routes.optimization.operator_selection import (
+    MIN_OPERATOR_WEIGHT,
+    OperatorPortfolio,
+)
+
+
+NAMES = ["swap", "move", "reverse"]
+
+
+def test_record_credits_only_positive_improvement():
+    portfolio = OperatorPortfolio(NAMES)
+    
+    portfolio.record("swap", 3.0, 0.5)
+    portfolio.record("swap", -2.0, 0.5)
+    portfolio.record("move", 0.0, 0.25)
+    
+    stats = portfolio.stats()
+    assert stats["swap"]["uses"] == 2
+    assert stats["swap"]["successes"] == 1
+    assert stats["swap"]["success_rate"] == 0.5
+    assert stats["swap"]["improvement"] == 3.0
+    assert stats["swap"]["cpu_time"] == 1.0
+    assert stats["swap"]["improvement_per_second"] == 3.0
+    assert stats["move"]["improvement_per_second"] == 0.0
+    assert stats["reverse"]["uses"] == 0
+
+
+def test_end_segment_rewards_improvement_per_second():
+    portfolio = OperatorPortfolio(NAMES, reaction_factor=0.5)
+    # Mesma melhoria total, mas "move" custa o dobro do tempo
+    portfolio.record("swap", 4.0, 1.0)
+    portfolio.record("move", 4.0, 2.0)
+    
+    portfolio.end_segment()
+    
+    assert portfolio.weights["swap"] == pytest.approx(1.0)
+    assert portfolio.weights["move"] == pytest.approx(0.75)
+    # Operador não usado no segmento mantém o peso
+    assert portfolio.weights["reverse"] == 1.0
+
+
+def test_weights_never_drop_below_minimum():
+    portfolio = OperatorPortfolio(NAMES, reaction_factor=0.9)
+    for _ in range(20):
+        portfolio.record("swap", 1.0, 1.0)
+        portfolio.record("move", 0.0, 1.0)
+        portfolio.end_segment()
+    
+    assert portfolio.weights["move"] == MIN_OPERATOR_WEIGHT
+    assert portfolio.probabilities()["move"] == pytest.approx(
+        MIN_OPERATOR_WEIGHT / (2.0 + MIN_OPERATOR_WEIGHT)
+    )
+
+
+def test_segment_credit_is_reset():
+    portfolio = OperatorPortfolio(NAMES, reaction_factor=0.5)
+    portfolio.record("move", 5.0, 1.0)
+    portfolio.end_segment()
+    weights = dict(portfolio.weights)
+    
+    portfolio.end_segment()
+    
+    assert portfolio.weights == weights
+
+
+def test_roulette_follows_weights():
+    portfolio = OperatorPortfolio(NAMES, rng=random.Random(1))
+    portfolio.weights = {"swap": 6.0, "move": 3.0, "reverse": 1.0}
+    
+    counts = Counter(portfolio.select() for _ in range(10_000))
+    
+    assert portfolio.probabilities() == pytest.approx(
+        {"swap": 0.6, "move": 0.3, "reverse": 0.1}
+    )
+    assert counts["swap"] / 10_000 == pytest.approx(0.6, abs=0.03)
+    assert counts["move"] / 10_000 == pytest.approx(0.3, abs=0.03)
+    assert counts["reverse"] / 10_000 == pytest.approx(0.1, abs=0.03)
+
+
+def test_ucb_tries_every_operator_then_prefers_the_best():
+    portfolio = OperatorPortfolio(NAMES, policy="ucb", exploration=0.1)
+    gains = {"swap": 1.0, "move": 10.0, "reverse": 0.0}
+    
+    chosen = []
+    for _ in range(200):
+        name = portfolio.select()
+        chosen.append(name)
+        portfolio.record(name, gains[name], 0.01)
+    
+    assert chosen[:3] == NAMES
+    assert portfolio.uses["move"] > portfolio.uses["swap"] > 0
+    assert portfolio.uses["move"] > portfolio.uses["reverse"] > 0
+    assert portfolio.probabilities()["move"] == portfolio.uses["move"] / 200
+
+
+def test_uniform_policy_keeps_equal_probabilities():
+    portfolio = OperatorPortfolio(NAMES, policy="uniform", rng=random.Random(2))
+    portfolio.record("swap", 10.0, 0.1)
+    portfolio.end_segment()
+    
+    assert portfolio.select() in NAMES
+    assert portfolio.probabilities() == pytest.approx({name: 1 / 3 for name in NAMES})
+
+
+@pytest.mark.parametrize("names, policy", [([], "roulette"), (NAMES, "greedy")])
+def test_invalid_portfolio_raises(names, policy):
+    with pytest.raises(ValueError):
+        OperatorPortfolio(names, policy=policy)
@@ -0,0 +1,69 @@
+"""
+Testes da avaliação paralela com o problema em memória compartilhada.
+"""
+
+import random
+
+import pytest
+
+from hospital_routes.core.interfaces import Delivery, OptimizationConfig, VehicleConstraints
+from hospital_routes.optimization.genetic_algorithm import GeneticAlgorithmOptimizer
+from hospital_routes.optimization.parallel_evaluation import (
+    ParallelEvaluator,
+    _worker_state,
+    evaluate_shared,
+)
+
+
+DEPOT = (-23.5505, -46.6333)
+
+
+def _instance(n_deliveries: int = 20, seed: int = 5):
+    rng = random.Random(seed)
+    deliveries = [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.55 + rng.uniform(-0.05, 0.05), -46.63 + rng.uniform(-0.05, 0.05)),
+            priority=rng.choice([1, 2]),
+            weight=rng.uniform(1, 10),
+        )
+        for i in range(n_deliveries)
+    ]
+    vehicles = [
+        VehicleConstraints(
+            max_capacity=60.0, max_range=120.0,
+            fuel_cost_per_km=0.8, driver_cost_per_hour=30.0,
+        )
+        for _ in range(4)
+    ]
+    return deliveries, vehicles
+
+
+def _evaluate_and_probe(individual):
+    """Avalia no worker e informa se a matriz criou ``rows``."""
+    fitness = evaluate_shared(individual)
+    matrix = _worker_state["optimizer"]._distance_matrix
+    return fitness, matrix._rows is not None
+
+
+@pytest.mark.parametrize("encoding", ["routes", "giant_tour"])
+def test_workers_evaluate_without_materializing_rows(encoding):
+    deliveries, vehicles = _instance()
+    ga = GeneticAlgorithmOptimizer(encoding=encoding)
+    ga._prepare_problem(deliveries, vehicles, DEPOT, OptimizationConfig())
+    population = ga._create_initial_population(
+        deliveries, vehicles, DEPOT, OptimizationConfig(population_size=8)
+    )
+    expected = [ga._evaluate_individual(ind) for ind in population]
+    
+    evaluator = ParallelEvaluator(
+        deliveries, vehicles, DEPOT, ga._distance_matrix, ga.fitness_weights,
+        n_workers=2, encoding=encoding,
+    )
+    try:
+        results = evaluator.map(_evaluate_and_probe, population)
+    finally:
+        evaluator.close()
+    
+    assert [materialized for _, materialized in results] == [False] * len(population)
+    assert [fitness for fitness, _ in results] == pytest.approx(expected, rel=1e-12)
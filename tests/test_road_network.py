@@ -0,0 +1,138 @@
+"""
+Testes da malha viária: caminhos mínimos, distâncias e leitura de arquivos.
+
+Os caminhos mínimos são conferidos contra Floyd-Warshall em um grafo
+dirigido aleatório (com nós inalcançáveis).
+"""
+
+import numpy as np
+import pytest
+
+from hospital_routes.utils import road_network as road_network_module
+from hospital_routes.utils.distance import compute_distance_array
+from hospital_routes.utils.road_network import FALLBACK_DETOUR_FACTOR, RoadNetwork
+
+
+def _random_network(n_nodes: int = 40, n_edges: int = 120, seed: int = 2):
+    rng = np.random.default_rng(seed)
+    latitudes = -23.60 + rng.uniform(0, 0.1, n_nodes)
+    longitudes = -46.70 + rng.uniform(0, 0.1, n_nodes)
+    # Os dois últimos nós não recebem arestas (inalcançáveis)
+    sources = rng.integers(0, n_nodes, n_edges)
+    targets = rng.integers(0, n_nodes - 2, n_edges)
+    lengths = rng.uniform(0.5, 3.0, n_edges)
+    network = RoadNetwork.from_edges(latitudes, longitudes, sources, targets, lengths)
+    return network, sources, targets, lengths
+
+
+def _floyd_warshall(n_nodes, sources, targets, lengths):
+    distances = np.full((n_nodes, n_nodes), np.inf)
+    for a, b, length in zip(sources, targets, lengths):
+        if a != b:
+            distances[a, b] = min(distances[a, b], length)
+    np.fill_diagonal(distances, 0.0)
+    for k in range(n_nodes):
+        distances = np.minimum(distances, distances[:, k:k + 1] + distances[k:k + 1, :])
+    return distances
+
+
+@pytest.fixture(params=["dijkstra", "scipy"])
+def backend(request, monkeypatch):
+    if request.param == "scipy" and not road_network_module.SCIPY_AVAILABLE:
+        pytest.skip("SciPy não instalado")
+    if request.param == "dijkstra":
+        monkeypatch.setattr(road_network_module, "SCIPY_AVAILABLE", False)
+    return request.param
+
+
+def test_shortest_paths_match_floyd_warshall(backend):
+    network, sources, targets, lengths = _random_network()
+    expected = _floyd_warshall(network.node_count, sources, targets, lengths)
+    origins = [0, 5, 17, 38, 39]
+    destinations = [3, 0, 39, 22, 22, 11]
+    
+    paths = network.shortest_paths(origins, destinations)
+    
+    np.testing.assert_allclose(
+        paths, expected[np.ix_(origins, destinations)], rtol=1e-12
+    )
+    assert np.isinf(paths[:-1, 2]).all() and paths[-1, 2] == 0.0
+
+
+def test_from_edges_keeps_shortest_parallel_edge_and_drops_loops():
+    network = RoadNetwork.from_edges(
+        [0.0, 0.0, 0.0], [0.0, 0.01, 0.02],
+        sources=[0, 0, 1, 1], targets=[1, 1, 1, 2], lengths=[5.0, 2.0, 1.0, 3.0],
+    )
+    
+    assert network.edge_count == 2
+    np.testing.assert_allclose(network.shortest_paths([0], [1, 2]), [[2.0, 5.0]])
+    assert np.isinf(network.shortest_paths([2], [0])).all()
+
+
+def test_distance_array_on_nodes_follows_the_graph():
+    latitudes = [-23.55, -23.55, -23.54]
+    longitudes = [-46.64, -46.63, -46.63]
+    network = RoadNetwork.from_edges(
+        latitudes, longitudes, sources=[0, 1, 2], targets=[1, 2, 0],
+    )
+    points = list(zip(latitudes, longitudes))
+    
+    values = network.distance_array(points, points)
+    
+    straight = compute_distance_array(points)
+    assert values[0, 1] == pytest.approx(straight[0, 1])
+    assert values[1, 0] == pytest.approx(straight[1, 2] + straight[2, 0])
+    assert (values >= straight - 1e-12).all()
+    assert network.fallback_pairs == 0
+
+
+def test_unreachable_pairs_use_detour_fallback():
+    network = RoadNetwork.from_edges(
+        [-23.55, -23.50], [-46.64, -46.60], sources=[0], targets=[1],
+    )
+    points = [(-23.55, -46.64), (-23.50, -46.60)]
+    
+    values = network.distance_array(points[1:], points[:1])
+    
+    straight = compute_distance_array(points[1:], points[:1])
+    assert values[0, 0] == pytest.approx(straight[0, 0] * FALLBACK_DETOUR_FACTOR)
+    assert network.fallback_pairs == 1
+
+
+def test_index_round_trip(tmp_path):
+    network, _, _, _ = _random_network()
+    path = str(tmp_path / "network.npz")
+    
+    network.save_index(path)
+    loaded = RoadNetwork.from_file(path)
+    
+    assert loaded.fingerprint == network.fingerprint
+    np.testing.assert_array_equal(
+        loaded.shortest_paths([0, 1], [2, 3]), network.shortest_paths([0, 1], [2, 3])
+    )
+
+
+def test_osm_xml_respects_oneway(tmp_path):
+    path = tmp_path / "streets.osm"
+    path.write_text(
+        '<?xml version="1.0"?>\n'
+        '<osm>\n'
+        '  <node id="1" lat="-23.550" lon="-46.640"/>\n'
+        '  <node id="2" lat="-23.550" lon="-46.630"/>\n'
+        '  <node id="3" lat="-23.540" lon="-46.630"/>\n'
+        '  <way id="10"><nd ref="1"/><nd ref="2"/>'
+        '<tag k="highway" v="residential"/><tag k="oneway" v="yes"/></way>\n'
+        '  <way id="11"><nd ref="2"/><nd ref="3"/>'
+        '<tag k="highway" v="primary"/></way>\n'
+        '  <way id="12"><nd ref="3"/><nd ref="1"/>'
+        '<tag k="highway" v="footway"/></way>\n'
+        '</osm>\n'
+    )
+    
+    network = RoadNetwork.from_file(str(path), use_index=False)
+    
+    assert network.node_count == 3
+    assert network.edge_count == 3
+    paths = network.shortest_paths([0, 1], [0, 1, 2])
+    assert np.isfinite(paths[0, 1]) and np.isinf(paths[1, 0])
@@ -0,0 +1,121 @@
+"""
+Testes do Split (decodificação de giant tours).
+
+O Split deve devolver o particionamento de custo mínimo do tour em rotas
+consecutivas; em instâncias pequenas isso é conferido contra a enumeração
+de todos os pontos de corte.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from hospital_routes.core.interfaces import Delivery, VehicleConstraints
+from hospital_routes.optimization.split import GiantTourSplitter
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.distance import build_delivery_distance_matrix
+
+
+DEPOT = (-23.550, -46.640)
+WEIGHTS = FitnessWeights(priority_penalty=5.0, vehicle_penalty=10.0)
+
+
+def _instance(n_deliveries: int = 8, seed: int = 3):
+    rng = random.Random(seed)
+    deliveries = [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.60 + rng.uniform(0, 0.1), -46.69 + rng.uniform(0, 0.1)),
+            priority=rng.choice([1, 2]),
+            weight=rng.uniform(5.0, 20.0),
+        )
+        for i in range(n_deliveries)
+    ]
+    vehicles = [
+        VehicleConstraints(
+            max_capacity=capacity, max_range=max_range,
+            fuel_cost_per_km=1.0, driver_cost_per_hour=10.0,
+        )
+        for capacity, max_range in ((45.0, 50.0), (60.0, 35.0), (50.0, 60.0))
+    ]
+    matrix = build_delivery_distance_matrix(deliveries, DEPOT)
+    return deliveries, vehicles, matrix
+
+
+def _route_cost(route, vehicle, splitter):
+    """Custo de uma rota no Split (None se a rota viola alguma restrição)."""
+    matrix = splitter.distance_matrix
+    distance = matrix.route_distance(route)
+    load = sum(splitter._weights[stop] for stop in route)
+    if len(route) > 1 and (load > vehicle.max_capacity or distance > vehicle.max_range):
+        return None
+    
+    delay = sum(
+        position for position, stop in enumerate(route) if splitter._critical[stop]
+    )
+    return (
+        WEIGHTS.distance_weight * distance
+        + WEIGHTS.priority_penalty * delay
+        + WEIGHTS.vehicle_penalty
+    )
+
+
+def _brute_force(tour, vehicles, splitter):
+    """Menor custo entre todas as divisões do tour em até len(vehicles) rotas."""
+    best = float('inf')
+    for n_cuts in range(len(vehicles)):
+        for cuts in itertools.combinations(range(1, len(tour)), n_cuts):
+            bounds = (0,) + cuts + (len(tour),)
+            total = 0.0
+            for vehicle, start, stop in zip(vehicles, bounds, bounds[1:]):
+                cost = _route_cost(list(tour[start:stop]), vehicle, splitter)
+                if cost is None:
+                    break
+                total += cost
+            else:
+                best = min(best, total)
+    return best
+
+
+def _split_cost(routes, vehicles, splitter):
+    costs = [_route_cost(route, vehicle, splitter) for route, vehicle in zip(routes, vehicles)]
+    assert None not in costs
+    return sum(costs)
+
+
+# Embaralhamentos com ao menos uma divisão viável (sem cair no fallback)
+@pytest.mark.parametrize("seed", [0, 2, 3, 4, 5])
+def test_split_matches_brute_force(seed):
+    deliveries, vehicles, matrix = _instance()
+    splitter = GiantTourSplitter(matrix, deliveries, vehicles, WEIGHTS)
+    tour = [matrix.index_of(d.id) for d in deliveries]
+    random.Random(seed).shuffle(tour)
+    best = _brute_force(tour, vehicles, splitter)
+    
+    routes = splitter.split(tour)
+    
+    assert best < float('inf')
+    assert [stop for route in routes for stop in route] == tour
+    assert len(routes) <= len(vehicles)
+    assert _split_cost(routes, vehicles, splitter) == pytest.approx(best, rel=1e-12)
+
+
+def test_split_falls_back_when_fleet_is_too_small():
+    deliveries, vehicles, matrix = _instance()
+    splitter = GiantTourSplitter(matrix, deliveries, vehicles[:1], WEIGHTS)
+    tour = [matrix.index_of(d.id) for d in deliveries]
+    
+    routes = splitter.split(tour)
+    
+    assert routes == [tour]
+
+
+def test_decode_returns_delivery_ids():
+    deliveries, vehicles, matrix = _instance()
+    splitter = GiantTourSplitter(matrix, deliveries, vehicles, WEIGHTS)
+    tour = [matrix.index_of(d.id) for d in deliveries]
+    
+    decoded = splitter.decode(tour)
+    
+    assert [d_id for route in decoded for d_id in route] == [d.id for d in deliveries]
@@ -0,0 +1,142 @@
+"""
+Testes da avaliação vetorizada da população.
+
+``population_components`` deve reproduzir, solução a solução, os
+componentes do avaliador fundido (``components_from_indices``), inclusive
+com penalidades de capacidade, autonomia e rotas além da frota.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from hospital_routes.core.interfaces import Delivery, OptimizationConfig, VehicleConstraints
+from hospital_routes.optimization.fitness.fused_fitness import FusedFitnessEvaluator
+from hospital_routes.optimization.genetic_algorithm import GeneticAlgorithmOptimizer
+from hospital_routes.utils.config import FitnessWeights
+from hospital_routes.utils.distance import DistanceMatrix
+
+
+DEPOT = (-23.5505, -46.6333)
+COMPONENTS = (
+    "distance",
+    "capacity_penalty",
+    "autonomy_penalty",
+    "priority_penalty",
+    "load_balance_penalty",
+    "vehicle_penalty",
+)
+
+
+def _instance(n_deliveries: int = 30, seed: int = 4):
+    rng = random.Random(seed)
+    deliveries = [
+        Delivery(
+            id=f"D{i}",
+            location=(-23.55 + rng.uniform(-0.1, 0.1), -46.63 + rng.uniform(-0.1, 0.1)),
+            priority=rng.choice([1, 2]),
+            weight=rng.uniform(1, 10),
+        )
+        for i in range(n_deliveries)
+    ]
+    # Capacidade e autonomia apertadas: penalidades aparecem com frequência
+    vehicles = [
+        VehicleConstraints(
+            max_capacity=40.0, max_range=35.0,
+            fuel_cost_per_km=0.8, driver_cost_per_hour=30.0,
+        )
+        for _ in range(4)
+    ]
+    return deliveries, vehicles
+
+
+def _solutions(matrix, n_vehicles, n_solutions=40, seed=8):
+    """Soluções aleatórias, algumas com rotas vazias ou além da frota."""
+    rng = random.Random(seed)
+    stops = list(range(1, len(matrix)))
+    solutions = []
+    for _ in range(n_solutions):
+        rng.shuffle(stops)
+        n_routes = rng.randint(1, n_vehicles + 2)
+        cuts = sorted(rng.choices(range(len(stops) + 1), k=n_routes - 1))
+        bounds = [0] + cuts + [len(stops)]
+        solutions.append([stops[a:b] for a, b in zip(bounds, bounds[1:])])
+    return solutions
+
+
+def _evaluator(layout="dense", dtype="float64", materialize_rows=True):
+    deliveries, vehicles = _instance()
+    built = DistanceMatrix.from_deliveries(deliveries, DEPOT, dtype=dtype, layout=layout)
+    matrix = DistanceMatrix(
+        built.ids, built.data, locations=built.locations, dtype=dtype,
+        layout=layout, materialize_rows=materialize_rows,
+    )
+    weights = FitnessWeights()
+    return FusedFitnessEvaluator(weights, deliveries, vehicles, matrix), len(vehicles)
+
+
+@pytest.mark.parametrize("layout, dtype, materialize_rows", [
+    ("dense", "float64", True),
+    ("dense", "float32", True),
+    ("packed", "float32", True),
+    ("packed", "float64", False),
+])
+def test_population_components_match_fused(layout, dtype, materialize_rows):
+    evaluator, n_vehicles = _evaluator(layout, dtype, materialize_rows)
+    solutions = _solutions(evaluator.distance_matrix, n_vehicles)
+    
+    vectorized = evaluator.population_components(solutions)
+    
+    fused = [evaluator.components_from_indices(routes) for routes in solutions]
+    for name in COMPONENTS:
+        assert vectorized[name].shape == (len(solutions),)
+        np.testing.assert_allclose(
+            vectorized[name], [c[name] for c in fused], rtol=1e-12, atol=1e-9,
+            err_msg=name,
+        )
+    # As soluções sorteadas exercitam todas as penalidades
+    assert (vectorized["capacity_penalty"] > 0).any()
+    assert (vectorized["autonomy_penalty"] > 0).any()
+
+
+def test_vectorized_fitness_matches_fused_population():
+    evaluator, n_vehicles = _evaluator()
+    solutions = _solutions(evaluator.distance_matrix, n_vehicles)
+    
+    vectorized = evaluator.evaluate_population_vectorized(solutions)
+    
+    assert vectorized.tolist() == pytest.approx(
+        evaluator.evaluate_population(solutions), rel=1e-12
+    )
+    assert vectorized.tolist() == pytest.approx(
+        [evaluator.evaluate_indices(routes) for routes in solutions], rel=1e-12
+    )
+
+
+def test_vectorized_handles_empty_population_and_empty_routes():
+    evaluator, _ = _evaluator()
+    
+    assert evaluator.evaluate_population_vectorized([]).shape == (0,)
+    
+    solutions = [[[], [1, 2], []], [[]]]
+    assert evaluator.evaluate_population_vectorized(solutions).tolist() == pytest.approx(
+        [evaluator.evaluate_indices(routes) for routes in solutions], rel=1e-12
+    )
+
+
+@pytest.mark.parametrize("encoding", ["routes", "giant_tour"])
+def test_ga_vectorized_mode_matches_fused_mode(encoding):
+    deliveries, vehicles = _instance()
+    fitnesses = {}
+    for mode in ("fused", "vectorized"):
+        random.seed(3)
+        np.random.seed(3)
+        ga = GeneticAlgorithmOptimizer(encoding=encoding, evaluation_mode=mode)
+        ga._prepare_problem(deliveries, vehicles, DEPOT, OptimizationConfig())
+        population = ga._create_initial_population(
+            deliveries, vehicles, DEPOT, OptimizationConfig(population_size=12)
+        )
+        fitnesses[mode] = ga._compute_fitnesses(population)
+    
+    assert fitnesses["vectorized"] == pytest.approx(fitnesses["fused"], rel=1e-12)
@@ -87,10 +87,15 @@ class AccidentDataProvider:
             return self._accident_cache[location]
         
         # Buscar próximo (dentro do raio)
-        from hospital_routes.utils.distance import calculate_distance
+        from hospital_routes.utils.distance_service import get_distance_service
         
+        distance_service = get_distance_service()
         for cached_loc, data in self._accident_cache.items():
-            distance = calculate_distance(location, cached_loc)
+            distance = distance_service.distance(
+                location, cached_loc,
+                call_site="AccidentDataProvider.get_accident_data",
+                geodesic=True,
+            )
             if distance <= radius_km:
                 return data
         
@@ -1,39 +1,268 @@
 """
 Sistema de cache para distâncias e outros cálculos custosos.
 
-Implementa cache LRU em memória com opção de persistência.
+Implementa cache LRU em memória com opção de persistência em um log
+binário append-only (gravado em lotes e compactado periodicamente) ou em
+um banco SQLite (modo WAL) compartilhado entre processos e execuções.
 """
 
-from functools import lru_cache, wraps
-from typing import Callable, Dict, Tuple, Any, Optional
+import atexit
 import json
+import os
+import sqlite3
+import struct
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Any, Optional
 from pathlib import Path
-import hashlib
+
+import numpy as np
+
+
+# Coordenadas são quantizadas em microdegraus (~0,1 m), como no formato
+# textual anterior (6 casas decimais)
+COORDINATE_SCALE = 1_000_000
+
+# Log de persistência: cabeçalho seguido de registros de tamanho fixo
+# (chave de 16 bytes = 4 int32 em microdegraus + distância float64)
+LOG_MAGIC = b"HRDCLOG1"
+_KEY_STRUCT = struct.Struct("<4i")
+_DISTANCE_STRUCT = struct.Struct("<d")
+_RECORD_DTYPE = np.dtype([("key", "V16"), ("distance", "<f8")])
+# Mesmo registro visto como colunas (microdegraus) para o SQLite
+_COLUMNS_DTYPE = np.dtype([
+    ("lat1", "<i4"), ("lon1", "<i4"), ("lat2", "<i4"), ("lon2", "<i4"),
+    ("distance", "<f8"),
+])
+_KEY_COLUMNS_DTYPE = np.dtype([
+    ("lat1", "<i4"), ("lon1", "<i4"), ("lat2", "<i4"), ("lon2", "<i4"),
+])
+
+# Backends de persistência do DistanceCache
+CACHE_BACKENDS = ("log", "sqlite")
+
+# Par de coordenadas quantizado: (lat1, lon1, lat2, lon2) em microdegraus
+QuantizedPair = Tuple[int, int, int, int]
+
+
+class SQLiteDistanceStore:
+    """
+    Armazenamento persistente de distâncias em SQLite (modo WAL).
+    
+    As chaves são pares de coordenadas quantizados em microdegraus inteiros
+    (menor coordenada primeiro). O modo WAL permite leituras concorrentes
+    de vários processos enquanto um deles grava; cada processo abre a sua
+    própria conexão (reaberta automaticamente após ``fork``).
+    
+    ``get_many``/``put_many`` resolvem lotes inteiros (por exemplo, todos
+    os pares de uma matriz N x N) com poucas consultas.
+    """
+    
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Args:
+            path: Caminho do arquivo do banco
+            timeout: Espera máxima (s) por um lock de escrita de outro processo
+        """
+        self.path = path
+        self.timeout = timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão do processo atual (criada sob demanda)."""
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS distances ("
+                " lat1 INTEGER NOT NULL, lon1 INTEGER NOT NULL,"
+                " lat2 INTEGER NOT NULL, lon2 INTEGER NOT NULL,"
+                " distance REAL NOT NULL,"
+                " PRIMARY KEY (lat1, lon1, lat2, lon2)"
+                ") WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS lookup ("
+                " lat1 INTEGER, lon1 INTEGER, lat2 INTEGER, lon2 INTEGER,"
+                " PRIMARY KEY (lat1, lon1, lat2, lon2)"
+                ") WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+    
+    def __len__(self) -> int:
+        """Número de pares armazenados."""
+        return self._connection().execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+    
+    def get(self, key: QuantizedPair) -> Optional[float]:
+        """Distância de um par (None se ausente)."""
+        row = self._connection().execute(
+            "SELECT distance FROM distances"
+            " WHERE lat1 = ? AND lon1 = ? AND lat2 = ? AND lon2 = ?",
+            key,
+        ).fetchone()
+        return row[0] if row else None
+    
+    def get_many(self, keys: Iterable[QuantizedPair]) -> Dict[QuantizedPair, float]:
+        """
+        Distâncias de vários pares em uma única consulta.
+        
+        As chaves são carregadas em uma tabela temporária e resolvidas
+        com um JOIN, sem o limite de parâmetros de ``IN (...)``.
+        
+        Args:
+            keys: Pares quantizados
+        
+        Returns:
+            Dict: Distâncias dos pares encontrados (ausentes são omitidos)
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM lookup")
+            conn.executemany("INSERT OR IGNORE INTO lookup VALUES (?, ?, ?, ?)", keys)
+            rows = conn.execute(
+                "SELECT d.lat1, d.lon1, d.lat2, d.lon2, d.distance"
+                " FROM lookup JOIN distances AS d USING (lat1, lon1, lat2, lon2)"
+            ).fetchall()
+            conn.execute("DELETE FROM lookup")
+        return {row[:4]: row[4] for row in rows}
+    
+    def put_many(self, rows: Iterable[Tuple[int, int, int, int, float]]) -> None:
+        """
+        Grava vários pares em uma única transação.
+        
+        Args:
+            rows: Tuplas (lat1, lon1, lat2, lon2, distância)
+        """
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO distances VALUES (?, ?, ?, ?, ?)", rows
+            )
+    
+    def clear(self) -> None:
+        """Remove todos os pares."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM distances")
+    
+    def close(self) -> None:
+        """Fecha a conexão do processo atual."""
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        self._pid = None
 
 
 class DistanceCache:
     """
     Cache para cálculos de distância.
     
-    Usa LRU cache em memória com opção de persistência em arquivo.
+    LRU em memória com ``get``/``set`` O(1) e contadores de acertos, falhas
+    e remoções. Com ``persist_file``, novas entradas são acumuladas e
+    anexadas ao log em lotes (por tamanho, por tempo ou ao encerrar o
+    processo); o log é reescrito só com as entradas vivas quando acumula
+    registros obsoletos demais.
+    
+    Entradas carregadas do disco ficam em um dicionário "frio" até o
+    primeiro acesso, quando passam para a LRU; são as primeiras removidas.
+    Assim a carga de um cache grande é uma única construção de dicionário.
+    
+    Com ``backend="sqlite"``, ``persist_file`` é um banco SQLite
+    (``SQLiteDistanceStore``) compartilhado entre processos: falhas da LRU
+    são consultadas no banco e as entradas novas gravadas nele em lotes.
     """
     
-    def __init__(self, maxsize: int = 1000, persist_file: Optional[str] = None):
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        persist_file: Optional[str] = None,
+        flush_every: int = 1000,
+        flush_interval: float = 5.0,
+        compaction_ratio: float = 2.0,
+        backend: str = "log",
+    ):
         """
         Args:
             maxsize: Tamanho máximo do cache em memória
             persist_file: Arquivo para persistir cache (None = não persiste)
+            flush_every: Gravar o log a cada N entradas novas
+            flush_interval: Gravar o log se a última gravação tiver mais de
+                N segundos (verificado em ``set``)
+            compaction_ratio: Compactar quando o log tiver mais que
+                ``compaction_ratio`` x entradas vivas
+            backend: Persistência de ``persist_file``: "log" (arquivo
+                append-only do processo) ou "sqlite" (banco compartilhado)
+        
+        Raises:
+            ValueError: Se o backend não for suportado
         """
+        if backend not in CACHE_BACKENDS:
+            raise ValueError(
+                f"Backend de cache inválido: {backend}. "
+                f"Opções: {', '.join(CACHE_BACKENDS)}"
+            )
+        
         self.maxsize = maxsize
         self.persist_file = persist_file
-        self._cache: Dict[str, float] = {}
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compaction_ratio = compaction_ratio
+        self.backend = backend
+        self._store: Optional[SQLiteDistanceStore] = (
+            SQLiteDistanceStore(persist_file)
+            if persist_file and backend == "sqlite" else None
+        )
+        
+        self._cache: "OrderedDict[bytes, float]" = OrderedDict()
+        self._cold: Dict[bytes, float] = {}
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._log_records = 0
+        self._last_flush = time.time()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
         self._load_cache()
+        if self.persist_file:
+            atexit.register(self.flush)
     
-    def _cache_key(self, loc1: Tuple[float, float], loc2: Tuple[float, float]) -> str:
-        """Gera chave de cache para duas localizações."""
-        # Normalizar coordenadas (sempre menor -> maior)
-        coords = tuple(sorted([loc1, loc2]))
-        return f"{coords[0][0]:.6f},{coords[0][1]:.6f}|{coords[1][0]:.6f},{coords[1][1]:.6f}"
+    def __len__(self) -> int:
+        """Número de entradas em memória."""
+        return len(self._cache) + len(self._cold)
+    
+    def _cache_key(self, loc1: Tuple[float, float], loc2: Tuple[float, float]) -> bytes:
+        """Gera chave de cache para duas localizações (independe da ordem)."""
+        a = (round(loc1[0] * COORDINATE_SCALE), round(loc1[1] * COORDINATE_SCALE))
+        b = (round(loc2[0] * COORDINATE_SCALE), round(loc2[1] * COORDINATE_SCALE))
+        if b < a:
+            a, b = b, a
+        return _KEY_STRUCT.pack(a[0], a[1], b[0], b[1])
+    
+    def _cache_keys(
+        self, pairs: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]]
+    ) -> List[bytes]:
+        """Chaves de vários pares em uma passada vetorizada (iguais a ``_cache_key``)."""
+        if not len(pairs):
+            return []
+        # np.rint arredonda meio para par, como round()
+        quantized = np.rint(
+            np.asarray(pairs, dtype=np.float64).reshape(-1, 2, 2) * COORDINATE_SCALE
+        ).astype("<i4")
+        first, second = quantized[:, 0], quantized[:, 1]
+        swap = (second[:, 0] < first[:, 0]) | (
+            (second[:, 0] == first[:, 0]) & (second[:, 1] < first[:, 1])
+        )
+        ordered = np.where(swap[:, None, None], quantized[:, ::-1], quantized)
+        return np.ascontiguousarray(ordered).reshape(-1, 4).view("V16").ravel().tolist()
     
     def get(self, loc1: Tuple[float, float], loc2: Tuple[float, float]) -> Optional[float]:
         """
@@ -47,7 +276,71 @@ class DistanceCache:
             Distância em km ou None se não estiver no cache
         """
         key = self._cache_key(loc1, loc2)
-        return self._cache.get(key)
+        
+        distance = self._cache.get(key)
+        if distance is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return distance
+        
+        distance = self._cold.pop(key, None)
+        if distance is None and self._store is not None:
+            distance = self._store.get(_KEY_STRUCT.unpack(key))
+        if distance is not None:
+            self._cache[key] = distance
+            self._evict()
+            self.hits += 1
+            return distance
+        
+        self.misses += 1
+        return None
+    
+    def get_many(
+        self, pairs: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]]
+    ) -> List[Optional[float]]:
+        """
+        Obtém distâncias de vários pares.
+        
+        Com backend SQLite, os pares ausentes da memória são resolvidos com
+        uma única consulta ao banco.
+        
+        Args:
+            pairs: Pares de localizações ((lat, lon), (lat, lon))
+        
+        Returns:
+            List: Distância de cada par (None se não estiver no cache)
+        """
+        keys = self._cache_keys(pairs)
+        results: List[Optional[float]] = []
+        missing: Dict[bytes, List[int]] = {}
+        
+        for position, key in enumerate(keys):
+            distance = self._cache.get(key)
+            if distance is not None:
+                self._cache.move_to_end(key)
+            else:
+                distance = self._cold.pop(key, None)
+                if distance is not None:
+                    self._cache[key] = distance
+            if distance is None:
+                missing.setdefault(key, []).append(position)
+            results.append(distance)
+        
+        if missing and self._store is not None:
+            found = self._store.get_many(
+                np.frombuffer(b"".join(missing), dtype=_KEY_COLUMNS_DTYPE).tolist()
+            )
+            for columns, distance in found.items():
+                key = _KEY_STRUCT.pack(*columns)
+                self._cache[key] = distance
+                for position in missing.pop(key):
+                    results[position] = distance
+            self._evict()
+        
+        misses = sum(len(positions) for positions in missing.values())
+        self.misses += misses
+        self.hits += len(keys) - misses
+        return results
     
     def set(self, loc1: Tuple[float, float], loc2: Tuple[float, float], distance: float) -> None:
         """
@@ -58,57 +351,181 @@ class DistanceCache:
             loc2: Segunda localização
             distance: Distância em km
         """
-        key = self._cache_key(loc1, loc2)
-        
-        # Se cache está cheio, remover item mais antigo (FIFO simples)
-        if len(self._cache) >= self.maxsize and key not in self._cache:
-            # Remover primeiro item
-            first_key = next(iter(self._cache))
-            del self._cache[first_key]
+        self._store_entry(self._cache_key(loc1, loc2), distance)
+        self._maybe_flush()
+    
+    def put_many(
+        self,
+        pairs: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]],
+        distances: Sequence[float],
+    ) -> None:
+        """
+        Armazena distâncias de vários pares (gravação em lote).
         
+        Args:
+            pairs: Pares de localizações ((lat, lon), (lat, lon))
+            distances: Distância de cada par em km
+        """
+        for key, distance in zip(self._cache_keys(pairs), distances):
+            self._store_entry(key, float(distance))
+        self._maybe_flush()
+    
+    def _store_entry(self, key: bytes, distance: float) -> None:
+        """Insere na LRU e enfileira para persistência."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._cold.pop(key, None)
         self._cache[key] = distance
-        self._save_cache()
+        self._evict()
+        
+        if self.persist_file:
+            self._pending += key
+            self._pending += _DISTANCE_STRUCT.pack(distance)
+            self._pending_count += 1
+    
+    def _maybe_flush(self) -> None:
+        """Grava as pendências ao atingir o limite de tamanho ou de tempo."""
+        if self._pending_count and (
+            self._pending_count >= self.flush_every
+            or time.time() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+    
+    def _evict(self) -> None:
+        """Remove entradas até respeitar ``maxsize`` (frias primeiro, depois LRU)."""
+        while len(self._cache) + len(self._cold) > self.maxsize:
+            if self._cold:
+                # Mais antiga primeiro (dict mantém a ordem de carga)
+                del self._cold[next(iter(self._cold))]
+            else:
+                self._cache.popitem(last=False)
+            self.evictions += 1
+    
+    def flush(self) -> None:
+        """Grava as entradas pendentes no banco ou no log (compactando se necessário)."""
+        self._last_flush = time.time()
+        if not self.persist_file or not self._pending_count:
+            return
+        
+        if self._store is not None:
+            try:
+                self._store.put_many(
+                    np.frombuffer(self._pending, dtype=_COLUMNS_DTYPE).tolist()
+                )
+            except sqlite3.Error:
+                # Falha silenciosa - cache em memória continua funcionando
+                return
+            self._pending = bytearray()
+            self._pending_count = 0
+            return
+        
+        try:
+            cache_file = Path(self.persist_file)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not cache_file.exists() or cache_file.stat().st_size == 0
+            with open(cache_file, "ab") as f:
+                if new_file:
+                    f.write(LOG_MAGIC)
+                f.write(self._pending)
+            self._log_records += self._pending_count
+            self._pending = bytearray()
+            self._pending_count = 0
+            
+            if self._log_records > self.compaction_ratio * max(len(self), 1):
+                self.compact()
+        except OSError:
+            # Falha silenciosa - cache em memória continua funcionando
+            pass
+    
+    def compact(self) -> None:
+        """Reescreve o log apenas com as entradas vivas (mais recentes por último)."""
+        if not self.persist_file or self._store is not None:
+            return
+        
+        records = np.empty(len(self), dtype=_RECORD_DTYPE)
+        records["key"] = list(self._cold) + list(self._cache)
+        records["distance"] = list(self._cold.values()) + list(self._cache.values())
+        
+        cache_file = Path(self.persist_file)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(temp_file, "wb") as f:
+            f.write(LOG_MAGIC)
+            f.write(records.tobytes())
+        os.replace(temp_file, cache_file)
+        
+        self._log_records = len(records)
+        self._pending = bytearray()
+        self._pending_count = 0
     
     def clear(self) -> None:
         """Limpa o cache."""
         self._cache.clear()
-        if self.persist_file and Path(self.persist_file).exists():
+        self._cold.clear()
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._log_records = 0
+        if self._store is not None:
+            self._store.clear()
+        elif self.persist_file and Path(self.persist_file).exists():
             Path(self.persist_file).unlink()
     
     def _load_cache(self) -> None:
-        """Carrega cache do arquivo se existir."""
-        if not self.persist_file:
+        """Carrega cache do arquivo se existir (o banco SQLite é lido sob demanda)."""
+        if not self.persist_file or self._store is not None:
             return
         
         cache_file = Path(self.persist_file)
-        if cache_file.exists():
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
-            except Exception:
-                # Se houver erro, começar com cache vazio
-                self._cache = {}
-    
-    def _save_cache(self) -> None:
-        """Salva cache no arquivo."""
-        if not self.persist_file:
+        if not cache_file.exists():
             return
         
         try:
-            cache_file = Path(self.persist_file)
-            cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(self._cache, f)
-        except Exception:
-            # Falha silenciosa - cache em memória continua funcionando
-            pass
+            data = cache_file.read_bytes()
+            if data.startswith(LOG_MAGIC):
+                # Registro incompleto no final (gravação interrompida) é ignorado
+                count = (len(data) - len(LOG_MAGIC)) // _RECORD_DTYPE.itemsize
+                records = np.frombuffer(
+                    data, dtype=_RECORD_DTYPE, count=count, offset=len(LOG_MAGIC)
+                )
+                self._log_records = count
+                # Registros mais recentes ficam no fim do log
+                records = records[-self.maxsize:] if self.maxsize > 0 else records[:0]
+                self._cold = dict(zip(records["key"].tolist(), records["distance"].tolist()))
+            elif data.lstrip().startswith(b"{"):
+                self._load_legacy_json(data)
+        except (OSError, ValueError):
+            # Se houver erro, começar com cache vazio
+            self._cold = {}
+        
+        self._evict()
+    
+    def _load_legacy_json(self, data: bytes) -> None:
+        """Importa o formato JSON anterior (``{"lat,lon|lat,lon": km}``)."""
+        for text_key, distance in json.loads(data).items():
+            first, second = text_key.split("|")
+            loc1 = tuple(float(v) for v in first.split(","))
+            loc2 = tuple(float(v) for v in second.split(","))
+            self._cold[self._cache_key(loc1, loc2)] = float(distance)
+        
+        # Regravar imediatamente no formato de log
+        self._evict()
+        self.compact()
     
     def stats(self) -> Dict[str, Any]:
         """Retorna estatísticas do cache."""
+        lookups = self.hits + self.misses
         return {
-            "size": len(self._cache),
+            "size": len(self),
             "maxsize": self.maxsize,
             "persist_file": self.persist_file,
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "pending_writes": self._pending_count,
+            "log_records": self._log_records,
         }
 
 
@@ -116,20 +533,27 @@ class DistanceCache:
 _global_cache: Optional[DistanceCache] = None
 
 
-def get_distance_cache(maxsize: int = 1000, persist_file: Optional[str] = None) -> DistanceCache:
+def get_distance_cache(
+    maxsize: int = 1000,
+    persist_file: Optional[str] = None,
+    backend: str = "log",
+) -> DistanceCache:
     """
     Obtém instância global do cache de distâncias.
     
     Args:
         maxsize: Tamanho máximo (usado apenas na primeira chamada)
         persist_file: Arquivo de persistência (usado apenas na primeira chamada)
+        backend: "log" ou "sqlite" (usado apenas na primeira chamada)
     
     Returns:
         DistanceCache: Instância do cache
     """
     global _global_cache
     if _global_cache is None:
-        _global_cache = DistanceCache(maxsize=maxsize, persist_file=persist_file)
+        _global_cache = DistanceCache(
+            maxsize=maxsize, persist_file=persist_file, backend=backend
+        )
     return _global_cache
 
 
@@ -0,0 +1,259 @@
+"""
+Grafo de candidatos: k vizinhos mais próximos de cada localização.
+
+Heurísticas construtivas (Greedy, vizinho mais próximo), 2-opt, movimentos
+entre rotas e inserção do ALNS restringem a busca aos vizinhos de cada
+parada, em vez de percorrer todas as n entregas a cada passo.
+
+Os vizinhos são encontrados com um índice espacial sobre coordenadas
+projetadas (equiretangular em km): ``scipy.spatial.cKDTree`` quando o
+SciPy está instalado, ou uma grade uniforme em NumPy. Os candidatos são
+então reordenados pela distância real da ``DistanceMatrix``.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from hospital_routes.utils.distance import EARTH_RADIUS_KM
+
+
+# Vizinhos por parada quando o consumidor não especifica
+DEFAULT_CANDIDATE_COUNT = 16
+
+# Candidatos extras buscados no espaço projetado antes da reordenação pela
+# distância real (compensa a diferença entre projeção e geodésica)
+CANDIDATE_OVERSAMPLE = 4
+
+# Linhas por bloco na busca exata (matrizes sem coordenadas)
+_EXACT_BLOCK_ROWS = 512
+
+
+def project_points(
+    points: Sequence[Tuple[float, float]],
+    reference_latitude: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Projeção equiretangular (km).
+    
+    Args:
+        points: Coordenadas (lat, lon)
+        reference_latitude: Latitude (graus) de escala da projeção; padrão:
+            latitude média dos pontos. Conjuntos comparados entre si devem
+            usar a mesma referência.
+    
+    Returns:
+        np.ndarray: Array (n, 2) com coordenadas (x, y) em km
+    """
+    coords = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+    if not len(coords):
+        return coords
+    
+    if reference_latitude is None:
+        cos_lat = math.cos(float(coords[:, 0].mean()))
+    else:
+        cos_lat = math.cos(math.radians(reference_latitude))
+    return np.column_stack(
+        (EARTH_RADIUS_KM * coords[:, 1] * cos_lat, EARTH_RADIUS_KM * coords[:, 0])
+    )
+
+
+def spatial_knn(data: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """
+    k pontos de ``data`` mais próximos de cada consulta (distância euclidiana).
+    
+    Args:
+        data: Pontos indexados, array (n, 2)
+        queries: Pontos consultados, array (m, 2)
+        k: Vizinhos por consulta (limitado a n)
+    
+    Returns:
+        np.ndarray: Índices em ``data``, array (m, k) ordenado por distância
+    """
+    k = min(k, len(data))
+    if k == 0 or not len(queries):
+        return np.empty((len(queries), k), dtype=np.int64)
+    
+    if SCIPY_AVAILABLE:
+        _, indices = cKDTree(data).query(queries, k=k)
+        return np.asarray(indices, dtype=np.int64).reshape(len(queries), k)
+    return _grid_knn(data, queries, k)
+
+
+def _grid_knn(data: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """
+    k-NN por grade uniforme (sem SciPy).
+    
+    Células com ~k pontos em média; para cada célula consultada, os anéis
+    de células vizinhas são ampliados até que o k-ésimo vizinho esteja
+    dentro do raio coberto, o que garante o resultado exato.
+    """
+    low = data.min(axis=0)
+    span = data.max(axis=0) - low
+    area = float(max(span[0], 1e-9) * max(span[1], 1e-9))
+    cell = math.sqrt(area * k / len(data)) or 1.0
+    dims = (span // cell).astype(np.int64) + 1
+    
+    def cell_of(points: np.ndarray) -> np.ndarray:
+        cells = ((points - low) // cell).astype(np.int64)
+        return np.clip(cells, 0, dims - 1)
+    
+    data_cells = cell_of(data)
+    keys = data_cells[:, 0] * dims[1] + data_cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    unique_keys, starts, counts = np.unique(
+        keys[order], return_index=True, return_counts=True
+    )
+    buckets: Dict[int, np.ndarray] = {
+        key: order[start:start + count]
+        for key, start, count in zip(unique_keys.tolist(), starts, counts)
+    }
+    
+    query_cells = cell_of(queries)
+    query_keys = query_cells[:, 0] * dims[1] + query_cells[:, 1]
+    query_order = np.argsort(query_keys, kind="stable")
+    _, query_starts = np.unique(query_keys[query_order], return_index=True)
+    
+    result = np.empty((len(queries), k), dtype=np.int64)
+    for members in np.split(query_order, query_starts[1:]):
+        cx, cy = query_cells[members[0]].tolist()
+        points = queries[members]
+        ring = 1
+        while True:
+            candidates = [
+                buckets[x * dims[1] + y]
+                for x in range(max(cx - ring, 0), min(cx + ring, dims[0] - 1) + 1)
+                for y in range(max(cy - ring, 0), min(cy + ring, dims[1] - 1) + 1)
+                if x * dims[1] + y in buckets
+            ]
+            candidates = np.concatenate(candidates) if candidates else order[:0]
+            if len(candidates) >= k:
+                gaps = points[:, None, :] - data[candidates][None, :, :]
+                squared = np.einsum("mcd,mcd->mc", gaps, gaps)
+                nearest = np.argpartition(squared, k - 1, axis=1)[:, :k]
+                kth = np.take_along_axis(squared, nearest, axis=1).max(axis=1)
+                if np.all(kth <= _covered_radius(points, low, cell, dims, cx, cy, ring) ** 2):
+                    break
+            ring *= 2
+        
+        ranked = np.take_along_axis(
+            nearest,
+            np.argsort(np.take_along_axis(squared, nearest, axis=1), axis=1),
+            axis=1,
+        )
+        result[members] = candidates[ranked]
+    
+    return result
+
+
+def _covered_radius(
+    points: np.ndarray,
+    low: np.ndarray,
+    cell: float,
+    dims: np.ndarray,
+    cx: int,
+    cy: int,
+    ring: int,
+) -> np.ndarray:
+    """
+    Raio em torno de cada ponto inteiramente coberto pelo bloco de células.
+    
+    Lados do bloco na borda da grade não limitam o raio (não há pontos além).
+    """
+    radius = np.full(len(points), np.inf)
+    for axis, center in ((0, cx), (1, cy)):
+        if center - ring > 0:
+            radius = np.minimum(radius, points[:, axis] - (low[axis] + (center - ring) * cell))
+        if center + ring < dims[axis] - 1:
+            radius = np.minimum(
+                radius, low[axis] + (center + ring + 1) * cell - points[:, axis]
+            )
+    return radius
+
+
+class CandidateGraph:
+    """
+    k vizinhos mais próximos de cada localização de uma ``DistanceMatrix``.
+    
+    ``neighbors[i]`` lista as entregas mais próximas de i em ordem crescente
+    de distância (``distances[i]``). O depósito tem linha própria (útil
+    para sair do depósito), mas nunca aparece como vizinho.
+    
+    Exemplo:
+        graph = distance_matrix.candidate_graph(16)
+        for j, km in zip(graph.neighbors[i], graph.distances[i]): ...
+    """
+    
+    def __init__(self, neighbors: List[List[int]], distances: List[List[float]]):
+        """
+        Args:
+            neighbors: Vizinhos de cada localização (índices da matriz)
+            distances: Distâncias correspondentes em km
+        """
+        self.neighbors = neighbors
+        self.distances = distances
+    
+    @classmethod
+    def from_matrix(cls, matrix, k: int = DEFAULT_CANDIDATE_COUNT) -> "CandidateGraph":
+        """
+        Constrói o grafo para as localizações da matriz.
+        
+        Com coordenadas (``matrix.locations``) usa o índice espacial
+        (O(n log n)); sem elas, recorre a uma busca exata por blocos de
+        linhas da matriz (O(n²)).
+        
+        Args:
+            matrix: ``DistanceMatrix`` (depósito no índice 0)
+            k: Vizinhos por localização
+        
+        Returns:
+            CandidateGraph: Grafo de candidatos
+        """
+        size = len(matrix)
+        stops = np.arange(1, size)
+        k = max(0, min(k, size - 2))
+        if k == 0:
+            return cls([[] for _ in range(size)], [[] for _ in range(size)])
+        
+        if matrix.locations is not None:
+            xy = project_points(matrix.locations)
+            # +1: a própria entrega aparece entre os seus vizinhos
+            candidates = stops[spatial_knn(xy[1:], xy, k + 1 + CANDIDATE_OVERSAMPLE)]
+            origins = np.arange(size)[:, None]
+            distances = matrix.take(origins, candidates).astype(np.float64)
+            distances[candidates == origins] = np.inf
+        else:
+            candidates, distances = cls._exact_candidates(matrix, stops, k)
+        
+        ranked = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        neighbors = np.take_along_axis(candidates, ranked, axis=1)
+        distances = np.take_along_axis(distances, ranked, axis=1)
+        return cls(neighbors.tolist(), distances.tolist())
+    
+    @staticmethod
+    def _exact_candidates(
+        matrix, stops: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """k+1 entregas mais próximas de cada localização lidas da matriz."""
+        size = len(matrix)
+        candidates = np.empty((size, k + 1), dtype=np.int64)
+        distances = np.empty((size, k + 1), dtype=np.float64)
+        for start in range(0, size, _EXACT_BLOCK_ROWS):
+            origins = np.arange(start, min(start + _EXACT_BLOCK_ROWS, size))[:, None]
+            block = matrix.take(origins, stops[None, :]).astype(np.float64)
+            block[stops[None, :] == origins] = np.inf
+            nearest = np.argpartition(block, k, axis=1)[:, :k + 1]
+            candidates[origins[:, 0]] = stops[nearest]
+            distances[origins[:, 0]] = np.take_along_axis(block, nearest, axis=1)
+        return candidates, distances
+    
+    def __len__(self) -> int:
+        """Número de localizações (depósito incluído)."""
+        return len(self.neighbors)
@@ -0,0 +1,110 @@
+"""
+Prazo de execução (wall-clock) para os otimizadores.
+
+Os otimizadores consultam ``Deadline.expired()`` nos seus laços principais
+e, quando o prazo termina, devolvem a melhor solução encontrada até então.
+"""
+
+import time
+from typing import Optional
+
+from hospital_routes.core.exceptions import InvalidConfigurationError
+from hospital_routes.core.interfaces import OptimizationConfig
+
+
+# Motivos de parada registrados em ``OptimizationResult.statistics["stop_reason"]``
+STOP_TIME_LIMIT = "time_limit"  # Prazo atingido (melhor solução até o momento)
+STOP_CONVERGED = "converged"  # Critério de convergência do algoritmo
+STOP_COMPLETED = "completed"  # Orçamento de iterações/gerações esgotado
+
+
+class Deadline:
+    """
+    Prazo absoluto de execução.
+    
+    Sem limite (``seconds=None``) a verificação custa uma comparação; com
+    limite, uma chamada a ``time.time()``. Laços muito curtos podem usar
+    ``check_interval`` para consultar o relógio a cada N chamadas.
+    """
+    
+    def __init__(
+        self,
+        seconds: Optional[float] = None,
+        start_time: Optional[float] = None,
+        check_interval: int = 1,
+    ):
+        """
+        Args:
+            seconds: Tempo disponível em segundos (None = sem limite)
+            start_time: Instante inicial (``time.time()``; padrão: agora)
+            check_interval: Consultar o relógio a cada N chamadas de ``expired``
+        
+        Raises:
+            ValueError: Se ``seconds`` não for positivo
+        """
+        if seconds is not None and seconds <= 0:
+            raise ValueError(f"Limite de tempo deve ser positivo: {seconds}")
+        
+        self.seconds = seconds
+        self.start_time = time.time() if start_time is None else start_time
+        self.end_time = None if seconds is None else self.start_time + seconds
+        self.check_interval = max(1, check_interval)
+        self.reached = False
+        self._calls = 0
+    
+    @classmethod
+    def from_config(
+        cls,
+        config: OptimizationConfig,
+        start_time: Optional[float] = None,
+        check_interval: int = 1,
+    ) -> "Deadline":
+        """
+        Cria o prazo a partir de ``config.time_limit_seconds``.
+        
+        Raises:
+            InvalidConfigurationError: Se o prazo da configuração não for positivo
+                (ex: alterado após a criação da configuração)
+        """
+        seconds = getattr(config, "time_limit_seconds", None)
+        if seconds is not None and seconds <= 0:
+            raise InvalidConfigurationError(
+                f"time_limit_seconds deve ser positivo: {seconds}"
+            )
+        return cls(
+            seconds,
+            start_time=start_time,
+            check_interval=check_interval,
+        )
+    
+    def expired(self) -> bool:
+        """True quando o prazo terminou (permanece True a partir daí)."""
+        if self.end_time is None or self.reached:
+            return self.reached
+        
+        self._calls += 1
+        if self._calls % self.check_interval:
+            return False
+        
+        self.reached = time.time() >= self.end_time
+        return self.reached
+    
+    def remaining(self) -> Optional[float]:
+        """Segundos restantes (None se não há limite)."""
+        if self.end_time is None:
+            return None
+        return max(0.0, self.end_time - time.time())
+    
+    def stop_reason(self, converged: bool = False) -> str:
+        """Motivo de parada para as estatísticas do resultado."""
+        if self.reached:
+            return STOP_TIME_LIMIT
+        return STOP_CONVERGED if converged else STOP_COMPLETED
+    
+    def statistics(self, converged: bool = False) -> dict:
+        """Entradas de ``OptimizationResult.statistics`` sobre o prazo."""
+        return {
+            "time_limit_seconds": self.seconds,
+            "time_limit_reached": self.reached,
+            "stop_reason": self.stop_reason(converged),
+        }
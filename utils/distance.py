@@ -3,11 +3,53 @@ Utilitários para cálculo de distâncias geográficas.
 
 Este módulo fornece funções para calcular distâncias entre pontos
 usando coordenadas geográficas (latitude, longitude).
+
+Além do cálculo ponto a ponto (geodesic), oferece um motor vetorizado
+(NumPy) que calcula a matriz N×N completa em uma única passada de
+broadcast, com dois modos de precisão:
+
+- ``"haversine"``: esfera de raio médio, mais rápido (erro < 0.5%)
+- ``"ellipsoidal"``: correção elipsoidal WGS-84 (fórmula de Lambert),
+  erro da ordem de metros em escala urbana
 """
 
-from typing import Tuple
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 from geopy.distance import geodesic
 
+from hospital_routes.core.interfaces import Delivery
+
+
+# Raio médio da Terra (IUGG) em km
+EARTH_RADIUS_KM = 6371.0088
+
+# Elipsoide WGS-84
+WGS84_SEMI_MAJOR_AXIS_KM = 6378.137
+WGS84_FLATTENING = 1 / 298.257223563
+
+# Modos de precisão suportados pelo motor vetorizado
+DISTANCE_PRECISIONS = ("haversine", "ellipsoidal")
+
+# Chave e índice do depósito nas matrizes de distância
+DEPOT_KEY = "depot"
+DEPOT_INDEX = 0
+
+# Armazenamento da DistanceMatrix: quadrada ("dense") ou só o triângulo
+# inferior sem a diagonal, linha a linha ("packed", n(n-1)/2 valores).
+# Nessa ordem, a linha de uma nova localização é anexada ao final do array.
+MATRIX_LAYOUTS = ("dense", "packed")
+MATRIX_DTYPES = ("float64", "float32")
+
+# Até este tamanho, matrizes compactas também criam ``rows`` (listas Python
+# são mais rápidas nos laços dos otimizadores e ainda ocupam pouca memória)
+COMPACT_ROWS_LIMIT = 1000
+
+# Linhas calculadas por bloco ao montar matrizes compactas (limita o pico
+# de memória a block_rows x n valores float64)
+COMPACT_BLOCK_ROWS = 512
+
 
 def calculate_distance(
     point1: Tuple[float, float],
@@ -33,8 +75,283 @@ def calculate_distance(
     return geodesic(point1, point2).kilometers
 
 
+def _coordinates_to_radians(
+    points: Sequence[Tuple[float, float]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte lista de (lat, lon) em arrays de latitude e longitude em radianos."""
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return np.radians(coords[:, 0]), np.radians(coords[:, 1])
+
+
+def _central_angle(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+) -> np.ndarray:
+    """Ângulo central (radianos) pela fórmula de haversine, com broadcast."""
+    sin_dlat = np.sin((lat2 - lat1) / 2.0)
+    sin_dlon = np.sin((lon2 - lon1) / 2.0)
+    h = sin_dlat ** 2 + np.cos(lat1) * np.cos(lat2) * sin_dlon ** 2
+    return 2.0 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def haversine_pairs(
+    points1: Sequence[Tuple[float, float]],
+    points2: Sequence[Tuple[float, float]],
+) -> np.ndarray:
+    """
+    Distância (km) de haversine entre pares correspondentes de pontos.
+    
+    Args:
+        points1: Pontos (latitude, longitude)
+        points2: Pontos (latitude, longitude), mesmo tamanho de ``points1``
+    
+    Returns:
+        np.ndarray: Array (n,) com a distância de points1[k] a points2[k]
+    """
+    lat1, lon1 = _coordinates_to_radians(points1)
+    lat2, lon2 = _coordinates_to_radians(points2)
+    return EARTH_RADIUS_KM * _central_angle(lat1, lon1, lat2, lon2)
+
+
+def haversine_distance_array(
+    origins: Sequence[Tuple[float, float]],
+    destinations: Optional[Sequence[Tuple[float, float]]] = None,
+) -> np.ndarray:
+    """
+    Calcula matriz de distâncias (km) pela fórmula de haversine.
+    
+    Args:
+        origins: Lista de pontos de origem (latitude, longitude)
+        destinations: Lista de pontos de destino (None = mesmos das origens)
+    
+    Returns:
+        np.ndarray: Matriz (len(origins), len(destinations)) em km
+    """
+    lat1, lon1 = _coordinates_to_radians(origins)
+    if destinations is None:
+        lat2, lon2 = lat1, lon1
+    else:
+        lat2, lon2 = _coordinates_to_radians(destinations)
+    
+    sigma = _central_angle(
+        lat1[:, None], lon1[:, None], lat2[None, :], lon2[None, :]
+    )
+    return EARTH_RADIUS_KM * sigma
+
+
+def ellipsoidal_distance_array(
+    origins: Sequence[Tuple[float, float]],
+    destinations: Optional[Sequence[Tuple[float, float]]] = None,
+) -> np.ndarray:
+    """
+    Calcula matriz de distâncias (km) com correção elipsoidal WGS-84.
+    
+    Usa a fórmula de Lambert para linhas longas: o ângulo central é
+    calculado sobre as latitudes reduzidas e corrigido pelo achatamento
+    do elipsoide. Fica a poucos metros do geodesic exato em escala
+    urbana, mantendo o custo de uma única passada vetorizada.
+    
+    Args:
+        origins: Lista de pontos de origem (latitude, longitude)
+        destinations: Lista de pontos de destino (None = mesmos das origens)
+    
+    Returns:
+        np.ndarray: Matriz (len(origins), len(destinations)) em km
+    """
+    f = WGS84_FLATTENING
+    
+    lat1, lon1 = _coordinates_to_radians(origins)
+    if destinations is None:
+        lat2, lon2 = lat1, lon1
+    else:
+        lat2, lon2 = _coordinates_to_radians(destinations)
+    
+    # Latitudes reduzidas
+    beta1 = np.arctan((1.0 - f) * np.tan(lat1))[:, None]
+    beta2 = np.arctan((1.0 - f) * np.tan(lat2))[None, :]
+    
+    sigma = _central_angle(beta1, lon1[:, None], beta2, lon2[None, :])
+    
+    p = (beta1 + beta2) / 2.0
+    q = (beta2 - beta1) / 2.0
+    
+    sin_sigma = np.sin(sigma)
+    cos_half = np.cos(sigma / 2.0) ** 2
+    sin_half = np.sin(sigma / 2.0) ** 2
+    
+    # Pares coincidentes (sigma = 0) zerariam os denominadores
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = (sigma - sin_sigma) * np.sin(p) ** 2 * np.cos(q) ** 2 / cos_half
+        y = (sigma + sin_sigma) * np.cos(p) ** 2 * np.sin(q) ** 2 / sin_half
+        distances = WGS84_SEMI_MAJOR_AXIS_KM * (sigma - f / 2.0 * (x + y))
+    
+    return np.where(sigma > 0.0, distances, 0.0)
+
+
+def compute_distance_array(
+    origins: Sequence[Tuple[float, float]],
+    destinations: Optional[Sequence[Tuple[float, float]]] = None,
+    precision: str = "haversine",
+) -> np.ndarray:
+    """
+    Calcula a matriz de distâncias completa em uma única passada vetorizada.
+    
+    Args:
+        origins: Lista de pontos de origem (latitude, longitude)
+        destinations: Lista de pontos de destino (None = mesmos das origens)
+        precision: "haversine" (rápido) ou "ellipsoidal" (correção WGS-84)
+    
+    Returns:
+        np.ndarray: Matriz de distâncias em km
+    
+    Raises:
+        ValueError: Se o modo de precisão não for suportado
+    
+    Example:
+        >>> points = [(40.7128, -74.0060), (34.0522, -118.2437)]
+        >>> compute_distance_array(points, precision="ellipsoidal")[0, 1]
+        3944.4...
+    """
+    if precision == "haversine":
+        return haversine_distance_array(origins, destinations)
+    if precision == "ellipsoidal":
+        return ellipsoidal_distance_array(origins, destinations)
+    raise ValueError(
+        f"Precisão de distância não suportada: {precision}. "
+        f"Opções: {', '.join(DISTANCE_PRECISIONS)}"
+    )
+
+
+def packed_size(size: int) -> int:
+    """Número de valores do triângulo (sem diagonal) de uma matriz size x size."""
+    return size * (size - 1) // 2
+
+
+def packed_indices(i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Posições dos pares (i, j) no array triangular (linha max(i, j)).
+    
+    Pares da diagonal (i == j) recebem a posição 0; quem consulta deve
+    tratá-los como distância zero.
+    """
+    lo = np.minimum(i, j).astype(np.int64)
+    hi = np.maximum(i, j).astype(np.int64)
+    return np.where(lo == hi, 0, hi * (hi - 1) // 2 + lo)
+
+
+def compute_compact_distance_array(
+    points: Sequence[Tuple[float, float]],
+    precision: str = "haversine",
+    dtype: str = "float32",
+    layout: str = "packed",
+    block_rows: int = COMPACT_BLOCK_ROWS,
+) -> np.ndarray:
+    """
+    Calcula a matriz em blocos de linhas direto no formato compacto.
+    
+    Evita a matriz float64 completa como intermediária: o pico de memória
+    é o resultado mais ``block_rows`` x n valores float64.
+    
+    Args:
+        points: Lista de pontos (latitude, longitude)
+        precision: "haversine" ou "ellipsoidal"
+        dtype: "float64" ou "float32"
+        layout: "dense" (n x n) ou "packed" (triângulo inferior, 1-D)
+        block_rows: Linhas calculadas por bloco
+    
+    Returns:
+        np.ndarray: Matriz (n, n) ou array (n(n-1)/2,) no dtype pedido
+    """
+    points = list(points)
+    size = len(points)
+    if layout == "dense":
+        result = np.empty((size, size), dtype=dtype)
+    else:
+        result = np.empty(packed_size(size), dtype=dtype)
+    
+    for start in range(0, size, block_rows):
+        stop = min(start + block_rows, size)
+        block = compute_distance_array(points[start:stop], points, precision=precision)
+        block[np.arange(stop - start), np.arange(start, stop)] = 0.0
+        
+        if layout == "dense":
+            result[start:stop] = block
+            continue
+        
+        for i in range(start, stop):
+            offset = packed_size(i)
+            result[offset:offset + i] = block[i - start, :i]
+    
+    return result
+
+
+def routes_to_csr(routes: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatena rotas de índices no formato CSR.
+    
+    Args:
+        routes: Rotas (listas de índices da matriz)
+    
+    Returns:
+        Tuple: (paradas concatenadas, offsets com len(routes) + 1 posições;
+        a rota k ocupa ``stops[offsets[k]:offsets[k + 1]]``)
+    """
+    offsets = np.zeros(len(routes) + 1, dtype=np.int64)
+    np.cumsum([len(route) for route in routes], out=offsets[1:])
+    stops = np.fromiter(
+        itertools.chain.from_iterable(routes), dtype=np.int64, count=int(offsets[-1])
+    )
+    return stops, offsets
+
+
+def calculate_route_distances(
+    routes: Sequence[Sequence[Tuple[float, float]]],
+    return_to_start: bool = True,
+) -> np.ndarray:
+    """
+    Distância (km) de várias rotas de coordenadas de uma vez, por haversine.
+    
+    Todos os trechos de todas as rotas saem de uma única chamada de
+    ``haversine_pairs``. A métrica é a esfera de raio médio, não o geodesic
+    de ``calculate_route_distance``: os valores diferem em até ~0.5%.
+    
+    Args:
+        routes: Rotas como listas de pontos (lat, lon) na ordem de visita
+        return_to_start: Se True, inclui o trecho do último ponto ao primeiro
+            (rotas com mais de 2 pontos, como em ``calculate_route_distance``)
+    
+    Returns:
+        np.ndarray: Distância de cada rota (0.0 para rotas com menos de 2 pontos)
+    """
+    lengths = np.array([len(route) for route in routes], dtype=np.int64)
+    result = np.zeros(len(routes), dtype=np.float64)
+    if not lengths.sum():
+        return result
+    
+    points = np.concatenate(
+        [np.asarray(route, dtype=np.float64).reshape(-1, 2) for route in routes if len(route)]
+    )
+    legs = haversine_pairs(points[:-1], points[1:])
+    
+    # Trecho k liga os pontos k e k+1; descartar os que cruzam rotas
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    within = np.ones(len(legs), dtype=bool)
+    within[ends[(lengths > 0) & (ends < len(points))] - 1] = False
+    leg_route = np.repeat(np.arange(len(routes)), lengths)[:-1]
+    np.add.at(result, leg_route[within], legs[within])
+    
+    if return_to_start:
+        closed = lengths > 2
+        result[closed] += haversine_pairs(points[ends[closed] - 1], points[starts[closed]])
+    return result
+
+
 def calculate_distance_matrix(
     points: list[Tuple[float, float]],
+    precision: str = "haversine",
 ) -> dict[Tuple[int, int], float]:
     """
     Calcula matriz de distâncias entre todos os pares de pontos.
@@ -44,6 +361,7 @@ def calculate_distance_matrix(
     
     Args:
         points: Lista de pontos (latitude, longitude)
+        precision: "haversine" (rápido) ou "ellipsoidal" (correção WGS-84)
     
     Returns:
         dict: Dicionário onde chave é (índice1, índice2) e valor é distância em km
@@ -54,19 +372,709 @@ def calculate_distance_matrix(
         >>> matrix[(0, 1)]
         3944.0
     """
-    matrix = {}
     n = len(points)
+    if n == 0:
+        return {}
+    
+    array = compute_distance_array(points, precision=precision)
+    np.fill_diagonal(array, 0.0)
+    values = array.tolist()
+    
+    return {(i, j): values[i][j] for i in range(n) for j in range(n)}
+
+
+class DistanceMatrix:
+    """
+    Matriz de distâncias indexada por inteiros.
+    
+    Guarda as distâncias em um array contíguo e um mapeamento id ↔ índice
+    construído uma única vez. O depósito ocupa sempre o índice 0
+    (``DEPOT_INDEX``), seguido das entregas na ordem recebida.
+    
+    Os caminhos críticos (fitness, busca local, heurísticas construtivas)
+    trabalham com índices inteiros via ``rows``/``route_distance``. O acesso
+    antigo por chave ``(from_id, to_id)`` continua disponível via
+    ``get``/``[]`` para código que ainda não migrou.
+    
+    Armazenamento compacto (opcional, mesma interface de consulta):
+    
+    - ``dtype="float32"``: metade da memória (erro relativo ~1e-7)
+    - ``layout="packed"``: só o triângulo inferior (matriz simétrica),
+      cerca de metade dos valores; ``values`` passa a ser materializada
+      a cada acesso
+    
+    Em matrizes compactas com mais de ``COMPACT_ROWS_LIMIT`` localizações,
+    ``distance``/``route_distance``/``get`` leem o array diretamente
+    (vetorizado) sem criar ``rows``; ``rows`` continua disponível, mas cria
+    n² floats Python.
+    
+    ``add_locations``/``remove_locations`` atualizam a matriz no lugar
+    (replanejamento com novas entregas): só as distâncias das localizações
+    novas são calculadas.
+    
+    Com uma malha viária (``network``), as distâncias são de condução e
+    em geral assimétricas (vias de mão única): ``values[i][j]`` é o trajeto
+    de i para j, e o layout "packed" não se aplica.
+    """
+    
+    def __init__(
+        self,
+        ids: Sequence[str],
+        values: np.ndarray,
+        locations: Optional[Sequence[Tuple[float, float]]] = None,
+        dtype: Optional[str] = None,
+        layout: str = "dense",
+        precision: str = "haversine",
+        network: Optional["RoadNetwork"] = None,
+        materialize_rows: bool = True,
+    ):
+        """
+        Args:
+            ids: IDs das localizações (ids[0] deve ser o depósito)
+            values: Matriz quadrada de distâncias em km, na ordem de ``ids``
+                (com ``layout="packed"``, também aceita o triângulo inferior 1-D)
+            locations: Coordenadas (lat, lon) na ordem de ``ids`` (opcional;
+                permite consultas por coordenada no ``DistanceService`` e
+                atualizações com ``add_locations``)
+            dtype: "float64" (padrão) ou "float32"
+            layout: "dense" (padrão) ou "packed"
+            precision: Modo de precisão das distâncias (usado por ``add_locations``)
+            network: Malha viária de onde vieram as distâncias (None = geodésicas)
+            materialize_rows: False impede que as leituras criem ``rows``
+                implicitamente (ex: matriz em memória compartilhada nos workers,
+                onde n² floats Python por processo anulariam o compartilhamento)
+        
+        Raises:
+            ValueError: Se as dimensões, o dtype ou o layout forem inválidos
+        """
+        if layout not in MATRIX_LAYOUTS:
+            raise ValueError(
+                f"Layout de matriz não suportado: {layout}. "
+                f"Opções: {', '.join(MATRIX_LAYOUTS)}"
+            )
+        if network is not None and layout == "packed":
+            raise ValueError(
+                "Layout \"packed\" exige matriz simétrica; distâncias pela "
+                "malha viária usam o layout \"dense\""
+            )
+        dtype = np.dtype(dtype or np.float64)
+        if dtype.name not in MATRIX_DTYPES:
+            raise ValueError(
+                f"Tipo de matriz não suportado: {dtype.name}. "
+                f"Opções: {', '.join(MATRIX_DTYPES)}"
+            )
+        
+        size = len(ids)
+        if layout == "packed" and np.ndim(values) == 1:
+            data = np.ascontiguousarray(values, dtype=dtype)
+            if data.shape != (packed_size(size),):
+                raise ValueError(
+                    f"Triângulo {data.shape} incompatível com {size} localizações"
+                )
+        else:
+            data = np.ascontiguousarray(values, dtype=dtype)
+            if data.ndim != 2 or data.shape != (size, size):
+                raise ValueError(
+                    f"Matriz {data.shape} incompatível com {size} localizações"
+                )
+            if layout == "packed":
+                data = np.ascontiguousarray(data[np.tril_indices(size, -1)])
+        
+        self.ids: List[str] = list(ids)
+        self.index: Dict[str, int] = {loc_id: i for i, loc_id in enumerate(self.ids)}
+        self.dtype = dtype
+        self.layout = layout
+        self.data = data
+        self.compact = layout == "packed" or dtype != np.float64
+        self.precision = precision
+        self.network = network
+        self.materialize_rows = materialize_rows
+        self.locations: Optional[List[Tuple[float, float]]] = (
+            [tuple(loc) for loc in locations] if locations is not None else None
+        )
+        self._rows: Optional[List[List[float]]] = None
+        self._candidate_graphs: Dict[int, "CandidateGraph"] = {}
+    
+    @classmethod
+    def from_deliveries(
+        cls,
+        deliveries: List[Delivery],
+        depot_location: Tuple[float, float],
+        precision: str = "haversine",
+        dtype: Optional[str] = None,
+        layout: str = "dense",
+    ) -> "DistanceMatrix":
+        """
+        Constrói a matriz para depósito + entregas em uma passada vetorizada.
+        
+        Com um ``MatrixStore`` ativo (``set_matrix_store`` ou variável
+        ``HOSPITAL_ROUTES_MATRIX_CACHE``), instâncias já calculadas são
+        abertas do disco, mapeadas em memória e somente leitura.
+        
+        Com uma malha viária ativa (``set_road_network`` ou variável
+        ``HOSPITAL_ROUTES_ROAD_NETWORK``), as distâncias são de condução
+        pela malha (``precision`` deixa de ser usada no cálculo).
+        
+        Args:
+            deliveries: Lista de entregas
+            depot_location: Localização do depósito
+            precision: "haversine" (rápido) ou "ellipsoidal" (correção WGS-84)
+            dtype: "float64" (padrão) ou "float32"
+            layout: "dense" (padrão) ou "packed" (triângulo inferior)
+        
+        Returns:
+            DistanceMatrix: Matriz com o depósito no índice 0
+        
+        Raises:
+            ValueError: Se ``layout="packed"`` com malha viária ativa
+        """
+        from hospital_routes.utils.matrix_store import get_matrix_store
+        from hospital_routes.utils.road_network import get_road_network
+        
+        ids = [DEPOT_KEY] + [d.id for d in deliveries]
+        points = [depot_location] + [d.location for d in deliveries]
+        dtype_name = np.dtype(dtype or np.float64).name
+        compact = layout == "packed" or dtype_name != "float64"
+        network = get_road_network()
+        if network is not None and layout == "packed":
+            raise ValueError(
+                "Layout \"packed\" exige matriz simétrica; distâncias pela "
+                "malha viária usam o layout \"dense\""
+            )
+        
+        def compute() -> np.ndarray:
+            if network is not None:
+                values = network.distance_array(points, points).astype(dtype_name)
+                np.fill_diagonal(values, 0.0)
+                return values
+            if compact:
+                return compute_compact_distance_array(
+                    points, precision=precision, dtype=dtype_name, layout=layout
+                )
+            values = compute_distance_array(points, precision=precision)
+            np.fill_diagonal(values, 0.0)
+            return values
+        
+        store = get_matrix_store()
+        if store is None:
+            values = compute()
+        elif network is not None:
+            # Matrizes da malha são identificadas pelo grafo, não pela precisão
+            values = store.get_or_compute(
+                points,
+                f"road:{network.fingerprint}:{dtype_name}",
+                compute,
+                shape=(len(points), len(points)),
+            )
+        elif compact:
+            shape = (
+                (packed_size(len(points)),) if layout == "packed"
+                else (len(points), len(points))
+            )
+            values = store.get_or_compute(
+                points, f"{precision}:{layout}:{dtype_name}", compute, shape=shape
+            )
+        else:
+            values = store.get_or_compute(points, precision, compute)
+        
+        return cls(
+            ids,
+            values,
+            locations=points,
+            dtype=dtype_name,
+            layout=layout,
+            precision=precision,
+            network=network,
+        )
     
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                matrix[(i, j)] = calculate_distance(points[i], points[j])
+    @classmethod
+    def from_mapping(
+        cls,
+        ids: Sequence[str],
+        mapping: Dict[Tuple[str, str], float],
+    ) -> "DistanceMatrix":
+        """
+        Converte uma matriz legada ``{(from_id, to_id): km}`` em matriz densa.
+        
+        Pares ausentes no dicionário ficam com distância 0.0, o mesmo
+        comportamento do ``.get(key, 0.0)`` usado anteriormente.
+        
+        Args:
+            ids: IDs das localizações (ids[0] deve ser o depósito)
+            mapping: Dicionário de distâncias por par de IDs
+        
+        Returns:
+            DistanceMatrix: Matriz densa equivalente
+        """
+        index = {loc_id: i for i, loc_id in enumerate(ids)}
+        values = np.zeros((len(ids), len(ids)), dtype=np.float64)
+        for (from_id, to_id), distance in mapping.items():
+            if from_id in index and to_id in index:
+                values[index[from_id], index[to_id]] = distance
+        return cls(ids, values)
+    
+    def __len__(self) -> int:
+        """Número de localizações (depósito incluído)."""
+        return len(self.ids)
+    
+    @property
+    def values(self) -> np.ndarray:
+        """Matriz quadrada (no layout "packed", materializada a cada acesso)."""
+        if self.layout == "dense":
+            return self.data
+        
+        size = len(self.ids)
+        values = np.zeros((size, size), dtype=self.dtype)
+        lower = np.tril_indices(size, -1)
+        values[lower] = self.data
+        values[lower[1], lower[0]] = self.data
+        return values
+    
+    @property
+    def symmetric(self) -> bool:
+        """
+        True se d(i, j) == d(j, i) para todo par.
+        
+        Distâncias geodésicas são simétricas; as da malha viária não
+        (vias de mão única), e quem inverte trechos de rota precisa somar
+        o custo do trecho no sentido contrário.
+        """
+        return self.network is None
+    
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelas distâncias (sem ``rows``)."""
+        return self.data.nbytes
+    
+    @property
+    def rows_available(self) -> bool:
+        """
+        True se ``rows`` é o caminho mais rápido de leitura.
+        
+        Falso em matrizes compactas grandes (``COMPACT_ROWS_LIMIT``) ou com
+        ``materialize_rows=False`` cujas listas ainda não foram criadas:
+        nesse caso ``distance`` e ``route_distance`` leem o array direto.
+        """
+        if self._rows is not None:
+            return True
+        if not self.materialize_rows:
+            return False
+        return not self.compact or len(self.ids) <= COMPACT_ROWS_LIMIT
+    
+    @property
+    def rows(self) -> List[List[float]]:
+        """
+        Linhas da matriz como listas Python (criadas sob demanda).
+        
+        Indexar ``rows[i][j]`` evita o custo de criar escalares NumPy
+        em laços Python puros.
+        """
+        if self._rows is None:
+            self._rows = self.values.tolist()
+        return self._rows
+    
+    def take(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """
+        Distâncias dos pares (i[k], j[k]) em uma operação vetorizada.
+        
+        Args:
+            i: Índices de origem (qualquer forma compatível por broadcast)
+            j: Índices de destino
+        
+        Returns:
+            np.ndarray: Distâncias no dtype da matriz
+        """
+        i = np.asarray(i)
+        j = np.asarray(j)
+        if self.layout == "dense":
+            return self.data[i, j]
+        
+        if not self.data.size:
+            return np.zeros(np.broadcast(i, j).shape, dtype=self.dtype)
+        
+        positions = packed_indices(i, j)
+        return np.where(i == j, 0.0, self.data[positions]).astype(self.dtype, copy=False)
+    
+    def row(self, i: int) -> np.ndarray:
+        """Distâncias da localização ``i`` a todas as outras (sem criar ``rows``)."""
+        if self.layout == "dense":
+            return self.data[i]
+        size = len(self.ids)
+        return self.take(np.full(size, i), np.arange(size))
+    
+    def candidate_graph(self, k: int) -> "CandidateGraph":
+        """
+        Grafo dos k vizinhos mais próximos de cada localização (em cache).
+        
+        Ver ``hospital_routes.utils.candidate_graph.CandidateGraph``.
+        """
+        graph = self._candidate_graphs.get(k)
+        if graph is None:
+            from hospital_routes.utils.candidate_graph import CandidateGraph
+            
+            graph = self._candidate_graphs[k] = CandidateGraph.from_matrix(self, k)
+        return graph
+    
+    def submatrix(self, indices: Sequence[int]) -> np.ndarray:
+        """Submatriz quadrada das localizações ``indices`` (cópia)."""
+        indices = np.asarray(indices)
+        if self.layout == "dense":
+            return self.data[np.ix_(indices, indices)]
+        return self.take(indices[:, None], indices[None, :])
+    
+    def max_distance(self) -> float:
+        """Maior distância da matriz (0.0 se vazia)."""
+        return float(self.data.max()) if self.data.size else 0.0
+    
+    def add_locations(
+        self,
+        ids: Sequence[str],
+        locations: Sequence[Tuple[float, float]],
+    ) -> List[int]:
+        """
+        Acrescenta localizações ao final da matriz (no lugar).
+        
+        Calcula apenas as k novas linhas/colunas (k x n distâncias; com
+        malha viária, os dois sentidos); as distâncias existentes são
+        reaproveitadas.
+        
+        Args:
+            ids: IDs das novas localizações
+            locations: Coordenadas (lat, lon) na ordem de ``ids``
+        
+        Returns:
+            List[int]: Índices atribuídos às novas localizações
+        
+        Raises:
+            ValueError: Se a matriz não tiver coordenadas, se um ID já
+                existir ou se ``ids`` e ``locations`` tiverem tamanhos diferentes
+        """
+        ids = list(ids)
+        locations = [tuple(loc) for loc in locations]
+        if self.locations is None:
+            raise ValueError("Matriz sem coordenadas não pode ser atualizada")
+        if len(ids) != len(locations):
+            raise ValueError(
+                f"{len(ids)} IDs para {len(locations)} localizações"
+            )
+        duplicated = [loc_id for loc_id in ids if loc_id in self.index]
+        if duplicated or len(set(ids)) != len(ids):
+            raise ValueError(f"Localizações já presentes na matriz: {duplicated or ids}")
+        if not ids:
+            return []
+        
+        old_size = len(self.ids)
+        new_size = old_size + len(ids)
+        points = self.locations + locations
+        if self.network is not None:
+            block = self.network.distance_array(locations, points)
+        else:
+            block = compute_distance_array(locations, points, precision=self.precision)
+        block[np.arange(len(ids)), np.arange(old_size, new_size)] = 0.0
+        
+        if self.layout == "dense":
+            data = np.empty((new_size, new_size), dtype=self.dtype)
+            data[:old_size, :old_size] = self.data
+            data[old_size:] = block
+            if self.network is not None:
+                # Assimétrica: sentido antigas -> novas calculado à parte
+                data[:old_size, old_size:] = self.network.distance_array(
+                    self.locations, locations
+                )
             else:
-                matrix[(i, j)] = 0.0
+                data[:old_size, old_size:] = block[:, :old_size].T
+        else:
+            rows = [block[k, :old_size + k] for k in range(len(ids))]
+            data = np.concatenate([self.data] + rows).astype(self.dtype, copy=False)
+        
+        self._replace(self.ids + ids, points, data)
+        return list(range(old_size, new_size))
+    
+    def remove_locations(self, ids: Sequence[str]) -> None:
+        """
+        Remove localizações da matriz (no lugar).
+        
+        As localizações seguintes são renumeradas; nenhuma distância é
+        recalculada.
+        
+        Args:
+            ids: IDs das localizações a remover
+        
+        Raises:
+            ValueError: Se um ID não existir ou for o depósito
+        """
+        removed = set(ids)
+        if not removed:
+            return
+        unknown = [loc_id for loc_id in removed if loc_id not in self.index]
+        if unknown:
+            raise ValueError(f"Localizações ausentes da matriz: {unknown}")
+        if self.ids[DEPOT_INDEX] in removed:
+            raise ValueError("O depósito não pode ser removido da matriz")
+        
+        keep = np.array(
+            [i for i, loc_id in enumerate(self.ids) if loc_id not in removed],
+            dtype=np.int64,
+        )
+        if self.layout == "dense":
+            data = self.data[np.ix_(keep, keep)]
+        else:
+            # Linha r do novo triângulo = linha keep[r] do antigo, colunas keep[:r]
+            data = np.concatenate(
+                [self.data[packed_size(old) + keep[:r]] for r, old in enumerate(keep)]
+            ).astype(self.dtype, copy=False)
+        
+        self._replace(
+            [self.ids[i] for i in keep],
+            [self.locations[i] for i in keep] if self.locations is not None else None,
+            data,
+        )
+    
+    def update_deliveries(self, deliveries: Sequence[Delivery]) -> Tuple[int, int]:
+        """
+        Sincroniza a matriz com uma nova lista de entregas.
+        
+        Entregas ausentes (ou com coordenadas alteradas) são removidas e as
+        novas são acrescentadas; o depósito e as demais são mantidos.
+        
+        Args:
+            deliveries: Entregas do replanejamento
+        
+        Returns:
+            Tuple[int, int]: (localizações acrescentadas, localizações removidas)
+        """
+        current = {d.id: tuple(d.location) for d in deliveries}
+        stale = [
+            loc_id for i, loc_id in enumerate(self.ids)
+            if i != DEPOT_INDEX and current.get(loc_id) != self.locations[i]
+        ]
+        self.remove_locations(stale)
+        
+        new = [d for d in deliveries if d.id not in self.index]
+        self.add_locations([d.id for d in new], [d.location for d in new])
+        return len(new), len(stale)
+    
+    def _replace(
+        self,
+        ids: List[str],
+        locations: Optional[List[Tuple[float, float]]],
+        data: np.ndarray,
+    ) -> None:
+        """Troca o conteúdo da matriz e invalida os dados derivados."""
+        from hospital_routes.utils.distance_service import notify_matrix_changed
+        
+        self.ids = ids
+        self.index = {loc_id: i for i, loc_id in enumerate(ids)}
+        self.locations = locations
+        self.data = np.ascontiguousarray(data)
+        self._rows = None
+        self._candidate_graphs = {}
+        notify_matrix_changed(self)
+    
+    def index_of(self, location_id: str) -> int:
+        """Retorna o índice de uma localização pelo ID."""
+        return self.index[location_id]
+    
+    def indices(self, location_ids: Sequence[str]) -> List[int]:
+        """Converte uma sequência de IDs em índices."""
+        index = self.index
+        return [index[loc_id] for loc_id in location_ids]
+    
+    def distance(self, i: int, j: int) -> float:
+        """Distância em km entre os índices ``i`` e ``j``."""
+        if self.rows_available:
+            return self.rows[i][j]
+        if self.layout == "dense":
+            return float(self.data[i, j])
+        if i == j:
+            return 0.0
+        if i < j:
+            i, j = j, i
+        return float(self.data[i * (i - 1) // 2 + j])
+    
+    def route_distance(self, route: Sequence[int]) -> float:
+        """
+        Distância de uma rota depósito → entregas → depósito.
+        
+        Args:
+            route: Índices das entregas na ordem de visita
+        
+        Returns:
+            float: Distância total em km (0.0 para rota vazia)
+        """
+        if not len(route):
+            return 0.0
+        
+        if not self.rows_available:
+            # Leitura vetorizada do array compacto (soma em float64)
+            stops = np.empty(len(route) + 2, dtype=np.int64)
+            stops[0] = stops[-1] = DEPOT_INDEX
+            stops[1:-1] = route
+            return float(self.take(stops[:-1], stops[1:]).sum(dtype=np.float64))
+        
+        rows = self.rows
+        total = 0.0
+        previous = DEPOT_INDEX
+        for current in route:
+            total += rows[previous][current]
+            previous = current
+        
+        return total + rows[previous][DEPOT_INDEX]
     
+    def route_distances(self, routes: Sequence[Sequence[int]]) -> np.ndarray:
+        """
+        Distância de várias rotas depósito → entregas → depósito de uma vez.
+        
+        Ex: todas as rotas de uma população do GA em uma única chamada.
+        
+        Args:
+            routes: Rotas como listas de índices das entregas
+        
+        Returns:
+            np.ndarray: Distância de cada rota em km, float64 (0.0 para rota vazia)
+        """
+        return self.route_distances_csr(*routes_to_csr(routes))
+    
+    def route_distances_csr(self, stops: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """
+        Distância de rotas no formato CSR (ver ``routes_to_csr``).
+        
+        Intercala o depósito entre as rotas e lê todos os trechos com um
+        único ``take``; a soma por rota é um ``np.add.reduceat``.
+        
+        Args:
+            stops: Paradas de todas as rotas concatenadas
+            offsets: Início de cada rota em ``stops`` (len(rotas) + 1 posições)
+        
+        Returns:
+            np.ndarray: Distância de cada rota em km, float64
+        """
+        stops = np.asarray(stops, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        n_routes = len(offsets) - 1
+        if n_routes <= 0:
+            return np.zeros(0, dtype=np.float64)
+        
+        # [0, rota 0, 0, rota 1, ..., 0]: a rota k ocupa as posições
+        # offsets[k] + k + 1 ... offsets[k + 1] + k, com depósitos nas pontas
+        sequence = np.full(len(stops) + n_routes + 1, DEPOT_INDEX, dtype=np.int64)
+        positions = np.arange(len(stops)) + np.repeat(
+            np.arange(1, n_routes + 1), np.diff(offsets)
+        )
+        sequence[positions] = stops
+        
+        legs = self.take(sequence[:-1], sequence[1:]).astype(np.float64, copy=False)
+        return np.add.reduceat(legs, offsets[:-1] + np.arange(n_routes))
+    
+    def route_distances_padded(self, routes: np.ndarray) -> np.ndarray:
+        """
+        Distância de rotas em um array retangular (uma rota por linha).
+        
+        Preenchimento ao final de cada linha com ``DEPOT_INDEX`` ou valores negativos
+        (trechos depósito → depósito têm distância zero).
+        
+        Args:
+            routes: Array (rotas, paradas) de índices
+        
+        Returns:
+            np.ndarray: Distância de cada rota em km, float64
+        """
+        routes = np.asarray(routes, dtype=np.int64)
+        padded = np.full((routes.shape[0], routes.shape[1] + 2), DEPOT_INDEX, dtype=np.int64)
+        padded[:, 1:-1] = np.where(routes < 0, DEPOT_INDEX, routes)
+        legs = self.take(padded[:, :-1], padded[:, 1:])
+        return legs.sum(axis=1, dtype=np.float64)
+    
+    def get(self, key: Tuple[str, str], default: Optional[float] = None) -> Optional[float]:
+        """Acesso compatível com a matriz legada por par de IDs."""
+        from_idx = self.index.get(key[0])
+        to_idx = self.index.get(key[1])
+        if from_idx is None or to_idx is None:
+            return default
+        return self.distance(from_idx, to_idx)
+    
+    def __getitem__(self, key: Tuple[str, str]) -> float:
+        """Acesso compatível com a matriz legada por par de IDs."""
+        return self.distance(self.index[key[0]], self.index[key[1]])
+    
+    def __contains__(self, key: object) -> bool:
+        """Verifica se o par de IDs pertence à matriz."""
+        return (
+            isinstance(key, tuple)
+            and len(key) == 2
+            and key[0] in self.index
+            and key[1] in self.index
+        )
+
+
+def build_delivery_distance_matrix(
+    deliveries: List[Delivery],
+    depot_location: Tuple[float, float],
+    precision: str = "haversine",
+    dtype: Optional[str] = None,
+    layout: str = "dense",
+    previous: Optional[DistanceMatrix] = None,
+) -> DistanceMatrix:
+    """
+    Constrói matriz de distâncias entre depósito e entregas.
+    
+    Calcula todas as distâncias em uma única passada vetorizada e
+    devolve uma matriz densa com o depósito no índice 0.
+    
+    Args:
+        deliveries: Lista de entregas
+        depot_location: Localização do depósito
+        precision: "haversine" (rápido) ou "ellipsoidal" (correção WGS-84)
+        dtype: "float64" (padrão) ou "float32"
+        layout: "dense" (padrão) ou "packed" (triângulo inferior)
+        previous: Matriz de uma execução anterior; se compatível (mesmo
+            depósito e formato) e com poucas entregas diferentes, é
+            atualizada no lugar em vez de recalculada
+    
+    Returns:
+        DistanceMatrix: Matriz de distâncias (depósito = índice 0, ID "depot")
+    """
+    if _can_update(previous, deliveries, depot_location, precision, dtype, layout):
+        matrix = previous
+        matrix.update_deliveries(deliveries)
+    else:
+        matrix = DistanceMatrix.from_deliveries(
+            deliveries, depot_location, precision=precision, dtype=dtype, layout=layout
+        )
     return matrix
 
 
+def _can_update(
+    matrix: Optional[DistanceMatrix],
+    deliveries: List[Delivery],
+    depot_location: Tuple[float, float],
+    precision: str,
+    dtype: Optional[str],
+    layout: str,
+) -> bool:
+    """True se ``matrix`` pode ser atualizada para ``deliveries`` com ganho."""
+    from hospital_routes.utils.road_network import get_road_network
+    
+    if (
+        matrix is None
+        or matrix.locations is None
+        or matrix.locations[DEPOT_INDEX] != tuple(depot_location)
+        or matrix.precision != precision
+        or matrix.dtype != np.dtype(dtype or np.float64)
+        or matrix.layout != layout
+        or matrix.network is not get_road_network()
+    ):
+        return False
+    
+    # Reaproveitar só compensa se a maior parte das entregas já está na matriz
+    index, locations = matrix.index, matrix.locations
+    kept = sum(
+        1 for d in deliveries
+        if d.id in index and locations[index[d.id]] == tuple(d.location)
+    )
+    return kept * 2 > len(deliveries)
+
+
 def calculate_route_distance(
     route: list[Tuple[float, float]],
     return_to_start: bool = True,
@@ -95,4 +1103,3 @@ def calculate_route_distance(
         total_distance += calculate_distance(route[-1], route[0])
     
     return total_distance
-
@@ -0,0 +1,211 @@
+"""
+Serviço de distâncias ponto a ponto do processo.
+
+Todos os consumidores que precisam da distância entre duas coordenadas
+(estratégias de inicialização, timeline, mapas, comparador de cenários,
+chatbot, dados de acidentes) passam por ``get_distance_service()``, que
+resolve cada consulta na ordem:
+
+1. Matriz de distâncias do problema em otimização (se as duas coordenadas
+   estão nela); o otimizador a registra só enquanto precisa dela
+   (``problem_matrix``), para que o serviço global não a mantenha viva
+2. ``DistanceCache`` global do processo
+3. Cálculo geodésico (``calculate_distance``), gravado no cache
+
+Consultas de raio (ex: acidentes próximos) pedem ``geodesic=True``: uma
+matriz da malha viária tem distâncias de condução e é ignorada.
+
+Cada consulta é contabilizada por ponto de chamada (``call_site``), para
+mostrar quais consumidores mais dependem do cálculo.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from hospital_routes.utils.cache import DistanceCache, get_distance_cache
+from hospital_routes.utils.distance import DistanceMatrix, calculate_distance
+
+
+# Tamanho do cache global quando criado pelo serviço
+DEFAULT_CACHE_SIZE = 100_000
+
+# Ponto de chamada usado quando o consumidor não se identifica
+DEFAULT_CALL_SITE = "default"
+
+
+class DistanceService:
+    """
+    Resolve distâncias entre coordenadas: matriz -> cache -> cálculo.
+    
+    Exemplo:
+        service = get_distance_service()
+        km = service.distance(a, b, call_site="TimelineGenerator.generate_timeline")
+        service.stats()["TimelineGenerator.generate_timeline"]["hit_rate"]
+    """
+    
+    def __init__(
+        self,
+        cache: Optional[DistanceCache] = None,
+        compute: Callable[[Tuple[float, float], Tuple[float, float]], float] = calculate_distance,
+    ):
+        """
+        Args:
+            cache: Cache de distâncias (padrão: cache global do processo)
+            compute: Função de cálculo usada quando matriz e cache falham
+        """
+        self.cache = cache if cache is not None else get_distance_cache(
+            maxsize=DEFAULT_CACHE_SIZE
+        )
+        self.compute = compute
+        self._matrix: Optional[DistanceMatrix] = None
+        self._matrix_index: Dict[Tuple[float, float], int] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+    
+    @property
+    def matrix(self) -> Optional[DistanceMatrix]:
+        """Matriz do problema atual (None se não há)."""
+        return self._matrix
+    
+    def use_matrix(self, matrix: Optional[DistanceMatrix]) -> None:
+        """
+        Define a matriz do problema atual (None remove).
+        
+        Matrizes sem coordenadas (``locations``) não podem ser consultadas
+        por coordenada e são ignoradas.
+        """
+        if matrix is None or matrix.locations is None:
+            self._matrix = None
+            self._matrix_index = {}
+            return
+        
+        self._matrix = matrix
+        self._matrix_index = {
+            location: idx for idx, location in enumerate(matrix.locations)
+        }
+    
+    @contextmanager
+    def problem_matrix(self, matrix: Optional[DistanceMatrix]) -> Iterator["DistanceService"]:
+        """
+        Usa ``matrix`` como matriz do problema atual dentro do bloco.
+        
+        Ao sair, restaura a matriz anterior (em geral nenhuma)::
+            
+            with get_distance_service().problem_matrix(matrix) as service:
+                km = service.distance(a, b)
+        """
+        previous = self._matrix
+        self.use_matrix(matrix)
+        try:
+            yield self
+        finally:
+            self.use_matrix(previous)
+    
+    def distance(
+        self,
+        point1: Tuple[float, float],
+        point2: Tuple[float, float],
+        call_site: str = DEFAULT_CALL_SITE,
+        geodesic: bool = False,
+    ) -> float:
+        """
+        Distância em km entre dois pontos.
+        
+        Args:
+            point1: Tupla (latitude, longitude) do primeiro ponto
+            point2: Tupla (latitude, longitude) do segundo ponto
+            call_site: Identificação do consumidor (para as estatísticas)
+            geodesic: Exige distância geodésica (ignora a matriz se ela
+                vier da malha viária)
+        
+        Returns:
+            float: Distância em quilômetros
+        """
+        stats = self._stats.get(call_site)
+        if stats is None:
+            stats = self._stats[call_site] = {
+                "calls": 0, "matrix_hits": 0, "cache_hits": 0,
+                "computed": 0, "compute_time": 0.0,
+            }
+        stats["calls"] += 1
+        
+        if self._matrix_index and not (geodesic and not self._matrix.symmetric):
+            i = self._matrix_index.get(tuple(point1))
+            j = self._matrix_index.get(tuple(point2))
+            if i is not None and j is not None:
+                stats["matrix_hits"] += 1
+                return self._matrix.distance(i, j)
+        
+        cached = self.cache.get(point1, point2)
+        if cached is not None:
+            stats["cache_hits"] += 1
+            return cached
+        
+        start = time.perf_counter()
+        distance = self.compute(point1, point2)
+        stats["compute_time"] += time.perf_counter() - start
+        stats["computed"] += 1
+        self.cache.set(point1, point2, distance)
+        return distance
+    
+    def path_distance(
+        self,
+        points: Sequence[Tuple[float, float]],
+        call_site: str = DEFAULT_CALL_SITE,
+    ) -> float:
+        """Soma das distâncias entre pontos consecutivos."""
+        return sum(
+            self.distance(points[k], points[k + 1], call_site)
+            for k in range(len(points) - 1)
+        )
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Estatísticas por ponto de chamada.
+        
+        Returns:
+            Dict: Para cada ``call_site``: calls, matrix_hits, cache_hits,
+            computed, compute_time (s) e hit_rate (matriz + cache)
+        """
+        report = {}
+        for call_site, stats in self._stats.items():
+            calls = stats["calls"]
+            report[call_site] = {
+                **stats,
+                "hit_rate": (
+                    (stats["matrix_hits"] + stats["cache_hits"]) / calls
+                    if calls else 0.0
+                ),
+            }
+        return report
+    
+    def reset_stats(self) -> None:
+        """Zera as estatísticas por ponto de chamada."""
+        self._stats.clear()
+
+
+# Instância global do serviço
+_global_service: Optional[DistanceService] = None
+
+
+def notify_matrix_changed(matrix: DistanceMatrix) -> None:
+    """
+    Reindexa a matriz no serviço global após ``add_locations``/``remove_locations``.
+    
+    Não cria o serviço se ele ainda não existe.
+    """
+    if _global_service is not None and _global_service._matrix is matrix:
+        _global_service.use_matrix(matrix)
+
+
+def get_distance_service() -> DistanceService:
+    """
+    Obtém a instância global do serviço de distâncias.
+    
+    Returns:
+        DistanceService: Instância do serviço
+    """
+    global _global_service
+    if _global_service is None:
+        _global_service = DistanceService()
+    return _global_service
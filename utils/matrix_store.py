@@ -0,0 +1,218 @@
+"""
+Armazenamento em disco de matrizes de distâncias.
+
+Matrizes calculadas são gravadas como arquivos ``.npy`` em um diretório
+de cache, identificadas por um hash da lista ordenada de coordenadas e
+do modo de precisão. Execuções seguintes abrem o arquivo com
+``np.load(mmap_mode="r")``: a matriz não é recalculada nem copiada, e
+vários processos compartilham a mesma cópia pelo page cache do sistema.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Variável de ambiente que ativa o armazenamento global
+MATRIX_CACHE_ENV = "HOSPITAL_ROUTES_MATRIX_CACHE"
+
+# Abaixo deste tamanho calcular é mais barato que manter arquivos
+DEFAULT_MIN_LOCATIONS = 500
+
+# Versão do formato (entra no hash; mudanças invalidam o cache)
+_FORMAT_VERSION = b"matrix-v2"
+
+
+class MatrixStore:
+    """
+    Cache de matrizes de distâncias em arquivos ``.npy`` mapeados em memória.
+    
+    Exemplo:
+        store = MatrixStore("~/.cache/hospital_routes/matrices")
+        values = store.get_or_compute(points, "haversine", compute)
+    """
+    
+    def __init__(
+        self,
+        cache_dir: str,
+        min_locations: int = DEFAULT_MIN_LOCATIONS,
+    ):
+        """
+        Args:
+            cache_dir: Diretório dos arquivos ``.npy``
+            min_locations: Instâncias menores não são gravadas em disco
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.min_locations = min_locations
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def fingerprint(points: Sequence[Tuple[float, float]], precision: str) -> str:
+        """
+        Hash da instância: coordenadas (na ordem) + modo de precisão.
+        
+        Args:
+            points: Coordenadas (lat, lon) na ordem da matriz
+            precision: Modo de precisão usado no cálculo
+        
+        Returns:
+            str: Hash hexadecimal (SHA-256)
+        """
+        digest = hashlib.sha256(_FORMAT_VERSION)
+        digest.update(precision.encode("utf-8"))
+        digest.update(np.ascontiguousarray(points, dtype="<f8").tobytes())
+        return digest.hexdigest()
+    
+    def path_for(self, points: Sequence[Tuple[float, float]], precision: str) -> Path:
+        """Arquivo ``.npy`` correspondente à instância."""
+        return self.cache_dir / f"{self.fingerprint(points, precision)}.npy"
+    
+    def load(
+        self,
+        points: Sequence[Tuple[float, float]],
+        precision: str,
+        shape: Optional[Tuple[int, ...]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Abre a matriz gravada (somente leitura, mapeada em memória).
+        
+        Args:
+            points: Coordenadas (lat, lon) na ordem da matriz
+            precision: Modo de precisão (ou variante de armazenamento)
+            shape: Forma esperada do array (padrão: (n, n))
+        
+        Returns:
+            np.ndarray: Matriz mapeada ou None se não houver arquivo válido
+        """
+        path = self.path_for(points, precision)
+        try:
+            values = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        
+        if shape is None:
+            shape = (len(points), len(points))
+        if values.shape != tuple(shape):
+            return None
+        return values
+    
+    def save(
+        self,
+        points: Sequence[Tuple[float, float]],
+        precision: str,
+        values: np.ndarray,
+    ) -> Path:
+        """
+        Grava a matriz de forma atômica (arquivo temporário + rename).
+        
+        Processos concorrentes gravando a mesma instância produzem o mesmo
+        conteúdo; o último rename vence sem deixar arquivos parciais.
+        
+        Returns:
+            Path: Arquivo gravado
+        """
+        path = self.path_for(points, precision)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, values)
+            # mkstemp cria o arquivo com permissão 0600
+            os.chmod(temp_name, 0o644)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return path
+    
+    def get_or_compute(
+        self,
+        points: Sequence[Tuple[float, float]],
+        precision: str,
+        compute: Callable[[], np.ndarray],
+        shape: Optional[Tuple[int, ...]] = None,
+    ) -> np.ndarray:
+        """
+        Matriz do disco se existir; senão calcula, grava e a devolve.
+        
+        Args:
+            points: Coordenadas (lat, lon) na ordem da matriz
+            precision: Modo de precisão (matrizes compactas usam
+                "precisão:layout:dtype", ex. "haversine:packed:float32")
+            compute: Função que calcula a matriz (sem argumentos)
+            shape: Forma esperada do array (padrão: (n, n))
+        
+        Returns:
+            np.ndarray: Matriz (mapeada em memória quando vem do disco)
+        """
+        if len(points) < self.min_locations:
+            return compute()
+        
+        values = self.load(points, precision, shape)
+        if values is not None:
+            self.hits += 1
+            return values
+        
+        self.misses += 1
+        values = compute()
+        try:
+            self.save(points, precision, values)
+        except OSError:
+            # Falha silenciosa - a matriz calculada continua válida
+            pass
+        return values
+    
+    def clear(self) -> None:
+        """Remove todas as matrizes gravadas."""
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.npy"):
+                path.unlink(missing_ok=True)
+    
+    def stats(self) -> dict:
+        """Retorna estatísticas do armazenamento."""
+        return {
+            "cache_dir": str(self.cache_dir),
+            "min_locations": self.min_locations,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Instância global (None = desativado)
+_global_store: Optional[MatrixStore] = None
+_global_store_configured = False
+
+
+def set_matrix_store(store: Optional[MatrixStore]) -> None:
+    """
+    Define o armazenamento global usado por ``build_delivery_distance_matrix``.
+    
+    Args:
+        store: Armazenamento (None desativa)
+    """
+    global _global_store, _global_store_configured
+    _global_store = store
+    _global_store_configured = True
+
+
+def get_matrix_store() -> Optional[MatrixStore]:
+    """
+    Obtém o armazenamento global de matrizes.
+    
+    Sem ``set_matrix_store``, é criado a partir da variável de ambiente
+    ``HOSPITAL_ROUTES_MATRIX_CACHE`` (diretório); ausente = desativado.
+    
+    Returns:
+        MatrixStore ou None se desativado
+    """
+    global _global_store, _global_store_configured
+    if not _global_store_configured:
+        cache_dir = os.environ.get(MATRIX_CACHE_ENV)
+        _global_store = MatrixStore(cache_dir) if cache_dir else None
+        _global_store_configured = True
+    return _global_store
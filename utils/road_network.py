@@ -0,0 +1,592 @@
+"""
+Distâncias pela malha viária a partir de um arquivo local (offline).
+
+Carrega um grafo de ruas de um extrato OSM (``.osm`` XML) ou de um arquivo
+GraphML (formato exportado pelo OSMnx) e calcula distâncias de condução
+entre coordenadas arbitrárias:
+
+1. Cada ponto é ligado ao nó mais próximo da malha (índice espacial), e a
+   distância em linha reta até esse nó é somada ao trajeto
+2. Caminhos mínimos muitos-para-muitos: pontos ligados ao mesmo nó são
+   agrupados e cada nó de origem distinto roda um Dijkstra. Com o SciPy
+   instalado, ``scipy.sparse.csgraph.dijkstra`` percorre a malha inteira a
+   partir de cada origem (em lotes de origens); sem ele, o Dijkstra em
+   Python puro para quando todos os nós de destino foram fixados
+
+O grafo é convertido para arrays CSR e gravado como índice ``.npz`` ao
+lado do arquivo original; execuções seguintes abrem o índice sem
+reprocessar o XML. Com uma malha ativa (``set_road_network`` ou variável
+``HOSPITAL_ROUTES_ROAD_NETWORK``), ``DistanceMatrix.from_deliveries``
+produz a matriz pela malha, com a mesma interface usada pelos otimizadores.
+"""
+
+import hashlib
+import heapq
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from hospital_routes.utils.candidate_graph import project_points, spatial_knn
+from hospital_routes.utils.distance import compute_distance_array, haversine_pairs
+
+
+# Variável de ambiente com o caminho da malha viária global
+ROAD_NETWORK_ENV = "HOSPITAL_ROUTES_ROAD_NETWORK"
+
+# Sufixo do índice pré-processado gravado ao lado do arquivo original
+INDEX_SUFFIX = ".index.npz"
+
+# Versão do formato do índice (mudanças invalidam índices antigos)
+_INDEX_VERSION = 1
+
+# Vias de OSM consideradas trafegáveis por veículos
+DRIVABLE_HIGHWAYS = frozenset({
+    "motorway", "motorway_link", "trunk", "trunk_link", "primary",
+    "primary_link", "secondary", "secondary_link", "tertiary",
+    "tertiary_link", "unclassified", "residential", "living_street",
+    "service", "road",
+})
+
+# Pares sem caminho na malha (componentes desconexas): linha reta x fator
+# típico de desvio urbano
+FALLBACK_DETOUR_FACTOR = 1.4
+
+# Origens por chamada ao Dijkstra do SciPy (limita a matriz origens x nós)
+_SCIPY_SOURCE_BATCH = 64
+
+
+class RoadNetwork:
+    """
+    Grafo dirigido de ruas em formato CSR, com distâncias em km.
+    
+    Exemplo:
+        network = RoadNetwork.from_file("sao_paulo.graphml")
+        km = network.distance_array(origins, destinations)
+    """
+    
+    def __init__(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        lengths: np.ndarray,
+        source: Optional[str] = None,
+    ):
+        """
+        Args:
+            latitudes: Latitude de cada nó
+            longitudes: Longitude de cada nó
+            indptr: Ponteiros CSR (arestas de saída do nó i em indptr[i]:indptr[i+1])
+            indices: Nó de destino de cada aresta
+            lengths: Comprimento de cada aresta em km
+            source: Arquivo de origem (informativo)
+        
+        Raises:
+            ValueError: Se os arrays forem inconsistentes ou o grafo estiver vazio
+        """
+        self.latitudes = np.ascontiguousarray(latitudes, dtype=np.float64)
+        self.longitudes = np.ascontiguousarray(longitudes, dtype=np.float64)
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        self.indices = np.ascontiguousarray(indices, dtype=np.int64)
+        self.lengths = np.ascontiguousarray(lengths, dtype=np.float64)
+        self.source = source
+        
+        n_nodes = len(self.latitudes)
+        if n_nodes == 0:
+            raise ValueError("Malha viária sem nós")
+        if (
+            len(self.longitudes) != n_nodes
+            or len(self.indptr) != n_nodes + 1
+            or len(self.indices) != len(self.lengths)
+            or self.indptr[-1] != len(self.indices)
+        ):
+            raise ValueError("Arrays da malha viária inconsistentes")
+        
+        self.fallback_pairs = 0
+        self._node_xy: Optional[np.ndarray] = None
+        self._adjacency: Optional[List[Tuple[List[int], List[float]]]] = None
+        self._fingerprint: Optional[str] = None
+    
+    @classmethod
+    def from_edges(
+        cls,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        sources: Sequence[int],
+        targets: Sequence[int],
+        lengths: Optional[Sequence[float]] = None,
+        source: Optional[str] = None,
+    ) -> "RoadNetwork":
+        """
+        Monta o grafo a partir de uma lista de arestas dirigidas.
+        
+        Arestas paralelas ficam com o menor comprimento; comprimentos
+        ausentes (None/NaN) são calculados em linha reta entre os nós.
+        
+        Args:
+            latitudes: Latitude de cada nó
+            longitudes: Longitude de cada nó
+            sources: Nó de origem de cada aresta
+            targets: Nó de destino de cada aresta
+            lengths: Comprimento de cada aresta em km (opcional)
+            source: Arquivo de origem (informativo)
+        
+        Returns:
+            RoadNetwork: Grafo em formato CSR
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        
+        coordinates = np.column_stack((latitudes, longitudes))
+        straight = haversine_pairs(coordinates[sources], coordinates[targets])
+        if lengths is None:
+            lengths = straight
+        else:
+            lengths = np.asarray(lengths, dtype=np.float64)
+            lengths = np.where(np.isnan(lengths), straight, lengths)
+        
+        # Remover laços e manter a menor aresta entre cada par de nós
+        keep = sources != targets
+        sources, targets, lengths = sources[keep], targets[keep], lengths[keep]
+        order = np.lexsort((lengths, targets, sources))
+        sources, targets, lengths = sources[order], targets[order], lengths[order]
+        first = np.ones(len(sources), dtype=bool)
+        first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources, targets, lengths = sources[first], targets[first], lengths[first]
+        
+        indptr = np.zeros(len(latitudes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(latitudes)), out=indptr[1:])
+        return cls(latitudes, longitudes, indptr, targets, lengths, source=source)
+    
+    @classmethod
+    def from_graphml(cls, path: str) -> "RoadNetwork":
+        """
+        Lê um arquivo GraphML (ex: ``osmnx.save_graphml``).
+        
+        Coordenadas dos nós nos atributos ``y``/``x`` (ou ``lat``/``lon``);
+        comprimento das arestas em metros no atributo ``length``.
+        
+        Args:
+            path: Caminho do arquivo ``.graphml``
+        
+        Returns:
+            RoadNetwork: Grafo carregado
+        
+        Raises:
+            ValueError: Se faltar coordenada em algum nó
+        """
+        keys: Dict[str, str] = {}
+        node_index: Dict[str, int] = {}
+        latitudes: List[float] = []
+        longitudes: List[float] = []
+        sources: List[int] = []
+        targets: List[int] = []
+        lengths: List[float] = []
+        pending_edges: List[Tuple[str, str, float]] = []
+        directed = True
+        
+        for _, element in ET.iterparse(path, events=("end",)):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "key":
+                keys[element.get("id")] = element.get("attr.name")
+            elif tag == "graph":
+                directed = element.get("edgedefault", "directed") == "directed"
+            elif tag == "node":
+                data = _graphml_data(element, keys)
+                lat = data.get("y", data.get("lat"))
+                lon = data.get("x", data.get("lon"))
+                if lat is None or lon is None:
+                    raise ValueError(f"Nó {element.get('id')} sem coordenadas no GraphML")
+                node_index[element.get("id")] = len(latitudes)
+                latitudes.append(float(lat))
+                longitudes.append(float(lon))
+                element.clear()
+            elif tag == "edge":
+                data = _graphml_data(element, keys)
+                length = data.get("length")
+                pending_edges.append((
+                    element.get("source"),
+                    element.get("target"),
+                    float(length) / 1000.0 if length is not None else float("nan"),
+                ))
+                element.clear()
+        
+        for source, target, length in pending_edges:
+            if source not in node_index or target not in node_index:
+                continue
+            sources.append(node_index[source])
+            targets.append(node_index[target])
+            lengths.append(length)
+            if not directed:
+                sources.append(node_index[target])
+                targets.append(node_index[source])
+                lengths.append(length)
+        
+        return cls.from_edges(
+            latitudes, longitudes, sources, targets, lengths, source=str(path)
+        )
+    
+    @classmethod
+    def from_osm_xml(cls, path: str) -> "RoadNetwork":
+        """
+        Lê um extrato OSM em XML (``.osm``).
+        
+        Usa as vias com ``highway`` trafegável (``DRIVABLE_HIGHWAYS``) e
+        respeita ``oneway`` (incluindo ``-1`` e rotatórias). Comprimentos
+        são calculados em linha reta entre nós consecutivos das vias.
+        
+        Args:
+            path: Caminho do arquivo ``.osm``
+        
+        Returns:
+            RoadNetwork: Grafo carregado
+        
+        Raises:
+            ValueError: Se o extrato não tiver vias trafegáveis
+        """
+        coordinates: Dict[str, Tuple[float, float]] = {}
+        ways: List[Tuple[List[str], int]] = []
+        
+        for _, element in ET.iterparse(path, events=("end",)):
+            if element.tag == "node":
+                coordinates[element.get("id")] = (
+                    float(element.get("lat")), float(element.get("lon"))
+                )
+                element.clear()
+            elif element.tag == "way":
+                tags = {
+                    tag.get("k"): tag.get("v") for tag in element.iter("tag")
+                }
+                if tags.get("highway") in DRIVABLE_HIGHWAYS:
+                    refs = [nd.get("ref") for nd in element.iter("nd")]
+                    ways.append((refs, _oneway_direction(tags)))
+                element.clear()
+        
+        if not ways:
+            raise ValueError(f"Nenhuma via trafegável em {path}")
+        
+        node_index: Dict[str, int] = {}
+        sources: List[int] = []
+        targets: List[int] = []
+        for refs, direction in ways:
+            refs = [ref for ref in refs if ref in coordinates]
+            for ref in refs:
+                if ref not in node_index:
+                    node_index[ref] = len(node_index)
+            for a, b in zip(refs, refs[1:]):
+                if direction >= 0:
+                    sources.append(node_index[a])
+                    targets.append(node_index[b])
+                if direction <= 0:
+                    sources.append(node_index[b])
+                    targets.append(node_index[a])
+        
+        latitudes = [coordinates[ref][0] for ref in node_index]
+        longitudes = [coordinates[ref][1] for ref in node_index]
+        return cls.from_edges(latitudes, longitudes, sources, targets, source=str(path))
+    
+    @classmethod
+    def from_file(cls, path: str, use_index: bool = True) -> "RoadNetwork":
+        """
+        Carrega a malha de ``.graphml``, ``.osm``/``.xml`` ou de um índice ``.npz``.
+        
+        Com ``use_index``, o índice ``<arquivo>.index.npz`` é reaproveitado
+        quando mais novo que o arquivo original, e (re)gravado caso contrário.
+        
+        Args:
+            path: Caminho do arquivo
+            use_index: Ler/gravar o índice pré-processado
+        
+        Returns:
+            RoadNetwork: Grafo carregado
+        
+        Raises:
+            ValueError: Se o formato não for suportado
+        """
+        path = Path(path).expanduser()
+        if path.suffix == ".npz":
+            return cls.load_index(str(path))
+        
+        index_path = path.with_name(path.name + INDEX_SUFFIX)
+        if use_index and index_path.exists():
+            if index_path.stat().st_mtime >= path.stat().st_mtime:
+                try:
+                    return cls.load_index(str(index_path))
+                except (OSError, KeyError, ValueError):
+                    pass  # Índice inválido: reprocessar o arquivo
+        
+        suffix = path.suffix.lower()
+        if suffix == ".graphml":
+            network = cls.from_graphml(str(path))
+        elif suffix in (".osm", ".xml"):
+            network = cls.from_osm_xml(str(path))
+        else:
+            raise ValueError(
+                f"Formato de malha viária não suportado: {path.suffix}. "
+                "Use .graphml, .osm (XML) ou um índice .npz"
+            )
+        
+        if use_index:
+            try:
+                network.save_index(str(index_path))
+            except OSError:
+                # Falha silenciosa - a malha carregada continua válida
+                pass
+        return network
+    
+    @classmethod
+    def load_index(cls, path: str) -> "RoadNetwork":
+        """Abre um índice gravado por ``save_index``."""
+        with np.load(path) as data:
+            if int(data["version"]) != _INDEX_VERSION:
+                raise ValueError(f"Versão de índice incompatível: {path}")
+            return cls(
+                data["latitudes"],
+                data["longitudes"],
+                data["indptr"],
+                data["indices"],
+                data["lengths"],
+                source=str(path),
+            )
+    
+    def save_index(self, path: str) -> None:
+        """Grava os arrays do grafo em um índice ``.npz``."""
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                version=np.int64(_INDEX_VERSION),
+                latitudes=self.latitudes,
+                longitudes=self.longitudes,
+                indptr=self.indptr,
+                indices=self.indices,
+                lengths=self.lengths,
+            )
+    
+    @property
+    def node_count(self) -> int:
+        """Número de nós da malha."""
+        return len(self.latitudes)
+    
+    @property
+    def edge_count(self) -> int:
+        """Número de arestas dirigidas da malha."""
+        return len(self.indices)
+    
+    @property
+    def fingerprint(self) -> str:
+        """Hash do grafo (identifica matrizes calculadas sobre esta malha)."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for array in (
+                self.latitudes, self.longitudes, self.indptr, self.indices, self.lengths
+            ):
+                digest.update(array.tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+    
+    def snap(self, points: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Liga cada ponto ao nó mais próximo da malha.
+        
+        Args:
+            points: Coordenadas (lat, lon)
+        
+        Returns:
+            Tuple: (nó de cada ponto, distância em km do ponto ao nó)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        node_coordinates = np.column_stack((self.latitudes, self.longitudes))
+        reference = float(self.latitudes.mean())
+        if self._node_xy is None:
+            self._node_xy = project_points(node_coordinates, reference)
+        
+        xy = project_points(points, reference)
+        nodes = spatial_knn(self._node_xy, xy, 1)[:, 0]
+        return nodes, haversine_pairs(points, node_coordinates[nodes])
+    
+    def shortest_paths(
+        self, sources: Sequence[int], targets: Sequence[int]
+    ) -> np.ndarray:
+        """
+        Caminhos mínimos entre nós da malha.
+        
+        Args:
+            sources: Nós de origem (distintos)
+            targets: Nós de destino
+        
+        Returns:
+            np.ndarray: Distâncias (len(sources), len(targets)) em km
+            (``inf`` quando não há caminho)
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        result = np.full((len(sources), len(targets)), np.inf)
+        
+        if SCIPY_AVAILABLE:
+            graph = csr_matrix(
+                (self.lengths, self.indices, self.indptr),
+                shape=(self.node_count, self.node_count),
+            )
+            for start in range(0, len(sources), _SCIPY_SOURCE_BATCH):
+                batch = sources[start:start + _SCIPY_SOURCE_BATCH]
+                distances = csgraph_dijkstra(graph, directed=True, indices=batch)
+                result[start:start + len(batch)] = distances[:, targets]
+            return result
+        
+        target_positions: Dict[int, List[int]] = {}
+        for position, node in enumerate(targets.tolist()):
+            target_positions.setdefault(node, []).append(position)
+        for row, source in enumerate(sources.tolist()):
+            for node, distance in self._dijkstra(source, target_positions).items():
+                result[row, target_positions[node]] = distance
+        return result
+    
+    def _dijkstra(self, source: int, targets: Dict[int, List[int]]) -> Dict[int, float]:
+        """Dijkstra a partir de ``source`` até fixar todos os ``targets``."""
+        if self._adjacency is None:
+            indptr = self.indptr.tolist()
+            indices = self.indices.tolist()
+            lengths = self.lengths.tolist()
+            self._adjacency = [
+                (indices[indptr[u]:indptr[u + 1]], lengths[indptr[u]:indptr[u + 1]])
+                for u in range(self.node_count)
+            ]
+        
+        adjacency = self._adjacency
+        remaining = len(targets)
+        found: Dict[int, float] = {}
+        best = {source: 0.0}
+        heap = [(0.0, source)]
+        while heap and remaining:
+            distance, node = heapq.heappop(heap)
+            if distance > best[node]:
+                continue
+            if node in targets:
+                found[node] = distance
+                remaining -= 1
+            neighbors, lengths = adjacency[node]
+            for neighbor, length in zip(neighbors, lengths):
+                candidate = distance + length
+                if candidate < best.get(neighbor, float("inf")):
+                    best[neighbor] = candidate
+                    heapq.heappush(heap, (candidate, neighbor))
+        return found
+    
+    def distance_array(
+        self,
+        origins: Sequence[Tuple[float, float]],
+        destinations: Sequence[Tuple[float, float]],
+    ) -> np.ndarray:
+        """
+        Distâncias de condução (km) de cada origem a cada destino.
+        
+        Soma a ligação do ponto à malha nas duas pontas; o resultado nunca
+        é menor que a linha reta. Pares sem caminho usam a linha reta vezes
+        ``FALLBACK_DETOUR_FACTOR`` (contados em ``fallback_pairs``).
+        
+        Args:
+            origins: Coordenadas (lat, lon) de origem
+            destinations: Coordenadas (lat, lon) de destino
+        
+        Returns:
+            np.ndarray: Matriz (len(origins), len(destinations)), assimétrica
+            em geral (vias de mão única)
+        """
+        origin_nodes, origin_offsets = self.snap(origins)
+        target_nodes, target_offsets = self.snap(destinations)
+        
+        # Pontos ligados ao mesmo nó compartilham o cálculo
+        unique_sources, source_rows = np.unique(origin_nodes, return_inverse=True)
+        unique_targets, target_cols = np.unique(target_nodes, return_inverse=True)
+        paths = self.shortest_paths(unique_sources, unique_targets)
+        
+        values = (
+            origin_offsets[:, None]
+            + paths[source_rows][:, target_cols]
+            + target_offsets[None, :]
+        )
+        straight = compute_distance_array(origins, destinations)
+        unreachable = ~np.isfinite(values)
+        if unreachable.any():
+            self.fallback_pairs += int(unreachable.sum())
+            values[unreachable] = straight[unreachable] * FALLBACK_DETOUR_FACTOR
+        return np.maximum(values, straight)
+    
+    def stats(self) -> dict:
+        """Retorna informações da malha."""
+        return {
+            "source": self.source,
+            "nodes": self.node_count,
+            "edges": self.edge_count,
+            "fallback_pairs": self.fallback_pairs,
+            "scipy": SCIPY_AVAILABLE,
+        }
+
+
+def _graphml_data(element: ET.Element, keys: Dict[str, str]) -> Dict[str, str]:
+    """Atributos ``<data>`` de um nó/aresta GraphML, pelo nome do atributo."""
+    return {
+        keys.get(data.get("key"), data.get("key")): data.text
+        for data in element
+        if data.tag.rsplit("}", 1)[-1] == "data"
+    }
+
+
+def _oneway_direction(tags: Dict[str, str]) -> int:
+    """1 = só no sentido da via, -1 = só no sentido contrário, 0 = mão dupla."""
+    oneway = tags.get("oneway", "").lower()
+    if oneway in ("yes", "true", "1"):
+        return 1
+    if oneway == "-1":
+        return -1
+    if tags.get("junction") in ("roundabout", "circular") and oneway != "no":
+        return 1
+    return 0
+
+
+# Instância global (None = distâncias geodésicas)
+_global_network: Optional[RoadNetwork] = None
+_global_network_configured = False
+
+
+def set_road_network(network: Optional[RoadNetwork]) -> None:
+    """
+    Define a malha viária usada por ``build_delivery_distance_matrix``.
+    
+    Args:
+        network: Malha viária (None volta às distâncias geodésicas)
+    """
+    global _global_network, _global_network_configured
+    _global_network = network
+    _global_network_configured = True
+
+
+def get_road_network() -> Optional[RoadNetwork]:
+    """
+    Obtém a malha viária global.
+    
+    Sem ``set_road_network``, é carregada do arquivo indicado pela variável
+    de ambiente ``HOSPITAL_ROUTES_ROAD_NETWORK``; ausente = desativada.
+    
+    Returns:
+        RoadNetwork ou None se desativada
+    """
+    global _global_network, _global_network_configured
+    if not _global_network_configured:
+        path = os.environ.get(ROAD_NETWORK_ENV)
+        _global_network = RoadNetwork.from_file(path) if path else None
+        _global_network_configured = True
+    return _global_network
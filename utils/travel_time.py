@@ -0,0 +1,287 @@
+"""
+Tempos de viagem dependentes do horário (perfil de velocidades por hora).
+
+O custo do motorista, a timeline e as estimativas de ETA usam o mesmo
+``TravelTimeProfile``: velocidade média (km/h) em cada faixa horária
+(24 faixas de 1h no perfil padrão, com picos de manhã e fim de tarde).
+
+``TravelTimeTensor`` expõe os tempos como um tensor
+faixa horária x origem x destino sobre uma ``DistanceMatrix``. Como a
+velocidade de cada faixa é um escalar, o tensor é guardado fatorado: a
+matriz de distâncias (compartilhada, sem cópia) + o inverso da velocidade
+de cada faixa. Uma fatia materializada custa uma multiplicação, e as 24
+fatias ocupam a memória de uma única matriz.
+"""
+
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hospital_routes.core.interfaces import Delivery
+from hospital_routes.utils.distance import DistanceMatrix, DEPOT_INDEX
+
+
+# Variável de ambiente com o perfil global: uma velocidade (constante) ou
+# uma velocidade por faixa, separadas por vírgula
+SPEED_PROFILE_ENV = "HOSPITAL_ROUTES_SPEED_PROFILE"
+
+# Velocidade média (km/h) por hora do dia em área urbana: picos às 7-9h
+# e às 17-19h, trânsito livre de madrugada
+DEFAULT_HOURLY_SPEEDS = (
+    55.0, 55.0, 55.0, 55.0, 55.0, 50.0,  # 00h-05h
+    40.0, 28.0, 25.0, 32.0, 40.0, 40.0,  # 06h-11h
+    40.0, 40.0, 40.0, 40.0, 32.0, 24.0,  # 12h-17h
+    22.0, 28.0, 38.0, 48.0, 48.0, 48.0,  # 18h-23h
+)
+
+# Início do turno de entregas quando o chamador não informa (horas)
+DEFAULT_DEPARTURE_HOUR = 9.0
+
+
+class TravelTimeProfile:
+    """
+    Velocidade média por faixa horária.
+    
+    As faixas dividem o dia em partes iguais (24 velocidades = faixas de
+    1h, 48 = faixas de 30 min). O trecho inteiro usa a velocidade da faixa
+    do horário de partida.
+    
+    Exemplo:
+        profile = TravelTimeProfile()
+        hours = profile.travel_hours(12.0, departure_hour=8.5)
+    """
+    
+    def __init__(
+        self,
+        speeds: Sequence[float] = DEFAULT_HOURLY_SPEEDS,
+        departure_hour: float = DEFAULT_DEPARTURE_HOUR,
+    ):
+        """
+        Args:
+            speeds: Velocidade média (km/h) de cada faixa, a partir de 00h
+            departure_hour: Horário de saída do depósito usado quando o
+                chamador não informa outro (horas desde 00h)
+        
+        Raises:
+            ValueError: Se não houver faixas ou alguma velocidade não for positiva
+        """
+        speeds = np.asarray(speeds, dtype=np.float64).reshape(-1)
+        if not len(speeds):
+            raise ValueError("Perfil de velocidades sem faixas horárias")
+        if not np.all(speeds > 0):
+            raise ValueError("Velocidades do perfil devem ser positivas")
+        
+        self.speeds = speeds
+        self.inverse_speeds = 1.0 / speeds
+        self.departure_hour = departure_hour
+        self._inverse_list: List[float] = self.inverse_speeds.tolist()
+    
+    @classmethod
+    def flat(
+        cls, speed: float, departure_hour: float = DEFAULT_DEPARTURE_HOUR
+    ) -> "TravelTimeProfile":
+        """Perfil com a mesma velocidade o dia inteiro."""
+        return cls([speed], departure_hour=departure_hour)
+    
+    @property
+    def buckets(self) -> int:
+        """Número de faixas horárias."""
+        return len(self.speeds)
+    
+    def bucket_of(self, hour: float) -> int:
+        """Faixa do horário ``hour`` (horas desde 00h; dias seguintes dão a volta)."""
+        return int((hour % 24.0) * len(self._inverse_list) / 24.0) % len(self._inverse_list)
+    
+    def speed_at(self, hour: float) -> float:
+        """Velocidade média (km/h) no horário ``hour``."""
+        return float(self.speeds[self.bucket_of(hour)])
+    
+    def travel_hours(self, distance_km: float, departure_hour: Optional[float] = None) -> float:
+        """
+        Tempo (horas) de um trecho iniciado em ``departure_hour``.
+        
+        Args:
+            distance_km: Distância do trecho
+            departure_hour: Horário de partida (padrão: ``self.departure_hour``)
+        
+        Returns:
+            float: Duração em horas
+        """
+        if departure_hour is None:
+            departure_hour = self.departure_hour
+        return distance_km * self._inverse_list[self.bucket_of(departure_hour)]
+
+
+class TravelTimeTensor:
+    """
+    Tensor de tempos de viagem (faixa x origem x destino) em horas.
+    
+    Fatorado sobre a ``DistanceMatrix``: o tempo de i para j na faixa b é
+    ``distance(i, j) / speeds[b]``, sem copiar a matriz. Atualizações da
+    matriz (``add_locations``/``remove_locations``) valem imediatamente.
+    
+    Exemplo:
+        travel_times = TravelTimeTensor.for_deliveries(matrix, deliveries)
+        hours = travel_times.route_hours(route)
+        arrivals, _ = travel_times.route_schedule(route, start_hour=7.5)
+    """
+    
+    def __init__(
+        self,
+        distance_matrix: DistanceMatrix,
+        profile: Optional[TravelTimeProfile] = None,
+        service_hours: Optional[Sequence[float]] = None,
+    ):
+        """
+        Args:
+            distance_matrix: Matriz de distâncias
+            profile: Perfil de velocidades (padrão: ``get_travel_time_profile()``)
+            service_hours: Tempo de serviço em cada localização, por índice
+                da matriz (avança o relógio entre trechos; padrão: zero)
+        """
+        self.distance_matrix = distance_matrix
+        self.profile = profile or get_travel_time_profile()
+        self.service_hours = list(service_hours) if service_hours is not None else None
+    
+    @classmethod
+    def for_deliveries(
+        cls,
+        distance_matrix: DistanceMatrix,
+        deliveries: Sequence[Delivery],
+        profile: Optional[TravelTimeProfile] = None,
+    ) -> "TravelTimeTensor":
+        """Tensor com os tempos de serviço das entregas (``estimated_service_time``)."""
+        service_hours = [0.0] * len(distance_matrix)
+        index = distance_matrix.index
+        for d in deliveries:
+            if d.id in index:
+                service_hours[index[d.id]] = d.estimated_service_time
+        return cls(distance_matrix, profile, service_hours)
+    
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """(faixas, origens, destinos)."""
+        size = len(self.distance_matrix)
+        return (self.profile.buckets, size, size)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memória do tensor fatorado (matriz compartilhada + velocidades)."""
+        return self.distance_matrix.nbytes + self.profile.inverse_speeds.nbytes
+    
+    def hours(self, i: int, j: int, departure_hour: Optional[float] = None) -> float:
+        """Tempo (horas) de ``i`` para ``j`` saindo em ``departure_hour``."""
+        return self.profile.travel_hours(
+            self.distance_matrix.distance(i, j), departure_hour
+        )
+    
+    def take(self, buckets: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """
+        Tempos dos trechos (buckets[k], i[k], j[k]) em uma operação vetorizada.
+        
+        Args:
+            buckets: Faixas horárias (ver ``TravelTimeProfile.bucket_of``)
+            i: Índices de origem
+            j: Índices de destino (formas compatíveis por broadcast)
+        
+        Returns:
+            np.ndarray: Tempos em horas (float64)
+        """
+        distances = self.distance_matrix.take(i, j).astype(np.float64)
+        return distances * self.profile.inverse_speeds[np.asarray(buckets)]
+    
+    def slice(self, bucket: int) -> np.ndarray:
+        """Fatia materializada (n x n) da faixa ``bucket``, em horas."""
+        return self.distance_matrix.values * self.profile.inverse_speeds[bucket]
+    
+    def route_schedule(
+        self,
+        route: Sequence[int],
+        start_hour: Optional[float] = None,
+    ) -> Tuple[List[float], float]:
+        """
+        Horários de chegada ao longo de uma rota depósito → entregas → depósito.
+        
+        Cada trecho usa a faixa do horário em que começa; o relógio avança
+        pelo tempo de viagem e pelo tempo de serviço de cada parada.
+        
+        Args:
+            route: Índices das entregas na ordem de visita
+            start_hour: Saída do depósito (padrão: ``profile.departure_hour``)
+        
+        Returns:
+            Tuple: (chegada a cada entrega e, por último, ao depósito;
+            horas dirigindo)
+        """
+        travel_hours = self.profile.travel_hours
+        distance = self.distance_matrix.distance
+        service = self.service_hours
+        clock = self.profile.departure_hour if start_hour is None else start_hour
+        
+        arrivals = []
+        driving = 0.0
+        previous = DEPOT_INDEX
+        for current in list(route) + [DEPOT_INDEX]:
+            leg = travel_hours(distance(previous, current), clock)
+            driving += leg
+            clock += leg
+            arrivals.append(clock)
+            if service is not None and current != DEPOT_INDEX:
+                clock += service[current]
+            previous = current
+        
+        return arrivals, driving
+    
+    def route_hours(self, route: Sequence[int], start_hour: Optional[float] = None) -> float:
+        """
+        Horas dirigindo em uma rota (0.0 para rota vazia).
+        
+        Args:
+            route: Índices das entregas na ordem de visita
+            start_hour: Saída do depósito (padrão: ``profile.departure_hour``)
+        
+        Returns:
+            float: Tempo de viagem em horas (sem os tempos de serviço)
+        """
+        if not len(route):
+            return 0.0
+        return self.route_schedule(route, start_hour)[1]
+
+
+def _profile_from_env(value: str) -> TravelTimeProfile:
+    """Perfil a partir de ``"40"`` (constante) ou ``"55,55,...,48"`` (por faixa)."""
+    speeds = [float(speed) for speed in value.split(",") if speed.strip()]
+    return TravelTimeProfile(speeds)
+
+
+# Instância global
+_global_profile: Optional[TravelTimeProfile] = None
+
+
+def set_travel_time_profile(profile: Optional[TravelTimeProfile]) -> None:
+    """
+    Define o perfil de velocidades usado em custos, timeline e ETAs.
+    
+    Args:
+        profile: Perfil (None volta ao padrão/variável de ambiente)
+    """
+    global _global_profile
+    _global_profile = profile
+
+
+def get_travel_time_profile() -> TravelTimeProfile:
+    """
+    Obtém o perfil de velocidades global.
+    
+    Sem ``set_travel_time_profile``, é criado a partir da variável de
+    ambiente ``HOSPITAL_ROUTES_SPEED_PROFILE`` ou de ``DEFAULT_HOURLY_SPEEDS``.
+    
+    Returns:
+        TravelTimeProfile: Perfil global
+    """
+    global _global_profile
+    if _global_profile is None:
+        value = os.environ.get(SPEED_PROFILE_ENV)
+        _global_profile = _profile_from_env(value) if value else TravelTimeProfile()
+    return _global_profile
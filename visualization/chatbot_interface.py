@@ -52,6 +52,7 @@ class ChatbotWebInterface:
         """Prepara dados para a interface."""
         # Dados de motoristas/veículos
         self.drivers_data = []
+        route_distances = self._calculate_route_distances()
         for idx, route in enumerate(self.solution.routes):
             route_deliveries = [d for d in self.deliveries if d.id in route]
             critical_count = sum(1 for d in route_deliveries if d.priority == 1)
@@ -63,7 +64,7 @@ class ChatbotWebInterface:
                 "num_deliveries": len(route),
                 "critical_deliveries": critical_count,
                 "total_weight": total_weight,
-                "distance": self._calculate_route_distance(route),
+                "distance": route_distances[idx],
             })
         
         # Dados de hospitais
@@ -87,25 +88,29 @@ class ChatbotWebInterface:
             "execution_time": self.optimization_result.execution_time,
         }
     
-    def _calculate_route_distance(self, route: List[str]) -> float:
-        """Calcula distância de uma rota."""
-        from hospital_routes.utils.distance import calculate_distance
+    def _calculate_route_distances(self) -> List[float]:
+        """
+        Calcula a distância de cada rota (entre entregas, sem o depósito).
         
-        if not route:
-            return 0.0
+        Usa o ``DistanceService`` (matriz do problema, cache ou geodesic),
+        como os demais painéis.
+        """
+        from hospital_routes.utils.distance_service import get_distance_service
         
-        total = 0.0
+        distance_service = get_distance_service()
         delivery_dict = {d.id: d for d in self.deliveries}
-        
-        # Distância entre entregas
-        for i in range(len(route) - 1):
-            if route[i] in delivery_dict and route[i + 1] in delivery_dict:
-                total += calculate_distance(
-                    delivery_dict[route[i]].location,
-                    delivery_dict[route[i + 1]].location,
-                )
-        
-        return total
+        distances = []
+        for route in self.solution.routes:
+            total = 0.0
+            for origin, destination in zip(route, route[1:]):
+                if origin in delivery_dict and destination in delivery_dict:
+                    total += distance_service.distance(
+                        delivery_dict[origin].location,
+                        delivery_dict[destination].location,
+                        call_site="ChatbotWebInterface._calculate_route_distances",
+                    )
+            distances.append(total)
+        return distances
     
     def generate_interface(
         self,
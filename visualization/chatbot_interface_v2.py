@@ -68,11 +68,12 @@ class ChatbotInterfaceV2:
         """Prepara dados para a interface."""
         # Dados de motoristas/veículos
         self.drivers_data = []
+        route_distances = self._calculate_route_distances()
         for idx, route in enumerate(self.solution.routes):
             route_deliveries = [d for d in self.deliveries if d.id in route]
             critical_count = sum(1 for d in route_deliveries if d.priority == 1)
             total_weight = sum(d.weight for d in route_deliveries)
-            route_distance = self._calculate_route_distance(route)
+            route_distance = route_distances[idx]
             
             # Obter restrições do veículo se disponível
             vehicle = self.vehicles[idx] if idx < len(self.vehicles) else None
@@ -150,24 +151,29 @@ class ChatbotInterfaceV2:
             "fitness_score": self.solution.fitness_score,
         }
     
-    def _calculate_route_distance(self, route: List[str]) -> float:
-        """Calcula distância de uma rota."""
-        from hospital_routes.utils.distance import calculate_distance
+    def _calculate_route_distances(self) -> List[float]:
+        """
+        Calcula a distância de cada rota (entre entregas, sem o depósito).
         
-        if not route:
-            return 0.0
+        Usa o ``DistanceService`` (matriz do problema, cache ou geodesic),
+        como os demais painéis.
+        """
+        from hospital_routes.utils.distance_service import get_distance_service
         
-        total = 0.0
+        distance_service = get_distance_service()
         delivery_dict = {d.id: d for d in self.deliveries}
-        
-        for i in range(len(route) - 1):
-            if route[i] in delivery_dict and route[i + 1] in delivery_dict:
-                total += calculate_distance(
-                    delivery_dict[route[i]].location,
-                    delivery_dict[route[i + 1]].location,
-                )
-        
-        return total
+        distances = []
+        for route in self.solution.routes:
+            total = 0.0
+            for origin, destination in zip(route, route[1:]):
+                if origin in delivery_dict and destination in delivery_dict:
+                    total += distance_service.distance(
+                        delivery_dict[origin].location,
+                        delivery_dict[destination].location,
+                        call_site="ChatbotInterfaceV2._calculate_route_distances",
+                    )
+            distances.append(total)
+        return distances
     
     def generate_interface(
         self,
@@ -2398,7 +2404,7 @@ class ChatbotInterfaceV2:
                 // Mostrar mensagem de sucesso
                 alert('✅ Relatório exportado com sucesso!');
                 closeModal('export-modal');
-                
+            
             }} catch (error) {{
                 // Remover indicador de carregamento se existir
                 const loadingMsg = document.getElementById('export-loading');
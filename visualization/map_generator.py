@@ -16,7 +16,7 @@ from hospital_routes.core.interfaces import (
     Delivery,
     RouteSolution,
 )
-from hospital_routes.utils.distance import calculate_distance
+from hospital_routes.utils.distance_service import get_distance_service
 from hospital_routes.utils.accident_data import (
     AccidentDataProvider,
     get_risk_color,
@@ -309,11 +309,9 @@ class MapGenerator:
         route_coordinates.append(depot_location)
         
         # Calcular distância total da rota
-        total_route_distance = 0.0
-        for i in range(len(route_coordinates) - 1):
-            total_route_distance += calculate_distance(
-                route_coordinates[i], route_coordinates[i + 1]
-            )
+        total_route_distance = get_distance_service().path_distance(
+            route_coordinates, call_site="MapGenerator._add_route_to_map"
+        )
         
         # Calcular risco de acidentes se disponível
         route_risk_info = None
@@ -22,6 +22,8 @@ from hospital_routes.core.interfaces import (
     Delivery,
     VehicleConstraints,
 )
+from hospital_routes.utils.distance_service import get_distance_service
+from hospital_routes.utils.travel_time import get_travel_time_profile
 
 
 class ReportExporter:
@@ -267,6 +269,28 @@ class ReportExporter:
         
         return str(output_file.absolute())
     
+    def _route_distances(
+        self, solution, delivery_dict: Dict[str, Delivery]
+    ) -> List[float]:
+        """
+        Distância de cada rota entre entregas (sem o depósito).
+        
+        Usa o ``DistanceService`` (matriz do problema, cache ou geodesic).
+        """
+        distance_service = get_distance_service()
+        distances = []
+        for route in solution.routes:
+            total = 0.0
+            for origin, destination in zip(route, route[1:]):
+                if origin in delivery_dict and destination in delivery_dict:
+                    total += distance_service.distance(
+                        delivery_dict[origin].location,
+                        delivery_dict[destination].location,
+                        call_site="ReportExporter._route_distances",
+                    )
+            distances.append(total)
+        return distances
+    
     def _generate_executive_html(
         self,
         optimization_result: OptimizationResult,
@@ -283,21 +307,15 @@ class ReportExporter:
         total_weight = sum(d.weight for d in deliveries)
         
         # Calcular métricas por veículo
+        route_distances = self._route_distances(solution, delivery_dict)
         vehicle_metrics = []
         for vehicle_idx, route in enumerate(solution.routes):
             if route:
                 route_weight = sum(delivery_dict[d_id].weight for d_id in route if d_id in delivery_dict)
                 route_critical = sum(1 for d_id in route if d_id in delivery_dict and delivery_dict[d_id].priority == 1)
                 
-                # Calcular distância da rota
-                from hospital_routes.utils.distance import calculate_distance
-                route_distance = 0.0
-                for i in range(len(route) - 1):
-                    if route[i] in delivery_dict and route[i+1] in delivery_dict:
-                        route_distance += calculate_distance(
-                            delivery_dict[route[i]].location,
-                            delivery_dict[route[i+1]].location
-                        )
+                # Distância da rota (calculada em lote para todas as rotas)
+                route_distance = route_distances[vehicle_idx]
                 
                 vehicle_metrics.append({
                     'id': vehicle_idx + 1,
@@ -934,26 +952,23 @@ class ReportExporter:
             </div>
         """
         
+        route_distances = self._route_distances(solution, delivery_dict)
+        travel_time_profile = get_travel_time_profile()
         for vehicle_idx, route in enumerate(solution.routes):
             if not route:
                 continue
-                
+            
             # Calcular métricas do veículo
             route_weight = sum(delivery_dict[d_id].weight for d_id in route if d_id in delivery_dict)
             route_critical = sum(1 for d_id in route if d_id in delivery_dict and delivery_dict[d_id].priority == 1)
             
-            # Calcular distância estimada
-            from hospital_routes.utils.distance import calculate_distance
-            route_distance = 0.0
-            for i in range(len(route) - 1):
-                if route[i] in delivery_dict and route[i+1] in delivery_dict:
-                    route_distance += calculate_distance(
-                        delivery_dict[route[i]].location,
-                        delivery_dict[route[i+1]].location
-                    )
+            # Distância estimada (calculada em lote para todas as rotas)
+            route_distance = route_distances[vehicle_idx]
             
-            # Tempo estimado (assumindo 40 km/h médio + 15 min por parada)
-            estimated_time_hours = (route_distance / 40.0) + (len(route) * 0.25)
+            # Tempo estimado (perfil horário de velocidades + 15 min por parada)
+            estimated_time_hours = (
+                travel_time_profile.travel_hours(route_distance) + (len(route) * 0.25)
+            )
             estimated_time_min = int(estimated_time_hours * 60)
             
             vehicle_capacity = vehicles[vehicle_idx].max_capacity if vehicle_idx < len(vehicles) else 100
@@ -1017,7 +1032,7 @@ class ReportExporter:
                 delivery = delivery_dict.get(delivery_id)
                 if not delivery:
                     continue
-                    
+                
                 is_critical = delivery.priority == 1
                 priority_class = 'critical' if is_critical else ''
                 priority_badge_class = 'priority-critical' if is_critical else 'priority-normal'
@@ -12,8 +12,10 @@ from hospital_routes.core.interfaces import (
     Delivery,
     VehicleConstraints,
     OptimizationConfig,
+    RouteSolution,
 )
 from hospital_routes.optimization.greedy_optimizer import GreedyOptimizer
+from hospital_routes.utils.travel_time import get_travel_time_profile
 
 
 @dataclass
@@ -130,15 +132,17 @@ class ScenarioComparator:
     ) -> float:
         """Estima tempo total de entrega em horas."""
         delivery_dict = {d.id: d for d in deliveries}
+        profile = get_travel_time_profile()
         total_time = 0.0
         
         for route in solution.routes:
             if not route:
                 continue
             
-            # Tempo de viagem (simplificado: 1h por 40km)
+            # Tempo de viagem (simplificado: distância média por rota, na
+            # velocidade do horário de saída)
             route_distance = solution.total_distance / len([r for r in solution.routes if r])
-            travel_time = route_distance / 40.0
+            travel_time = profile.travel_hours(route_distance)
             
             # Tempo de serviço
             service_time = sum(
@@ -157,7 +161,11 @@ class ScenarioComparator:
         depot_location: tuple[float, float],
     ) -> tuple[float, float, int, float, float]:
         """Calcula métricas da solução baseline (sem otimização)."""
-        from hospital_routes.utils.distance import calculate_distance
+        from hospital_routes.utils.distance_service import get_distance_service
+        
+        distance_service = get_distance_service()
+        profile = get_travel_time_profile()
+        call_site = "ScenarioComparator._calculate_baseline"
         
         # Baseline: distribuir entregas sequencialmente entre veículos
         num_vehicles = len(vehicles)
@@ -165,6 +173,7 @@ class ScenarioComparator:
         
         total_distance = 0.0
         total_cost = 0.0
+        total_travel_time = 0.0
         violations = 0.0
         
         for vehicle_idx in range(num_vehicles):
@@ -177,22 +186,36 @@ class ScenarioComparator:
             
             vehicle = vehicles[vehicle_idx]
             
-            # Calcular distância da rota
+            # Calcular distância e tempo da rota (cada trecho na velocidade
+            # do horário em que começa)
             route_distance = 0.0
+            travel_time = 0.0
+            clock = profile.departure_hour
             current_location = depot_location
             
             for delivery in route_deliveries:
-                route_distance += calculate_distance(current_location, delivery.location)
+                leg = distance_service.distance(
+                    current_location, delivery.location, call_site
+                )
+                leg_time = profile.travel_hours(leg, clock)
+                route_distance += leg
+                travel_time += leg_time
+                clock += leg_time + delivery.estimated_service_time
                 current_location = delivery.location
             
             # Voltar ao depósito
-            route_distance += calculate_distance(current_location, depot_location)
+            leg = distance_service.distance(
+                current_location, depot_location, call_site
+            )
+            route_distance += leg
+            travel_time += profile.travel_hours(leg, clock)
             
             total_distance += route_distance
+            total_travel_time += travel_time
             
             # Custo
             route_cost = route_distance * vehicle.fuel_cost_per_km
-            route_cost += (route_distance / 50.0) * vehicle.driver_cost_per_hour
+            route_cost += travel_time * vehicle.driver_cost_per_hour
             total_cost += route_cost
             
             # Verificar violações
@@ -203,7 +226,7 @@ class ScenarioComparator:
                 violations += 1.0
         
         # Tempo estimado
-        estimated_time = total_distance / 40.0 + len(deliveries) * 0.5
+        estimated_time = total_travel_time + len(deliveries) * 0.5
         
         return total_distance, total_cost, num_vehicles, violations, estimated_time
     
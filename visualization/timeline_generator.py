@@ -13,7 +13,8 @@ from hospital_routes.core.interfaces import (
     Delivery,
     RouteSolution,
 )
-from hospital_routes.utils.distance import calculate_distance
+from hospital_routes.utils.distance_service import get_distance_service
+from hospital_routes.utils.travel_time import TravelTimeProfile, get_travel_time_profile
 
 
 @dataclass
@@ -48,7 +49,7 @@ class TimelineGenerator:
         optimization_result: OptimizationResult,
         deliveries: List[Delivery],
         depot_location: Tuple[float, float],
-        average_speed: float = 40.0,  # km/h
+        average_speed: Optional[float] = None,  # km/h
     ) -> List[TimelineEvent]:
         """
         Gera timeline de eventos das entregas.
@@ -57,7 +58,9 @@ class TimelineGenerator:
             optimization_result: Resultado da otimização
             deliveries: Lista de entregas
             depot_location: Localização do depósito
-            average_speed: Velocidade média dos veículos (km/h)
+            average_speed: Velocidade média constante dos veículos (km/h);
+                None usa o perfil horário de velocidades (picos de trânsito),
+                o mesmo do custo das otimizações
         
         Returns:
             Lista de eventos ordenados por tempo
@@ -65,6 +68,11 @@ class TimelineGenerator:
         events = []
         delivery_dict = {d.id: d for d in deliveries}
         solution = optimization_result.solution
+        distance_service = get_distance_service()
+        profile = (
+            TravelTimeProfile.flat(average_speed) if average_speed
+            else get_travel_time_profile()
+        )
         
         for vehicle_idx, route in enumerate(solution.routes):
             if not route:
@@ -81,10 +89,17 @@ class TimelineGenerator:
                 delivery = delivery_dict[delivery_id]
                 
                 # Calcular distância até a entrega
-                distance = calculate_distance(current_location, delivery.location)
+                distance = distance_service.distance(
+                    current_location, delivery.location,
+                    call_site="TimelineGenerator.generate_timeline",
+                )
                 
-                # Calcular tempo de viagem (horas)
-                travel_time_hours = distance / average_speed
+                # Calcular tempo de viagem (horas), na velocidade do horário de saída
+                clock_hour = (
+                    current_time.hour + current_time.minute / 60.0
+                    + current_time.second / 3600.0
+                )
+                travel_time_hours = profile.travel_hours(distance, clock_hour)
                 travel_time = timedelta(hours=travel_time_hours)
                 
                 # Horário de chegada